@@ -1,15 +1,30 @@
 from dataclasses import dataclass
-from typing import Any
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from src.preferences import PreferenceSpec
+
+# Value marking a missing preference in uint8 preference arrays: offline
+# nodes and undecided honest nodes, which do not answer queries.
+NO_PREFERENCE = 255
 
 
 @dataclass
 class SnowballConfig:
-    """Snowball Config class."""
+    """
+    Snowball Config class.
+
+    `Beta` is the confidence threshold of virtuous nodes. When `BetaRogue`
+    is set, frostbyte engines require it instead from rogue nodes, those
+    that have seen successful polls for more than one value, as go-flare's
+    BetaVirtuous/BetaRogue pair.
+    """
 
     K: int
     AlphaPreference: int
     AlphaConfidence: int
     Beta: int
+    BetaRogue: int | None = None
 
     def update(self, **kwargs: Any) -> None:
         """Update SnowballConfig parameters in-place."""
@@ -23,13 +38,18 @@ class SnowballConfig:
 
 @dataclass
 class SimConfig:
-    """General configuration."""
+    """
+    General configuration.
+
+    Initial preferences of a node type are given either as an explicit list
+    or as a compact PreferenceSpec (see src.preferences).
+    """
 
     num_nodes: int
     num_iterations: int
     snowball: SnowballConfig
     node_counts: dict[str, int]
-    initial_preferences: dict[str, list[int | None]]
+    initial_preferences: "dict[str, list[int | None] | PreferenceSpec]"
 
     def update_snowball(self, **kwargs: Any) -> None:
         """Update nested SnowballConfig."""
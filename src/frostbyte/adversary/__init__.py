@@ -0,0 +1,15 @@
+from .strategies import (
+    AdversaryStrategy,
+    BalancingStrategy,
+    ContrarianStrategy,
+    MinorityStrategy,
+    StaleViewStrategy,
+)
+
+__all__ = [
+    "AdversaryStrategy",
+    "BalancingStrategy",
+    "ContrarianStrategy",
+    "MinorityStrategy",
+    "StaleViewStrategy",
+]
@@ -0,0 +1,142 @@
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import TYPE_CHECKING, override
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from src.frostbyte.snowball.state import SnowballState
+
+
+class AdversaryStrategy(ABC):
+    """
+    Vectorized behaviour of L-nodes.
+
+    Strategies see the whole (M, K) sample matrix of a round together with
+    the querier state, and answer for every sampled position at once.
+    """
+
+    def observe(self, state: "SnowballState") -> None:  # noqa: B027
+        """Hook called once per sampler call, before any votes are gathered."""
+
+    @abstractmethod
+    def respond(
+        self,
+        queriers: np.ndarray,
+        peer_samples: np.ndarray,
+        state: "SnowballState",
+    ) -> np.ndarray:
+        """
+        Return L-node votes for the sampled peers.
+
+        Args:
+            queriers: (M,) array of querying honest nodes.
+            peer_samples: (M, K) array of sampled peer indices.
+            state: current Snowball state.
+
+        Returns:
+            Votes broadcastable to (M, K); only L-node positions are used.
+
+        """
+
+
+class MinorityStrategy(AdversaryStrategy):
+    """Answer every query with the minority honest preference."""
+
+    @override
+    def respond(
+        self,
+        queriers: np.ndarray,
+        peer_samples: np.ndarray,
+        state: "SnowballState",
+    ) -> np.ndarray:
+        """Return the state's L-node preference for every position."""
+        return np.asarray(state.lnode_pref)
+
+
+class ContrarianStrategy(AdversaryStrategy):
+    """Answer each querier with its strongest value other than its preference."""
+
+    @override
+    def respond(
+        self,
+        queriers: np.ndarray,
+        peer_samples: np.ndarray,
+        state: "SnowballState",
+    ) -> np.ndarray:
+        """Return one vote per querier, pushing it away from its preference."""
+        strengths = state.strengths[queriers].astype(np.int64)
+        current = state.preferences[queriers]
+        strengths[np.arange(queriers.size), current] = -1
+
+        return strengths.argmax(axis=1)[:, None]
+
+
+class BalancingStrategy(AdversaryStrategy):
+    """
+    Break the confidence streaks of queriers close to Beta.
+
+    Queriers whose confidence reaches `threshold * Beta` get a vote against
+    their last majority; everyone else gets the minority preference.
+    """
+
+    def __init__(self, threshold: float = 0.5) -> None:
+        """Initialize with the fraction of Beta at which queriers are targeted."""
+        self.threshold = threshold
+
+    @override
+    def respond(
+        self,
+        queriers: np.ndarray,
+        peer_samples: np.ndarray,
+        state: "SnowballState",
+    ) -> np.ndarray:
+        """Return one vote per querier, depending on its confidence."""
+        num_choices = state.strengths.shape[1]
+        beta = state.snowball_config.Beta
+
+        last_majority = state.last_majority[queriers].astype(np.int64)
+        targeted = state.confidences[queriers] >= self.threshold * beta
+
+        # Any value other than the last majority resets the streak
+        against = np.where(
+            last_majority == state.lnode_pref,
+            (last_majority + 1) % num_choices,
+            state.lnode_pref,
+        )
+        votes = np.where(targeted, against, state.lnode_pref)
+
+        return votes[:, None]
+
+
+class StaleViewStrategy(AdversaryStrategy):
+    """
+    Minority strategy acting on a delayed view of the network.
+
+    The L-node preference is taken from `lag` sampler calls ago, i.e. `lag`
+    rounds in lockstep and `lag` node steps in random sampling.
+    """
+
+    def __init__(self, lag: int) -> None:
+        """Initialize with the delay of the adversary's network view."""
+        self.lag = lag
+        self.history: deque[int] = deque(maxlen=lag + 1)
+        self._state: SnowballState | None = None
+
+    @override
+    def observe(self, state: "SnowballState") -> None:
+        """Record the current L-node preference, restarting on a new run."""
+        if state is not self._state:
+            self.history.clear()
+            self._state = state
+        self.history.append(state.lnode_pref)
+
+    @override
+    def respond(
+        self,
+        queriers: np.ndarray,
+        peer_samples: np.ndarray,
+        state: "SnowballState",
+    ) -> np.ndarray:
+        """Return the oldest L-node preference still in view."""
+        return np.asarray(self.history[0])
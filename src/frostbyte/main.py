@@ -5,6 +5,7 @@ from src.config import SimConfig, SnowballConfig
 from src.frostbyte.sampler import SnowballSampler
 from src.frostbyte.simul import run_snowball
 from src.frostbyte.snowball import snowball_ls
+from src.preferences import Proportions
 from src.snow.node import TYPES
 
 
@@ -22,7 +23,7 @@ def start() -> None:
         num_iterations=10,
         snowball=snowball,
         node_counts={TYPES.honest: 250},
-        initial_preferences={TYPES.honest: [0] * 125 + [1] * 125},  # type: ignore[arg-type]
+        initial_preferences={TYPES.honest: Proportions({0: 0.5, 1: 0.5})},
     )
 
     sampler = SnowballSampler(rng=np.random.default_rng())
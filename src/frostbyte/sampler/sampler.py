@@ -1,16 +1,45 @@
 from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
 
 import numpy as np
 
+from src.utils.streams import CHOICE, RandomStreams, StreamBuffers
+from src.utils.topology import PeerGraph
+
+if TYPE_CHECKING:
+    from src.frostbyte.adversary import AdversaryStrategy
+    from src.frostbyte.snowball.state import SnowballState
+
 
 @dataclass
 class SnowballSampler:
-    """Holds the fixed state needed to sample peers."""
+    """
+    Holds the fixed state needed to sample peers.
+
+    L-nodes answer with the scalar `lnode_pref` passed by the engines, unless
+    an `adversary` strategy is set, in which case it provides their votes.
+
+    If `streams` is set, peers and queriers are drawn from counter-based
+    streams keyed by the current `trial` and `round` and the querying node,
+    instead of sequentially from `rng`. Results then do not depend on how
+    the nodes of a round are batched or split between workers.
+
+    If a peer `graph` is set, every node samples K distinct neighbors in the
+    graph instead of K distinct nodes out of the whole network. On sparse
+    graphs, nodes on the boundary between regions of different preferences
+    can flip forever, so full finality may never be reached; such runs
+    should use partial finality or the `max_rounds` cap of `snowball_ls`.
+    """
 
     rng: np.random.Generator
+    adversary: "AdversaryStrategy | None" = None
+    streams: RandomStreams | None = None
+    graph: PeerGraph | None = None
     sample_size: int = field(default=0, init=False)
     num_nodes: int = field(default=0, init=False)
     lnode_start: int = field(default=0, init=False)
+    trial: int = field(default=0, init=False)
+    round: int = field(default=0, init=False)
 
     def update_config(self, sample_size: int, num_nodes: int, lnode_start: int) -> None:
         """Update Class config."""
@@ -23,19 +52,180 @@ class SnowballSampler:
         if 0 in (self.sample_size, self.num_nodes, self.lnode_start):
             e = "SnowballSampler is not fully configured."
             raise RuntimeError(e)
+        if self.graph is not None:
+            if self.graph.num_nodes != self.num_nodes:
+                e = (
+                    f"Peer graph has {self.graph.num_nodes} nodes, "
+                    f"the network {self.num_nodes}."
+                )
+                raise ValueError(e)
+            self.graph.check_degree(self.sample_size)
+
+    def set_trial(self, trial: int) -> None:
+        """Select the trial used to key the random streams."""
+        self.trial = trial
+
+    def set_round(self, round_: int) -> None:
+        """Select the round used to key the random streams."""
+        self.round = round_
+
+    def with_rng(self, rng: np.random.Generator) -> "SnowballSampler":
+        """Return a copy of this sampler, with the same config, drawing from rng."""
+        clone = SnowballSampler(
+            rng=rng, adversary=self.adversary, streams=self.streams, graph=self.graph
+        )
+        clone.update_config(self.sample_size, self.num_nodes, self.lnode_start)
+        clone.set_trial(self.trial)
+        clone.set_round(self.round)
+        return clone
 
     def choose_node(
         self,
         active_nodes: np.ndarray,
     ) -> int:
         """Randomly select a node from active nodes."""
+        if self.streams is not None:
+            index = self.streams.choice(self.trial, self.round, active_nodes.size)
+            return active_nodes[index]
         return self.rng.choice(active_nodes)
 
+    def choose_nodes(self, active_nodes: np.ndarray, size: int) -> np.ndarray:
+        """Randomly select `size` distinct nodes from active nodes."""
+        if self.streams is not None:
+            u = self.streams.uniform(
+                self.trial, self.round, active_nodes, 1, purpose=CHOICE
+            )
+            return active_nodes[np.argsort(u[:, 0], kind="stable")[:size]]
+        return self.rng.choice(active_nodes, size=size, replace=False)
+
+    def draw_peer_set(self, node_id: int) -> np.ndarray:
+        """Draw K distinct peers for a single node, excluding the node itself."""
+        if self.streams is not None or self.graph is not None:
+            return self.draw_peers(np.array([node_id]))[0]
+
+        # Draw from [0..num_nodes-2], then shift ≥node_id up by 1
+        u = self.rng.choice(self.num_nodes - 1, size=self.sample_size, replace=False)
+        return u + (u >= node_id)
+
+    def draw_peers(
+        self,
+        active_nodes: np.ndarray,
+        out: np.ndarray | None = None,
+        buffers: StreamBuffers | None = None,
+    ) -> np.ndarray:
+        """
+        Draw K distinct peers for every active node, shape (M, K).
+
+        With streams, `buffers` are reused for the draws instead of
+        allocating work arrays in every call.
+        """
+        if self.graph is not None:
+            return self._draw_neighbors(active_nodes, out)
+        if self.streams is not None:
+            return self.streams.peer_samples(
+                self.trial,
+                self.round,
+                active_nodes,
+                self.num_nodes,
+                self.sample_size,
+                out=out,
+                buffers=buffers,
+            )
+
+        peer_samples = (
+            np.empty((active_nodes.size, self.sample_size), dtype=int)
+            if out is None
+            else out
+        )
+
+        for idx, node_id in enumerate(active_nodes):
+            # draw K distinct peers from [0..N-2]
+            u = self.rng.choice(
+                self.num_nodes - 1, size=self.sample_size, replace=False
+            )
+            # shift those ≥ node_id up by 1 to skip self
+            np.add(u, u >= node_id, out=peer_samples[idx])
+
+        return peer_samples
+
+    def _draw_neighbors(
+        self, active_nodes: np.ndarray, out: np.ndarray | None = None
+    ) -> np.ndarray:
+        """Draw K distinct graph neighbors for every active node."""
+        if self.streams is not None:
+            u = self.streams.uniform(
+                self.trial, self.round, active_nodes, self.sample_size
+            )
+        else:
+            u = self.rng.random((active_nodes.size, self.sample_size))
+
+        return self.graph.sample(active_nodes, u, out=out)  # type: ignore[union-attr]
+
+    def sampled_votes(
+        self,
+        peer_samples: np.ndarray,
+        preferences: np.ndarray,
+        lnode_pref: int,
+        queriers: np.ndarray | None = None,
+        state: "SnowballState | None" = None,
+    ) -> np.ndarray:
+        """
+        Gather the votes of sampled peers, overriding L-node responses.
+
+        Args:
+            peer_samples: (M, K) array of sampled peers.
+            preferences: 1d array of preferences.
+            lnode_pref: preference of LNodes.
+            queriers: (M,) array of querying nodes, used by the adversary.
+            state: current state, used by the adversary.
+
+        Returns:
+            (M, K) array of votes.
+
+        """
+        adversary = self.adversary if state is not None else None
+        if adversary is not None and state is not None:
+            adversary.observe(state)
+
+        sampled_prefs = preferences[peer_samples]  # fancy indexing copies
+        if self.lnode_start < self.num_nodes:
+            lnode_mask = peer_samples >= self.lnode_start
+            if not lnode_mask.any():
+                pass
+            elif adversary is not None and state is not None and queriers is not None:
+                votes = adversary.respond(queriers, peer_samples, state)
+                votes = np.broadcast_to(votes, peer_samples.shape)
+                sampled_prefs[lnode_mask] = votes[lnode_mask]
+            else:
+                sampled_prefs[lnode_mask] = lnode_pref
+
+        # Undecided honest peers adopt the querier's preference
+        if state is not None and queriers is not None and state.num_undecided > 0:
+            state.answer_undecided(queriers, peer_samples, sampled_prefs)
+
+        return sampled_prefs
+
+    def _single_votes(
+        self,
+        node_id: int,
+        sampled: np.ndarray,
+        preferences: np.ndarray,
+        lnode_pref: int,
+        state: "SnowballState | None",
+    ) -> np.ndarray:
+        """Gather the votes for a single querier as a 1d array."""
+        sampled_prefs = self.sampled_votes(
+            sampled[None, :], preferences, lnode_pref, np.array([node_id]), state
+        )
+        return sampled_prefs[0]
+
     def sample_and_count(
         self,
         node_id: int,
         preferences: np.ndarray,
         lnode_pref: int,
+        *,
+        state: "SnowballState | None" = None,
     ) -> tuple[int, int]:
         """
         Sample K peers and count how many votes for 0 vs. 1.
@@ -44,25 +234,23 @@ class SnowballSampler:
             node_id: The index of the honest node doing the sampling.
             preferences: 1d array of preferences.
             lnode_pref: preference of LNodes.
+            state: current state, passed to the adversary strategy.
 
         Returns:
             (preference, count) giving the majority and count of votes.
 
         """
-        # 1) Draw from [0..num_nodes-2], then shift ≥node_id up by 1
-        u = self.rng.choice(self.num_nodes - 1, size=self.sample_size, replace=False)
-        sampled = u + (u >= node_id)
+        # 1) Draw K distinct peers other than node_id
+        sampled = self.draw_peer_set(node_id)
 
         # 2) Get prefs, overriding L-nodes
-        sampled_prefs = preferences[sampled]
-        if self.lnode_start < self.num_nodes:
-            lmask = sampled >= self.lnode_start
-            if lmask.any():
-                sampled_prefs[lmask] = lnode_pref
+        sampled_prefs = self._single_votes(
+            node_id, sampled, preferences, lnode_pref, state
+        )
 
-        # 3) Count 1s vs 0s
-        ones = int(sampled_prefs.sum())
-        zeros = self.sample_size - ones
+        # 3) Count 1s vs 0s, skipping missing votes
+        ones = int(np.count_nonzero(sampled_prefs == 1))
+        zeros = int(np.count_nonzero(sampled_prefs == 0))
 
         # 4) Get preference and count
         if ones > zeros:
@@ -74,36 +262,103 @@ class SnowballSampler:
 
         return majority_pref, majority_count
 
+    def sample_and_count_nary(
+        self,
+        node_id: int,
+        preferences: np.ndarray,
+        lnode_pref: int,
+        num_choices: int,
+        *,
+        state: "SnowballState | None" = None,
+    ) -> tuple[int, int]:
+        """
+        Sample K peers and count the votes for each of `num_choices` values.
+
+        Args:
+            node_id: The index of the honest node doing the sampling.
+            preferences: 1d array of preferences in [0, num_choices).
+            lnode_pref: preference of LNodes.
+            num_choices: number of competing values.
+            state: current state, passed to the adversary strategy.
+
+        Returns:
+            (preference, count) giving the majority and count of votes.
+
+        """
+        sampled = self.draw_peer_set(node_id)
+        sampled_prefs = self._single_votes(
+            node_id, sampled, preferences, lnode_pref, state
+        )
+
+        # Ties go to the lowest value, as in the binary case
+        valid = sampled_prefs[sampled_prefs < num_choices]
+        vote_counts = np.bincount(valid, minlength=num_choices)
+        majority_pref = int(vote_counts.argmax())
+
+        return majority_pref, int(vote_counts[majority_pref])
+
     def batch_sampler(
         self,
         active_nodes: np.ndarray,
         preferences: np.ndarray,
         lnode_pref: int,
+        *,
+        state: "SnowballState | None" = None,
     ) -> tuple[np.ndarray, np.ndarray]:
         """Sample peers for all active nodes and parse votes."""
-        peer_samples = np.empty((active_nodes.size, self.sample_size), dtype=int)
-
-        for idx, node_id in enumerate(active_nodes):
-            # draw K distinct peers from [0..N-2]
-            u = self.rng.choice(
-                self.num_nodes - 1, size=self.sample_size, replace=False
-            )
-            # shift those ≥ node_id up by 1 to skip self
-            peer_samples[idx] = u + (u >= node_id)
+        peer_samples = self.draw_peers(active_nodes)
 
         # Gather preferences and override LNode values
-        sampled_prefs = preferences[peer_samples].copy()  # shape (M, K)
-        if self.lnode_start < self.num_nodes:
-            lnode_mask = peer_samples >= self.lnode_start
-            if lnode_mask.any():
-                sampled_prefs[lnode_mask] = lnode_pref
+        sampled_prefs = self.sampled_votes(
+            peer_samples, preferences, lnode_pref, active_nodes, state
+        )
 
-        # Count zeros/ones
-        ones = sampled_prefs.sum(axis=1).astype(int)
-        zeros = self.sample_size - ones
+        # Count zeros/ones, skipping missing votes
+        ones = np.count_nonzero(sampled_prefs == 1, axis=1)
+        zeros = np.count_nonzero(sampled_prefs == 0, axis=1)
 
         # Return preferences and counts
         majority_pref = (ones > zeros).astype(np.uint8)
         majority_count = np.where(ones > zeros, ones, zeros)
 
         return majority_pref, majority_count
+
+    def batch_sampler_nary(
+        self,
+        active_nodes: np.ndarray,
+        preferences: np.ndarray,
+        lnode_pref: int,
+        num_choices: int,
+        *,
+        state: "SnowballState | None" = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Sample peers for all active nodes and count votes per choice.
+
+        Votes are tallied with a single offset `bincount` over the (M, K)
+        vote matrix, giving an (M, num_choices) table of choice counts.
+        Missing votes are masked out before counting.
+
+        Returns:
+            (majority_pref, majority_count) arrays of length M.
+
+        """
+        peer_samples = self.draw_peers(active_nodes)
+        sampled_prefs = self.sampled_votes(
+            peer_samples, preferences, lnode_pref, active_nodes, state
+        )
+
+        # Row r counts into bins [r * C, (r + 1) * C)
+        num_active = active_nodes.size
+        offsets = np.arange(num_active)[:, None] * num_choices
+        bins = sampled_prefs + offsets
+        choice_counts = np.bincount(
+            bins[sampled_prefs < num_choices],
+            minlength=num_active * num_choices,
+        ).reshape(num_active, num_choices)
+
+        # Ties go to the lowest value, as in the binary case
+        majority_pref = choice_counts.argmax(axis=1)
+        majority_count = choice_counts[np.arange(num_active), majority_pref]
+
+        return majority_pref.astype(np.uint8), majority_count
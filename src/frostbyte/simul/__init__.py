@@ -1,5 +1,36 @@
-from .runner import run_snowball
+from .fork import TrialBatch, fork, run_prefix
+from .metrics import FinalizationHistogram
+from .runner import run_snowball, run_snowball_configs
+from .search import (
+    ThresholdEstimate,
+    liveness_failure,
+    safety_failure,
+    search_threshold,
+    wilson_interval,
+)
+from .splitting import (
+    RareEventEstimate,
+    SplittingResult,
+    conflict_score,
+    multilevel_splitting,
+    run_splitting,
+)
 
 __all__ = [
+    "FinalizationHistogram",
+    "RareEventEstimate",
+    "SplittingResult",
+    "ThresholdEstimate",
+    "TrialBatch",
+    "conflict_score",
+    "fork",
+    "liveness_failure",
+    "multilevel_splitting",
+    "run_prefix",
     "run_snowball",
+    "run_snowball_configs",
+    "run_splitting",
+    "safety_failure",
+    "search_threshold",
+    "wilson_interval",
 ]
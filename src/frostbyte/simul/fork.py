@@ -0,0 +1,339 @@
+from collections.abc import Callable
+from copy import deepcopy
+from dataclasses import replace
+
+import numpy as np
+
+from src.config import SnowballConfig
+from src.frostbyte.adversary import AdversaryStrategy
+from src.frostbyte.sampler import SnowballSampler
+from src.frostbyte.snowball.lockstep import lockstep_round
+from src.frostbyte.snowball.state import NarySnowballState, SnowballState
+from src.utils.streams import floyd_sample
+
+StopCondition = Callable[[SnowballState], bool]
+
+
+def run_prefix(  # noqa: PLR0913
+    config: SnowballConfig,
+    node_types: np.ndarray,
+    initial_preferences: np.ndarray,
+    sampler: SnowballSampler,
+    until: StopCondition,
+    *,
+    max_rounds: int | None = None,
+    record_latency: bool = False,
+    record_values: bool = False,
+) -> SnowballState:
+    """
+    Run Snowball Lockstep until `until(state)` holds, to fork the state.
+
+    Args:
+        config: SnowballConfig instance
+        node_types: cumulative node type boundaries, honest nodes first
+        initial_preferences: initial node preferences (0, 1 or NO_PREFERENCE)
+        sampler: SnowballSampler instance
+        until: condition on the state ending the prefix
+        max_rounds: end the prefix after this many rounds anyway
+        record_latency: record each honest node's finalization round, in
+            the prefix and its continuations
+        record_values: record the value each honest node finalized on
+
+    Returns:
+        the state at the end of the prefix, `round` rounds completed
+
+    """
+    state = SnowballState.initial(
+        config,
+        node_types,
+        initial_preferences,
+        record_latency=record_latency,
+        record_values=record_values,
+    )
+    sampler.check_config()
+    honest_ids = np.arange(node_types[0])
+
+    while not until(state):
+        if max_rounds is not None and state.round >= max_rounds:
+            break
+        if not lockstep_round(state, sampler, honest_ids):
+            break
+
+    return state
+
+
+def _continue(
+    state: SnowballState,
+    sampler: SnowballSampler,
+    finality: str,
+    max_rounds: int | None,
+) -> dict:
+    """Run a state on to finality, one lockstep round at a time."""
+    honest_ids = np.arange(state.num_honest)
+    half = state.preferences.size // 2
+    rounds_to_partial = None
+
+    while True:
+        if state.finalized_count > half and rounds_to_partial is None:
+            rounds_to_partial = state.round
+            if finality == "partial":
+                break
+        if max_rounds is not None and state.round >= max_rounds:
+            break
+        if not lockstep_round(state, sampler, honest_ids):
+            break
+
+    return state.summary(state.round, rounds_to_partial, finality)
+
+
+class TrialBatch:
+    """
+    Snowball Lockstep state of many independent continuations.
+
+    Every array of a SnowballState gains a leading trial axis, so one round
+    of all continuations is a single vectorized update over the active
+    (trial, node) pairs, each drawing its own peers.
+    """
+
+    def __init__(
+        self, state: SnowballState, sampler: SnowballSampler, trials: int
+    ) -> None:
+        """
+        Copy `state` into `trials` continuations.
+
+        Args:
+            state: SnowballState to continue
+            sampler: configured SnowballSampler drawing the peers
+            trials: number of continuations
+
+        """
+        self.snowball_config = state.snowball_config
+        self.sampler = sampler
+        self.num_honest = state.num_honest
+        self.round = state.round
+
+        self.preferences = np.tile(state.preferences, (trials, 1))
+        self.strengths = np.tile(state.strengths[: self.num_honest], (trials, 1, 1))
+        self.confidences = np.tile(state.confidences[: self.num_honest], (trials, 1))
+        self.last_majority = np.tile(state.last_majority, (trials, 1))
+        self.finalized = np.tile(state.finalized[: self.num_honest], (trials, 1))
+        self.finalized_counts = np.tile(state.finalized_counts, (trials, 1))
+        self.count_0 = np.full(trials, state.count_0, dtype=np.int64)
+        self.first_trial = sampler.trial + 1
+
+        # Optional records of the state, one row per trial
+        self.finalization_rounds = (
+            None
+            if state.finalization_rounds is None
+            else np.tile(state.finalization_rounds, (trials, 1))
+        )
+        self.finalized_values = (
+            None
+            if state.finalized_values is None
+            else np.tile(state.finalized_values, (trials, 1))
+        )
+
+    @property
+    def lnode_prefs(self) -> np.ndarray:
+        """L-node response of every trial: its minority honest preference."""
+        return np.where(self.count_0 < self.num_honest - self.count_0, 0, 1)
+
+    def _draw_peers(self, trials: np.ndarray, nodes: np.ndarray) -> np.ndarray:
+        """Draw K distinct peers, other than itself, for every (trial, node) pair."""
+        sampler = self.sampler
+        k, population = sampler.sample_size, sampler.num_nodes - 1
+        if sampler.streams is None:
+            u = sampler.rng.random((nodes.size, k))
+        else:
+            # Each continuation draws from its own trial streams
+            u = np.empty((nodes.size, k))
+            for trial in np.unique(trials):
+                rows = trials == trial
+                u[rows] = sampler.streams.uniform(
+                    self.first_trial + trial, self.round, nodes[rows], k
+                )
+
+        peers = floyd_sample(u, population)
+        return peers + (peers >= nodes[:, None])
+
+    def step(self, running: np.ndarray) -> bool:
+        """
+        Run one round of the running trials.
+
+        Returns:
+            False, without running the round, if no pair is active
+
+        """
+        config = self.snowball_config
+        trials, nodes = np.nonzero(~self.finalized & running[:, None])
+        if nodes.size == 0:
+            return False
+
+        # 1) Sample peers and count votes against this round's preferences
+        peers = self._draw_peers(trials, nodes)
+        votes = self.preferences[trials[:, None], peers]
+        lnode_prefs = self.lnode_prefs[trials]
+        votes = np.where(peers >= self.sampler.lnode_start, lnode_prefs[:, None], votes)
+        ones = np.count_nonzero(votes == 1, axis=1)
+        zeros = np.count_nonzero(votes == 0, axis=1)
+        majority = (ones > zeros).astype(np.uint8)
+        count = np.maximum(ones, zeros)
+
+        # 2) Strengths and flips, as in `lockstep_update`
+        passed = count >= config.AlphaPreference
+        t, n, m = trials[passed], nodes[passed], majority[passed]
+        self.strengths[t, n, m] += 1
+        flip = (self.strengths[t, n, m] > self.strengths[t, n, 1 - m]) & (
+            self.preferences[t, n] != m
+        )
+        t, n, m = t[flip], n[flip], m[flip]
+        self.preferences[t, n] = m
+        num_trials = self.count_0.size
+        self.count_0 += np.bincount(t[m == 0], minlength=num_trials)
+        self.count_0 -= np.bincount(t[m == 1], minlength=num_trials)
+
+        # 3) Confidences, reset to 1 unless confirmed, and finalization
+        confirm = (count >= config.AlphaConfidence) & (
+            majority == self.last_majority[trials, nodes]
+        )
+        confidences = np.where(confirm, self.confidences[trials, nodes] + 1, 1)
+        self.confidences[trials, nodes] = confidences
+        beta = config.Beta
+        if config.BetaRogue is not None:
+            rogue = np.all(self.strengths[trials, nodes] > 0, axis=1)
+            beta = np.where(rogue, config.BetaRogue, config.Beta)
+        final = confirm & (confidences >= beta)
+        t, n, m = trials[final], nodes[final], majority[final]
+        self.finalized[t, n] = True
+        np.add.at(self.finalized_counts, (t, m), 1)
+        if self.finalization_rounds is not None:
+            self.finalization_rounds[t, n] = self.round + 1
+        if self.finalized_values is not None:
+            self.finalized_values[t, n] = m
+
+        self.last_majority[trials, nodes] = majority
+        self.round += 1
+
+        return True
+
+
+def _batch_continuations(
+    state: SnowballState,
+    sampler: SnowballSampler,
+    continuations: int,
+    finality: str,
+    max_rounds: int | None,
+) -> list[dict]:
+    """Run all continuations of `state` as one trial-axis batch."""
+    batch = TrialBatch(state, sampler, continuations)
+    half = state.preferences.size // 2
+    running = np.ones(continuations, dtype=bool)
+    to_partial = np.full(continuations, -1)
+    to_full = np.full(continuations, -1)
+
+    while running.any():
+        finalized = batch.finalized.sum(axis=1)
+        reached = running & (finalized > half) & (to_partial < 0)
+        to_partial[reached] = batch.round
+        if finality == "partial":
+            running &= ~reached
+        done = running & (finalized == state.num_honest)
+        to_full[done] = batch.round
+        running &= ~done
+
+        if max_rounds is not None and batch.round >= max_rounds:
+            break
+        if not batch.step(running):
+            break
+
+    results = []
+    for trial in range(continuations):
+        count_0 = int(batch.count_0[trial])
+        finalized_count = int(batch.finalized[trial].sum())
+        full = finality == "full" and to_full[trial] >= 0
+        result = {
+            "honest_0": count_0,
+            "honest_1": state.num_honest - count_0,
+            "honest_undecided": 0,
+            "finalized_honest": finalized_count,
+            "rounds_to_partial": int(to_partial[trial])
+            if to_partial[trial] >= 0
+            else None,
+            "rounds_to_full": int(to_full[trial]) if full else None,
+            "conflict": bool(np.count_nonzero(batch.finalized_counts[trial]) > 1),
+        }
+        if batch.finalization_rounds is not None:
+            result["finalization_rounds"] = batch.finalization_rounds[trial]
+        if batch.finalized_values is not None:
+            result["finalized_values"] = batch.finalized_values[trial]
+        results.append(result)
+
+    return results
+
+
+def fork(  # noqa: PLR0913
+    state: SnowballState,
+    sampler: SnowballSampler,
+    continuations: int,
+    *,
+    config: SnowballConfig | None = None,
+    adversary: AdversaryStrategy | None = None,
+    finality: str = "full",
+    max_rounds: int | None = None,
+) -> list[dict]:
+    """
+    Run many independent continuations of a Snowball Lockstep state.
+
+    The state is left untouched, so the prefix that led to it is paid for
+    once. Continuations run as a single trial-axis batch (`TrialBatch`)
+    when the state is a plain SnowballState without undecided nodes and no
+    adversary or graph is involved; otherwise each continuation runs on its
+    own copy of the state and sampler. Sequential generators are spawned
+    from the sampler's `rng`; with counter-based streams, continuation i
+    draws from trial `sampler.trial + 1 + i`.
+
+    Args:
+        state: state to continue, such as the result of `run_prefix`
+        sampler: SnowballSampler configured for the network
+        continuations: number of continuations
+        config: SnowballConfig of the continuations, the state's by default
+        adversary: adversary strategy of the continuations, copied for each
+        finality: "full" or "partial" finality
+        max_rounds: stop each continuation after this many rounds in total
+
+    Returns:
+        result dict of every continuation, with rounds counted from the
+        start of the prefix, and the state's finalization records if any
+
+    """
+    if isinstance(state, NarySnowballState):
+        e = "fork continues binary protocols only, not NarySnowballState."
+        raise TypeError(e)
+
+    state = replace(state, snowball_config=config or state.snowball_config)
+    sampler = sampler.with_rng(sampler.rng)
+    sampler.update_config(
+        state.snowball_config.K, sampler.num_nodes, sampler.lnode_start
+    )
+    adversary = adversary or sampler.adversary
+    sampler.check_config()
+
+    batched = (
+        type(state) is SnowballState
+        and state.num_undecided == 0
+        and adversary is None
+        and sampler.graph is None
+    )
+    if batched:
+        return _batch_continuations(
+            state.copy(), sampler, continuations, finality, max_rounds
+        )
+
+    results = []
+    for i, rng in enumerate(sampler.rng.spawn(continuations)):
+        clone = sampler.with_rng(rng)
+        clone.adversary = deepcopy(adversary)
+        clone.set_trial(sampler.trial + 1 + i)
+        results.append(_continue(state.copy(), clone, finality, max_rounds))
+
+    return results
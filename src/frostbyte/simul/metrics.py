@@ -0,0 +1,79 @@
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from src.frostbyte.snowball.state import NOT_FINALIZED
+
+
+@dataclass
+class FinalizationHistogram:
+    """
+    Histogram of honest-node finalization rounds.
+
+    `counts[r]` is the number of nodes that finalized in round r. Histograms
+    of different runs add up, so latency statistics over many trials only
+    keep one array of length max-round in memory.
+    """
+
+    counts: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.int64))
+    unfinalized: int = 0
+
+    @classmethod
+    def from_rounds(cls, finalization_rounds: np.ndarray) -> "FinalizationHistogram":
+        """Build a histogram from a per-node `finalization_rounds` array."""
+        done = finalization_rounds != NOT_FINALIZED
+        return cls(
+            counts=np.bincount(finalization_rounds[done]).astype(np.int64),
+            unfinalized=int(np.count_nonzero(~done)),
+        )
+
+    @classmethod
+    def merge(
+        cls, histograms: Iterable["FinalizationHistogram"]
+    ) -> "FinalizationHistogram":
+        """Reduce many histograms into one."""
+        total = cls()
+        for histogram in histograms:
+            total += histogram
+        return total
+
+    def __add__(self, other: "FinalizationHistogram") -> "FinalizationHistogram":
+        """Add two histograms, padding the shorter one."""
+        size = max(self.counts.size, other.counts.size)
+        counts = np.zeros(size, dtype=np.int64)
+        counts[: self.counts.size] += self.counts
+        counts[: other.counts.size] += other.counts
+        return FinalizationHistogram(counts, self.unfinalized + other.unfinalized)
+
+    @property
+    def finalized(self) -> int:
+        """Number of finalized nodes counted."""
+        return int(self.counts.sum())
+
+    def quantile(self, q: float) -> int | None:
+        """Smallest round by which a fraction q of finalized nodes finalized."""
+        if self.finalized == 0:
+            return None
+        cumulative = np.cumsum(self.counts)
+        rank = max(np.ceil(q * cumulative[-1]), 1)
+        return int(np.searchsorted(cumulative, rank, side="left"))
+
+    def mean(self) -> float | None:
+        """Mean finalization round of finalized nodes."""
+        if self.finalized == 0:
+            return None
+        rounds = np.arange(self.counts.size)
+        return float(np.dot(rounds, self.counts) / self.finalized)
+
+    def summary(self, quantiles: Iterable[float] = (0.5, 0.9, 0.99)) -> dict:
+        """Return mean, quantiles and extremes of the finalization rounds."""
+        nonzero = np.flatnonzero(self.counts)
+        return {
+            "finalized": self.finalized,
+            "unfinalized": self.unfinalized,
+            "mean": self.mean(),
+            **{f"p{round(100 * q, 2):g}": self.quantile(q) for q in quantiles},
+            "min": int(nonzero[0]) if nonzero.size else None,
+            "max": int(nonzero[-1]) if nonzero.size else None,
+        }
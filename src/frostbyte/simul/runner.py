@@ -1,38 +1,43 @@
-from collections.abc import Callable
-from itertools import accumulate, chain
+from collections.abc import Callable, Iterable
+from itertools import accumulate
+from typing import Any
 
 import numpy as np
-from tqdm import trange
+from tqdm import tqdm
 
-from src.config import SimConfig
+from src.config import NO_PREFERENCE, SimConfig, SnowballConfig
 from src.frostbyte.sampler import SnowballSampler
+from src.frostbyte.simul.metrics import FinalizationHistogram
+from src.frostbyte.snowball.config_axis import snowball_ls_configs
+from src.preferences import preference_array
 from src.snow.node import TYPES
 
 
-def run_snowball(
-    sim_config: SimConfig,
-    sampler: SnowballSampler,
-    snowball_algo: Callable[..., dict],
-    finality: str = "full",
-) -> list[dict]:
+def build_network(
+    sim_config: SimConfig, sampler: SnowballSampler
+) -> tuple[np.ndarray, np.ndarray]:
     """
-    Run multiple network simulations with identical parameters.
+    Build the engine inputs of a SimConfig and configure the sampler for it.
 
     Returns:
-        List of finalization stats dicts (one per run).
+        cumulative node type boundaries and initial preferences
 
     """
-    results = []
-    key_order = [TYPES.honest, TYPES.fixed, TYPES.dynamic]
+    key_order = [TYPES.honest, TYPES.fixed, TYPES.offline, TYPES.dynamic]
     counts_ordered = [sim_config.node_counts.get(k, 0) for k in key_order]
     node_types = np.fromiter(accumulate(counts_ordered), dtype=int)
 
-    initial_prefs = np.fromiter(
-        chain.from_iterable(
-            sim_config.initial_preferences.get(k, []) for k in key_order
-        ),
-        dtype=np.uint8,
-    )
+    # Offline, L-nodes and unset honest nodes hold no preference
+    initial_prefs = np.full(node_types[-1], NO_PREFERENCE, dtype=np.uint8)
+    for k, count, end in zip(key_order, counts_ordered, node_types, strict=True):
+        prefs = sim_config.initial_preferences.get(k)
+        if prefs is None:
+            continue
+        try:
+            initial_prefs[end - count : end] = preference_array(prefs, count)
+        except ValueError as err:
+            e = f"Initial preferences of '{k}' must match node counts: {err}"
+            raise ValueError(e) from err
 
     sampler.update_config(
         sample_size=sim_config.snowball.K,
@@ -40,15 +45,119 @@ def run_snowball(
         lnode_start=node_types[-2],
     )
 
-    for _ in trange(sim_config.num_iterations, desc="Running simulations"):
+    return node_types, initial_prefs
+
+
+def run_snowball(  # noqa: PLR0913
+    sim_config: SimConfig,
+    sampler: SnowballSampler,
+    snowball_algo: Callable[..., dict],
+    finality: str = "full",
+    *,
+    latency_histogram: bool = False,
+    first_trial: int = 0,
+    **algo_kwargs: Any,
+) -> list[dict]:
+    """
+    Run multiple network simulations with identical parameters.
+
+    Args:
+        sim_config: simulation configuration
+        sampler: SnowballSampler instance
+        snowball_algo: frostbyte engine, such as `snowball_ls`
+        finality: "full" or "partial" finality
+        latency_histogram: replace each run's per-node finalization rounds
+            with a FinalizationHistogram under "latency_histogram"
+        first_trial: number of the first trial, so that further batches of
+            trials draw fresh sampler streams
+        algo_kwargs: extra keyword arguments for the engine
+
+    Returns:
+        List of finalization stats dicts (one per run).
+
+    """
+    results = []
+    node_types, initial_prefs = build_network(sim_config, sampler)
+
+    if latency_histogram:
+        algo_kwargs["record_latency"] = True
+
+    trials = range(first_trial, first_trial + sim_config.num_iterations)
+    for trial in tqdm(trials, desc="Running simulations"):
+        sampler.set_trial(trial)
         sim_result = snowball_algo(
             config=sim_config.snowball,
             node_types=node_types,
             initial_preferences=initial_prefs,
             sampler=sampler,
             finality=finality,
+            **algo_kwargs,
         )
 
+        if latency_histogram and "finalization_counts" in sim_result:
+            # Count-based engines report the histogram counts directly
+            sim_result["latency_histogram"] = FinalizationHistogram(
+                counts=sim_result.pop("finalization_counts"),
+                unfinalized=node_types[0] - sim_result["finalized_honest"],
+            )
+        elif latency_histogram:
+            sim_result["latency_histogram"] = FinalizationHistogram.from_rounds(
+                sim_result.pop("finalization_rounds")
+            )
+
         results.append(sim_result)
 
     return results
+
+
+def run_snowball_configs(
+    sim_config: SimConfig,
+    sampler: SnowballSampler,
+    configs: Iterable[SnowballConfig],
+    finality: str = "full",
+    *,
+    first_trial: int = 0,
+    **algo_kwargs: Any,
+) -> list[list[dict]]:
+    """
+    Run multiple network simulations of several SnowballConfigs at once.
+
+    Each trial is a single `snowball_ls_configs` pass over all configs,
+    which share the peer draws of the trial. The network and K are read
+    from `sim_config`, whose own SnowballConfig is otherwise ignored.
+
+    Args:
+        sim_config: simulation configuration
+        sampler: SnowballSampler instance
+        configs: SnowballConfigs to compare, with the K of `sim_config`,
+            such as the result of `config_grid`
+        finality: "full" or "partial" finality
+        first_trial: number of the first trial, as for `run_snowball`
+        algo_kwargs: extra keyword arguments for `snowball_ls_configs`
+
+    Returns:
+        List of finalization stats dicts per config, one per run.
+
+    """
+    configs = list(configs)
+    node_types, initial_prefs = build_network(sim_config, sampler)
+    if any(config.K != sim_config.snowball.K for config in configs):
+        e = f"Configs must use the K of the simulation, {sim_config.snowball.K}."
+        raise ValueError(e)
+
+    results: list[list[dict]] = [[] for _ in configs]
+    trials = range(first_trial, first_trial + sim_config.num_iterations)
+    for trial in tqdm(trials, desc="Running simulations"):
+        sampler.set_trial(trial)
+        runs = snowball_ls_configs(
+            configs,
+            node_types=node_types,
+            initial_preferences=initial_prefs,
+            sampler=sampler,
+            finality=finality,
+            **algo_kwargs,
+        )
+        for per_config, run in zip(results, runs, strict=True):
+            per_config.append(run)
+
+    return results
@@ -0,0 +1,282 @@
+from collections import Counter
+from collections.abc import Callable
+from copy import deepcopy
+from dataclasses import dataclass, field, fields
+from math import sqrt
+from statistics import NormalDist
+from typing import Any
+
+from src.config import SimConfig, SnowballConfig
+from src.frostbyte.sampler import SnowballSampler
+from src.frostbyte.simul.runner import run_snowball
+from src.preferences import PreferenceSpec, Proportions
+from src.snow.node import TYPES
+
+Event = Callable[[dict], bool]
+
+
+def safety_failure(result: dict) -> bool:
+    """Honest nodes finalized on different values."""
+    return bool(result["conflict"])
+
+
+def liveness_failure(result: dict) -> bool:
+    """Honest nodes did not all finalize, e.g. within `max_rounds`."""
+    return result["rounds_to_full"] is None
+
+
+def wilson_interval(
+    events: int, trials: int, confidence: float = 0.95
+) -> tuple[float, float]:
+    """
+    Wilson score interval of a binomial rate.
+
+    Returns:
+        lower and upper bound of the rate, (0, 1) without trials
+
+    """
+    if trials == 0:
+        return 0.0, 1.0
+
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+    rate = events / trials
+    denominator = 1 + z**2 / trials
+    center = (rate + z**2 / (2 * trials)) / denominator
+    spread = z * sqrt(rate * (1 - rate) / trials + z**2 / (4 * trials**2))
+    spread /= denominator
+
+    return max(0.0, center - spread), min(1.0, center + spread)
+
+
+@dataclass
+class Evaluation:
+    """Event count of the trials run at one parameter value."""
+
+    events: int = 0
+    trials: int = 0
+    significant: bool = False
+
+    @property
+    def rate(self) -> float:
+        """Observed event rate."""
+        return self.events / self.trials if self.trials else float("nan")
+
+    def beyond(self, target: float, *, increasing: bool) -> bool:
+        """Whether the observed rate lies on the far side of `target`."""
+        return (self.rate > target) == increasing
+
+
+@dataclass
+class ThresholdEstimate:
+    """
+    Outcome of a threshold search.
+
+    `threshold` is the smallest parameter value on the far side of the
+    target event rate, None if the upper bound is still on the near side.
+    `interval` holds every value the threshold may take given the points
+    whose test was significant; points that ran out of trials only narrow
+    the point estimate. It is None without a threshold, or if significant
+    points contradict each other, as a non-monotone event rate may do.
+    """
+
+    parameter: str
+    target: float
+    threshold: float | None
+    interval: tuple[float, float] | None
+    evaluations: dict[float, Evaluation] = field(default_factory=dict)
+
+    @property
+    def trials(self) -> int:
+        """Number of simulation runs spent by the search."""
+        return sum(point.trials for point in self.evaluations.values())
+
+    def summary(self) -> dict:
+        """Return the threshold, its interval and the simulation cost."""
+        return {
+            "parameter": self.parameter,
+            "target": self.target,
+            "threshold": self.threshold,
+            "interval": self.interval,
+            "trials": self.trials,
+            "evaluations": {
+                value: (point.events, point.trials)
+                for value, point in sorted(self.evaluations.items())
+            },
+        }
+
+
+def _configure(sim_config: SimConfig, parameter: str, value: int) -> SimConfig:
+    """
+    Copy a SimConfig with one parameter set to an integer value.
+
+    SnowballConfig fields are set as is. For a node type, `value` is its node
+    count; honest nodes make up for the change so `num_nodes` is kept.
+    Preference lists of the two resized types are replaced by the
+    `Proportions` of their values, PreferenceSpecs are built for the new
+    counts as they are.
+    """
+    config = deepcopy(sim_config)
+    if parameter in {f.name for f in fields(SnowballConfig)}:
+        config.update_snowball(**{parameter: value})
+        return config
+
+    if parameter == TYPES.honest or parameter not in vars(TYPES).values():
+        e = f"Invalid search parameter: {parameter}"
+        raise ValueError(e)
+
+    counts = dict(config.node_counts)
+    counts[TYPES.honest] = counts.get(TYPES.honest, 0) - (
+        value - counts.get(parameter, 0)
+    )
+    counts[parameter] = value
+    if counts[TYPES.honest] < 0:
+        e = f"Not enough honest nodes for {value} '{parameter}' nodes."
+        raise ValueError(e)
+    config.node_counts = counts
+
+    prefs = dict(config.initial_preferences)
+    for node_type in (TYPES.honest, parameter):
+        prefs[node_type] = _resized(prefs.get(node_type), counts[node_type])
+    config.initial_preferences = {
+        node_type: pref for node_type, pref in prefs.items() if pref is not None
+    }
+
+    return config
+
+
+def _resized(
+    prefs: list[int | None] | PreferenceSpec | None, count: int
+) -> list[int | None] | PreferenceSpec | None:
+    """Preferences of a node type resized to `count` nodes."""
+    if prefs is None or isinstance(prefs, PreferenceSpec) or len(prefs) == count:
+        return prefs
+    if not prefs:
+        e = f"Cannot derive the preferences of {count} nodes from an empty list."
+        raise ValueError(e)
+
+    return Proportions(dict(Counter(prefs)))
+
+
+def search_threshold(  # noqa: PLR0913
+    sim_config: SimConfig,
+    sampler: SnowballSampler,
+    snowball_algo: Callable[..., dict],
+    parameter: str,
+    bounds: tuple[float, float],
+    *,
+    event: Event = safety_failure,
+    target: float = 0.01,
+    increasing: bool = False,
+    confidence: float = 0.95,
+    batch: int = 20,
+    max_trials: int = 1000,
+    finality: str = "full",
+    **algo_kwargs: Any,
+) -> ThresholdEstimate:
+    """
+    Find where the rate of an event crosses `target` by noisy bisection.
+
+    The event rate is assumed monotone in the parameter. Each bisection
+    point runs batches of `batch` trials until the Wilson interval of its
+    rate excludes `target` or `max_trials` is reached, so points far from
+    the boundary are settled after a batch or two and the effort goes to
+    the points close to it. Batches of one point continue the trial numbers
+    of the previous ones, while different points share trial numbers, i.e.
+    sampler streams, which makes their comparison less noisy.
+
+    When a node type is searched, preference lists of the honest nodes and
+    of that type keep their proportions, not their order, as their counts
+    change.
+
+    Examples are the minimal Beta keeping the safety-failure rate below
+    1% (`parameter="Beta"`, the default event and direction), or the L-node
+    fraction at which liveness breaks (`parameter=TYPES.dynamic`,
+    `event=liveness_failure`, `increasing=True` and a `max_rounds` cap for
+    `snowball_ls`).
+
+    Args:
+        sim_config: simulation configuration
+        sampler: SnowballSampler instance
+        snowball_algo: frostbyte engine, such as `snowball_ls`
+        parameter: SnowballConfig field (integer values), or node type
+            (fraction of `num_nodes`, taken from the honest nodes)
+        bounds: lowest and highest parameter value to consider
+        event: outcome of a run whose rate is compared to `target`
+        target: event rate defining the threshold
+        increasing: whether the event rate grows with the parameter; the
+            threshold is the smallest value with a rate at most `target` if
+            not, above `target` if so
+        confidence: confidence level of the test at every point
+        batch: number of trials added at a time
+        max_trials: number of trials after which a point is decided on its
+            observed rate
+        finality: "full" or "partial" finality
+        algo_kwargs: extra keyword arguments for the engine
+
+    Returns:
+        ThresholdEstimate with the threshold and the trials of every point
+
+    """
+    node_type = parameter not in {f.name for f in fields(SnowballConfig)}
+    scale = sim_config.num_nodes if node_type else 1
+    lo, hi = (round(bound * scale) for bound in bounds)
+    evaluations: dict[int, Evaluation] = {}
+
+    def beyond(value: int) -> bool:
+        """Test whether `value` lies on the far side of the threshold."""
+        config = _configure(sim_config, parameter, value)
+        point = evaluations.setdefault(value, Evaluation())
+        while not point.significant and point.trials < max_trials:
+            config.num_iterations = min(batch, max_trials - point.trials)
+            results = run_snowball(
+                sim_config=config,
+                sampler=sampler,
+                snowball_algo=snowball_algo,
+                finality=finality,
+                first_trial=point.trials,
+                **algo_kwargs,
+            )
+            point.events += sum(event(result) for result in results)
+            point.trials += len(results)
+
+            low, high = wilson_interval(point.events, point.trials, confidence)
+            if high < target or low > target:
+                point.significant = True
+                break
+
+        return point.beyond(target, increasing=increasing)
+
+    # The threshold is the first value beyond, in (left, right]
+    left, right = lo - 1, hi
+    while right - left > 1:
+        middle = (left + right) // 2
+        if beyond(middle):
+            right = middle
+        else:
+            left = middle
+
+    threshold = right if beyond(right) else None
+
+    # Significant points bound the threshold whatever the others say
+    near, far = [lo - 1], [hi]
+    for value, point in evaluations.items():
+        if point.significant:
+            side = far if point.beyond(target, increasing=increasing) else near
+            side.append(value)
+
+    def unit(value: int) -> float:
+        """Express a searched value in parameter units."""
+        return value / scale if node_type else value
+
+    lower, upper = max(near) + 1, min(far)
+    consistent = threshold is not None and lower <= upper
+
+    return ThresholdEstimate(
+        parameter=parameter,
+        target=target,
+        threshold=None if threshold is None else unit(threshold),
+        interval=(unit(lower), unit(upper)) if consistent else None,
+        evaluations={
+            unit(value): point for value, point in sorted(evaluations.items())
+        },
+    )
@@ -0,0 +1,284 @@
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+from math import comb
+
+import numpy as np
+from tqdm import trange
+
+from src.config import SimConfig, SnowballConfig
+from src.frostbyte.sampler import SnowballSampler
+from src.frostbyte.simul.runner import build_network
+from src.frostbyte.snowball.lockstep import lockstep_round
+from src.frostbyte.snowball.state import SnowballState
+
+ScoreFunction = Callable[[SnowballState], float]
+
+
+def _streak_probability(config: SnowballConfig, supporters: int, total: int) -> float:
+    """Chance that a sample of K out of `total` nodes has AlphaConfidence supporters."""
+    k, alpha = config.K, config.AlphaConfidence
+    hits = sum(
+        comb(supporters, x) * comb(total - supporters, k - x)
+        for x in range(alpha, min(k, supporters) + 1)
+    )
+    return hits / comb(total, k)
+
+
+def conflict_score(state: SnowballState) -> float:
+    """
+    Danger level of a state with respect to conflicting finalization.
+
+    Each value scores Beta once an honest node finalized on it. Otherwise it
+    scores the longest confidence streak c among non-finalized honest nodes
+    whose last majority is that value, plus the chance that one of the nodes
+    at that streak extends it in the next round, so the score lies in
+    [c, c + 1). The danger level is the lowest value score: it reaches Beta
+    exactly when the run is in conflict, and grows in between when both
+    values keep many high-confidence nodes while the honest split stays
+    balanced.
+    """
+    config = state.snowball_config
+    num_decided = state.num_honest - state.num_undecided
+    supporters = (state.count_0, num_decided - state.count_0)
+
+    open_ids = np.flatnonzero(~state.finalized[: state.num_honest])
+    values = state.last_majority[open_ids]
+    confidences = state.confidences[open_ids]
+
+    progress = []
+    for value, count in enumerate(supporters):
+        if state.finalized_counts[value] > 0:
+            progress.append(float(config.Beta))
+            continue
+
+        streaks = confidences[values == value]
+        if streaks.size == 0:
+            progress.append(0.0)
+            continue
+
+        streak = int(streaks.max())
+        at_streak = int(np.count_nonzero(streaks == streak))
+        extend = _streak_probability(config, count, state.preferences.size)
+        # Stay below the next integer level, which needs an actual streak
+        progress.append(
+            min(streak + 1 - (1 - extend) ** at_streak, np.nextafter(streak + 1, 0))
+        )
+
+    return min(progress)
+
+
+@dataclass
+class SplittingResult:
+    """
+    Outcome of one fixed-effort multilevel splitting run.
+
+    The rare-event probability is the product of the conditional
+    probabilities of reaching each level from the previous one.
+    """
+
+    levels: list[float]
+    level_probabilities: list[float]
+    trajectories: int
+    rounds: int
+
+    @property
+    def probability(self) -> float:
+        """Estimated probability of reaching the last level."""
+        if len(self.level_probabilities) < len(self.levels):
+            return 0.0
+        return float(np.prod(self.level_probabilities))
+
+    @property
+    def relative_variance(self) -> float:
+        """
+        Asymptotic squared relative error of the estimate.
+
+        Uses the usual approximation sum_j (1 - p_j) / (n p_j), which ignores
+        the correlation between levels; replicate runs give an unbiased
+        variance estimate instead.
+        """
+        probs = np.asarray(self.level_probabilities)
+        if probs.size < len(self.levels) or np.any(probs == 0):
+            return float("inf")
+        return float(np.sum((1 - probs) / (self.trajectories * probs)))
+
+
+@dataclass
+class RareEventEstimate:
+    """Aggregate of independent splitting runs."""
+
+    runs: list[SplittingResult] = field(default_factory=list)
+
+    @property
+    def estimates(self) -> np.ndarray:
+        """Probability estimate of each run."""
+        return np.array([run.probability for run in self.runs])
+
+    @property
+    def probability(self) -> float:
+        """Mean of the run estimates."""
+        return float(self.estimates.mean())
+
+    @property
+    def variance(self) -> float:
+        """Variance of the mean estimate, from the spread between runs."""
+        if len(self.runs) < 2:  # noqa: PLR2004
+            return float("nan")
+        return float(self.estimates.var(ddof=1) / len(self.runs))
+
+    @property
+    def relative_error(self) -> float:
+        """Standard error of the mean estimate relative to the estimate."""
+        if self.probability == 0:
+            return float("nan")
+        return float(np.sqrt(self.variance) / self.probability)
+
+    def summary(self) -> dict:
+        """
+        Return the estimate, its variance and the simulation cost.
+
+        Level probabilities are averaged over all runs, counting the levels
+        a run never reached as 0.
+        """
+        level_probabilities = None
+        if self.runs:
+            probs = np.zeros((len(self.runs), len(self.runs[0].levels)))
+            for row, run in zip(probs, self.runs, strict=True):
+                row[: len(run.level_probabilities)] = run.level_probabilities
+            level_probabilities = probs.mean(axis=0).tolist()
+
+        return {
+            "probability": self.probability,
+            "variance": self.variance,
+            "relative_error": self.relative_error,
+            "runs": len(self.runs),
+            "rounds": sum(run.rounds for run in self.runs),
+            "level_probabilities": level_probabilities,
+        }
+
+
+def multilevel_splitting(  # noqa: PLR0913
+    config: SnowballConfig,
+    node_types: np.ndarray,
+    initial_preferences: np.ndarray,
+    sampler: SnowballSampler,
+    *,
+    levels: Sequence[float] | None = None,
+    trajectories: int = 1000,
+    max_rounds: int | None = None,
+    score: ScoreFunction = conflict_score,
+) -> SplittingResult:
+    """
+    Estimate the probability of a rare Snowball Lockstep outcome.
+
+    Fixed-effort multilevel splitting: in each stage `trajectories` copies of
+    the states that reached the previous level are run until they reach the
+    next level or the run ends. The states that made it are cloned to seed
+    the next stage, so rare outcomes are reached through a chain of moderate
+    conditional probabilities. With counter-based sampler streams, every
+    trajectory draws from a fresh trial number.
+
+    Args:
+        config: SnowballConfig instance
+        node_types: cumulative node type boundaries, honest nodes first
+        initial_preferences: initial node preferences (0, 1 or NO_PREFERENCE)
+        sampler: SnowballSampler instance
+        levels: increasing danger levels, the last one defining the event;
+            defaults to 0.5, 1, 1.5, ..., Beta in steps of one half, Beta
+            meaning conflicting finalization
+        trajectories: number of trajectories per stage
+        max_rounds: treat runs longer than this many rounds as ended
+        score: danger level of a state
+
+    Returns:
+        SplittingResult with the per-level conditional probabilities
+
+    """
+    levels = list(levels or np.arange(1, 2 * config.Beta + 1) / 2)
+    num_honest = node_types[0]
+    honest_ids = np.arange(num_honest)
+
+    # Check sampler configuration
+    sampler.check_config()
+
+    starts = [SnowballState.initial(config, node_types, initial_preferences)]
+    level_probabilities: list[float] = []
+    rounds = 0
+
+    for level in levels:
+        # Spread the effort evenly over the entrance states
+        picks = sampler.rng.permutation(np.arange(trajectories) % len(starts))
+
+        hits = []
+        for pick in picks:
+            # Clones must not replay the same streams
+            sampler.set_trial(sampler.trial + 1)
+            state = starts[pick].copy()
+            start_round = state.round
+            while score(state) < level:
+                if max_rounds is not None and state.round >= max_rounds:
+                    break
+                if not lockstep_round(state, sampler, honest_ids):
+                    break
+            else:
+                hits.append(state)
+            rounds += state.round - start_round
+
+        level_probabilities.append(len(hits) / trajectories)
+        if not hits:
+            break
+        starts = hits
+
+    return SplittingResult(
+        levels=levels,
+        level_probabilities=level_probabilities,
+        trajectories=trajectories,
+        rounds=rounds,
+    )
+
+
+def run_splitting(  # noqa: PLR0913
+    sim_config: SimConfig,
+    sampler: SnowballSampler,
+    *,
+    levels: Sequence[float] | None = None,
+    trajectories: int = 1000,
+    max_rounds: int | None = None,
+    score: ScoreFunction = conflict_score,
+) -> RareEventEstimate:
+    """
+    Run independent multilevel splitting estimates with identical parameters.
+
+    Each of the `sim_config.num_iterations` runs gives an unbiased estimate;
+    their spread gives the variance of the combined estimate.
+
+    Args:
+        sim_config: simulation configuration
+        sampler: SnowballSampler instance
+        levels: increasing danger levels, see `multilevel_splitting`
+        trajectories: number of trajectories per stage
+        max_rounds: treat runs longer than this many rounds as ended
+        score: danger level of a state
+
+    Returns:
+        RareEventEstimate over all runs
+
+    """
+    node_types, initial_prefs = build_network(sim_config, sampler)
+
+    estimate = RareEventEstimate()
+    for _ in trange(sim_config.num_iterations, desc="Running splitting"):
+        estimate.runs.append(
+            multilevel_splitting(
+                config=sim_config.snowball,
+                node_types=node_types,
+                initial_preferences=initial_prefs,
+                sampler=sampler,
+                levels=levels,
+                trajectories=trajectories,
+                max_rounds=max_rounds,
+                score=score,
+            )
+        )
+
+    return estimate
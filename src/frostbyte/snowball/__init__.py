@@ -1,7 +1,26 @@
+from .buffered import LockstepKernel, snowball_ls_buffered
+from .config_axis import ConfigAxisState, config_grid, snowball_ls_configs
 from .lockstep import snowball_ls
-from .random_sampling import snowball_rs
+from .multi import MultiInstanceState, snowball_multi_ls
+from .nary import snowball_nary_ls, snowball_nary_rs
+from .parallel import snowball_ls_parallel
+from .population import PopulationState, snowball_population_ls
+from .random_sampling import snowball_rs, snowball_rs_tau
 
 __all__ = [
+    "ConfigAxisState",
+    "LockstepKernel",
+    "MultiInstanceState",
+    "PopulationState",
+    "config_grid",
     "snowball_ls",
+    "snowball_ls_buffered",
+    "snowball_ls_configs",
+    "snowball_ls_parallel",
+    "snowball_multi_ls",
+    "snowball_nary_ls",
+    "snowball_nary_rs",
+    "snowball_population_ls",
     "snowball_rs",
+    "snowball_rs_tau",
 ]
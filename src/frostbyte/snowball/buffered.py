@@ -0,0 +1,293 @@
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from src.config import SnowballConfig
+from src.frostbyte.sampler import SnowballSampler
+from src.frostbyte.snowball.state import (
+    NarySnowballState,
+    SnowballState,
+    protocol_state,
+)
+from src.utils.streams import CHUNK_ROWS, StreamBuffers
+
+if TYPE_CHECKING:
+    from src.utils.telemetry import Telemetry
+
+
+class LockstepKernel:
+    """
+    Snowball Lockstep round on preallocated buffers.
+
+    Keeps the non-finalized honest nodes as a compacted int32 index array,
+    shrunk in place as nodes finalize, and preallocates the per-round
+    arrays (peer samples, votes, masks, counts) for the initial active set,
+    as well as the work arrays of the sampler's stream draws. Each round
+    works on views of the first M entries and writes through `out=`
+    targets. With streams, rounds of the Snowball protocol allocate no
+    arrays of the size of the active set; peers drawn from the sampler's
+    `rng` or a peer graph, adversary answers and the Snowflake and Slush
+    updates still allocate theirs. Results match `snowball_ls` for the
+    same sampler.
+    """
+
+    def __init__(self, state: SnowballState, sampler: SnowballSampler) -> None:
+        """Allocate scratch buffers sized to the honest nodes of `state`."""
+        if isinstance(state, NarySnowballState):
+            e = "LockstepKernel runs binary protocols only, not NarySnowballState."
+            raise TypeError(e)
+
+        self.state = state
+        self.sampler = sampler
+
+        # Snowflake and Slush override how nodes adopt and count polls
+        self._adopts_by_state = type(state).adopts is not SnowballState.adopts
+        self._polls_by_state = (
+            type(state).batch_confidence_update
+            is not SnowballState.batch_confidence_update
+        )
+
+        num_honest, k = state.num_honest, sampler.sample_size
+        self._stream_buffers = (
+            StreamBuffers(max(min(num_honest, CHUNK_ROWS), 1), k)
+            if sampler.streams is not None
+            else None
+        )
+        self.active = np.arange(num_honest, dtype=np.int32)
+        self._spare = np.empty(num_honest, dtype=np.int32)
+        self.num_active = num_honest
+
+        self._peers = np.empty((num_honest, k), dtype=np.int32)
+        self._votes = np.empty((num_honest, k), dtype=np.uint8)
+        self._vote_mask = np.empty((num_honest, k), dtype=bool)
+
+        self._ones = np.empty(num_honest, dtype=np.int32)
+        self._zeros = np.empty(num_honest, dtype=np.int32)
+        self._count = np.empty(num_honest, dtype=np.int32)
+        self._majority = np.empty(num_honest, dtype=bool)
+
+        self._passed = np.empty(num_honest, dtype=bool)
+        self._ids = np.empty(num_honest, dtype=np.int32)
+        self._prefs = np.empty(num_honest, dtype=np.uint8)
+        self._index = np.empty(num_honest, dtype=np.intp)
+        self._strg_maj = np.empty(num_honest, dtype=np.uint8)
+        self._strg_other = np.empty(num_honest, dtype=np.uint8)
+        self._flip = np.empty(num_honest, dtype=bool)
+        self._current = np.empty(num_honest, dtype=np.uint8)
+        self._changed = np.empty(num_honest, dtype=bool)
+
+        self._last = np.empty(num_honest, dtype=np.uint8)
+        self._confirm = np.empty(num_honest, dtype=bool)
+        self._reached = np.empty(num_honest, dtype=bool)
+        self._confidences = np.empty(num_honest, dtype=np.uint8)
+
+        # Strengths are addressed as a flat (node * 2 + value) array
+        self._flat_strengths = state.strengths.reshape(-1)
+
+    def queriers(self) -> np.ndarray:
+        """Active nodes that hold a preference, i.e. query this round."""
+        active = self.active[: self.num_active]
+        return self.state.decided(active)
+
+    def step(self, queriers: np.ndarray) -> None:
+        """Run one lockstep round for `queriers`."""
+        majority_pref, majority_count = self._sample(queriers)
+        self._update(queriers, majority_pref, majority_count)
+        self._compact()
+
+    def _sample(self, queriers: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Draw peers, gather votes and return the sampled majorities."""
+        state, sampler = self.state, self.sampler
+        m = queriers.size
+
+        peers = sampler.draw_peers(
+            queriers, out=self._peers[:m], buffers=self._stream_buffers
+        )
+        votes = np.take(state.preferences, peers, out=self._votes[:m], mode="clip")
+        vote_mask = self._vote_mask[:m]
+
+        # Override L-node answers
+        adversary = sampler.adversary
+        if adversary is not None:
+            adversary.observe(state)
+        if sampler.lnode_start < sampler.num_nodes:
+            np.greater_equal(peers, sampler.lnode_start, out=vote_mask)
+            if not vote_mask.any():
+                pass
+            elif adversary is not None:
+                answers = adversary.respond(queriers, peers, state)
+                np.copyto(
+                    votes,
+                    np.broadcast_to(answers, votes.shape),
+                    where=vote_mask,
+                    casting="unsafe",
+                )
+            else:
+                np.copyto(votes, state.lnode_pref, where=vote_mask, casting="unsafe")
+
+        # Undecided honest peers adopt the querier's preference
+        if state.num_undecided > 0:
+            state.answer_undecided(queriers, peers, votes)
+
+        # Count zeros/ones, skipping missing votes
+        ones, zeros = self._ones[:m], self._zeros[:m]
+        np.sum(np.equal(votes, 1, out=vote_mask), axis=1, out=ones)
+        np.sum(np.equal(votes, 0, out=vote_mask), axis=1, out=zeros)
+
+        majority = np.greater(ones, zeros, out=self._majority[:m])
+        count = np.maximum(ones, zeros, out=self._count[:m])
+
+        return majority.view(np.uint8), count
+
+    def _update(
+        self,
+        queriers: np.ndarray,
+        majority_pref: np.ndarray,
+        majority_count: np.ndarray,
+    ) -> None:
+        """Apply `lockstep_update` semantics through the scratch buffers."""
+        state = self.state
+        config = state.snowball_config
+        m = queriers.size
+
+        # 1) Update strengths of nodes passing AlphaPreference
+        passed = np.greater_equal(
+            majority_count, config.AlphaPreference, out=self._passed[:m]
+        )
+        n = int(np.count_nonzero(passed))
+        ids = np.compress(passed, queriers, out=self._ids[:n])
+        prefs = np.compress(passed, majority_pref, out=self._prefs[:n])
+
+        index = np.multiply(ids, 2, out=self._index[:n])
+        np.add(index, prefs, out=index)
+        strg_maj = np.take(self._flat_strengths, index, out=self._strg_maj[:n])
+        np.add(strg_maj, 1, out=strg_maj)
+        np.put(self._flat_strengths, index, strg_maj)
+
+        # 2) Flip towards the majority if the node adopts it
+        if self._adopts_by_state:
+            flip = self._flip[:n]
+            np.copyto(flip, state.adopts(ids, prefs))
+        else:
+            np.bitwise_xor(index, 1, out=index)
+            strg_other = np.take(self._flat_strengths, index, out=self._strg_other[:n])
+            flip = np.greater(strg_maj, strg_other, out=self._flip[:n])
+        current = np.take(state.preferences, ids, out=self._current[:n])
+        flip &= np.not_equal(current, prefs, out=self._changed[:n])
+
+        if flip.any():
+            state.batch_flip(ids[flip], prefs[flip])
+
+        if self._polls_by_state:
+            state.batch_confidence_update(queriers, majority_pref, majority_count)
+            return
+
+        # 3) Bump confidence of confirmed nodes, reset the others to 1
+        last = np.take(state.last_majority, queriers, out=self._last[:m])
+        confirm = np.equal(last, majority_pref, out=self._confirm[:m])
+        confirm &= np.greater_equal(
+            majority_count, config.AlphaConfidence, out=self._reached[:m]
+        )
+
+        confidences = np.take(state.confidences, queriers, out=self._confidences[:m])
+        np.multiply(confidences, confirm, out=confidences)
+        np.add(confidences, 1, out=confidences)
+        np.put(state.confidences, queriers, confidences)
+
+        # 4) Finalize confirmed nodes reaching Beta
+        beta = state.beta(queriers)
+        confirm &= np.greater_equal(confidences, beta, out=self._reached[:m])
+        if confirm.any():
+            state.finalize(queriers[confirm])
+
+        np.put(state.last_majority, queriers, majority_pref)
+
+    def _compact(self) -> None:
+        """Drop newly finalized nodes from the active set, keeping order."""
+        m = self.num_active
+        active = self.active[:m]
+        keep = np.take(self.state.finalized, active, out=self._passed[:m])
+        np.logical_not(keep, out=keep)
+
+        num_kept = int(np.count_nonzero(keep))
+        if num_kept == m:
+            return
+
+        np.compress(keep, active, out=self._spare[:num_kept])
+        self.active, self._spare = self._spare, self.active
+        self.num_active = num_kept
+
+
+def snowball_ls_buffered(  # noqa: PLR0913
+    config: SnowballConfig,
+    node_types: np.ndarray,
+    initial_preferences: np.ndarray,
+    sampler: SnowballSampler,
+    finality: str = "full",
+    *,
+    record_latency: bool = False,
+    record_values: bool = False,
+    protocol: str = "snowball",
+    telemetry: "Telemetry | None" = None,
+) -> dict:
+    """
+    Run Snowball Lockstep with the buffered `LockstepKernel`.
+
+    Args:
+        config: SnowballConfig instance
+        node_types: array [N1, N2, N3] (or [N1, N2, N3, N4]) where:
+            :0 to N1-1: honest nodes
+            :N1 to N2-1: fixed nodes
+            :N2 to N3-1: L nodes
+            (a 4-entry form inserts offline nodes before the L nodes)
+        initial_preferences: initial node preferences (0, 1 or NO_PREFERENCE)
+        sampler: SnowballSampler instance
+        finality: "full" or "partial" finality
+        record_latency: return each honest node's finalization round
+        record_values: return the value each honest node finalized on
+        protocol: "snowball", "snowflake" or "slush"
+        telemetry: Telemetry following the run's progress
+
+    Returns:
+        dictionary with algorithm results
+
+    """
+    num_nodes = node_types[-1]
+    state = protocol_state(protocol).initial(
+        config,
+        node_types,
+        initial_preferences,
+        record_latency=record_latency,
+        record_values=record_values,
+    )
+
+    # Check sampler configuration
+    sampler.check_config()
+    if telemetry is not None:
+        telemetry.watch(state)
+    kernel = LockstepKernel(state, sampler)
+
+    rounds, rounds_to_partial = 0, None
+    half = num_nodes // 2
+
+    while True:
+        state.round = rounds
+        sampler.set_round(rounds)
+
+        # 1) Partial finality check
+        if (state.finalized_count > half) and (rounds_to_partial is None):
+            rounds_to_partial = rounds
+            if finality == "partial":
+                break
+
+        # 2) Check active nodes; undecided nodes wait to be queried
+        queriers = kernel.queriers()
+        if queriers.size == 0:
+            break
+
+        # 3) Sample, update and drop finalized nodes
+        kernel.step(queriers)
+
+        rounds += 1
+
+    return state.summary(rounds, rounds_to_partial, finality)
@@ -0,0 +1,290 @@
+from collections.abc import Iterable
+from dataclasses import replace
+from itertools import product
+from typing import Any
+
+import numpy as np
+
+from src.config import NO_PREFERENCE, SnowballConfig
+from src.frostbyte.sampler import SnowballSampler
+from src.frostbyte.snowball.state import NOT_FINALIZED
+
+
+def config_grid(base: SnowballConfig, **values: Iterable[Any]) -> list[SnowballConfig]:
+    """
+    Configurations of a grid over SnowballConfig fields, as for sweeps.
+
+    For example, `config_grid(base, Beta=[10, 20], AlphaConfidence=[3, 4])`
+    returns the four combinations, the last field varying fastest.
+    """
+    keys = list(values)
+    return [
+        replace(base, **dict(zip(keys, point, strict=True)))
+        for point in product(*(values[key] for key in keys))
+    ]
+
+
+class ConfigAxisState:
+    """
+    Snowball Lockstep state of one network under several configurations.
+
+    Every array carries a leading configuration axis. The configurations
+    share K, so that one peer set per node and round can answer for all of
+    them, but may differ in AlphaPreference, AlphaConfidence, Beta and
+    BetaRogue, kept as per-configuration columns.
+    """
+
+    def __init__(
+        self,
+        configs: list[SnowballConfig],
+        node_types: np.ndarray,
+        initial_preferences: np.ndarray,
+        *,
+        record_latency: bool = False,
+    ) -> None:
+        """
+        Allocate the configuration arrays.
+
+        Args:
+            configs: SnowballConfig of every row, all with the same K
+            node_types: cumulative node type boundaries, honest nodes first
+            initial_preferences: initial node preferences of every row
+            record_latency: allocate per-node finalization rounds
+
+        """
+        if not configs:
+            e = "At least one SnowballConfig is required."
+            raise ValueError(e)
+        if len({config.K for config in configs}) > 1:
+            e = "Configurations of one pass must share K, as they share peers."
+            raise ValueError(e)
+
+        self.configs = configs
+        self.num_honest = num_honest = int(node_types[0])
+        num_configs = len(configs)
+
+        def column(values: Iterable[int]) -> np.ndarray:
+            return np.array(list(values), dtype=np.int64)[:, None]
+
+        self.alpha_preference = column(c.AlphaPreference for c in configs)
+        self.alpha_confidence = column(c.AlphaConfidence for c in configs)
+        self.beta = column(c.Beta for c in configs)
+        self.beta_rogue = column(
+            c.Beta if c.BetaRogue is None else c.BetaRogue for c in configs
+        )
+
+        self.preferences = np.tile(initial_preferences, (num_configs, 1))
+        self.strengths = np.zeros((num_configs, num_honest, 2), dtype=np.uint8)
+        self.confidences = np.zeros((num_configs, num_honest), dtype=np.uint8)
+        self.last_majority = self.preferences[:, :num_honest].copy()
+        self.finalized = np.zeros((num_configs, num_honest), dtype=bool)
+        self.count_0 = np.full(
+            num_configs, np.count_nonzero(initial_preferences[:num_honest] == 0)
+        )
+        self.finalized_counts = np.zeros((num_configs, 2), dtype=np.int64)
+        self.running = np.ones(num_configs, dtype=bool)
+        self.finalization_rounds = (
+            np.full((num_configs, num_honest), NOT_FINALIZED, dtype=np.uint32)
+            if record_latency
+            else None
+        )
+        self.round = 0
+
+    @property
+    def lnode_prefs(self) -> np.ndarray:
+        """L-node response of every row: its minority honest preference."""
+        count_1 = self.num_honest - self.count_0
+        return np.where(self.count_0 < count_1, 0, 1).astype(np.uint8)
+
+    @property
+    def finalized_honest(self) -> np.ndarray:
+        """Number of finalized honest nodes of every row."""
+        return self.finalized_counts.sum(axis=1)
+
+    def pending(self, nodes: np.ndarray) -> np.ndarray:
+        """(C, M) mask of the rows still running an undecided node."""
+        return self.running[:, None] & ~self.finalized[:, nodes]
+
+    def update(
+        self,
+        active: np.ndarray,
+        majority_pref: np.ndarray,
+        majority_count: np.ndarray,
+    ) -> None:
+        """
+        Apply one lockstep round of sampled majorities to every row.
+
+        Mirrors `lockstep_update` for the (row, node) pairs still pending,
+        with the thresholds of each row's configuration.
+
+        Args:
+            active: (M,) honest nodes polling this round
+            majority_pref: (C, M) sampled majority per row and node
+            majority_count: (C, M) sampled majority count per row and node
+
+        """
+        pending = self.pending(active)
+
+        # 1) Strengths of pairs passing their AlphaPreference
+        rows, cols = np.nonzero(pending & (majority_count >= self.alpha_preference))
+        nodes, prefs = active[cols], majority_pref[rows, cols]
+        self.strengths[rows, nodes, prefs] += 1
+
+        # 2) Flip towards a strictly stronger majority
+        flip = (
+            self.strengths[rows, nodes, prefs] > self.strengths[rows, nodes, 1 - prefs]
+        ) & (self.preferences[rows, nodes] != prefs)
+        rows, nodes, prefs = rows[flip], nodes[flip], prefs[flip]
+        self.preferences[rows, nodes] = prefs
+        num_configs = self.count_0.size
+        self.count_0 += np.bincount(rows[prefs == 0], minlength=num_configs)
+        self.count_0 -= np.bincount(rows[prefs == 1], minlength=num_configs)
+
+        # 3) Confidences, reset to 1 unless the majority is confirmed
+        confirm = (
+            pending
+            & (majority_count >= self.alpha_confidence)
+            & (majority_pref == self.last_majority[:, active])
+        )
+        confidences = self.confidences[:, active]
+        confidences = np.where(confirm, confidences + 1, 1).astype(np.uint8)
+        self.confidences[:, active] = np.where(
+            pending, confidences, self.confidences[:, active]
+        )
+
+        # 4) Finalize on the confirmed value, rogue nodes against BetaRogue
+        rogue = np.all(self.strengths[:, active] > 0, axis=2)
+        beta = np.where(rogue, self.beta_rogue, self.beta)
+        rows, cols = np.nonzero(confirm & (confidences >= beta))
+        self.finalized[rows, active[cols]] = True
+        np.add.at(self.finalized_counts, (rows, majority_pref[rows, cols]), 1)
+        if self.finalization_rounds is not None:
+            self.finalization_rounds[rows, active[cols]] = self.round + 1
+
+        self.last_majority[:, active] = np.where(
+            pending, majority_pref, self.last_majority[:, active]
+        )
+
+
+def _poll(
+    state: ConfigAxisState,
+    sampler: SnowballSampler,
+    active: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Draw one peer set per active node and count its votes in every row."""
+    peers = sampler.draw_peers(active)
+    votes = state.preferences[:, peers]  # (C, M, K)
+
+    lnode_mask = peers >= sampler.lnode_start
+    if lnode_mask.any():
+        votes[:, lnode_mask] = state.lnode_prefs[:, None]
+
+    ones = np.count_nonzero(votes == 1, axis=2)
+    zeros = np.count_nonzero(votes == 0, axis=2)
+
+    return (ones > zeros).astype(np.uint8), np.maximum(ones, zeros)
+
+
+def snowball_ls_configs(  # noqa: PLR0913
+    configs: Iterable[SnowballConfig],
+    node_types: np.ndarray,
+    initial_preferences: np.ndarray,
+    sampler: SnowballSampler,
+    finality: str = "full",
+    *,
+    record_latency: bool = False,
+    max_rounds: int | None = None,
+) -> list[dict]:
+    """
+    Run Snowball Lockstep under several configurations in one pass.
+
+    Sweeps over AlphaPreference, AlphaConfidence, Beta or BetaRogue only
+    change how votes are judged, not how peers are drawn: every active
+    node draws one peer set per round, and the peers answer for all
+    configurations at once. Peer sampling is paid once per round instead
+    of once per configuration, and neighbouring sweep points see common
+    random numbers, so their differences have a lower variance than with
+    independent runs. With counter-based streams, every configuration
+    follows exactly the trajectory of its own `snowball_ls` run.
+
+    Args:
+        configs: SnowballConfigs to run, all with the same K
+        node_types: cumulative node type boundaries, honest nodes first
+        initial_preferences: initial node preferences (0 or 1 for honest
+            nodes)
+        sampler: SnowballSampler instance, without adversary strategy
+        finality: "full" or "partial" finality
+        record_latency: return each honest node's finalization round
+        max_rounds: stop after this many rounds
+
+    Returns:
+        result dict of every configuration, in order, as `snowball_ls`
+
+    """
+    configs = list(configs)
+    num_honest, num_nodes = node_types[0], node_types[-1]
+    if np.any(initial_preferences[:num_honest] == NO_PREFERENCE):
+        e = "snowball_ls_configs does not support undecided honest nodes."
+        raise ValueError(e)
+    if sampler.adversary is not None:
+        e = "snowball_ls_configs does not support adversary strategies."
+        raise ValueError(e)
+
+    state = ConfigAxisState(
+        configs, node_types, initial_preferences, record_latency=record_latency
+    )
+
+    # Check sampler configuration
+    sampler.check_config()
+
+    half = num_nodes // 2
+    honest_ids = np.arange(num_honest)
+    to_partial = np.full(len(configs), -1)
+    to_full = np.full(len(configs), -1)
+    rounds = 0
+
+    while max_rounds is None or rounds < max_rounds:
+        state.round = rounds
+        sampler.set_round(rounds)
+
+        # 1) Partial finality check, ending rows that only need it
+        reached = (state.finalized_honest > half) & (to_partial < 0)
+        to_partial[reached] = rounds
+        if finality == "partial":
+            state.running &= ~reached
+
+        # 2) Nodes poll while any running row is pending for them
+        active = honest_ids[state.pending(honest_ids).any(axis=0)]
+        if active.size == 0:
+            break
+
+        # 3) One peer set per node answers for every row
+        majority_pref, majority_count = _poll(state, sampler, active)
+        state.update(active, majority_pref, majority_count)
+        rounds += 1
+
+        done = (state.finalized_honest == num_honest) & (to_full < 0)
+        to_full[done] = rounds
+
+    # A capped run may reach partial finality in its last round
+    reached = (state.finalized_honest > half) & (to_partial < 0)
+    to_partial[reached] = rounds
+
+    results = []
+    for row in range(len(configs)):
+        count_0 = int(state.count_0[row])
+        full = finality == "full" and to_full[row] >= 0
+        result = {
+            "honest_0": count_0,
+            "honest_1": num_honest - count_0,
+            "honest_undecided": 0,
+            "finalized_honest": int(state.finalized_honest[row]),
+            "rounds_to_partial": int(to_partial[row]) if to_partial[row] >= 0 else None,
+            "rounds_to_full": int(to_full[row]) if full else None,
+            "conflict": bool(np.count_nonzero(state.finalized_counts[row]) > 1),
+        }
+        if state.finalization_rounds is not None:
+            result["finalization_rounds"] = state.finalization_rounds[row]
+        results.append(result)
+
+    return results
@@ -1,113 +1,253 @@
+from functools import partial
+from typing import TYPE_CHECKING
+
 import numpy as np
 
 from src.config import SnowballConfig
 from src.frostbyte.sampler import SnowballSampler
-from src.frostbyte.snowball.state import SnowballState
+from src.frostbyte.snowball.state import SnowballState, protocol_state
+from src.utils.milestones import MilestoneTracker
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+    from src.utils.milestones import Milestone
+    from src.utils.telemetry import Telemetry
+
+
+def lockstep_update(
+    state: SnowballState,
+    active: np.ndarray,
+    majority_pref: np.ndarray,
+    majority_count: np.ndarray,
+) -> None:
+    """
+    Apply one round of sampled majorities to the active nodes.
+
+    Args:
+        state: SnowballState instance
+        active: array of active honest nodes
+        majority_pref: sampled majority preference per active node
+        majority_count: sampled majority count per active node
+
+    """
+    config = state.snowball_config
+
+    # 1) Update strengths
+    pref_pass_mask = majority_count >= config.AlphaPreference
+
+    passed_ids = active[pref_pass_mask]
+    passed_prefs = majority_pref[pref_pass_mask]
+    state.strengths[passed_ids, passed_prefs] += 1
+
+    # 2) Perform preference changes
+    flip_mask = state.adopts(passed_ids, passed_prefs) & (
+        state.preferences[passed_ids] != passed_prefs
+    )
+
+    to_flip = passed_ids[flip_mask]
+    new_prefs = passed_prefs[flip_mask]
+    state.batch_flip(to_flip, new_prefs)
+
+    # 3) Update confidence counter
+    state.batch_confidence_update(active, majority_pref, majority_count)
+
+
+def lockstep_round(
+    state: SnowballState,
+    sampler: SnowballSampler,
+    honest_ids: np.ndarray,
+) -> bool:
+    """
+    Run one lockstep round from `state.round` and move to the next round.
+
+    Returns:
+        False, without running the round, once no honest node is active
+
+    """
+    active = state.decided(honest_ids[~state.finalized[: state.num_honest]])
+    if active.size == 0:
+        return False
+
+    sampler.set_round(state.round)
+    majority_pref, majority_count = sampler.batch_sampler(
+        active, state.preferences, state.lnode_pref, state=state
+    )
+    lockstep_update(state, active, majority_pref, majority_count)
+    state.round += 1
+
+    return True
+
+
+def chunked_lockstep_round(
+    state: SnowballState,
+    sampler: SnowballSampler,
+    chunk_size: int,
+    frozen: np.ndarray,
+) -> bool:
+    """
+    Run one lockstep round over the honest nodes, `chunk_size` at a time.
 
+    The preferences at the start of the round are copied into `frozen`,
+    which every chunk samples against together with the L-node response of
+    the round start, while updates go to `state`. Sampling and update
+    temporaries are then bounded by `chunk_size` (x K) rather than by the
+    number of active nodes, and the round follows the same lockstep
+    semantics as a single batch.
 
-def snowball_ls(
+    Args:
+        state: SnowballState instance, without undecided nodes
+        sampler: SnowballSampler instance, without adversary strategy
+        chunk_size: number of honest nodes handled at a time
+        frozen: buffer shaped like `state.preferences`
+
+    Returns:
+        False, without running the round, once no honest node is active
+
+    """
+    np.copyto(frozen, state.preferences)
+    lnode_pref = state.lnode_pref
+    polled = False
+
+    for start in range(0, state.num_honest, chunk_size):
+        stop = min(start + chunk_size, state.num_honest)
+        active = np.flatnonzero(~state.finalized[start:stop]) + start
+        if active.size == 0:
+            continue
+
+        majority_pref, majority_count = sampler.batch_sampler(
+            active, frozen, lnode_pref, state=state
+        )
+        lockstep_update(state, active, majority_pref, majority_count)
+        polled = True
+
+    return polled
+
+
+def _round_runner(
+    state: SnowballState, sampler: SnowballSampler, chunk_size: int | None
+) -> "Callable[[], bool]":
+    """Pick the round function of `snowball_ls`, checking chunked runs."""
+    honest_ids = np.arange(state.num_honest)  # honest indices
+    if chunk_size is None:
+        return partial(lockstep_round, state, sampler, honest_ids)
+
+    if chunk_size < 1:
+        e = f"chunk_size must be positive, got {chunk_size}."
+        raise ValueError(e)
+
+    # Adoption and adversary observations would happen per chunk
+    if state.num_undecided > 0:
+        e = "Chunked snowball_ls does not support undecided honest nodes."
+        raise ValueError(e)
+    if sampler.adversary is not None:
+        e = "Chunked snowball_ls does not support adversary strategies."
+        raise ValueError(e)
+
+    frozen = np.empty_like(state.preferences)
+    return partial(chunked_lockstep_round, state, sampler, chunk_size, frozen)
+
+
+def snowball_ls(  # noqa: PLR0913
     config: SnowballConfig,
     node_types: np.ndarray,
     initial_preferences: np.ndarray,
     sampler: SnowballSampler,
     finality: str = "full",
+    *,
+    record_latency: bool = False,
+    record_values: bool = False,
+    telemetry: "Telemetry | None" = None,
+    protocol: str = "snowball",
+    max_rounds: int | None = None,
+    chunk_size: int | None = None,
+    milestones: "Iterable[Milestone | str] | None" = None,
 ) -> dict:
     """
     Run centralized Snowball Lockstep with vectorized operations.
 
+    By default a round samples all active nodes at once, materializing
+    (M, K) peer and vote matrices. With `chunk_size`, rounds go through
+    `chunked_lockstep_round` instead, so their transient memory is bounded
+    by the chunk size; for the same sampler, results are unchanged.
+
     Args:
         config: SnowballConfig instance
-        node_types: array [N1, N2, N3] where:
+        node_types: array [N1, N2, N3] (or [N1, N2, N3, N4]) where:
             :0 to N1-1: honest nodes
             :N1 to N2-1: fixed nodes
             :N2 to N3-1: L nodes
-        initial_preferences: initial node preferences (0 or 1)
+            (a 4-entry form inserts offline nodes before the L nodes)
+        initial_preferences: initial node preferences (0, 1 or NO_PREFERENCE)
         sampler: SnowballSampler instance
         finality: "full" or "partial" finality
+        record_latency: return each honest node's finalization round
+        record_values: return the value each honest node finalized on
+        telemetry: Telemetry following the run's progress
+        protocol: "snowball", "snowflake" or "slush"
+        max_rounds: stop after this many rounds, e.g. to observe liveness
+            failures as runs without full finality
+        chunk_size: sample and update at most this many honest nodes at a
+            time; not supported with undecided nodes or adversaries
+        milestones: milestones to record, as "milestones" in the results;
+            the run stops once all required ones are reached
 
     Returns:
         dictionary with algorithm results
 
     """
     # Save locally number of nodes
-    num_honest, num_nodes = (
-        node_types[0],
-        node_types[-1],
-    )
-
-    # LNode responses
-    count_0 = np.sum(initial_preferences[:num_honest] == 0)
-    lnode_pref = 0 if count_0 < (num_honest - count_0) else 1
+    num_nodes = node_types[-1]
 
     # Initialize SnowballState instance
-    state = SnowballState(
-        snowball_config=config,
-        preferences=initial_preferences.copy(),
-        strengths=np.zeros((num_nodes, 2), dtype=np.uint8),
-        confidences=np.zeros(num_nodes, dtype=np.uint8),
-        last_majority=initial_preferences[:num_honest].copy(),
-        finalized=np.zeros(num_nodes, dtype=bool),
-        count_0=count_0,
-        num_honest=num_honest,
-        lnode_pref=lnode_pref,
-        finalized_count=0,
+    state = protocol_state(protocol).initial(
+        config,
+        node_types,
+        initial_preferences,
+        record_latency=record_latency,
+        record_values=record_values,
     )
 
     # Check sampler configuration
     sampler.check_config()
+    if telemetry is not None:
+        telemetry.watch(state)
 
     rounds, rounds_to_partial = 0, None
     half = num_nodes // 2
-    honest_ids = np.arange(num_honest)  # honest indices
+    run_round = _round_runner(state, sampler, chunk_size)
+    tracker = None if milestones is None else MilestoneTracker(milestones)
 
     # Run Snowball algorithm
-    while True:
+    while max_rounds is None or rounds < max_rounds:
+        state.round = rounds
+        sampler.set_round(rounds)
+
         # 1) Partial finality check
         if (state.finalized_count > half) and (rounds_to_partial is None):
             rounds_to_partial = rounds
             if finality == "partial":
                 break
 
-        # 2) Check active nodes
-        active = honest_ids[~state.finalized[:num_honest]]
-        act_size = active.size
-        if act_size == 0:
+        # 2) Milestones, ending the run once all required ones are reached
+        if tracker is not None and tracker.observe(state):
             break
 
-        # 3) Sample K peers without replacement and parse votes
-        majority_pref, majority_count = sampler.batch_sampler(
-            active,
-            state.preferences,
-            state.lnode_pref,
-        )
-
-        # 4) Update strengths
-        pref_pass_mask = majority_count >= config.AlphaPreference
-
-        passed_ids = active[pref_pass_mask]
-        passed_prefs = majority_pref[pref_pass_mask]
-        state.strengths[passed_ids, passed_prefs] += 1
-
-        # 5) Perform preference changes
-        strg_maj = state.strengths[passed_ids, passed_prefs]
-        strg_other = state.strengths[passed_ids, 1 - passed_prefs]
-        flip_mask = (strg_maj > strg_other) & (
-            state.preferences[passed_ids] != passed_prefs
-        )
+        # 3-4) Sample and update the active nodes; undecided nodes wait to
+        # be queried
+        if not run_round():
+            break
 
-        to_flip = passed_ids[flip_mask]
-        new_prefs = passed_prefs[flip_mask]
-        state.batch_flip(to_flip, new_prefs)
+        rounds += 1
 
-        # 6) Update confidence counter
-        state.batch_confidence_update(active, majority_pref, majority_count)
+    # A capped run may reach partial finality in its last round
+    if (state.finalized_count > half) and (rounds_to_partial is None):
+        rounds_to_partial = rounds
 
-        rounds += 1
+    results = state.summary(rounds, rounds_to_partial, finality)
+    if tracker is not None:
+        state.round = rounds
+        tracker.observe(state)
+        results["milestones"] = tracker.results()
 
-    return {
-        "honest_0": state.count_0,
-        "honest_1": num_honest - state.count_0,
-        "finalized_honest": state.finalized_count,
-        "rounds_to_partial": rounds_to_partial,
-        "rounds_to_full": rounds if finality == "full" else None,
-    }
+    return results
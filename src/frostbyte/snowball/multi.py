@@ -0,0 +1,249 @@
+import numpy as np
+
+from src.config import NO_PREFERENCE, SnowballConfig
+from src.frostbyte.sampler import SnowballSampler
+
+
+class MultiInstanceState:
+    """
+    Snowball state of `num_slots` concurrent instances over the same nodes.
+
+    Every array carries a leading slot axis. A slot holds one in-flight
+    instance; once it is decided, the slot is reset to the initial
+    preferences and admits the next instance.
+    """
+
+    def __init__(
+        self,
+        config: SnowballConfig,
+        node_types: np.ndarray,
+        initial_preferences: np.ndarray,
+        num_slots: int,
+    ) -> None:
+        """
+        Allocate the slot arrays.
+
+        Args:
+            config: SnowballConfig instance
+            node_types: cumulative node type boundaries, honest nodes first
+            initial_preferences: initial node preferences of every instance
+            num_slots: number of concurrent instances
+
+        """
+        self.snowball_config = config
+        self.num_honest = int(node_types[0])
+        self.initial_preferences = initial_preferences
+
+        num_honest = self.num_honest
+        self.preferences = np.tile(initial_preferences, (num_slots, 1))
+        self.strengths = np.zeros((num_slots, num_honest, 2), dtype=np.uint8)
+        self.confidences = np.zeros((num_slots, num_honest), dtype=np.uint8)
+        self.last_majority = self.preferences[:, :num_honest].copy()
+        self.finalized = np.zeros((num_slots, num_honest), dtype=bool)
+        self.count_0 = np.zeros(num_slots, dtype=np.int64)
+        self.finalized_counts = np.zeros((num_slots, 2), dtype=np.int64)
+        self.admitted = np.zeros(num_slots, dtype=np.int64)
+        self.open = np.ones(num_slots, dtype=bool)
+        self.round = 0
+
+        for slot in range(num_slots):
+            self.reset(slot)
+
+    @property
+    def lnode_prefs(self) -> np.ndarray:
+        """L-node response of every slot: its minority honest preference."""
+        count_1 = self.num_honest - self.count_0
+        return np.where(self.count_0 < count_1, 0, 1).astype(np.uint8)
+
+    def reset(self, slot: int) -> None:
+        """Admit a fresh instance into `slot`."""
+        num_honest = self.num_honest
+        self.preferences[slot] = self.initial_preferences
+        self.strengths[slot] = 0
+        self.confidences[slot] = 0
+        self.last_majority[slot] = self.initial_preferences[:num_honest]
+        self.finalized[slot] = False
+        self.count_0[slot] = np.count_nonzero(
+            self.initial_preferences[:num_honest] == 0
+        )
+        self.finalized_counts[slot] = 0
+        self.admitted[slot] = self.round
+
+    def retire(self, slot: int) -> None:
+        """Close `slot` for good, its nodes stop polling for it."""
+        self.open[slot] = False
+        self.finalized[slot] = True
+
+    def update(
+        self,
+        active: np.ndarray,
+        majority_pref: np.ndarray,
+        majority_count: np.ndarray,
+    ) -> None:
+        """
+        Apply one lockstep round of sampled majorities to every open slot.
+
+        Mirrors `lockstep_update`, including the reset of non-confirming
+        nodes to confidence 1, for the (slot, node) pairs still undecided.
+
+        Args:
+            active: (M,) honest nodes polling this round
+            majority_pref: (S, M) sampled majority per slot and node
+            majority_count: (S, M) sampled majority count per slot and node
+
+        """
+        config = self.snowball_config
+        pending = ~self.finalized[:, active]
+
+        # 1) Strengths of pairs passing AlphaPreference
+        slots, cols = np.nonzero(pending & (majority_count >= config.AlphaPreference))
+        nodes, prefs = active[cols], majority_pref[slots, cols]
+        self.strengths[slots, nodes, prefs] += 1
+
+        # 2) Flip towards a strictly stronger majority
+        flip = (
+            self.strengths[slots, nodes, prefs]
+            > self.strengths[slots, nodes, 1 - prefs]
+        ) & (self.preferences[slots, nodes] != prefs)
+        slots, nodes, prefs = slots[flip], nodes[flip], prefs[flip]
+        self.preferences[slots, nodes] = prefs
+        num_slots = self.count_0.size
+        self.count_0 += np.bincount(slots[prefs == 0], minlength=num_slots)
+        self.count_0 -= np.bincount(slots[prefs == 1], minlength=num_slots)
+
+        # 3) Confidences, reset to 1 unless the majority is confirmed
+        confirm = (
+            pending
+            & (majority_count >= config.AlphaConfidence)
+            & (majority_pref == self.last_majority[:, active])
+        )
+        confidences = self.confidences[:, active]
+        confidences = np.where(confirm, confidences + 1, 1).astype(np.uint8)
+        self.confidences[:, active] = np.where(
+            pending, confidences, self.confidences[:, active]
+        )
+
+        # 4) Finalize on the confirmed value
+        slots, cols = np.nonzero(confirm & (confidences >= config.Beta))
+        self.finalized[slots, active[cols]] = True
+        np.add.at(self.finalized_counts, (slots, majority_pref[slots, cols]), 1)
+
+        self.last_majority[:, active] = np.where(
+            pending, majority_pref, self.last_majority[:, active]
+        )
+
+
+def _poll(
+    state: MultiInstanceState,
+    sampler: SnowballSampler,
+    active: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Draw one peer set per active node and count its votes in every slot."""
+    peers = sampler.draw_peers(active)
+    votes = state.preferences[:, peers]  # (S, M, K)
+
+    lnode_mask = peers >= sampler.lnode_start
+    if lnode_mask.any():
+        votes[:, lnode_mask] = state.lnode_prefs[:, None]
+
+    ones = np.count_nonzero(votes == 1, axis=2)
+    zeros = np.count_nonzero(votes == 0, axis=2)
+
+    return (ones > zeros).astype(np.uint8), np.maximum(ones, zeros)
+
+
+def snowball_multi_ls(  # noqa: PLR0913
+    config: SnowballConfig,
+    node_types: np.ndarray,
+    initial_preferences: np.ndarray,
+    sampler: SnowballSampler,
+    finality: str = "full",
+    *,
+    instances: int = 4,
+    decisions: int = 16,
+    max_rounds: int | None = None,
+) -> dict:
+    """
+    Run Snowball Lockstep on a pipeline of concurrent instances.
+
+    As with polls in go-flare that carry votes for every processing
+    container, each honest node draws one peer set per round and the peers
+    answer for all `instances` in-flight instances at once. An instance is
+    decided once its honest nodes reach the requested finality; its slot
+    then admits the next instance, with the same initial preferences,
+    until `decisions` instances are decided. L-nodes answer each instance
+    with its minority preference.
+
+    Args:
+        config: SnowballConfig instance
+        node_types: cumulative node type boundaries, honest nodes first
+        initial_preferences: initial node preferences of every instance
+        sampler: SnowballSampler instance, without adversary strategy
+        finality: "full" or "partial" finality of each instance
+        instances: number of concurrent instances
+        decisions: number of instances to decide
+        max_rounds: stop after this many rounds
+
+    Returns:
+        dictionary with the decisions, their latencies and the throughput
+
+    """
+    num_honest, num_nodes = node_types[0], node_types[-1]
+    if np.any(initial_preferences[:num_honest] == NO_PREFERENCE):
+        e = "snowball_multi_ls does not support undecided honest nodes."
+        raise ValueError(e)
+    if sampler.adversary is not None:
+        e = "snowball_multi_ls does not support adversary strategies."
+        raise ValueError(e)
+    if config.BetaRogue is not None:
+        e = "snowball_multi_ls does not support BetaRogue."
+        raise ValueError(e)
+
+    num_slots = min(instances, decisions)
+    state = MultiInstanceState(config, node_types, initial_preferences, num_slots)
+
+    # Check sampler configuration
+    sampler.check_config()
+
+    threshold = num_honest if finality == "full" else num_nodes // 2 + 1
+    honest_ids = np.arange(num_honest)
+    admitted, latencies, values, conflicts = num_slots, [], [], 0
+    rounds = 0
+
+    while len(latencies) < decisions:
+        if max_rounds is not None and rounds >= max_rounds:
+            break
+        state.round = rounds
+        sampler.set_round(rounds)
+
+        # 1) Nodes poll while any open instance is pending for them
+        active = honest_ids[~state.finalized.all(axis=0)]
+        if active.size == 0:
+            break
+
+        # 2) One peer set per node answers for every instance
+        majority_pref, majority_count = _poll(state, sampler, active)
+        state.update(active, majority_pref, majority_count)
+        rounds += 1
+
+        # 3) Decide instances and admit new ones
+        decided = state.open & (state.finalized.sum(axis=1) >= threshold)
+        for slot in np.flatnonzero(decided):
+            latencies.append(rounds - state.admitted[slot])
+            values.append(int(state.finalized_counts[slot].argmax()))
+            conflicts += bool(np.all(state.finalized_counts[slot] > 0))
+            state.round = rounds
+            if admitted < decisions:
+                state.reset(slot)
+                admitted += 1
+            else:
+                state.retire(slot)
+
+    return {
+        "decisions": len(latencies),
+        "rounds": rounds,
+        "throughput": len(latencies) / rounds if rounds else 0.0,
+        "decision_latencies": np.array(latencies, dtype=np.int64),
+        "decided_values": np.array(values, dtype=np.uint8),
+        "conflicts": conflicts,
+    }
@@ -0,0 +1,238 @@
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from src.config import NO_PREFERENCE, SnowballConfig
+from src.frostbyte.sampler import SnowballSampler
+from src.frostbyte.snowball.state import NarySnowballState
+
+if TYPE_CHECKING:
+    from src.utils.telemetry import Telemetry
+
+
+def _init_nary_state(
+    config: SnowballConfig,
+    node_types: np.ndarray,
+    initial_preferences: np.ndarray,
+    num_choices: int | None,
+) -> NarySnowballState:
+    """Build the n-ary state, inferring the number of choices if needed."""
+    num_honest, num_nodes = node_types[0], node_types[-1]
+    decided = initial_preferences[initial_preferences != NO_PREFERENCE]
+    if num_choices is None:
+        num_choices = max(2, int(decided.max(initial=0)) + 1)
+
+    honest_prefs = initial_preferences[:num_honest]
+    choice_counts = np.bincount(
+        honest_prefs[honest_prefs != NO_PREFERENCE], minlength=num_choices
+    ).astype(np.int64)
+    if choice_counts.size > num_choices:
+        e = f"Initial preferences must lie in [0, {num_choices})."
+        raise ValueError(e)
+
+    state = NarySnowballState(
+        snowball_config=config,
+        preferences=initial_preferences.copy(),
+        strengths=np.zeros((num_nodes, num_choices), dtype=np.uint32),
+        confidences=np.zeros(num_nodes, dtype=np.uint8),
+        last_majority=initial_preferences[:num_honest].copy(),
+        finalized=np.zeros(num_nodes, dtype=bool),
+        count_0=int(choice_counts[0]),
+        num_honest=num_honest,
+        lnode_pref=0,
+        finalized_count=0,
+        num_undecided=int(np.sum(honest_prefs == NO_PREFERENCE)),
+        finalized_counts=np.zeros(num_choices, dtype=np.int64),
+        choice_counts=choice_counts,
+    )
+    state.update_lnode_pref()
+
+    return state
+
+
+def snowball_nary_ls(  # noqa: PLR0913
+    config: SnowballConfig,
+    node_types: np.ndarray,
+    initial_preferences: np.ndarray,
+    sampler: SnowballSampler,
+    finality: str = "full",
+    *,
+    num_choices: int | None = None,
+    record_latency: bool = False,
+    record_values: bool = False,
+    telemetry: "Telemetry | None" = None,
+) -> dict:
+    """
+    Run centralized n-ary Snowball Lockstep with vectorized operations.
+
+    Args:
+        config: SnowballConfig instance
+        node_types: array [N1, N2, N3] (or [N1, N2, N3, N4]) where:
+            :0 to N1-1: honest nodes
+            :N1 to N2-1: fixed nodes
+            :N2 to N3-1: L nodes
+            (a 4-entry form inserts offline nodes before the L nodes)
+        initial_preferences: initial node preferences in [0, num_choices),
+            or NO_PREFERENCE
+        sampler: SnowballSampler instance
+        finality: "full" or "partial" finality
+        num_choices: number of competing values, inferred if None
+        record_latency: return each honest node's finalization round
+        record_values: return the value each honest node finalized on
+        telemetry: Telemetry following the run's progress
+
+    Returns:
+        dictionary with algorithm results
+
+    """
+    num_honest, num_nodes = node_types[0], node_types[-1]
+    state = _init_nary_state(config, node_types, initial_preferences, num_choices)
+    state.allocate_records(record_latency=record_latency, record_values=record_values)
+
+    # Check sampler configuration
+    sampler.check_config()
+    if telemetry is not None:
+        telemetry.watch(state)
+
+    rounds, rounds_to_partial = 0, None
+    half = num_nodes // 2
+    honest_ids = np.arange(num_honest)  # honest indices
+
+    # Run Snowball algorithm
+    while True:
+        state.round = rounds
+        sampler.set_round(rounds)
+
+        # 1) Partial finality check
+        if (state.finalized_count > half) and (rounds_to_partial is None):
+            rounds_to_partial = rounds
+            if finality == "partial":
+                break
+
+        # 2) Check active nodes; undecided nodes wait to be queried
+        active = state.decided(honest_ids[~state.finalized[:num_honest]])
+        if active.size == 0:
+            break
+
+        # 3) Sample K peers without replacement and tally votes per choice
+        majority_pref, majority_count = sampler.batch_sampler_nary(
+            active,
+            state.preferences,
+            state.lnode_pref,
+            state.num_choices,
+            state=state,
+        )
+
+        # 4) Update strengths
+        pref_pass_mask = majority_count >= config.AlphaPreference
+
+        passed_ids = active[pref_pass_mask]
+        passed_prefs = majority_pref[pref_pass_mask]
+        state.strengths[passed_ids, passed_prefs] += 1
+
+        # 5) Flip towards the majority if it is now strictly stronger
+        strg_maj = state.strengths[passed_ids, passed_prefs]
+        strg_cur = state.strengths[passed_ids, state.preferences[passed_ids]]
+        flip_mask = strg_maj > strg_cur
+
+        state.batch_flip(passed_ids[flip_mask], passed_prefs[flip_mask])
+
+        # 6) Update confidence counter
+        state.batch_confidence_update(active, majority_pref, majority_count)
+
+        rounds += 1
+
+    return state.summary(rounds, rounds_to_partial, finality)
+
+
+def snowball_nary_rs(  # noqa: PLR0913
+    config: SnowballConfig,
+    node_types: np.ndarray,
+    initial_preferences: np.ndarray,
+    sampler: SnowballSampler,
+    finality: str = "full",
+    *,
+    num_choices: int | None = None,
+    record_latency: bool = False,
+    record_values: bool = False,
+    telemetry: "Telemetry | None" = None,
+) -> dict:
+    """
+    Run centralized n-ary Snowball Random Sampling.
+
+    Args:
+        config: SnowballConfig instance
+        node_types: array [N1, N2, N3] (or [N1, N2, N3, N4]) where:
+            :0 to N1-1: honest nodes
+            :N1 to N2-1: fixed nodes
+            :N2 to N3-1: L nodes
+            (a 4-entry form inserts offline nodes before the L nodes)
+        initial_preferences: initial node preferences in [0, num_choices),
+            or NO_PREFERENCE
+        sampler: SnowballSampler config
+        finality: "full" or "partial" finality
+        num_choices: number of competing values, inferred if None
+        record_latency: return each honest node's finalization round
+        record_values: return the value each honest node finalized on
+        telemetry: Telemetry following the run's progress
+
+    Returns:
+        dictionary with algorithm results
+
+    """
+    num_honest, num_nodes = node_types[0], node_types[-1]
+    state = _init_nary_state(config, node_types, initial_preferences, num_choices)
+    state.allocate_records(record_latency=record_latency, record_values=record_values)
+
+    # Check sampler configuration
+    sampler.check_config()
+    if telemetry is not None:
+        telemetry.watch(state)
+
+    rounds, rounds_to_partial = 0, None
+    steps = 0
+
+    # Run Snowball algorithm
+    while True:
+        # Select honest unfinished nodes
+        active = np.where(~state.finalized[:num_honest])[0]
+        if active.size == 0:
+            break  # full honest finalization reached
+
+        # If only partial finalization is sought:
+        if state.finalized_count > num_nodes // 2 and rounds_to_partial is None:
+            rounds_to_partial = rounds
+            if finality == "partial":
+                break
+
+        # Undecided nodes wait to be queried
+        active = state.decided(active)
+        if active.size == 0:
+            break
+
+        # Choose node, sample network, and tally votes per choice
+        state.round = rounds
+        sampler.set_round(steps)  # failed steps do not count as rounds
+        steps += 1
+        node_id = sampler.choose_node(active)
+        majority_pref, majority_count = sampler.sample_and_count_nary(
+            node_id,
+            state.preferences,
+            state.lnode_pref,
+            state.num_choices,
+            state=state,
+        )
+
+        if majority_count < config.AlphaPreference:
+            state.confidences[node_id] = 0
+            continue
+
+        state.strengths[node_id, majority_pref] += 1
+
+        # Update network preferences and distribution
+        state.honest_flip(node_id, majority_pref)
+        state.confidence_update(node_id, majority_count, majority_pref)
+
+        rounds += 1
+
+    return state.summary(rounds, rounds_to_partial, finality)
@@ -0,0 +1,296 @@
+import multiprocessing as mp
+import os
+import threading
+from dataclasses import dataclass
+from multiprocessing.shared_memory import SharedMemory
+from multiprocessing.synchronize import Barrier
+
+import numpy as np
+
+from src.config import NO_PREFERENCE, SnowballConfig
+from src.frostbyte.sampler import SnowballSampler
+from src.frostbyte.snowball.lockstep import lockstep_update
+from src.frostbyte.snowball.state import SnowballState
+
+# Slots of the shared control array
+_NUM_ACTIVE, _LNODE_PREF, _ROUND, _STOP = range(4)
+
+
+@dataclass(frozen=True)
+class SharedArraySpec:
+    """Name, shape and dtype needed to attach to a shared array."""
+
+    name: str
+    shape: tuple[int, ...]
+    dtype: str
+
+
+class SharedArrays:
+    """A set of named numpy arrays backed by `multiprocessing.shared_memory`."""
+
+    def __init__(self) -> None:
+        """Initialize an empty set of shared arrays."""
+        self.specs: dict[str, SharedArraySpec] = {}
+        self.arrays: dict[str, np.ndarray] = {}
+        self._segments: list[SharedMemory] = []
+        self._owner = False
+
+    @classmethod
+    def create(cls, templates: dict[str, np.ndarray]) -> "SharedArrays":
+        """Allocate shared arrays initialized with copies of the templates."""
+        shared = cls()
+        shared._owner = True
+        for key, template in templates.items():
+            segment = SharedMemory(create=True, size=max(template.nbytes, 1))
+            array: np.ndarray = np.ndarray(
+                template.shape, dtype=template.dtype, buffer=segment.buf
+            )
+            array[...] = template
+            shared._register(key, segment, array)
+
+        return shared
+
+    @classmethod
+    def attach(cls, specs: dict[str, SharedArraySpec]) -> "SharedArrays":
+        """Attach to shared arrays created in another process."""
+        shared = cls()
+        for key, spec in specs.items():
+            segment = SharedMemory(name=spec.name)
+            array: np.ndarray = np.ndarray(
+                spec.shape, dtype=spec.dtype, buffer=segment.buf
+            )
+            shared._register(key, segment, array)
+
+        return shared
+
+    def _register(self, key: str, segment: SharedMemory, array: np.ndarray) -> None:
+        self._segments.append(segment)
+        self.arrays[key] = array
+        self.specs[key] = SharedArraySpec(segment.name, array.shape, array.dtype.str)
+
+    def close(self) -> None:
+        """Detach from all segments, unlinking them if this process created them."""
+        self.arrays.clear()
+        for segment in self._segments:
+            segment.close()
+            if self._owner:
+                segment.unlink()
+        self._segments.clear()
+
+
+def _worker_bounds(worker: int, num_workers: int, num_active: int) -> slice:
+    """Contiguous share of the active set handled by one worker."""
+    lo = worker * num_active // num_workers
+    hi = (worker + 1) * num_active // num_workers
+    return slice(lo, hi)
+
+
+def _lockstep_worker(  # noqa: PLR0913, PLR0917
+    worker: int,
+    num_workers: int,
+    specs: dict[str, SharedArraySpec],
+    config: SnowballConfig,
+    num_honest: int,
+    sampler: SnowballSampler,
+    barrier: Barrier,
+) -> None:
+    """
+    Process one share of the active set per round.
+
+    Each round goes through three barriers: the coordinator publishes the
+    active set (start), all workers sample against the previous round's
+    preferences (read), then all workers write their updates (write).
+    """
+    shared = SharedArrays.attach(specs)
+    arrays = shared.arrays
+    control, stats = arrays["control"], arrays["stats"]
+
+    # Counters are tracked as per-round deltas and summed by the coordinator
+    state = SnowballState(
+        snowball_config=config,
+        preferences=arrays["preferences"],
+        strengths=arrays["strengths"],
+        confidences=arrays["confidences"],
+        last_majority=arrays["last_majority"],
+        finalized=arrays["finalized"],
+        count_0=0,
+        num_honest=num_honest,
+        lnode_pref=0,
+        finalized_count=0,
+    )
+
+    try:
+        while True:
+            barrier.wait()  # start
+            if control[_STOP]:
+                break
+
+            share = _worker_bounds(worker, num_workers, int(control[_NUM_ACTIVE]))
+            active = arrays["active"][share]
+
+            # Read phase: every node sees the previous round's preferences
+            state.lnode_pref = int(control[_LNODE_PREF])
+            sampler.set_round(int(control[_ROUND]))
+            majority_pref, majority_count = sampler.batch_sampler(
+                active, state.preferences, state.lnode_pref, state=state
+            )
+            barrier.wait()  # read
+
+            # Write phase: workers own disjoint node sets
+            state.count_0, state.finalized_count = 0, 0
+            state.finalized_counts[:] = 0
+            lockstep_update(state, active, majority_pref, majority_count)
+            stats[worker] = (
+                state.count_0,
+                state.finalized_count,
+                *state.finalized_counts,
+            )
+            barrier.wait()  # write
+    except threading.BrokenBarrierError:
+        pass  # the coordinator aborted the run
+    except BaseException:
+        barrier.abort()  # release the coordinator and the other workers
+        raise
+    finally:
+        shared.close()
+
+
+def snowball_ls_parallel(  # noqa: PLR0913
+    config: SnowballConfig,
+    node_types: np.ndarray,
+    initial_preferences: np.ndarray,
+    sampler: SnowballSampler,
+    finality: str = "full",
+    *,
+    num_workers: int | None = None,
+) -> dict:
+    """
+    Run Snowball Lockstep with each round split across worker processes.
+
+    The node arrays live in shared memory and each round's active set is
+    divided evenly between `num_workers` processes. A barrier separates the
+    sampling phase from the write phase, so results follow the same lockstep
+    semantics as `snowball_ls`.
+
+    Args:
+        config: SnowballConfig instance
+        node_types: array [N1, N2, N3] (or [N1, N2, N3, N4]) where:
+            :0 to N1-1: honest nodes
+            :N1 to N2-1: fixed nodes
+            :N2 to N3-1: L nodes
+            (a 4-entry form inserts offline nodes before the L nodes)
+        initial_preferences: initial node preferences (0 or 1, or NO_PREFERENCE
+            for offline nodes)
+        sampler: SnowballSampler instance, whose rng seeds the workers; with
+            `streams` set, results match `snowball_ls` for any worker count
+        finality: "full" or "partial" finality
+        num_workers: number of worker processes, defaults to the CPU count
+
+    Returns:
+        dictionary with algorithm results
+
+    """
+    num_honest, num_nodes = node_types[0], node_types[-1]
+    num_workers = num_workers or os.cpu_count() or 1
+
+    # Adoption by undecided nodes would race between workers
+    if np.any(initial_preferences[:num_honest] == NO_PREFERENCE):
+        e = "snowball_ls_parallel does not support undecided honest nodes."
+        raise ValueError(e)
+
+    # Check sampler configuration
+    sampler.check_config()
+
+    count_0 = int(np.sum(initial_preferences[:num_honest] == 0))
+    shared = SharedArrays.create(
+        {
+            "preferences": initial_preferences,
+            "strengths": np.zeros((num_nodes, 2), dtype=np.uint8),
+            "confidences": np.zeros(num_nodes, dtype=np.uint8),
+            "last_majority": initial_preferences[:num_honest],
+            "finalized": np.zeros(num_nodes, dtype=bool),
+            "active": np.zeros(num_honest, dtype=np.int64),
+            "control": np.zeros(4, dtype=np.int64),
+            "stats": np.zeros((num_workers, 4), dtype=np.int64),
+        }
+    )
+    arrays = shared.arrays
+    control, stats = arrays["control"], arrays["stats"]
+    finalized = arrays["finalized"]
+
+    ctx = mp.get_context()
+    barrier = ctx.Barrier(num_workers + 1)
+    workers = [
+        ctx.Process(
+            target=_lockstep_worker,
+            args=(
+                worker,
+                num_workers,
+                shared.specs,
+                config,
+                num_honest,
+                sampler.with_rng(rng),
+                barrier,
+            ),
+            daemon=True,
+        )
+        for worker, rng in enumerate(sampler.rng.spawn(num_workers))
+    ]
+    for process in workers:
+        process.start()
+
+    rounds, rounds_to_partial = 0, None
+    finalized_counts = np.zeros(2, dtype=np.int64)  # per finalized value
+    half = num_nodes // 2
+    honest_ids = np.arange(num_honest)  # honest indices
+
+    try:
+        while True:
+            # 1) Partial finality check
+            if (finalized_counts.sum() > half) and (rounds_to_partial is None):
+                rounds_to_partial = rounds
+                if finality == "partial":
+                    break
+
+            # 2) Publish active nodes and the L-node response
+            active = honest_ids[~finalized[:num_honest]]
+            if active.size == 0:
+                break
+            arrays["active"][: active.size] = active
+            control[_NUM_ACTIVE] = active.size
+            control[_LNODE_PREF] = 0 if count_0 < (num_honest - count_0) else 1
+            control[_ROUND] = rounds
+
+            # 3) Let the workers sample, then write
+            barrier.wait()  # start
+            barrier.wait()  # read
+            barrier.wait()  # write
+
+            # 4) Aggregate counter deltas
+            count_0 += int(stats[:, 0].sum())
+            finalized_counts += stats[:, 2:].sum(axis=0)
+
+            rounds += 1
+
+        # Release the workers from their start barrier
+        control[_STOP] = 1
+        barrier.wait()
+    except BaseException:
+        barrier.abort()
+        for process in workers:
+            process.terminate()
+        raise
+    finally:
+        for process in workers:
+            process.join()
+        shared.close()
+
+    return {
+        "honest_0": count_0,
+        "honest_1": num_honest - count_0,
+        "honest_undecided": 0,
+        "finalized_honest": int(finalized_counts.sum()),
+        "rounds_to_partial": rounds_to_partial,
+        "rounds_to_full": rounds if finality == "full" else None,
+        "conflict": bool(np.count_nonzero(finalized_counts) > 1),
+    }
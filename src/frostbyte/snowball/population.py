@@ -0,0 +1,303 @@
+from math import lgamma
+
+import numpy as np
+
+from src.config import NO_PREFERENCE, SnowballConfig
+from src.frostbyte.sampler import SnowballSampler
+
+# Poll outcome o encodes majority m = o >> 2, AlphaPreference passed
+# (o >> 1) & 1 and AlphaConfidence passed o & 1
+NUM_OUTCOMES = 8
+_MAJORITY, _PASSED, _REACHED = (
+    np.arange(NUM_OUTCOMES) >> 2,
+    (np.arange(NUM_OUTCOMES) >> 1) & 1,
+    np.arange(NUM_OUTCOMES) & 1,
+)
+
+# Offset keeping strength differences positive in packed cell keys
+_OFFSET = 1 << 40
+
+
+def _log_comb(n: int, k: np.ndarray) -> np.ndarray:
+    """Logarithm of C(n, k) for each k, -inf where k > n."""
+    out = np.full(k.shape, -np.inf)
+    valid = k <= n
+    out[valid] = [lgamma(n + 1) - lgamma(x + 1) - lgamma(n - x + 1) for x in k[valid]]
+    return out
+
+
+def outcome_probabilities(
+    config: SnowballConfig, zeros: int, ones: int, silent: int
+) -> np.ndarray:
+    """
+    Distribution of the outcome of one poll.
+
+    The K distinct peers are drawn out of `zeros` nodes voting 0, `ones`
+    voting 1 and `silent` nodes without a vote, so the vote counts follow a
+    multivariate hypergeometric law.
+
+    Returns:
+        (NUM_OUTCOMES,) probabilities, indexed as described above
+
+    """
+    k = config.K
+    z, o = np.meshgrid(np.arange(k + 1), np.arange(k + 1), indexing="ij")
+    s = k - z - o
+    valid = s >= 0
+
+    log_p = np.full(z.shape, -np.inf)
+    log_p[valid] = (
+        _log_comb(zeros, z[valid])
+        + _log_comb(ones, o[valid])
+        + _log_comb(silent, s[valid])
+        - _log_comb(zeros + ones + silent, np.array([k]))[0]
+    )
+    p = np.exp(log_p)
+
+    # Ties go to 0, as in `batch_sampler`
+    majority = (o > z).astype(np.int64)
+    count = np.maximum(z, o)
+    outcome = (
+        (majority << 2)
+        + ((count >= config.AlphaPreference) << 1)
+        + (count >= config.AlphaConfidence)
+    )
+    probs = np.bincount(outcome[valid], weights=p[valid], minlength=NUM_OUTCOMES)
+
+    return probs / probs.sum()
+
+
+class PopulationState:
+    """
+    Snowball Lockstep state of exchangeable honest nodes, as a count table.
+
+    Active honest nodes are counted per cell (preference, strength of 1
+    minus strength of 0, confidence, last majority): these fields fully
+    determine how a node reacts to a poll. Finalized nodes only keep their
+    preference, which they keep answering with.
+    """
+
+    def __init__(self, config: SnowballConfig, num_honest: int, count_0: int) -> None:
+        """
+        Start with all honest nodes in their initial cells.
+
+        Args:
+            config: SnowballConfig instance
+            num_honest: number of honest nodes
+            count_0: number of honest nodes preferring 0
+
+        """
+        self.snowball_config = config
+        self.num_honest = num_honest
+
+        prefs = np.array([0, 1], dtype=np.int64)
+        counts = np.array([count_0, num_honest - count_0], dtype=np.int64)
+        keep = counts > 0
+        self.preference = prefs[keep]
+        self.difference = np.zeros(keep.sum(), dtype=np.int64)
+        self.confidence = np.zeros(keep.sum(), dtype=np.int64)
+        self.last_majority = prefs[keep]
+        self.count = counts[keep]
+
+        # Preferences and values of finalized honest nodes
+        self.finalized_prefs = np.zeros(2, dtype=np.int64)
+        self.finalized_counts = np.zeros(2, dtype=np.int64)
+        self.round = 0
+
+    @property
+    def num_cells(self) -> int:
+        """Number of occupied cells."""
+        return self.count.size
+
+    @property
+    def finalized_count(self) -> int:
+        """Number of finalized honest nodes."""
+        return int(self.finalized_counts.sum())
+
+    @property
+    def count_0(self) -> int:
+        """Number of honest nodes preferring 0."""
+        active_0 = self.count[self.preference == 0].sum()
+        return int(active_0 + self.finalized_prefs[0])
+
+    @property
+    def lnode_pref(self) -> int:
+        """L-node response: the minority honest preference."""
+        count_0 = self.count_0
+        return 0 if count_0 < self.num_honest - count_0 else 1
+
+    def update(self, outcomes: np.ndarray) -> int:
+        """
+        Move every active node according to its poll outcome.
+
+        Applies `lockstep_update` to the cells: strengths and flips first,
+        then confidences, reset to 1 unless the majority is confirmed.
+
+        Args:
+            outcomes: (num_cells, NUM_OUTCOMES) nodes of each cell per outcome
+
+        Returns:
+            number of nodes finalized
+
+        """
+        cells, outcome = np.nonzero(outcomes)
+        count = outcomes[cells, outcome]
+        pref, last = self.preference[cells], self.last_majority[cells]
+        majority = _MAJORITY[outcome]
+        passed, reached = _PASSED[outcome], _REACHED[outcome]
+
+        # 1) Strengths and flips of nodes passing AlphaPreference
+        difference = self.difference[cells] + passed * (2 * majority - 1)
+        stronger = np.where(majority == 1, difference > 0, difference < 0)
+        pref = np.where((passed == 1) & stronger, majority, pref)
+
+        # 2) Confidences and finalization
+        confirm = (reached == 1) & (majority == last)
+        confidence = np.where(confirm, self.confidence[cells] + 1, 1)
+        final = confirm & (confidence >= self.snowball_config.Beta)
+
+        self.finalized_prefs += np.bincount(
+            pref[final], weights=count[final], minlength=2
+        ).astype(np.int64)
+        self.finalized_counts += np.bincount(
+            majority[final], weights=count[final], minlength=2
+        ).astype(np.int64)
+
+        # 3) Merge the remaining nodes into their new cells
+        keep = ~final
+        keys = (
+            ((difference[keep] + _OFFSET) << 10)
+            + (confidence[keep] << 2)
+            + (pref[keep] << 1)
+            + majority[keep]
+        )
+        keys, inverse = np.unique(keys, return_inverse=True)
+        self.count = np.bincount(inverse, weights=count[keep]).astype(np.int64)
+        self.difference = (keys >> 10) - _OFFSET
+        self.confidence = (keys >> 2) & 0xFF
+        self.preference = (keys >> 1) & 1
+        self.last_majority = keys & 1
+
+        return int(count[final].sum())
+
+
+def snowball_population_ls(  # noqa: PLR0913
+    config: SnowballConfig,
+    node_types: np.ndarray,
+    initial_preferences: np.ndarray,
+    sampler: SnowballSampler,
+    finality: str = "full",
+    *,
+    record_latency: bool = False,
+    max_rounds: int | None = None,
+) -> dict:
+    """
+    Run Snowball Lockstep on a count table of exchangeable honest nodes.
+
+    Each round, the poll outcome of every active honest node follows a
+    multivariate hypergeometric law over the current vote totals, so the
+    nodes of a cell split over the outcomes by one multinomial draw. Results
+    follow the same distribution as `snowball_ls`, and a round costs
+    O(occupied cells + K^2) whatever the number of nodes. Only the sampler's
+    `rng` and configuration are used.
+
+    Args:
+        config: SnowballConfig instance
+        node_types: cumulative node type boundaries, honest nodes first
+        initial_preferences: initial node preferences
+        sampler: SnowballSampler instance, without adversary, graph or
+            streams
+        finality: "full" or "partial" finality
+        record_latency: return the number of honest nodes finalizing after
+            each number of rounds, as "finalization_counts"
+        max_rounds: stop after this many rounds
+
+    Returns:
+        dictionary with the results of `snowball_ls`, plus the largest
+        number of occupied cells
+
+    """
+    num_honest, num_nodes = int(node_types[0]), int(node_types[-1])
+    honest_prefs = initial_preferences[:num_honest]
+    if np.any(honest_prefs == NO_PREFERENCE):
+        e = "snowball_population_ls does not support undecided honest nodes."
+        raise ValueError(e)
+    if sampler.adversary is not None or sampler.graph is not None:
+        e = "snowball_population_ls needs exchangeable nodes: no adversary or graph."
+        raise ValueError(e)
+    if config.BetaRogue is not None:
+        e = "snowball_population_ls does not support BetaRogue."
+        raise ValueError(e)
+
+    # Check sampler configuration
+    sampler.check_config()
+
+    others = initial_preferences[num_honest : sampler.lnode_start]
+    fixed = np.array([np.sum(others == 0), np.sum(others == 1)], dtype=np.int64)
+    num_lnodes = num_nodes - sampler.lnode_start
+
+    state = PopulationState(config, num_honest, int(np.sum(honest_prefs == 0)))
+    latencies = [0]
+    rounds, rounds_to_partial = 0, None
+    max_cells = state.num_cells
+    half = num_nodes // 2
+
+    while max_rounds is None or rounds < max_rounds:
+        state.round = rounds
+
+        # 1) Partial finality check
+        if (state.finalized_count > half) and (rounds_to_partial is None):
+            rounds_to_partial = rounds
+            if finality == "partial":
+                break
+
+        if state.num_cells == 0:
+            break
+
+        # 2) Vote totals of the round, L-nodes answering the minority
+        count_0 = state.count_0
+        votes = fixed + np.array([count_0, num_honest - count_0])
+        votes[state.lnode_pref] += num_lnodes
+        silent = num_nodes - int(votes.sum())
+
+        # 3) Split every cell over the poll outcomes, nodes not sampling self
+        probs = np.stack(
+            [
+                # Unused, and clipped, when no active node has the preference
+                outcome_probabilities(
+                    config,
+                    max(int(votes[0] - (pref == 0)), 0),
+                    max(int(votes[1] - (pref == 1)), 0),
+                    silent,
+                )
+                for pref in (0, 1)
+            ]
+        )
+        outcomes = sampler.rng.multinomial(state.count, probs[state.preference])
+
+        # 4) Update the count table
+        latencies.append(state.update(outcomes))
+        max_cells = max(max_cells, state.num_cells)
+
+        rounds += 1
+
+    # A capped run may reach partial finality in its last round
+    if (state.finalized_count > half) and (rounds_to_partial is None):
+        rounds_to_partial = rounds
+
+    count_0 = state.count_0
+    full = finality == "full" and state.finalized_count == num_honest
+    results = {
+        "honest_0": count_0,
+        "honest_1": num_honest - count_0,
+        "honest_undecided": 0,
+        "finalized_honest": state.finalized_count,
+        "rounds_to_partial": rounds_to_partial,
+        "rounds_to_full": rounds if full else None,
+        "conflict": bool(np.count_nonzero(state.finalized_counts) > 1),
+        "max_cells": max_cells,
+    }
+    if record_latency:
+        results["finalization_counts"] = np.array(latencies, dtype=np.int64)
+
+    return results
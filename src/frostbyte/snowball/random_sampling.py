@@ -1,29 +1,45 @@
+from typing import TYPE_CHECKING
+
 import numpy as np
 
 from src.config import SnowballConfig
 from src.frostbyte.sampler import SnowballSampler
-from src.frostbyte.snowball.state import SnowballState
+from src.frostbyte.snowball.population import outcome_probabilities
+from src.frostbyte.snowball.state import SnowballState, protocol_state
+
+if TYPE_CHECKING:
+    from src.utils.telemetry import Telemetry
 
 
-def snowball_rs(
+def snowball_rs(  # noqa: PLR0913
     config: SnowballConfig,
     node_types: np.ndarray,
     initial_preferences: np.ndarray,
     sampler: SnowballSampler,
     finality: str = "full",
+    *,
+    record_latency: bool = False,
+    record_values: bool = False,
+    telemetry: "Telemetry | None" = None,
+    protocol: str = "snowball",
 ) -> dict:
     """
     Run centralized Snowball Random Sampling with vectorized operations.
 
     Args:
         config: SnowballConfig instance
-        node_types: array [N1, N2, N3] where:
+        node_types: array [N1, N2, N3] (or [N1, N2, N3, N4]) where:
             :0 to N1-1: honest nodes
             :N1 to N2-1: fixed nodes
             :N2 to N3-1: L nodes
-        initial_preferences: initial node preferences (0 or 1)
+            (a 4-entry form inserts offline nodes before the L nodes)
+        initial_preferences: initial node preferences (0, 1 or NO_PREFERENCE)
         sampler: SnowballSampler config
         finality: "full" or "partial" finality
+        record_latency: return each honest node's finalization round
+        record_values: return the value each honest node finalized on
+        telemetry: Telemetry following the run's progress
+        protocol: "snowball", "snowflake" or "slush"
 
     Returns:
         dictionary with algorithm results
@@ -35,28 +51,22 @@ def snowball_rs(
         node_types[-1],
     )
 
-    # LNode responses
-    count_0 = np.sum(initial_preferences[:num_honest] == 0)
-    lnode_pref = 0 if count_0 < (num_honest - count_0) else 1
-
     # Bundle data into a SnowballState
-    state = SnowballState(
-        snowball_config=config,
-        preferences=initial_preferences.copy(),
-        strengths=np.zeros((num_nodes, 2), dtype=np.uint8),
-        confidences=np.zeros(num_nodes, dtype=np.uint8),
-        last_majority=initial_preferences[:num_honest].copy(),
-        finalized=np.zeros(num_nodes, dtype=bool),
-        count_0=count_0,
-        num_honest=num_honest,
-        lnode_pref=lnode_pref,
-        finalized_count=0,
+    state = protocol_state(protocol).initial(
+        config,
+        node_types,
+        initial_preferences,
+        record_latency=record_latency,
+        record_values=record_values,
     )
 
     # Check sampler configuration
     sampler.check_config()
+    if telemetry is not None:
+        telemetry.watch(state)
 
     rounds, rounds_to_partial = 0, None
+    steps = 0
 
     # Run Snowball algorithm
     while True:
@@ -72,16 +82,25 @@ def snowball_rs(
                 # Break if network is partially finalized
                 break
 
+        # Undecided nodes wait to be queried
+        active = state.decided(active)
+        if active.size == 0:
+            break  # only undecided nodes left, no one can query them
+
         # Choose node, sample network, and parse responses
+        state.round = rounds
+        sampler.set_round(steps)  # failed steps do not count as rounds
+        steps += 1
         node_id = sampler.choose_node(active)
         majority_pref, majority_count = sampler.sample_and_count(
             node_id,
             state.preferences,
             state.lnode_pref,
+            state=state,
         )
 
         if majority_count < config.AlphaPreference:
-            state.confidences[node_id] = 0
+            state.miss(node_id)
             continue
 
         state.strengths[node_id, majority_pref] += 1
@@ -100,10 +119,192 @@ def snowball_rs(
 
         rounds += 1
 
-    return {
-        "honest_0": state.count_0,
-        "honest_1": num_honest - state.count_0,
-        "finalized_honest": state.finalized_count,
-        "rounds_to_partial": rounds_to_partial,
-        "rounds_to_full": rounds if finality == "full" else None,
+    return state.summary(rounds, rounds_to_partial, finality)
+
+
+def leap_update(
+    state: SnowballState,
+    nodes: np.ndarray,
+    majority_pref: np.ndarray,
+    majority_count: np.ndarray,
+) -> int:
+    """
+    Apply the random-sampling update of `snowball_rs` to distinct nodes at once.
+
+    Nodes missing AlphaPreference or AlphaConfidence restart their
+    confidence at 0, nodes switching majority at 1, as in
+    `SnowballState.confidence_update`.
+
+    Args:
+        state: SnowballState instance
+        nodes: distinct honest nodes that polled
+        majority_pref: sampled majority preference per node
+        majority_count: sampled majority count per node
+
+    Returns:
+        number of preference flips
+
+    """
+    config = state.snowball_config
+
+    # 1) Strengths of nodes passing AlphaPreference
+    passed = majority_count >= config.AlphaPreference
+    state.confidences[nodes[~passed]] = 0
+    ids, prefs = nodes[passed], majority_pref[passed]
+    counts = majority_count[passed]
+    state.strengths[ids, prefs] += 1
+
+    # 2) Preference changes
+    flip = state.adopts(ids, prefs) & (state.preferences[ids] != prefs)
+    state.batch_flip(ids[flip], prefs[flip])
+
+    # 3) Confidences and finalization
+    reached = counts >= config.AlphaConfidence
+    state.confidences[ids[~reached]] = 0
+    ids, prefs = ids[reached], prefs[reached]
+    repeated = state.last_majority[ids] == prefs
+    state.confidences[ids[~repeated]] = 1
+    survivors = ids[repeated]
+    state.confidences[survivors] += 1
+    state.finalize(survivors[state.confidences[survivors] >= state.beta(survivors)])
+    state.last_majority[ids] = prefs
+
+    return int(np.count_nonzero(flip))
+
+
+def _flip_distance(state: SnowballState, fixed: np.ndarray, num_lnodes: int) -> float:
+    """Largest total variation one honest flip makes to the poll outcome law."""
+    count_1 = state.num_honest - state.num_undecided - state.count_0
+    votes = fixed + np.array([state.count_0, count_1])
+    votes[state.lnode_pref] += num_lnodes
+    silent = state.preferences.size - int(votes.sum())
+    config = state.snowball_config
+    outcomes = outcome_probabilities(config, int(votes[0]), int(votes[1]), silent)
+
+    distance = 0.0
+    for shift in ((-1, 1), (1, -1)):
+        zeros, ones = votes + shift
+        if min(zeros, ones) >= 0:
+            flipped = outcome_probabilities(config, int(zeros), int(ones), silent)
+            distance = max(distance, 0.5 * float(np.abs(flipped - outcomes).sum()))
+    return distance
+
+
+def snowball_rs_tau(  # noqa: PLR0913
+    config: SnowballConfig,
+    node_types: np.ndarray,
+    initial_preferences: np.ndarray,
+    sampler: SnowballSampler,
+    finality: str = "full",
+    *,
+    tolerance: float = 0.01,
+    record_latency: bool = False,
+    record_values: bool = False,
+    telemetry: "Telemetry | None" = None,
+) -> dict:
+    """
+    Run Snowball Random Sampling approximately, by tau-leaping.
+
+    Each leap lets a batch of distinct active nodes take their random-sampling
+    step against the same snapshot of preferences, as if their steps were
+    simultaneous. Exact stepping would let later steps of the batch see the
+    flips of earlier ones; the leap size is therefore chosen so that the
+    expected number of flips per leap, estimated from the previous leaps,
+    stays below `tolerance` times the number of honest nodes. This also
+    bounds the drift of `count_0` over a leap.
+
+    Under exact stepping, a poll of the leap sees the flips made earlier in
+    the leap, each moving the law of its outcome (sampled majority and the
+    thresholds it passes) by at most d, the largest total variation distance
+    one honest flip makes at the snapshot. The outcome laws of a leap of
+    `size` polls with `flips` flips thus differ from exact stepping by at
+    most size * flips * d in total, a bound on the expected number of polls
+    whose outcome exact stepping would change. `leap_error` reports its
+    largest share of honest nodes over all leaps and `mean_leap_error` its
+    mean. The law follows the default L-node answer and lets nodes sample
+    themselves; leaps of distinct nodes also even out how often nodes poll,
+    which this error does not cover.
+    Rounds count polls passing AlphaPreference, as in `snowball_rs`.
+    Finalization rounds are recorded at the start of the leap.
+
+    Args:
+        config: SnowballConfig instance
+        node_types: cumulative node type boundaries, honest nodes first
+        initial_preferences: initial node preferences (0, 1 or NO_PREFERENCE)
+        sampler: SnowballSampler config
+        finality: "full" or "partial" finality
+        tolerance: largest expected share of honest nodes flipping per leap
+        record_latency: return each honest node's finalization round
+        record_values: return the value each honest node finalized on
+        telemetry: Telemetry following the run's progress
+
+    Returns:
+        dictionary with algorithm results and the leap statistics
+
+    """
+    num_honest, num_nodes = node_types[0], node_types[-1]
+    others = initial_preferences[num_honest : sampler.lnode_start]
+    fixed = np.array([np.sum(others == 0), np.sum(others == 1)], dtype=np.int64)
+    num_lnodes = num_nodes - sampler.lnode_start
+
+    state = SnowballState.initial(
+        config,
+        node_types,
+        initial_preferences,
+        record_latency=record_latency,
+        record_values=record_values,
+    )
+
+    # Check sampler configuration
+    sampler.check_config()
+    if telemetry is not None:
+        telemetry.watch(state)
+
+    rounds, rounds_to_partial = 0, None
+    steps, leaps = 0, 0
+    budget = max(tolerance * num_honest, 1.0)
+    flips, polls = 0, 0
+    errors = []
+
+    while True:
+        active = np.where(~state.finalized[:num_honest])[0]
+        if active.size == 0:
+            break
+
+        if state.finalized_count > num_nodes // 2 and rounds_to_partial is None:
+            rounds_to_partial = rounds
+            if finality == "partial":
+                break
+
+        active = state.decided(active)
+        if active.size == 0:
+            break
+
+        # Leap size from the flip rate so far, smoothed towards one flip
+        flip_rate = (flips + 1) / (polls + 1)
+        size = int(np.clip(budget / flip_rate, 1, active.size))
+
+        state.round = rounds
+        sampler.set_round(steps)
+        nodes = sampler.choose_nodes(active, size)
+        majority_pref, majority_count = sampler.batch_sampler(
+            nodes, state.preferences, state.lnode_pref, state=state
+        )
+        distance = _flip_distance(state, fixed, num_lnodes)
+        flipped = leap_update(state, nodes, majority_pref, majority_count)
+
+        rounds += int(np.count_nonzero(majority_count >= config.AlphaPreference))
+        steps += size
+        leaps += 1
+        flips, polls = flips + flipped, polls + size
+        errors.append(size * flipped * distance / num_honest)
+
+    results = state.summary(rounds, rounds_to_partial, finality)
+    results |= {
+        "steps": steps,
+        "leaps": leaps,
+        "leap_error": float(max(errors, default=0.0)),
+        "mean_leap_error": float(np.mean(errors)) if errors else 0.0,
     }
+
+    return results
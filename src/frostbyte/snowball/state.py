@@ -1,13 +1,33 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field, fields, replace
+from typing import override
 
 import numpy as np
 
-from src.config import SnowballConfig
+from src.config import NO_PREFERENCE, SnowballConfig
+
+# Entry of `finalization_rounds` for honest nodes that have not finalized
+NOT_FINALIZED = np.iinfo(np.uint32).max
 
 
 @dataclass
 class SnowballState:
-    """Holds all the mutable Snowball state."""
+    """
+    Holds all the mutable Snowball state.
+
+    Undecided honest nodes hold NO_PREFERENCE; they do not query and, as in
+    the snow package, adopt the preference of the first node querying them.
+
+    When allocated, `finalization_rounds` records for each honest node the
+    number of rounds completed when it finalized (NOT_FINALIZED otherwise),
+    as the snow package's `per_node_rounds`, so the last entry equals
+    `rounds_to_full`; `finalized_values` records the value it finalized on
+    (its last majority).
+
+    `finalized_counts` always tracks how many honest nodes finalized on each
+    value; a run is in conflict as soon as two values have finalized nodes.
+    `flips` counts the preference changes of honest nodes, adoptions by
+    undecided nodes included.
+    """
 
     snowball_config: SnowballConfig
     preferences: np.ndarray
@@ -19,23 +39,230 @@ class SnowballState:
     num_honest: int
     lnode_pref: int
     finalized_count: int
+    num_undecided: int = 0
+    round: int = 0
+    finalization_rounds: np.ndarray | None = None
+    finalized_values: np.ndarray | None = None
+    finalized_counts: np.ndarray = field(
+        default_factory=lambda: np.zeros(2, dtype=np.int64)
+    )
+    flips: int = 0
 
-    def honest_flip(self, node_id: int, majority_pref: int) -> None:
-        """Flip single node preference if needed."""
+    @classmethod
+    def initial(
+        cls,
+        config: SnowballConfig,
+        node_types: np.ndarray,
+        initial_preferences: np.ndarray,
+        *,
+        record_latency: bool = False,
+        record_values: bool = False,
+    ) -> "SnowballState":
+        """
+        Build the state at the start of a run.
+
+        Args:
+            config: SnowballConfig instance
+            node_types: cumulative node type boundaries, honest nodes first
+            initial_preferences: initial node preferences
+            record_latency: allocate per-node finalization rounds
+            record_values: allocate per-node finalized values
+
+        """
+        num_honest, num_nodes = node_types[0], node_types[-1]
+        honest_prefs = initial_preferences[:num_honest]
+
+        state = cls(
+            snowball_config=config,
+            preferences=initial_preferences.copy(),
+            strengths=np.zeros((num_nodes, 2), dtype=np.uint8),
+            confidences=np.zeros(num_nodes, dtype=np.uint8),
+            last_majority=honest_prefs.copy(),
+            finalized=np.zeros(num_nodes, dtype=bool),
+            count_0=int(np.sum(honest_prefs == 0)),
+            num_honest=num_honest,
+            lnode_pref=0,
+            finalized_count=0,
+            num_undecided=int(np.sum(honest_prefs == NO_PREFERENCE)),
+        )
+        state.allocate_records(
+            record_latency=record_latency, record_values=record_values
+        )
+        state.update_lnode_pref()
+
+        return state
+
+    def allocate_records(
+        self, *, record_latency: bool = False, record_values: bool = False
+    ) -> None:
+        """Allocate the optional per-node finalization records."""
+        if record_latency:
+            self.finalization_rounds = np.full(
+                self.num_honest, NOT_FINALIZED, dtype=np.uint32
+            )
+        if record_values:
+            self.finalized_values = np.full(
+                self.num_honest, NO_PREFERENCE, dtype=np.uint8
+            )
+
+    def copy(self) -> "SnowballState":
+        """Return an independent clone of the state."""
+        return replace(
+            self,
+            **{
+                f.name: value.copy()
+                for f in fields(self)
+                if isinstance(value := getattr(self, f.name), np.ndarray)
+            },
+        )
+
+    @property
+    def conflict(self) -> bool:
+        """Whether honest nodes finalized on different values."""
+        return bool(np.count_nonzero(self.finalized_counts) > 1)
+
+    def beta(self, nodes: np.ndarray | int) -> np.ndarray | int:
+        """
+        Confidence threshold of the given honest nodes.
+
+        Rogue nodes, with a positive strength for more than one value, need
+        `BetaRogue` when it is set; all others need `Beta`.
+        """
+        config = self.snowball_config
+        if config.BetaRogue is None:
+            return config.Beta
+        rogue = np.count_nonzero(self.strengths[nodes], axis=-1) > 1
+        return np.where(rogue, config.BetaRogue, config.Beta)
+
+    def adopts(
+        self, nodes: np.ndarray | int, majority_pref: np.ndarray | int
+    ) -> np.ndarray | bool:
+        """Whether nodes switch to a sampled majority passing AlphaPreference."""
         other = 1 - majority_pref
+        return self.strengths[nodes, majority_pref] > self.strengths[nodes, other]
+
+    def miss(self, node_id: int) -> None:
+        """Reset the confidence of a node whose poll missed AlphaPreference."""
+        self.confidences[node_id] = 0
+
+    def finalize(self, nodes: np.ndarray | int) -> None:
+        """Finalize honest nodes on their last majority."""
+        self.finalized[nodes] = True
+        self.finalized_count += np.size(nodes)
+        self._record_finalized(nodes)
+
+    def _record_finalized(self, nodes: np.ndarray | int) -> None:
+        """Count the values of newly finalized nodes and record them."""
+        np.add.at(self.finalized_counts, self.last_majority[nodes], 1)
+        if self.finalization_rounds is not None:
+            self.finalization_rounds[nodes] = self.round + 1
+        if self.finalized_values is not None:
+            self.finalized_values[nodes] = self.last_majority[nodes]
 
+    def summary(
+        self,
+        rounds: int,
+        rounds_to_partial: int | None,
+        finality: str,
+    ) -> dict:
+        """
+        Build the result dict of a finished run.
+
+        Args:
+            rounds: number of rounds run
+            rounds_to_partial: round at which partial finality was reached
+            finality: "full" or "partial" finality
+
+        """
+        num_decided = self.num_honest - self.num_undecided
+        full = finality == "full" and self.finalized_count == self.num_honest
+        results = {
+            "honest_0": self.count_0,
+            "honest_1": num_decided - self.count_0,
+            "honest_undecided": self.num_undecided,
+            "finalized_honest": self.finalized_count,
+            "rounds_to_partial": rounds_to_partial,
+            "rounds_to_full": rounds if full else None,
+            "conflict": self.conflict,
+        }
+        if self.finalization_rounds is not None:
+            results["finalization_rounds"] = self.finalization_rounds
+        if self.finalized_values is not None:
+            results["finalized_values"] = self.finalized_values
+
+        return results
+
+    def update_lnode_pref(self) -> None:
+        """Recompute the L-node response as the minority honest preference."""
+        count_1 = self.num_honest - self.num_undecided - self.count_0
+        self.lnode_pref = 0 if self.count_0 < count_1 else 1
+
+    def decided(self, nodes: np.ndarray) -> np.ndarray:
+        """Return the given nodes that hold a preference."""
+        if self.num_undecided == 0:
+            return nodes
+        return nodes[self.preferences[nodes] != NO_PREFERENCE]
+
+    def answer_undecided(
+        self,
+        queriers: np.ndarray,
+        peer_samples: np.ndarray,
+        votes: np.ndarray,
+    ) -> None:
+        """
+        Apply the undecided-node rule to a matrix of sampled votes, in place.
+
+        Queries reach peers in row-major order: an undecided honest peer
+        gives no response to its first query and adopts that querier's
+        preference, which it then reports to any later query.
+
+        Args:
+            queriers: (M,) array of querying nodes
+            peer_samples: (M, K) array of sampled peers
+            votes: (M, K) array of sampled votes, updated in place
+
+        """
+        undecided = (votes == NO_PREFERENCE) & (peer_samples < self.num_honest)
+        if not undecided.any():
+            return
+
+        rows, cols = np.nonzero(undecided)
+        peers = peer_samples[rows, cols]
+        asked = self.preferences[queriers[rows]]
+
+        # The first query to each undecided peer sets its preference
+        adopters, first = np.unique(peers, return_index=True)
+        adopted = asked[first]
+
+        later = np.ones(peers.size, dtype=bool)
+        later[first] = False
+        votes[rows[later], cols[later]] = adopted[
+            np.searchsorted(adopters, peers[later])
+        ]
+
+        self.preferences[adopters] = adopted
+        self.num_undecided -= adopters.size
+        self.flips += adopters.size
+        self._count_adopted(adopted)
+        self.update_lnode_pref()
+
+    def _count_adopted(self, adopted: np.ndarray) -> None:
+        """Add newly adopted preferences to the honest counts."""
+        self.count_0 += int(np.sum(adopted == 0))
+
+    def honest_flip(self, node_id: int, majority_pref: int) -> None:
+        """Flip single node preference if needed."""
         # Only flip if this pref strength strictly exceeds the other.
-        if (self.preferences[node_id] != majority_pref) and (
-            self.strengths[node_id, majority_pref] > self.strengths[node_id, other]
+        if (self.preferences[node_id] != majority_pref) and self.adopts(
+            node_id, majority_pref
         ):
             # Flip the honest node
             self.preferences[node_id] = majority_pref
+            self.flips += 1
             # Adjust zero count
             self.count_0 += +1 if majority_pref == 0 else -1
             # Recompute LNode scalar
-            self.lnode_pref = (
-                0 if self.count_0 < (self.num_honest - self.count_0) else 1
-            )
+            self.update_lnode_pref()
 
     def confidence_update(
         self,
@@ -70,9 +297,8 @@ class SnowballState:
             self.confidences[node_id] += 1
 
             # Check if node can finalize
-            if self.confidences[node_id] >= self.snowball_config.Beta:
-                self.finalized[node_id] = True
-                self.finalized_count += 1
+            if self.confidences[node_id] >= self.beta(node_id):
+                self.finalize(node_id)
 
         # Update last majority for the next round
         self.last_majority[node_id] = maj_pref
@@ -100,9 +326,10 @@ class SnowballState:
 
         # Perform the flips
         self.preferences[to_flip] = new_prefs
+        self.flips += to_flip.size
 
         # Recompute L-node scalar
-        self.lnode_pref = 0 if self.count_0 < (self.num_honest - self.count_0) else 1
+        self.update_lnode_pref()
 
     def batch_confidence_update(
         self,
@@ -136,11 +363,169 @@ class SnowballState:
         self.confidences[non_survivors] = 1
 
         # Finalize anyone who just Beta in confidence
-        to_finalize = survivors[
-            self.confidences[survivors] >= self.snowball_config.Beta
-        ]
-        self.finalized[to_finalize] = True
-        self.finalized_count += len(to_finalize)
+        to_finalize = survivors[self.confidences[survivors] >= self.beta(survivors)]
+        self.finalize(to_finalize)
 
         # Update last_majority for all active
         self.last_majority[active] = maj_pref
+
+
+@dataclass
+class SnowflakeState(SnowballState):
+    """
+    Snowflake state: Snowball without preference strengths.
+
+    A node adopts every sampled majority passing AlphaPreference at once.
+    Strengths are still counted, only to tell rogue nodes apart for
+    `BetaRogue`.
+    """
+
+    @override
+    def adopts(
+        self, nodes: np.ndarray | int, majority_pref: np.ndarray | int
+    ) -> np.ndarray | bool:
+        """Whether nodes switch to a sampled majority passing AlphaPreference."""
+        return np.ones(np.shape(majority_pref), dtype=bool)
+
+
+@dataclass
+class SlushState(SnowflakeState):
+    """
+    Slush state: Snowflake without confidence.
+
+    Slush runs a fixed number of polls per node; here `confidences` counts
+    the polls of each node, successful or not, and a node finalizes on its
+    current preference after `Beta` polls (`BetaRogue` for rogue nodes).
+    """
+
+    def _count_polls(self, nodes: np.ndarray | int) -> None:
+        """Count one poll of the given nodes and finalize the last ones."""
+        nodes = np.atleast_1d(nodes)
+        self.confidences[nodes] += 1
+        self.last_majority[nodes] = self.preferences[nodes]
+        self.finalize(nodes[self.confidences[nodes] >= self.beta(nodes)])
+
+    @override
+    def miss(self, node_id: int) -> None:
+        """Count a poll that missed AlphaPreference."""
+        self._count_polls(node_id)
+
+    @override
+    def confidence_update(
+        self,
+        node_id: int,
+        maj_count: int,
+        maj_pref: int,
+    ) -> None:
+        """Count a poll of a single node."""
+        self._count_polls(node_id)
+
+    @override
+    def batch_confidence_update(
+        self,
+        active: np.ndarray,
+        maj_pref: np.ndarray,
+        maj_count: np.ndarray,
+    ) -> None:
+        """Count a poll of every active node."""
+        self._count_polls(active)
+
+
+# State classes of the binary protocols run by the frostbyte engines
+PROTOCOLS: dict[str, type[SnowballState]] = {
+    "snowball": SnowballState,
+    "snowflake": SnowflakeState,
+    "slush": SlushState,
+}
+
+
+def protocol_state(protocol: str) -> type[SnowballState]:
+    """Return the state class of a binary protocol."""
+    if protocol not in PROTOCOLS:
+        e = f"Unknown protocol: {protocol}. Supported protocols: {sorted(PROTOCOLS)}"
+        raise ValueError(e)
+    return PROTOCOLS[protocol]
+
+
+@dataclass
+class NarySnowballState(SnowballState):
+    """
+    Snowball state for a decision between `num_choices` competing values.
+
+    `strengths` has one column per choice and `choice_counts` tracks how many
+    honest nodes prefer each value; `count_0` is kept in sync with its first
+    entry so binary result reporting still applies. L-nodes answer with the
+    runner-up value, which reduces to the minority rule for two choices.
+    """
+
+    choice_counts: np.ndarray = field(kw_only=True)
+
+    @property
+    def num_choices(self) -> int:
+        """Number of competing values."""
+        return self.choice_counts.size
+
+    @override
+    def update_lnode_pref(self) -> None:
+        """Recompute the L-node response as the runner-up honest preference."""
+        # Stable sort: ties keep the lower value ahead, matching the binary rule
+        ranking = np.argsort(-self.choice_counts, kind="stable")
+        self.lnode_pref = int(ranking[1])
+        self.count_0 = int(self.choice_counts[0])
+
+    @override
+    def summary(
+        self,
+        rounds: int,
+        rounds_to_partial: int | None,
+        finality: str,
+    ) -> dict:
+        """Build the result dict, with one `honest_<value>` entry per choice."""
+        binary = super().summary(rounds, rounds_to_partial, finality)
+        del binary["honest_0"], binary["honest_1"]
+        return {
+            **{f"honest_{c}": int(n) for c, n in enumerate(self.choice_counts)},
+            **binary,
+        }
+
+    @override
+    def _count_adopted(self, adopted: np.ndarray) -> None:
+        """Add newly adopted preferences to the honest counts."""
+        self.choice_counts += np.bincount(adopted, minlength=self.num_choices)
+
+    @override
+    def honest_flip(self, node_id: int, majority_pref: int) -> None:
+        """Flip single node preference if needed."""
+        current = self.preferences[node_id]
+
+        # Only flip if the majority strength strictly exceeds the current one
+        if (current != majority_pref) and (
+            self.strengths[node_id, majority_pref] > self.strengths[node_id, current]
+        ):
+            self.preferences[node_id] = majority_pref
+            self.flips += 1
+            self.choice_counts[current] -= 1
+            self.choice_counts[majority_pref] += 1
+            self.update_lnode_pref()
+
+    @override
+    def batch_flip(self, to_flip: np.ndarray, new_prefs: np.ndarray) -> None:
+        """
+        Flip batch of honest nodes simultaneously.
+
+        Args:
+            to_flip: 1D array of honest-node indices to flip
+            new_prefs: same-length array of majority preferences
+
+        """
+        if to_flip.size == 0:
+            return
+
+        # Move each flipped node from its old bucket to its new one
+        old = self.preferences[to_flip]
+        self.choice_counts -= np.bincount(old, minlength=self.num_choices)
+        self.choice_counts += np.bincount(new_prefs, minlength=self.num_choices)
+
+        self.preferences[to_flip] = new_prefs
+        self.flips += to_flip.size
+        self.update_lnode_pref()
@@ -0,0 +1,19 @@
+from .cost import DEFAULT_PATH, CostModel, calibrate
+from .engines import ENGINES, EngineSpec, Request, RunOptions, register_engine
+from .planner import Plan, Simulation, describe_request, plan_simulation, simulate
+
+__all__ = [
+    "DEFAULT_PATH",
+    "ENGINES",
+    "CostModel",
+    "EngineSpec",
+    "Plan",
+    "Request",
+    "RunOptions",
+    "Simulation",
+    "calibrate",
+    "describe_request",
+    "plan_simulation",
+    "register_engine",
+    "simulate",
+]
@@ -0,0 +1,30 @@
+import argparse
+import sys
+from collections.abc import Sequence
+
+from src.planner.cost import DEFAULT_PATH, calibrate
+from src.planner.engines import ENGINES
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """Calibrate the planner's cost model on this host."""
+    parser = argparse.ArgumentParser(
+        prog="python -m src.planner",
+        description="Measure engine costs on this host for `simulate`.",
+    )
+    parser.add_argument(
+        "engines", nargs="*", help=f"engines to calibrate, among {sorted(ENGINES)}"
+    )
+    parser.add_argument("-o", "--output", default=DEFAULT_PATH, help="model path")
+    parser.add_argument("-t", "--trials", type=int, default=2)
+    args = parser.parse_args(argv)
+
+    model = calibrate(args.engines or None, trials=args.trials, path=args.output)
+    for name, coefficients in sorted(model.coefficients.items()):
+        values = " ".join(f"{c:.3g}" for c in coefficients)
+        sys.stdout.write(f"{name:<24} {values}\n")
+    sys.stdout.write(f"Saved to {args.output}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+import json
+import math
+import platform
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from itertools import product
+from pathlib import Path
+
+import numpy as np
+
+from src.config import SimConfig, SnowballConfig
+from src.planner.engines import ENGINES, EngineSpec, Request, RunOptions
+from src.snow.node import TYPES
+
+# Calibration kept between sessions unless another path is given
+DEFAULT_PATH = Path.home() / ".cache" / "snowman" / "cost_model.json"
+
+
+def expected_rounds(request: Request) -> float:
+    """
+    Rough number of lockstep rounds of a run.
+
+    Nodes need Beta confirming rounds once the network has tipped, which
+    takes a few rounds per doubling of the network. Only used to weigh
+    per-trial startup against per-round costs, and common to all engines.
+    """
+    return request.beta + 2 * math.log2(max(request.num_nodes, 2))
+
+
+@dataclass
+class CostModel:
+    """
+    Per-engine cost coefficients, see `EngineSpec`.
+
+    Engines without measured coefficients fall back to their prior.
+    """
+
+    coefficients: dict[str, tuple[float, ...]] = field(default_factory=dict)
+    host: str = ""
+    calibrated_at: str = ""
+
+    def coefficients_of(self, engine: EngineSpec) -> tuple[float, ...]:
+        """Measured coefficients of an engine, its prior otherwise."""
+        return self.coefficients.get(engine.name, engine.prior)
+
+    def is_calibrated(self, engine: EngineSpec) -> bool:
+        """Whether the engine's coefficients were measured."""
+        return engine.name in self.coefficients
+
+    def estimate(self, engine: EngineSpec, request: Request) -> float:
+        """Estimated seconds to run all trials of a request on an engine."""
+        startup, *per_round = self.coefficients_of(engine)
+        regressors = engine.regressors(request.num_nodes, request.k)
+        round_cost = sum(c * x for c, x in zip(per_round, regressors, strict=True))
+        return request.trials * (startup + expected_rounds(request) * round_cost)
+
+    def save(self, path: str | Path = DEFAULT_PATH) -> None:
+        """Write the measured coefficients as JSON."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(
+            json.dumps(
+                {
+                    "host": self.host,
+                    "calibrated_at": self.calibrated_at,
+                    "coefficients": self.coefficients,
+                },
+                indent=2,
+            )
+        )
+
+    @classmethod
+    def load(cls, path: str | Path = DEFAULT_PATH) -> "CostModel":
+        """Read saved coefficients, or return the priors if there are none."""
+        path = Path(path)
+        if not path.exists():
+            return cls()
+        data = json.loads(path.read_text())
+        return cls(
+            coefficients={
+                name: tuple(values) for name, values in data["coefficients"].items()
+            },
+            host=data.get("host", ""),
+            calibrated_at=data.get("calibrated_at", ""),
+        )
+
+
+# Sample sizes of the benchmarks, varied so that N and K terms separate
+BENCHMARK_KS = (5, 15)
+
+
+def benchmark_config(num_nodes: int, k: int) -> SimConfig:
+    """One trial of honest nodes split 60/40, with K peers out of the others."""
+    k = min(k, num_nodes - 1)
+    num_0 = num_nodes * 3 // 5
+    return SimConfig(
+        num_nodes=num_nodes,
+        num_iterations=1,
+        snowball=SnowballConfig(
+            K=k,
+            AlphaPreference=k // 2 + 1,
+            AlphaConfidence=max(k * 4 // 5, k // 2 + 1),
+            Beta=8,
+        ),
+        node_counts={TYPES.honest: num_nodes},
+        initial_preferences={TYPES.honest: [0] * num_0 + [1] * (num_nodes - num_0)},
+    )
+
+
+def _fit(rows: list[list[float]], times: list[float]) -> tuple[float, ...]:
+    """Least-squares coefficients, refitted without any negative one."""
+    x, y = np.array(rows), np.array(times)
+    keep = np.ones(x.shape[1], dtype=bool)
+    coefficients = np.zeros(x.shape[1])
+    while keep.any():
+        solution, *_ = np.linalg.lstsq(x[:, keep], y, rcond=None)
+        if (solution >= 0).all():
+            coefficients[keep] = solution
+            break
+        keep[np.flatnonzero(keep)[solution < 0]] = False
+
+    return tuple(float(c) for c in coefficients)
+
+
+def measure(
+    engine: EngineSpec, sizes: Iterable[int] | None = None, trials: int = 2
+) -> tuple[float, ...]:
+    """
+    Fit an engine's cost coefficients from timed benchmark runs.
+
+    Every benchmark size is run `trials` times for each of `BENCHMARK_KS`,
+    one trial per timing, and the time of every trial is regressed on its
+    startup and its rounds times the engine's regressors.
+
+    Returns:
+        (startup, *per-round) coefficients in seconds
+
+    """
+    rows, times = [], []
+    points = product(sizes or engine.benchmark_sizes, BENCHMARK_KS, range(trials))
+    for num_nodes, k, seed in points:
+        sim_config = benchmark_config(num_nodes, k)
+        start = time.perf_counter()
+        (result,) = engine.run(sim_config, "full", RunOptions(seed=seed))
+        elapsed = time.perf_counter() - start
+
+        rounds = result["rounds_to_full"] or 0
+        if engine.steps_per_round:
+            rounds /= num_nodes
+        regressors = engine.regressors(num_nodes, sim_config.snowball.K)
+        rows.append([1.0, *(rounds * x for x in regressors)])
+        times.append(elapsed)
+
+    return _fit(rows, times)
+
+
+def calibrate(
+    engines: Iterable[str] | None = None,
+    *,
+    trials: int = 2,
+    sizes: Iterable[int] | None = None,
+    path: str | Path | None = DEFAULT_PATH,
+) -> CostModel:
+    """
+    Measure the cost coefficients of engines on this host.
+
+    Args:
+        engines: names of registered engines, all of them by default
+        trials: timed trials per benchmark size
+        sizes: benchmark network sizes, each engine's own by default
+        path: where to save the model, merged with earlier measurements of
+            other engines; None to keep it in memory only
+
+    Returns:
+        the calibrated CostModel
+
+    """
+    model = CostModel.load(path) if path is not None else CostModel()
+    sizes = None if sizes is None else list(sizes)
+    engines = list(engines or ENGINES)
+    unknown = set(engines) - set(ENGINES)
+    if unknown:
+        e = f"Unknown engines: {sorted(unknown)}. Registered engines: {sorted(ENGINES)}"
+        raise ValueError(e)
+
+    for name in engines:
+        model.coefficients[name] = measure(ENGINES[name], sizes, trials)
+
+    model.host = (
+        f"{platform.node()} ({platform.machine()}, {platform.python_version()})"
+    )
+    model.calibrated_at = datetime.now(UTC).isoformat(timespec="seconds")
+    if path is not None:
+        model.save(path)
+
+    return model
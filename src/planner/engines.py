@@ -0,0 +1,355 @@
+import os
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+from src.config import SimConfig
+from src.frostbyte.sampler import SnowballSampler
+from src.frostbyte.simul import run_snowball
+from src.frostbyte.snowball import (
+    snowball_ls,
+    snowball_ls_buffered,
+    snowball_ls_parallel,
+    snowball_nary_ls,
+    snowball_nary_rs,
+    snowball_population_ls,
+    snowball_rs,
+    snowball_rs_tau,
+)
+from src.snow.network import BaseNetwork, LockstepNetwork, RandomSamplingNetwork
+from src.snow.sampler import UniformSampler
+from src.snow.simulation import run_simulation
+from src.utils.streams import RandomStreams
+
+if TYPE_CHECKING:
+    from src.frostbyte.adversary import AdversaryStrategy
+    from src.utils.milestones import Milestone
+    from src.utils.telemetry import Telemetry
+    from src.utils.topology import PeerGraph
+
+# Round models: engines of different models answer different questions
+LOCKSTEP, RANDOM_SAMPLING = "lockstep", "random_sampling"
+
+# Features a request may need, see `Request.needs`
+FEATURES = frozenset(
+    {
+        "undecided",  # honest nodes without initial preference
+        "nary",  # more than two values
+        "protocol",  # Snowflake or Slush instead of Snowball
+        "beta_rogue",  # SnowballConfig.BetaRogue
+        "adversary",  # frostbyte AdversaryStrategy for the L-nodes
+        "graph",  # sparse peer graph
+        "streams",  # counter-based streams shared by all engines
+        "finalization_rounds",  # per-node finalization rounds
+        "finalized_values",  # per-node finalized values
+        "latency_histogram",  # FinalizationHistogram of every run
+        "milestones",  # MilestoneTracker rounds
+        "max_rounds",  # round cap
+        "telemetry",  # Telemetry gauges
+    }
+)
+
+
+@dataclass
+class RunOptions:
+    """Sampler settings and outputs of a `simulate` call, for every engine."""
+
+    seed: int | None = None
+    streams: bool = False
+    protocol: str = "snowball"
+    adversary: "AdversaryStrategy | None" = None
+    graph: "PeerGraph | None" = None
+    record_latency: bool = False
+    record_values: bool = False
+    latency_histogram: bool = False
+    milestones: "list[Milestone | str] | None" = None
+    max_rounds: int | None = None
+    telemetry: "Telemetry | None" = None
+
+    def engine_kwargs(self) -> dict[str, Any]:
+        """Keyword arguments of the requested outputs, only those set."""
+        flags = {
+            "record_latency": self.record_latency,
+            "record_values": self.record_values,
+        }
+        kwargs: dict[str, Any] = {key: True for key, value in flags.items() if value}
+        settings = {
+            "milestones": self.milestones,
+            "max_rounds": self.max_rounds,
+            "telemetry": self.telemetry,
+        }
+        kwargs |= {key: value for key, value in settings.items() if value is not None}
+        if self.protocol != "snowball":
+            kwargs["protocol"] = self.protocol
+        return kwargs
+
+
+Runner = Callable[[SimConfig, str, RunOptions], list[dict]]
+
+
+@dataclass(frozen=True)
+class EngineSpec:
+    """
+    An engine `simulate` may dispatch to, with what it supports and costs.
+
+    The cost of a trial is modelled as `startup + rounds * per_round`, with
+    `per_round` a linear combination of the engine's `regressors(n, k)` for
+    n nodes and K peers, `rounds` counting lockstep rounds (for random
+    sampling, one round is one step of every honest node). `prior` holds
+    the coefficients (startup, *per-round) used until `calibrate` measured
+    them on the host.
+
+    Engines listed under `requires` are only candidates for requests
+    needing all of those features, such as n-ary engines for n-ary
+    preferences. `counts_only` engines return node counts without per-node
+    arrays, and are ranked below the others unless the request accepts it.
+    """
+
+    name: str
+    model: str
+    supports: frozenset[str]
+    run: Runner
+    regressors: Callable[[int, int], tuple[float, ...]]
+    prior: tuple[float, ...]
+    benchmark_sizes: tuple[int, ...] = (500, 2000, 8000)
+    steps_per_round: bool = False
+    approximate: bool = False
+    requires: frozenset[str] = frozenset()
+    counts_only: bool = False
+    description: str = ""
+
+    def missing(self, needs: frozenset[str]) -> frozenset[str]:
+        """Features of a request this engine does not support."""
+        return needs - self.supports
+
+    def unused(self, needs: frozenset[str]) -> frozenset[str]:
+        """Required features of this engine a request does not need."""
+        return self.requires - needs
+
+
+def _frostbyte_runner(algo: Callable[..., dict]) -> Runner:
+    """Run a frostbyte engine through `run_snowball`."""
+
+    def run(sim_config: SimConfig, finality: str, options: RunOptions) -> list[dict]:
+        rng = np.random.default_rng(options.seed)
+        sampler = SnowballSampler(
+            rng=rng,
+            adversary=options.adversary,
+            streams=RandomStreams(options.seed or 0) if options.streams else None,
+            graph=options.graph,
+        )
+        return run_snowball(
+            sim_config=sim_config,
+            sampler=sampler,
+            snowball_algo=algo,
+            finality=finality,
+            latency_histogram=options.latency_histogram,
+            **options.engine_kwargs(),
+        )
+
+    return run
+
+
+def _snow_runner(network_class: type[BaseNetwork]) -> Runner:
+    """Run a snow network through `run_simulation`."""
+
+    def run(sim_config: SimConfig, finality: str, options: RunOptions) -> list[dict]:
+        rng = np.random.default_rng(options.seed)
+        sampler = UniformSampler(
+            rng=rng,
+            streams=RandomStreams(options.seed or 0) if options.streams else None,
+        )
+        return run_simulation(
+            network_class=network_class,
+            sampler=sampler,
+            sim_config=sim_config,
+            finality=finality,
+            telemetry=options.telemetry,
+            milestones=options.milestones,
+        )
+
+    return run
+
+
+def _linear(n: int, k: int) -> tuple[float, ...]:
+    """Per-round cost of engines with fixed, per-node and per-sample work."""
+    return (1.0, float(n), float(n * k))
+
+
+def _parallel(n: int, k: int) -> tuple[float, ...]:
+    """Per-round cost of `_linear` work shared by one process per CPU."""
+    workers = os.cpu_count() or 1
+    return (1.0, n / workers, n * k / workers)
+
+
+def _population(n: int, k: int) -> tuple[float, ...]:  # noqa: ARG001
+    """Per-round cost of the count table, independent of n."""
+    return (1.0, float(k * k))
+
+
+_FROSTBYTE = frozenset(
+    {
+        "undecided",
+        "adversary",
+        "graph",
+        "streams",
+        "finalization_rounds",
+        "finalized_values",
+        "latency_histogram",
+        "telemetry",
+    }
+)
+
+ENGINES: dict[str, EngineSpec] = {}
+
+
+def register_engine(spec: EngineSpec) -> EngineSpec:
+    """Make an engine available to `simulate` and `calibrate`."""
+    unknown = (spec.supports | spec.requires) - FEATURES
+    if unknown:
+        e = f"Unknown features of engine {spec.name}: {sorted(unknown)}"
+        raise ValueError(e)
+    ENGINES[spec.name] = spec
+    return spec
+
+
+for _spec in (
+    EngineSpec(
+        name="snowball_ls",
+        model=LOCKSTEP,
+        supports=_FROSTBYTE | {"protocol", "beta_rogue", "milestones", "max_rounds"},
+        run=_frostbyte_runner(snowball_ls),
+        regressors=_linear,
+        prior=(1e-3, 1e-4, 1e-5, 2.5e-7),
+        description="vectorized lockstep",
+    ),
+    EngineSpec(
+        name="snowball_ls_buffered",
+        model=LOCKSTEP,
+        supports=_FROSTBYTE | {"protocol", "beta_rogue"},
+        run=_frostbyte_runner(snowball_ls_buffered),
+        regressors=_linear,
+        prior=(1e-3, 1e-4, 1e-5, 2.5e-7),
+        description="lockstep with preallocated buffers",
+    ),
+    EngineSpec(
+        name="snowball_ls_parallel",
+        model=LOCKSTEP,
+        supports=frozenset({"graph", "streams", "beta_rogue"}),
+        run=_frostbyte_runner(snowball_ls_parallel),
+        regressors=_parallel,
+        prior=(0.1, 1e-3, 1.2e-5, 3e-7),
+        benchmark_sizes=(2000, 8000, 32000),
+        description="lockstep split over worker processes",
+    ),
+    EngineSpec(
+        name="snowball_population_ls",
+        model=LOCKSTEP,
+        supports=frozenset({"latency_histogram", "max_rounds"}),
+        run=_frostbyte_runner(snowball_population_ls),
+        regressors=_population,
+        prior=(1e-3, 8e-4, 2e-6),
+        benchmark_sizes=(1000, 10000, 100000),
+        counts_only=True,
+        description="count table of exchangeable nodes, cost independent of N",
+    ),
+    EngineSpec(
+        name="snowball_nary_ls",
+        model=LOCKSTEP,
+        supports=_FROSTBYTE | {"nary"},
+        run=_frostbyte_runner(snowball_nary_ls),
+        regressors=_linear,
+        prior=(1e-3, 5e-4, 5e-6, 4e-7),
+        requires=frozenset({"nary"}),
+        description="vectorized n-ary lockstep",
+    ),
+    EngineSpec(
+        name="snowball_rs",
+        model=RANDOM_SAMPLING,
+        supports=_FROSTBYTE | {"protocol", "beta_rogue"},
+        run=_frostbyte_runner(snowball_rs),
+        regressors=_linear,
+        prior=(1e-3, 1e-4, 3.8e-5, 1e-8),
+        benchmark_sizes=(200, 800, 3200),
+        steps_per_round=True,
+        description="random sampling, one node per step",
+    ),
+    EngineSpec(
+        name="snowball_rs_tau",
+        model=RANDOM_SAMPLING,
+        supports=frozenset(
+            {
+                "finalization_rounds",
+                "finalized_values",
+                "latency_histogram",
+                "telemetry",
+            }
+        ),
+        run=_frostbyte_runner(snowball_rs_tau),
+        regressors=_linear,
+        prior=(1e-3, 1e-4, 1e-5, 2e-7),
+        steps_per_round=True,
+        approximate=True,
+        description="tau-leaping approximation of random sampling",
+    ),
+    EngineSpec(
+        name="snowball_nary_rs",
+        model=RANDOM_SAMPLING,
+        supports=_FROSTBYTE | {"nary"},
+        run=_frostbyte_runner(snowball_nary_rs),
+        regressors=_linear,
+        prior=(1e-3, 1e-4, 3.3e-5, 1.4e-7),
+        benchmark_sizes=(200, 800, 3200),
+        steps_per_round=True,
+        requires=frozenset({"nary"}),
+        description="n-ary random sampling",
+    ),
+    EngineSpec(
+        name="snow_lockstep",
+        model=LOCKSTEP,
+        supports=frozenset({"undecided", "streams", "milestones", "telemetry"}),
+        run=_snow_runner(LockstepNetwork),
+        regressors=_linear,
+        prior=(1e-3, 2e-4, 1.8e-5, 4e-7),
+        benchmark_sizes=(40, 80, 160),
+        description="object model, one Python object per node",
+    ),
+    EngineSpec(
+        name="snow_random_sampling",
+        model=RANDOM_SAMPLING,
+        supports=frozenset({"undecided", "streams", "milestones", "telemetry"}),
+        run=_snow_runner(RandomSamplingNetwork),
+        regressors=_linear,
+        prior=(1e-3, 1e-4, 1.5e-4, 3.6e-6),
+        benchmark_sizes=(40, 80, 160),
+        steps_per_round=True,
+        description="object model, random sampling",
+    ),
+):
+    register_engine(_spec)
+
+
+@dataclass(frozen=True)
+class Request:
+    """What a `simulate` call asks for, as seen by the planner."""
+
+    num_nodes: int
+    num_honest: int
+    k: int
+    beta: int
+    trials: int
+    model: str = LOCKSTEP
+    needs: frozenset[str] = field(default_factory=frozenset)
+    approximate: bool = False
+    counts_only: bool = False
+
+    def describe(self) -> str:
+        """One line summary of the request."""
+        needs = ", ".join(sorted(self.needs)) or "nothing extra"
+        return (
+            f"{self.trials} trial(s) of {self.num_nodes} nodes "
+            f"({self.num_honest} honest), K={self.k}, {self.model} model, "
+            f"needing {needs}"
+        )
@@ -0,0 +1,271 @@
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from src.config import NO_PREFERENCE, SimConfig
+from src.frostbyte.sampler import SnowballSampler
+from src.frostbyte.simul.runner import build_network
+from src.planner.cost import CostModel
+from src.planner.engines import ENGINES, LOCKSTEP, EngineSpec, Request, RunOptions
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from src.frostbyte.adversary import AdversaryStrategy
+    from src.utils.milestones import Milestone
+    from src.utils.telemetry import Telemetry
+    from src.utils.topology import PeerGraph
+
+
+def describe_request(
+    sim_config: SimConfig,
+    options: RunOptions,
+    *,
+    model: str = LOCKSTEP,
+    approximate: bool = False,
+    counts_only: bool = False,
+) -> Request:
+    """
+    Derive what a simulation needs from its configuration and options.
+
+    Args:
+        sim_config: simulation configuration
+        options: sampler settings and requested outputs
+        model: "lockstep" or "random_sampling" rounds
+        approximate: whether approximate engines may be used
+        counts_only: whether node counts are enough, without per-node
+            arrays
+
+    Returns:
+        the Request to plan
+
+    """
+    sampler = SnowballSampler(rng=np.random.default_rng(0))
+    node_types, initial_prefs = build_network(sim_config, sampler)
+    num_honest = int(node_types[0])
+    decided = initial_prefs[initial_prefs != NO_PREFERENCE]
+    snowball = sim_config.snowball
+
+    flags = {
+        "undecided": bool(np.any(initial_prefs[:num_honest] == NO_PREFERENCE)),
+        "nary": bool(decided.size and decided.max() > 1),
+        "protocol": options.protocol != "snowball",
+        "beta_rogue": snowball.BetaRogue is not None,
+        "adversary": options.adversary is not None,
+        "graph": options.graph is not None,
+        "streams": options.streams,
+        "finalization_rounds": options.record_latency,
+        "finalized_values": options.record_values,
+        "latency_histogram": options.latency_histogram,
+        "milestones": options.milestones is not None,
+        "max_rounds": options.max_rounds is not None,
+        "telemetry": options.telemetry is not None,
+    }
+
+    return Request(
+        num_nodes=int(node_types[-1]),
+        num_honest=num_honest,
+        k=snowball.K,
+        beta=snowball.Beta,
+        trials=sim_config.num_iterations,
+        model=model,
+        needs=frozenset(name for name, needed in flags.items() if needed),
+        approximate=approximate,
+        counts_only=counts_only,
+    )
+
+
+@dataclass
+class Plan:
+    """The engine picked for a request, with the estimates behind the choice."""
+
+    request: Request
+    engine: str
+    estimates: dict[str, float] = field(default_factory=dict)
+    rejected: dict[str, str] = field(default_factory=dict)
+    calibrated: dict[str, bool] = field(default_factory=dict)
+
+    def explain(self) -> str:
+        """Explain the choice in a few lines."""
+        lines = [f"Request: {self.request.describe()}."]
+        lines.append(
+            f"Chosen engine: {self.engine} ({ENGINES[self.engine].description})."
+        )
+        lines.append("Estimated seconds per candidate:")
+        for name, seconds in sorted(self.estimates.items(), key=lambda x: x[1]):
+            source = "measured" if self.calibrated.get(name) else "prior"
+            if ENGINES[name].counts_only and not self.request.counts_only:
+                source += " costs, ranked last as it returns counts only"
+            else:
+                source += " costs"
+            lines.append(f"  {name:<24} {seconds:>12.3g}  ({source})")
+        if self.rejected:
+            lines.append("Rejected:")
+            lines.extend(
+                f"  {name:<24} {reason}"
+                for name, reason in sorted(self.rejected.items())
+            )
+
+        return "\n".join(lines)
+
+
+def _rejection(engine: EngineSpec, request: Request) -> str | None:
+    """Why an engine cannot serve a request, None if it can."""
+    if engine.model != request.model:
+        return f"{engine.model} model"
+    if engine.approximate and not request.approximate:
+        return "approximate, pass approximate=True to allow it"
+    missing = engine.missing(request.needs)
+    if missing:
+        return f"does not support {', '.join(sorted(missing))}"
+    unused = engine.unused(request.needs)
+    if unused:
+        return f"only used for requests needing {', '.join(sorted(unused))}"
+    return None
+
+
+def plan_simulation(
+    request: Request,
+    cost_model: CostModel | None = None,
+    *,
+    engine: str | None = None,
+) -> Plan:
+    """
+    Pick the engine with the lowest estimated cost that supports a request.
+
+    Engines returning counts only come after the others, whatever their
+    cost, unless the request accepts counts only.
+
+    Args:
+        request: Request to plan, see `describe_request`
+        cost_model: CostModel, the saved calibration or priors by default
+        engine: name of an engine to use if it supports the request
+
+    Returns:
+        the Plan, with every candidate's estimate
+
+    """
+    cost_model = cost_model if cost_model is not None else CostModel.load()
+    if engine is not None and engine not in ENGINES:
+        e = f"Unknown engine: {engine}. Registered engines: {sorted(ENGINES)}"
+        raise ValueError(e)
+
+    estimates, rejected, calibrated = {}, {}, {}
+    for name, spec in ENGINES.items():
+        reason = _rejection(spec, request)
+        if reason is not None:
+            rejected[name] = reason
+            continue
+        estimates[name] = cost_model.estimate(spec, request)
+        calibrated[name] = cost_model.is_calibrated(spec)
+
+    if engine is not None and engine in rejected:
+        e = f"Engine {engine} cannot run this request: {rejected[engine]}."
+        raise ValueError(e)
+    if not estimates:
+        e = f"No engine supports {request.describe()}: {rejected}"
+        raise ValueError(e)
+
+    def rank(name: str) -> tuple[bool, float]:
+        demoted = ENGINES[name].counts_only and not request.counts_only
+        return demoted, estimates[name]
+
+    chosen = engine or min(estimates, key=rank)
+    return Plan(request, chosen, estimates, rejected, calibrated)
+
+
+@dataclass
+class Simulation:
+    """Results of a `simulate` call and the plan that produced them."""
+
+    results: list[dict]
+    plan: Plan
+
+
+def simulate(  # noqa: PLR0913
+    sim_config: SimConfig,
+    finality: str = "full",
+    *,
+    model: str = LOCKSTEP,
+    protocol: str = "snowball",
+    seed: int | None = None,
+    streams: bool = False,
+    adversary: "AdversaryStrategy | None" = None,
+    graph: "PeerGraph | None" = None,
+    record_latency: bool = False,
+    record_values: bool = False,
+    latency_histogram: bool = False,
+    milestones: "Iterable[Milestone | str] | None" = None,
+    max_rounds: int | None = None,
+    telemetry: "Telemetry | None" = None,
+    approximate: bool = False,
+    counts_only: bool = False,
+    engine: str | None = None,
+    cost_model: CostModel | str | Path | None = None,
+) -> Simulation:
+    """
+    Run a simulation on the fastest engine supporting it.
+
+    The request is read off the configuration (node types, N, K, number of
+    trials, n-ary or undecided preferences) and the options below. Every
+    registered engine of the requested round model that supports it gets a
+    cost estimate, from `calibrate` measurements on this host where
+    available, and the cheapest one runs all trials.
+
+    Args:
+        sim_config: simulation configuration
+        finality: "full" or "partial" finality
+        model: "lockstep" or "random_sampling" rounds
+        protocol: "snowball", "snowflake" or "slush"
+        seed: seed of the sampler's generator, and of its streams if used
+        streams: draw peers from counter-based streams, so that trajectories
+            do not depend on the engine
+        adversary: frostbyte adversary strategy for the L-nodes
+        graph: peer graph restricting sampling
+        record_latency: return each honest node's finalization round
+        record_values: return the value each honest node finalized on
+        latency_histogram: return a FinalizationHistogram per run
+        milestones: milestones to record, see `src.utils.milestones`
+        max_rounds: stop each run after this many rounds
+        telemetry: Telemetry following the current run
+        approximate: allow approximate engines, such as tau-leaping
+        counts_only: rank engines returning node counts only, such as the
+            population engine, by cost with the others
+        engine: run on this engine instead, if it supports the request
+        cost_model: CostModel or path of a saved one, the default
+            calibration file (or priors) otherwise
+
+    Returns:
+        Simulation with the per-run results and the Plan, whose `explain()`
+        tells why the engine was chosen
+
+    """
+    options = RunOptions(
+        seed=seed,
+        streams=streams,
+        protocol=protocol,
+        adversary=adversary,
+        graph=graph,
+        record_latency=record_latency,
+        record_values=record_values,
+        latency_histogram=latency_histogram,
+        milestones=None if milestones is None else list(milestones),
+        max_rounds=max_rounds,
+        telemetry=telemetry,
+    )
+    if isinstance(cost_model, str | Path):
+        cost_model = CostModel.load(cost_model)
+
+    request = describe_request(
+        sim_config,
+        options,
+        model=model,
+        approximate=approximate,
+        counts_only=counts_only,
+    )
+    plan = plan_simulation(request, cost_model, engine=engine)
+    results = ENGINES[plan.engine].run(sim_config, finality, options)
+
+    return Simulation(results, plan)
@@ -0,0 +1,168 @@
+from abc import ABC, abstractmethod
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, override
+
+import numpy as np
+
+from src.config import NO_PREFERENCE
+
+Preference = int | None
+
+
+def _code(pref: Preference) -> int:
+    """uint8 code of a preference, NO_PREFERENCE for None."""
+    return NO_PREFERENCE if pref is None else int(pref)
+
+
+def _split_counts(weights: Sequence[float], count: int) -> np.ndarray:
+    """Split `count` into integer parts proportional to `weights`."""
+    w = np.asarray(weights, dtype=np.float64)
+    if w.size == 0 or np.any(w < 0) or w.sum() <= 0:
+        e = "Preference weights must be non-negative and not all zero."
+        raise ValueError(e)
+
+    # Largest remainder: floor every share, then round up the largest rests
+    shares = w / w.sum() * count
+    counts = np.floor(shares).astype(np.int64)
+    rest = count - int(counts.sum())
+    counts[np.argsort(counts - shares, kind="stable")[:rest]] += 1
+
+    return counts
+
+
+class PreferenceSpec(ABC):
+    """
+    Compact description of the initial preferences of one node type.
+
+    Specs are built into a uint8 array (NO_PREFERENCE for None) only when a
+    network is set up, with vectorized construction, so configs for millions
+    of nodes stay small.
+    """
+
+    @abstractmethod
+    def build(self, count: int) -> np.ndarray:
+        """
+        Build the preferences of `count` nodes.
+
+        Returns:
+            uint8 array of length `count`
+
+        """
+
+    @staticmethod
+    def from_json(data: Mapping[str, Any]) -> "PreferenceSpec":
+        """
+        Parse a spec written as a single-key JSON object.
+
+        Supported forms are {"proportions": {"0": 0.5, "1": 0.5}},
+        {"random": {"0": 0.5, "1": 0.5}, "seed": 1}, {"runs": [[0, 10],
+        [1, 10]]} and {"file": "prefs.npy"}; "none" stands for no preference.
+        """
+
+        def key(pref: str) -> Preference:
+            return None if pref.lower() in {"none", "null"} else int(pref)
+
+        if "proportions" in data:
+            return Proportions({key(k): v for k, v in data["proportions"].items()})
+        if "random" in data:
+            weights = {key(k): v for k, v in data["random"].items()}
+            return RandomSplit(weights, seed=data.get("seed", 0))
+        if "runs" in data:
+            return RunLength([(pref, length) for pref, length in data["runs"]])
+        if "file" in data:
+            return ArrayFile(data["file"])
+
+        e = f"Invalid preference spec: {dict(data)}"
+        raise ValueError(e)
+
+
+@dataclass(frozen=True)
+class Proportions(PreferenceSpec):
+    """Contiguous blocks of preferences in the given proportions."""
+
+    weights: Mapping[Preference, float]
+
+    @override
+    def build(self, count: int) -> np.ndarray:
+        """Build one block per preference, in insertion order."""
+        codes = np.array([_code(p) for p in self.weights], dtype=np.uint8)
+        return np.repeat(codes, _split_counts(list(self.weights.values()), count))
+
+
+@dataclass(frozen=True)
+class RandomSplit(PreferenceSpec):
+    """Preferences in the given proportions, shuffled with a fixed seed."""
+
+    weights: Mapping[Preference, float]
+    seed: int = 0
+
+    @override
+    def build(self, count: int) -> np.ndarray:
+        """Build exact proportions and permute them."""
+        prefs = Proportions(self.weights).build(count)
+        return np.random.default_rng(self.seed).permutation(prefs)
+
+
+@dataclass(frozen=True)
+class RunLength(PreferenceSpec):
+    """Run-length encoded preferences, as (preference, length) pairs."""
+
+    runs: Sequence[tuple[Preference, int]]
+
+    @override
+    def build(self, count: int) -> np.ndarray:
+        """Expand the runs, which must cover exactly `count` nodes."""
+        codes = np.array([_code(p) for p, _ in self.runs], dtype=np.uint8)
+        lengths = np.array([n for _, n in self.runs], dtype=np.int64)
+        if lengths.sum() != count:
+            e = f"Preference runs cover {lengths.sum()} nodes instead of {count}."
+            raise ValueError(e)
+        return np.repeat(codes, lengths)
+
+
+@dataclass(frozen=True)
+class ArrayFile(PreferenceSpec):
+    """Preferences stored in a `.npy` file, read through a memory map."""
+
+    path: str | Path
+
+    @override
+    def build(self, count: int) -> np.ndarray:
+        """Map the file; callers copy the slices they keep."""
+        prefs = np.load(self.path, mmap_mode="r")
+        if prefs.shape != (count,):
+            e = f"Preference file {self.path} holds {prefs.shape} instead of {count}."
+            raise ValueError(e)
+        if prefs.dtype != np.uint8:
+            e = f"Preference file {self.path} must hold uint8, not {prefs.dtype}."
+            raise ValueError(e)
+        return prefs
+
+
+def preference_array(
+    prefs: "PreferenceSpec | Sequence[Preference] | None", count: int
+) -> np.ndarray:
+    """
+    Build the initial preferences of `count` nodes of one type.
+
+    Args:
+        prefs: a PreferenceSpec, an explicit per-node list, or None for
+            nodes without preference
+        count: number of nodes of the type
+
+    Returns:
+        uint8 array of length `count`, NO_PREFERENCE for missing preferences
+
+    """
+    if prefs is None:
+        return np.full(count, NO_PREFERENCE, dtype=np.uint8)
+    if isinstance(prefs, PreferenceSpec):
+        return prefs.build(count)
+
+    array = np.fromiter((_code(p) for p in prefs), dtype=np.uint8, count=len(prefs))
+    if array.size != count:
+        e = f"Preference list has {array.size} entries instead of {count}."
+        raise ValueError(e)
+    return array
@@ -0,0 +1,15 @@
+from .client import Job, ServiceClient
+from .jobs import FairQueue, Task, TaskResult, split_trials, tasks_of
+from .server import DEFAULT_SOCKET, Service
+
+__all__ = [
+    "DEFAULT_SOCKET",
+    "FairQueue",
+    "Job",
+    "Service",
+    "ServiceClient",
+    "Task",
+    "TaskResult",
+    "split_trials",
+    "tasks_of",
+]
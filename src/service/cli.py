@@ -0,0 +1,63 @@
+import argparse
+import json
+import sys
+from collections.abc import Sequence
+from pathlib import Path
+
+from src.service.client import ServiceClient
+from src.service.server import DEFAULT_SOCKET, Service
+
+
+def _echo(message: str) -> None:
+    sys.stdout.write(f"{message}\n")
+
+
+def _serve(args: argparse.Namespace) -> None:
+    service = Service(args.socket, args.processes, warm_up=not args.no_warm_up)
+    _echo(f"Serving on {args.socket} with {service.processes} workers")
+    service.serve_forever()
+
+
+def _status(args: argparse.Namespace) -> None:
+    with ServiceClient(args.socket) as client:
+        _echo(json.dumps(client.status()))
+
+
+def _stop(args: argparse.Namespace) -> None:
+    ServiceClient(args.socket).shutdown()
+    _echo(f"Stopped the service on {args.socket}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the `python -m src.service` argument parser."""
+    parser = argparse.ArgumentParser(
+        prog="python -m src.service",
+        description="Keep warm simulation workers for notebooks and scripts.",
+    )
+    parser.add_argument(
+        "-s", "--socket", type=Path, default=DEFAULT_SOCKET, help="Unix socket"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve = commands.add_parser("serve", help="run the service in the foreground")
+    serve.add_argument(
+        "-p", "--processes", type=int, default=None, help="workers, all CPUs by default"
+    )
+    serve.add_argument(
+        "--no-warm-up", action="store_true", help="skip the warm-up trial of workers"
+    )
+    serve.set_defaults(func=_serve)
+
+    status = commands.add_parser("status", help="show workers and pending trials")
+    status.set_defaults(func=_status)
+
+    stop = commands.add_parser("stop", help="stop the service")
+    stop.set_defaults(func=_stop)
+
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """Entry point of `python -m src.service`."""
+    args = build_parser().parse_args(sys.argv[1:] if argv is None else argv)
+    args.func(args)
@@ -0,0 +1,162 @@
+from collections import deque
+from collections.abc import Iterable, Iterator
+from itertools import count
+from multiprocessing.connection import Client
+from pathlib import Path
+from typing import Any, Self
+
+from src.config import SimConfig
+from src.service.jobs import TaskResult, tasks_of
+from src.service.server import DEFAULT_SOCKET, key_path
+from src.sweep.spec import SweepSpec, WorkUnit
+
+
+class Job:
+    """
+    A submitted job, iterated as its trial results arrive.
+
+    Results of all trials come in completion order; `results()` waits for
+    all of them and returns them per config, in trial order.
+    """
+
+    def __init__(self, client: "ServiceClient", job: int, size: int) -> None:
+        """Track job `job` of `client`, made of `size` trials."""
+        self.client = client
+        self.job = job
+        self.size = size
+        self.received: list[TaskResult] = []
+
+    def __iter__(self) -> Iterator[TaskResult]:
+        """Yield trial results as they arrive."""
+        while (result := self.client._next(self.job)) is not None:  # noqa: SLF001
+            self.received.append(result)
+            yield result
+
+    def results(self) -> list[list[dict]]:
+        """
+        Wait for every trial and return the results of each config.
+
+        Raises:
+            RuntimeError: with the traceback of the first failed trial
+
+        """
+        for _ in self:
+            pass
+
+        failed = [result for result in self.received if result.error is not None]
+        if failed:
+            e = f"{len(failed)} of {self.size} trials failed:\n{failed[0].error}"
+            raise RuntimeError(e)
+
+        per_config: dict[int, list[TaskResult]] = {}
+        for result in self.received:
+            per_config.setdefault(result.index, []).append(result)
+        return [
+            [result.result for result in sorted(trials, key=lambda r: r.trial)]
+            for _, trials in sorted(per_config.items())
+        ]
+
+    def cancel(self) -> None:
+        """Drop the trials not started yet; results still in flight are ignored."""
+        self.client.cancel(self.job)
+
+
+class ServiceClient:
+    """
+    Connection to a running `Service`.
+
+    .. code-block:: python
+
+        with ServiceClient() as client:
+            for trial in client.submit([sim_config], "snowball_ls", seed=1):
+                print(trial.index, trial.result["rounds_to_full"])
+
+    One client may have several jobs in flight; their results are buffered
+    until the corresponding `Job` is iterated.
+    """
+
+    def __init__(self, path: str | Path = DEFAULT_SOCKET) -> None:
+        """Connect to the service listening on `path`."""
+        self.path = Path(path)
+        self._conn = Client(
+            str(self.path), family="AF_UNIX", authkey=key_path(self.path).read_bytes()
+        )
+        self._job_ids = count()
+        self._buffers: dict[int, deque] = {}
+        self._finished: set[int] = set()
+        self._replies: deque = deque()
+
+    def submit(
+        self,
+        jobs: SweepSpec | Iterable[WorkUnit | SimConfig],
+        engine: str = "snowball_ls",
+        *,
+        finality: str = "full",
+        seed: int = 0,
+    ) -> Job:
+        """
+        Submit configs, work units or a whole sweep spec.
+
+        Args:
+            jobs: SweepSpec, WorkUnits, or SimConfigs
+            engine: engine of the SimConfigs, see `src.sweep.ENGINES`
+            finality: "full" or "partial" finality of the SimConfigs
+            seed: seed of the first SimConfig, the next ones get the next seeds
+
+        Returns:
+            the Job, to iterate over its trial results
+
+        """
+        tasks = tasks_of(jobs, engine, finality=finality, seed=seed)
+        job = next(self._job_ids)
+        self._buffers[job] = deque()
+        self._conn.send(("submit", job, tasks))
+        return Job(self, job, len(tasks))
+
+    def _receive(self) -> None:
+        """Read one message from the service into the buffers."""
+        kind, job, payload = self._conn.recv()
+        if kind == "status":
+            self._replies.append(payload)
+        elif job in self._finished or job not in self._buffers:
+            return
+        elif kind == "result":
+            self._buffers[job].append(payload)
+        elif kind == "done":
+            self._finished.add(job)
+
+    def _next(self, job: int) -> TaskResult | None:
+        """Next result of a job, None once all of them were returned."""
+        buffer = self._buffers[job]
+        while not buffer and job not in self._finished:
+            self._receive()
+        return buffer.popleft() if buffer else None
+
+    def cancel(self, job: int) -> None:
+        """Cancel a job, see `Job.cancel`."""
+        self._conn.send(("cancel", job))
+        self._finished.add(job)
+
+    def status(self) -> dict[str, Any]:
+        """Workers, pending trials and clients of the service."""
+        self._conn.send(("status",))
+        while not self._replies:
+            self._receive()
+        return self._replies.popleft()
+
+    def shutdown(self) -> None:
+        """Stop the service."""
+        self._conn.send(("shutdown",))
+        self.close()
+
+    def close(self) -> None:
+        """Disconnect; pending trials of this client are dropped."""
+        self._conn.close()
+
+    def __enter__(self) -> Self:
+        """Use the client as a context manager."""
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        """Disconnect."""
+        self.close()
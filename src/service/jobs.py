@@ -0,0 +1,170 @@
+from collections import OrderedDict, deque
+from collections.abc import Hashable, Iterable
+from dataclasses import dataclass, field, replace
+from typing import Any
+
+import numpy as np
+
+from src.config import SimConfig
+from src.sweep.spec import ENGINES, SweepSpec, WorkUnit
+
+
+@dataclass(frozen=True)
+class Task:
+    """One trial of a submitted config, the unit of work of the service."""
+
+    engine: str
+    sim_config: SimConfig
+    finality: str
+    seed: int
+    index: int = 0  # position of the config in its job
+    trial: int = 0
+    params: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class TaskResult:
+    """Result of one trial, or the traceback of its failure."""
+
+    job: int
+    index: int
+    trial: int
+    params: dict[str, Any]
+    result: dict | None = None
+    error: str | None = None
+
+
+def split_trials(  # noqa: PLR0913
+    engine: str,
+    sim_config: SimConfig,
+    *,
+    finality: str = "full",
+    seed: int = 0,
+    index: int = 0,
+    params: dict[str, Any] | None = None,
+) -> list[Task]:
+    """
+    Split a config into one single-trial task per iteration.
+
+    Trials get independent seeds spawned from `seed`, so results stream
+    back trial by trial and long configs do not hold a worker for all of
+    their trials.
+    """
+    if engine not in ENGINES:
+        e = f"Unknown engine: {engine}. Supported engines: {ENGINES}"
+        raise ValueError(e)
+
+    trials = sim_config.num_iterations
+    single = replace(sim_config, num_iterations=1)
+    seeds = np.random.SeedSequence(seed).spawn(trials)
+    return [
+        Task(
+            engine=engine,
+            sim_config=single,
+            finality=finality,
+            seed=int(trial_seed.generate_state(1, np.uint64)[0]),
+            index=index,
+            trial=trial,
+            params=params or {},
+        )
+        for trial, trial_seed in enumerate(seeds)
+    ]
+
+
+def tasks_of(
+    jobs: SweepSpec | Iterable[WorkUnit | SimConfig],
+    engine: str = "snowball_ls",
+    *,
+    finality: str = "full",
+    seed: int = 0,
+) -> list[Task]:
+    """
+    Tasks of a sweep spec, of work units or of configs.
+
+    Work units keep their own engine, finality and seed; `engine`,
+    `finality` and `seed` apply to plain configs, which get the
+    `seed + index` of their position.
+    """
+    if isinstance(jobs, SweepSpec):
+        jobs = jobs.expand()
+
+    tasks = []
+    for index, job in enumerate(jobs):
+        if isinstance(job, WorkUnit):
+            tasks += split_trials(
+                job.engine,
+                job.sim_config(),
+                finality=job.finality,
+                seed=job.seed,
+                index=index,
+                params={"unit_id": job.unit_id, **job.params},
+            )
+        else:
+            tasks += split_trials(
+                engine, job, finality=finality, seed=seed + index, index=index
+            )
+
+    return tasks
+
+
+class FairQueue:
+    """
+    Pending tasks of several clients, served round-robin.
+
+    Each client gets the next free worker in turn, whatever the number of
+    tasks it queued, so a short interactive job is not stuck behind a large
+    sweep of another client.
+    """
+
+    def __init__(self) -> None:
+        """Create an empty queue."""
+        self._pending: OrderedDict[Hashable, deque] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Number of pending tasks of all clients."""
+        return sum(len(tasks) for tasks in self._pending.values())
+
+    def add(self, client: Hashable, items: Iterable[Any]) -> None:
+        """Queue items of a client after its earlier ones."""
+        self._pending.setdefault(client, deque()).extend(items)
+
+    def pop(self) -> tuple[Hashable, Any] | None:
+        """
+        Next item of the client whose turn it is.
+
+        Returns:
+            (client, item), or None if nothing is pending
+
+        """
+        while self._pending:
+            client, items = next(iter(self._pending.items()))
+            self._pending.move_to_end(client)
+            if items:
+                return client, items.popleft()
+            del self._pending[client]
+        return None
+
+    def drop(self, client: Hashable, job: int | None = None) -> int:
+        """
+        Remove the pending items of a client, or of one of its jobs.
+
+        Items are (job, task) pairs when `job` is given.
+
+        Returns:
+            number of removed items
+
+        """
+        items = self._pending.get(client)
+        if items is None:
+            return 0
+        if job is None:
+            del self._pending[client]
+            return len(items)
+
+        kept = deque(item for item in items if item[0] != job)
+        self._pending[client] = kept
+        return len(items) - len(kept)
+
+    def counts(self) -> dict[Hashable, int]:
+        """Number of pending items per client."""
+        return {client: len(items) for client, items in self._pending.items()}
@@ -0,0 +1,376 @@
+import contextlib
+import multiprocessing as mp
+import os
+import queue
+import secrets
+import socket
+import threading
+import traceback
+from itertools import count
+from multiprocessing.connection import Client, Connection, Listener
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Self
+
+from src.config import SimConfig, SnowballConfig
+from src.service.jobs import FairQueue, Task, TaskResult
+from src.snow.node import TYPES
+from src.sweep.spec import run_engine
+
+if TYPE_CHECKING:
+    from multiprocessing.queues import Queue
+
+# Socket of the service unless another path is given
+DEFAULT_SOCKET = Path.home() / ".cache" / "snowman" / "service.sock"
+
+# Worker events
+_READY, _DONE, _WAKE, _STOP = "ready", "done", "wake", "stop"
+
+# Seconds between checks that busy workers are still alive
+_POLL = 1.0
+
+
+def key_path(path: str | Path) -> Path:
+    """File holding the authentication key of the service at `path`."""
+    return Path(f"{path}.key")
+
+
+def _warm_up() -> None:
+    """Run one tiny trial, so that the first real one finds everything loaded."""
+    sim_config = SimConfig(
+        num_nodes=20,
+        num_iterations=1,
+        snowball=SnowballConfig(K=5, AlphaPreference=3, AlphaConfidence=4, Beta=2),
+        node_counts={TYPES.honest: 20},
+        initial_preferences={TYPES.honest: [0, 1] * 10},
+    )
+    run_engine("snowball_ls", sim_config, "full", 0)
+
+
+def _work(index: int, tasks: "Queue", events: "Queue", warm_up: bool) -> None:
+    """Run tasks until told to stop, reporting every outcome as an event."""
+    # Progress bars of trials would interleave on the service's terminal
+    with Path(os.devnull).open("w") as devnull, contextlib.redirect_stderr(devnull):
+        if warm_up:
+            _warm_up()
+        events.put((_READY, index, None, None))
+
+        while (task := tasks.get()) is not None:
+            try:
+                (result,) = run_engine(
+                    task.engine, task.sim_config, task.finality, task.seed
+                )
+            except Exception:  # noqa: BLE001
+                events.put((_DONE, index, None, traceback.format_exc()))
+            else:
+                events.put((_DONE, index, result, None))
+
+
+class _Client:
+    """Connection of one client and the number of pending tasks of its jobs."""
+
+    def __init__(self, conn: Connection) -> None:
+        self.conn = conn
+        self.lock = threading.Lock()
+        self.remaining: dict[int, int] = {}
+
+    def send(self, message: tuple) -> None:
+        """Send a message, ignoring clients that went away."""
+        with self.lock, contextlib.suppress(OSError):
+            self.conn.send(message)
+
+
+class Service:
+    """
+    Local simulation service keeping warm worker processes.
+
+    Clients (see `ServiceClient`) connect over a Unix socket and submit
+    jobs, which the service splits into single trials. Pending trials of
+    all clients share one fair queue: each client in turn gets the next
+    free worker. Results are sent back trial by trial as workers finish
+    them.
+
+    Workers are started once, import the engines and run a warm-up trial,
+    so that jobs start as soon as they are submitted. A worker that dies
+    fails its current trial and is replaced.
+    """
+
+    def __init__(
+        self,
+        path: str | Path = DEFAULT_SOCKET,
+        processes: int | None = None,
+        *,
+        warm_up: bool = True,
+    ) -> None:
+        """
+        Configure the service.
+
+        Args:
+            path: Unix socket to listen on; its key is kept next to it
+            processes: number of worker processes, all CPUs by default
+            warm_up: run a warm-up trial in each worker before serving
+
+        """
+        self.path = Path(path)
+        self.processes = processes or os.cpu_count() or 1
+        self.warm_up = warm_up
+
+        # Workers fork from a server process that imported the engines once,
+        # not from this multi-threaded process
+        self._ctx = mp.get_context("forkserver")
+        self._ctx.set_forkserver_preload(["src.sweep.spec"])
+        self._events: Queue = self._ctx.Queue()
+        self._tasks: list[Queue] = []
+        self._workers: list[Any] = []
+        self._idle: list[int] = []
+        self._busy: dict[int, tuple[int, int, Task]] = {}
+
+        self._lock = threading.Lock()
+        self._queue = FairQueue()
+        self._clients: dict[int, _Client] = {}
+        self._client_ids = count()
+        self._threads: list[threading.Thread] = []
+        self._listener: Listener | None = None
+        self._key = b""
+        self._closed = threading.Event()
+        self._stopped = threading.Event()
+
+    def _spawn(self, index: int) -> None:
+        """Start (or restart) worker `index`, with a fresh task queue."""
+        self._tasks[index] = self._ctx.Queue()
+        # Plain processes, not daemons: units may start their own workers
+        process = self._ctx.Process(
+            target=_work,
+            args=(index, self._tasks[index], self._events, self.warm_up),
+            name=f"snowman-worker-{index}",
+        )
+        process.start()
+        self._workers[index] = process
+
+    def _bind(self) -> None:
+        """Listen on the socket, replacing a stale one."""
+        if self.path.exists():
+            probe = socket.socket(socket.AF_UNIX)
+            try:
+                probe.connect(str(self.path))
+            except ConnectionRefusedError:
+                self.path.unlink()
+            else:
+                e = f"A service is already listening on {self.path}"
+                raise RuntimeError(e)
+            finally:
+                probe.close()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._key = secrets.token_bytes(32)
+        key = key_path(self.path)
+        key.touch(mode=0o600)
+        key.chmod(0o600)
+        key.write_bytes(self._key)
+
+        self._listener = Listener(str(self.path), family="AF_UNIX", authkey=self._key)
+        self.path.chmod(0o600)
+
+    def start(self) -> Self:
+        """Start the workers and serve clients from background threads."""
+        self._bind()
+        self._tasks = [None] * self.processes
+        self._workers = [None] * self.processes
+        for index in range(self.processes):
+            self._spawn(index)
+
+        for target in (self._accept, self._schedule):
+            thread = threading.Thread(target=target, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+        return self
+
+    def serve_forever(self) -> None:
+        """Start the service and block until a client shuts it down."""
+        self.start()
+        try:
+            self._closed.wait()
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """Stop serving, stop the workers and remove the socket."""
+        with self._lock:
+            closing = self._listener is not None
+            self._closed.set()
+            listener, self._listener = self._listener, None
+        if not closing:
+            if self._threads:
+                self._stopped.wait()
+            return
+
+        # Wake the accept loop, which does not notice the listener closing
+        with contextlib.suppress(OSError):
+            Client(str(self.path), family="AF_UNIX", authkey=self._key).close()
+        listener.close()
+        self._events.put((_STOP, None, None, None))
+        for thread in self._threads:
+            thread.join()
+
+        for tasks in self._tasks:
+            tasks.put(None)
+        for process in self._workers:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+
+        with self._lock:
+            clients = list(self._clients.values())
+        for client in clients:
+            client.conn.close()
+        self.path.unlink(missing_ok=True)
+        key_path(self.path).unlink(missing_ok=True)
+        self._stopped.set()
+
+    def __enter__(self) -> Self:
+        """Start the service."""
+        return self.start()
+
+    def __exit__(self, *args: object) -> None:
+        """Close the service."""
+        self.close()
+
+    def _accept(self) -> None:
+        """Accept clients, each served by its own thread."""
+        while not self._closed.is_set():
+            try:
+                conn = self._listener.accept()
+            except (OSError, mp.AuthenticationError):
+                continue
+            if self._closed.is_set():
+                conn.close()
+                break
+
+            with self._lock:
+                client_id = next(self._client_ids)
+                self._clients[client_id] = _Client(conn)
+            thread = threading.Thread(
+                target=self._serve_client, args=(client_id,), daemon=True
+            )
+            thread.start()
+
+    def _serve_client(self, client_id: int) -> None:
+        """Handle the requests of one client until it disconnects."""
+        client = self._clients[client_id]
+        while True:
+            try:
+                op, *args = client.conn.recv()
+            except (EOFError, OSError):
+                break
+
+            if op == "submit":
+                self._submit(client_id, *args)
+            elif op == "cancel":
+                self._cancel(client_id, *args)
+            elif op == "status":
+                client.send(("status", None, self.status()))
+            elif op == "shutdown":
+                self._closed.set()
+                threading.Thread(target=self.close, daemon=True).start()
+                break
+
+        with self._lock:
+            self._queue.drop(client_id)
+            self._clients.pop(client_id, None)
+        client.conn.close()
+
+    def _submit(self, client_id: int, job: int, tasks: list[Task]) -> None:
+        """Queue the tasks of a job."""
+        client = self._clients[client_id]
+        if not tasks:
+            client.send(("done", job, None))
+            return
+
+        with self._lock:
+            client.remaining[job] = len(tasks)
+            self._queue.add(client_id, ((job, task) for task in tasks))
+        self._events.put((_WAKE, None, None, None))
+
+    def _cancel(self, client_id: int, job: int) -> None:
+        """Drop the pending tasks of a job; running ones finish unreported."""
+        with self._lock:
+            self._queue.drop(client_id, job)
+            self._clients[client_id].remaining.pop(job, None)
+
+    def status(self) -> dict[str, Any]:
+        """Workers, pending tasks and connected clients."""
+        with self._lock:
+            return {
+                "workers": self.processes,
+                "idle": len(self._idle),
+                "busy": len(self._busy),
+                "pending": len(self._queue),
+                "clients": len(self._clients),
+            }
+
+    def _schedule(self) -> None:
+        """Hand pending tasks to idle workers and route their results."""
+        while True:
+            try:
+                kind, index, result, error = self._events.get(timeout=_POLL)
+            except queue.Empty:
+                self._replace_dead()
+                continue
+
+            if kind == _STOP:
+                break
+            if kind == _READY:
+                with self._lock:
+                    self._idle.append(index)
+            elif kind == _DONE:
+                self._finish(index, result, error)
+            self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Give the next task of the fair queue to every idle worker."""
+        with self._lock:
+            while self._idle and (item := self._queue.pop()) is not None:
+                client_id, (job, task) = item
+                index = self._idle.pop()
+                self._busy[index] = (client_id, job, task)
+                self._tasks[index].put(task)
+
+    def _finish(self, index: int, result: dict | None, error: str | None) -> None:
+        """Send the outcome of worker `index`'s task to its client."""
+        with self._lock:
+            client_id, job, task = self._busy.pop(index)
+            self._idle.append(index)
+            client = self._clients.get(client_id)
+            if client is None or job not in client.remaining:
+                return
+            client.remaining[job] -= 1
+            finished = client.remaining[job] == 0
+            if finished:
+                del client.remaining[job]
+
+        client.send(
+            (
+                "result",
+                job,
+                TaskResult(job, task.index, task.trial, task.params, result, error),
+            )
+        )
+        if finished:
+            client.send(("done", job, None))
+
+    def _replace_dead(self) -> None:
+        """Fail the task of every dead worker and start a new one."""
+        for index, process in enumerate(self._workers):
+            if process.is_alive() or self._closed.is_set():
+                continue
+            error = f"Worker exited with code {process.exitcode}"
+            with self._lock:
+                busy = index in self._busy
+                if index in self._idle:
+                    self._idle.remove(index)
+            if busy:
+                self._finish(index, None, error)
+                with self._lock:
+                    self._idle.remove(index)
+            self._spawn(index)
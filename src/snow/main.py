@@ -1,4 +1,5 @@
 from src.config import SimConfig, SnowballConfig
+from src.preferences import Proportions
 from src.snow.network import LockstepNetwork
 from src.snow.node import TYPES
 from src.snow.sampler import UniformSampler
@@ -20,7 +21,7 @@ def start() -> None:
         num_iterations=10,
         snowball=snowball,
         node_counts={TYPES.honest: 250},
-        initial_preferences={TYPES.honest: [0] * 125 + [1] * 125},  # type: ignore[arg-type]
+        initial_preferences={TYPES.honest: Proportions({0: 0.5, 1: 0.5})},
     )
 
     results = run_simulation(
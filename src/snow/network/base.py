@@ -2,8 +2,9 @@ from abc import ABC, abstractmethod
 
 import numpy as np
 
-from src.config import SnowballConfig
-from src.snow.node import HonestNode, make_node
+from src.config import NO_PREFERENCE, SnowballConfig
+from src.preferences import PreferenceSpec, preference_array
+from src.snow.node import NO_RESPONSE, HonestNode, make_node
 from src.snow.sampler import Sampler
 
 
@@ -13,7 +14,7 @@ class BaseNetwork(ABC):
     def __init__(
         self,
         node_counts: dict[str, int],
-        initial_preferences: dict[str, list[int | None]],
+        initial_preferences: dict[str, list[int | None] | PreferenceSpec],
         snowball_params: SnowballConfig,
         sampler: Sampler,
     ) -> None:
@@ -22,7 +23,8 @@ class BaseNetwork(ABC):
 
         Args:
             node_counts: Dict mapping node type to count.
-            initial_preferences: Dict mapping node type to list of preferences.
+            initial_preferences: Dict mapping node type to list of preferences
+                or PreferenceSpec.
             snowball_params: Snowball protocol parameters.
             sampler: chosen sampler.
 
@@ -35,10 +37,14 @@ class BaseNetwork(ABC):
 
         node_id = 0
         for node_type, count in node_counts.items():
-            prefs = initial_preferences.get(node_type, [None] * count)
-            if len(prefs) != count:
+            try:
+                codes = preference_array(initial_preferences.get(node_type), count)
+            except ValueError as err:
                 msg = f"Preference list for '{node_type}' must match count {count}."
-                raise ValueError(msg)
+                raise ValueError(msg) from err
+
+            prefs = codes.astype(object)
+            prefs[codes == NO_PREFERENCE] = None
 
             for pref in prefs:
                 try:
@@ -54,6 +60,23 @@ class BaseNetwork(ABC):
             [isinstance(n, HonestNode) for n in self.nodes]
         ]
 
+        # Honest preference counts and changes, kept up to date by the rounds
+        self.flips: int = 0
+        self.honest_counts: list[int] = [0, 0]
+        for node in self.honest_nodes:
+            if node.preference is not None:
+                self.honest_counts[node.preference] += 1
+
+    def _record_change(self, old: int | None, new: int | None) -> None:
+        """Count a change of honest preference from `old` to `new`."""
+        if old == new:
+            return
+        self.flips += 1
+        if old is not None:
+            self.honest_counts[old] -= 1
+        if new is not None:
+            self.honest_counts[new] += 1
+
     def _get_distribution(self) -> dict[int, int]:
         """Return the current network preference distribution."""
         preferences = np.array(
@@ -62,11 +85,89 @@ class BaseNetwork(ABC):
         counts = np.bincount(preferences, minlength=2)
         return {0: int(counts[0]), 1: int(counts[1])}
 
+    def _query_peers(self, queriers: np.ndarray, peer_ids: np.ndarray) -> np.ndarray:
+        """
+        Query sampled peers with one batched call per distinct peer.
+
+        Queries reach each peer in row-major order of `peer_ids`, the same
+        order in which per-peer `on_query` calls would be made. Each querier
+        asks with its preference at its turn: rows are answered in chunks,
+        a new chunk starting at every undecided querier that an earlier row
+        of the chunk queried, and may thus have adopted a preference.
+
+        Args:
+            queriers: nodes doing the sampling.
+            peer_ids: (M, K) array of sampled node ids, one row per querier.
+
+        Returns:
+            (M, K) integer array of responses, NO_RESPONSE for no response.
+
+        """
+        responses = np.empty(peer_ids.shape, dtype=np.int64)
+        start = 0
+        while start < len(queriers):
+            querier_prefs = np.array(
+                [
+                    NO_RESPONSE if q.preference is None else q.preference
+                    for q in queriers[start:]
+                ],
+                dtype=np.int64,
+            )
+            stop = start + self._independent_rows(
+                queriers[start:], peer_ids[start:], querier_prefs
+            )
+            responses[start:stop] = self._answer_queries(
+                querier_prefs[: stop - start], peer_ids[start:stop]
+            )
+            start = stop
+
+        return responses
+
+    def _independent_rows(
+        self, queriers: np.ndarray, peer_ids: np.ndarray, querier_prefs: np.ndarray
+    ) -> int:
+        """Number of leading rows whose querier preferences cannot change."""
+        undecided = np.flatnonzero(querier_prefs[1:] == NO_RESPONSE) + 1
+        if undecided.size == 0:
+            return len(queriers)
+
+        # Row of the first query reaching each node
+        first_query = np.full(len(self.nodes), len(queriers))
+        rows = np.repeat(np.arange(len(queriers)), peer_ids.shape[1])
+        np.minimum.at(first_query, peer_ids.ravel(), rows)
+
+        ids = np.array([queriers[row].node_id for row in undecided])
+        queried = undecided[first_query[ids] < undecided]
+        return int(queried[0]) if queried.size else len(queriers)
+
+    def _answer_queries(
+        self, querier_prefs: np.ndarray, peer_ids: np.ndarray
+    ) -> np.ndarray:
+        """Responses of the peers to queries asked with fixed preferences."""
+        flat_ids = peer_ids.ravel()
+        asked = np.repeat(querier_prefs, peer_ids.shape[1])
+
+        # Group queries by peer, keeping query order within each group
+        order = np.argsort(flat_ids, kind="stable")
+        peers, starts = np.unique(flat_ids[order], return_index=True)
+        ends = np.append(starts[1:], flat_ids.size)
+
+        responses = np.empty(flat_ids.size, dtype=np.int64)
+        for peer_id, lo, hi in zip(peers, starts, ends, strict=True):
+            queries = order[lo:hi]
+            peer = self.nodes[peer_id]
+            old = peer.preference
+            responses[queries] = peer.on_query_batch(asked[queries])
+            self._record_change(old, peer.preference)
+
+        return responses.reshape(peer_ids.shape)
+
     def _update_finalization_stats(self) -> None:
-        """Update finalized round records for honest nodes."""
+        """Record the rounds completed when each honest node finalized."""
         for node in self.honest_nodes:
             if node.finalized and node.node_id not in self.finalized_rounds:
-                self.finalized_rounds[node.node_id] = self.round
+                # Called before `round` moves past the current round
+                self.finalized_rounds[node.node_id] = self.round + 1
 
     def check_partial_finalization(self) -> bool:
         """
@@ -1,6 +1,7 @@
 from typing import override
 
 from src.config import SnowballConfig
+from src.preferences import PreferenceSpec
 from src.snow.node import LNode
 from src.snow.sampler import Sampler
 
@@ -13,7 +14,7 @@ class LockstepNetwork(BaseNetwork):
     def __init__(
         self,
         node_counts: dict[str, int],
-        initial_preferences: dict[str, list[int | None]],
+        initial_preferences: dict[str, list[int | None] | PreferenceSpec],
         snowball_params: SnowballConfig,
         sampler: Sampler,
     ) -> None:
@@ -24,18 +25,19 @@ class LockstepNetwork(BaseNetwork):
         """Execute a single round of the protocol."""
         self._update_adversary_distributions()
 
-        sampled_preferences: dict[int, list[int | None]] = {}
-        for node in self.honest_nodes:
-            if node.finalized:
-                continue
-            peers = self.sampler.sample(node, self.nodes, self.snowball_params.K)
-            sampled_preferences[node.node_id] = [
-                peer.on_query(node.preference) for peer in peers
-            ]
-
-        for node in self.honest_nodes:
-            if not node.finalized:
-                node.snowball_round(sampled_preferences[node.node_id])
+        active = self.honest_nodes[[not n.finalized for n in self.honest_nodes]]
+        if active.size > 0:
+            # Query all peers before any node updates its state
+            self.sampler.set_round(self.round)
+            peer_ids = self.sampler.sample_batch(
+                active, self.nodes, self.snowball_params.K
+            )
+            sampled_preferences = self._query_peers(active, peer_ids)
+
+            for node, votes in zip(active, sampled_preferences, strict=True):
+                old = node.preference
+                node.snowball_round(votes)
+                self._record_change(old, node.preference)
 
         self._update_finalization_stats()
         self.round += 1
@@ -3,6 +3,7 @@ from typing import override
 import numpy as np
 
 from src.config import SnowballConfig
+from src.preferences import PreferenceSpec
 from src.snow.node import LNode
 from src.snow.sampler import Sampler
 
@@ -15,7 +16,7 @@ class RandomSamplingNetwork(BaseNetwork):
     def __init__(
         self,
         node_counts: dict[str, int],
-        initial_preferences: dict[str, list[int | None]],
+        initial_preferences: dict[str, list[int | None] | PreferenceSpec],
         snowball_params: SnowballConfig,
         sampler: Sampler,
     ) -> None:
@@ -30,12 +31,17 @@ class RandomSamplingNetwork(BaseNetwork):
         if unfinished.size == 0:
             return
 
-        rng = np.random.default_rng()
-        node = rng.choice(unfinished)
-
-        peers = self.sampler.sample(node, self.nodes, self.snowball_params.K)
-        preferences = np.array([peer.on_query(node.preference) for peer in peers])
-        node.snowball_round(preferences)
+        self.sampler.set_round(self.round)
+        node = self.sampler.choose_node(unfinished)
+
+        queriers = np.array([node], dtype=object)
+        peer_ids = self.sampler.sample_batch(
+            queriers, self.nodes, self.snowball_params.K
+        )
+        votes = self._query_peers(queriers, peer_ids)[0]
+        old = node.preference
+        node.snowball_round(votes)
+        self._record_change(old, node.preference)
 
         self._update_finalization_stats()
         self.round += 1
@@ -1,10 +1,11 @@
 from .adversary import FixedNode, LNode, OfflineNode
-from .base import BaseNode
+from .base import NO_RESPONSE, BaseNode
 from .factory import make_node
 from .node import HonestNode
 from .type import TYPES
 
 __all__ = [
+    "NO_RESPONSE",
     "BaseNode",
     "HonestNode",
     "OfflineNode",
@@ -1,8 +1,10 @@
 from typing import override
 
+import numpy as np
+
 from src.config import SnowballConfig
 
-from .base import BaseNode
+from .base import NO_RESPONSE, BaseNode
 from .type import TYPES
 
 
@@ -22,6 +24,11 @@ class OfflineNode(BaseNode):
         """Always return None."""
         return None
 
+    @override
+    def on_query_batch(self, peer_preferences: np.ndarray) -> np.ndarray:
+        """Never respond."""
+        return np.full(len(peer_preferences), NO_RESPONSE, dtype=np.int64)
+
 
 class FixedNode(BaseNode):
     """Node that always returns a fixed preference."""
@@ -43,6 +50,11 @@ class FixedNode(BaseNode):
         """Always returns the fixed preference."""
         return self.preference
 
+    @override
+    def on_query_batch(self, peer_preferences: np.ndarray) -> np.ndarray:
+        """Always return the fixed preference."""
+        return np.full(len(peer_preferences), self.preference, dtype=np.int64)
+
 
 class LNode(BaseNode):
     """Liveness attack node."""
@@ -72,3 +84,8 @@ class LNode(BaseNode):
         count_1 = self.network_distribution.get(1, 0)
 
         return 0 if count_1 > count_0 else 1
+
+    @override
+    def on_query_batch(self, peer_preferences: np.ndarray) -> np.ndarray:
+        """Respond to every querier with the minority preference."""
+        return np.full(len(peer_preferences), self.on_query(None), dtype=np.int64)
@@ -1,7 +1,12 @@
 from abc import ABC, abstractmethod
 
+import numpy as np
+
 from src.config import SnowballConfig
 
+# Sentinel used in integer vote arrays for a query that got no response
+NO_RESPONSE = -1
+
 
 class BaseNode(ABC):
     """Base class for all node types in the Snowball protocol."""
@@ -31,6 +36,29 @@ class BaseNode(ABC):
     def on_query(self, peer_preference: int | None) -> int | None:
         """Respond to a query from a peer."""
 
+    def on_query_batch(self, peer_preferences: np.ndarray) -> np.ndarray:
+        """
+        Respond to queries from many peers at once.
+
+        Queries are answered in order, so the result matches calling
+        `on_query` once per querier. Subclasses override this with
+        vectorized responses.
+
+        Args:
+            peer_preferences: integer array of querier preferences, with
+                NO_RESPONSE for queriers without a preference.
+
+        Returns:
+            Integer array of responses, with NO_RESPONSE for no response.
+
+        """
+        responses = np.empty(len(peer_preferences), dtype=np.int64)
+        for i, pref in enumerate(peer_preferences):
+            response = self.on_query(None if pref == NO_RESPONSE else int(pref))
+            responses[i] = NO_RESPONSE if response is None else response
+
+        return responses
+
     def update_snow_params(self, snowball_params: SnowballConfig) -> None:
         """Update Snowball parameters."""
         self.snowball_params = snowball_params
@@ -5,7 +5,7 @@ import numpy as np
 
 from src.config import SnowballConfig
 
-from .base import BaseNode
+from .base import NO_RESPONSE, BaseNode
 from .type import TYPES
 
 
@@ -43,6 +43,34 @@ class HonestNode(BaseNode):
 
         return self.preference
 
+    @override
+    def on_query_batch(self, peer_preferences: np.ndarray) -> np.ndarray:
+        """
+        Respond to many queriers with this node's current preference.
+
+        An undecided node adopts the first available querier preference and
+        answers with it from the next query on, as with repeated `on_query`.
+
+        Args:
+            peer_preferences: querier preferences, NO_RESPONSE if undecided.
+
+        Returns:
+            Integer array of responses, NO_RESPONSE for no response.
+
+        """
+        num_queries = len(peer_preferences)
+        if self.preference is not None:
+            return np.full(num_queries, self.preference, dtype=np.int64)
+
+        responses = np.full(num_queries, NO_RESPONSE, dtype=np.int64)
+        decided = np.flatnonzero(peer_preferences != NO_RESPONSE)
+        if decided.size > 0:
+            first = decided[0]
+            self.preference = int(peer_preferences[first])
+            responses[first + 1 :] = self.preference
+
+        return responses
+
     def snowball_round(
         self,
         sampled_preferences: np.ndarray,
@@ -51,7 +79,9 @@ class HonestNode(BaseNode):
         Execute one round of the Snowball protocol.
 
         Args:
-            sampled_preferences: List of preferences sampled.
+            sampled_preferences: Integer array of sampled preferences, with
+                NO_RESPONSE for missing votes. Object arrays holding None
+                are also accepted.
 
         """
         # Check if node is finalized or if no preference
@@ -91,7 +121,12 @@ class HonestNode(BaseNode):
 
     def _count_votes(self, sampled_preferences: np.ndarray) -> tuple[int, int]:
         """Count votes and returns majority and votes for it."""
-        valid = np.array([x for x in sampled_preferences if x is not None])
+        votes = np.asarray(sampled_preferences)
+        if votes.dtype == object:
+            votes = np.array(
+                [NO_RESPONSE if x is None else x for x in votes], dtype=np.int64
+            )
+        valid = votes[votes != NO_RESPONSE]
 
         if valid.size == 0:
             self.confidence = 0
@@ -1,7 +1,9 @@
 from .base import Sampler
+from .graph import GraphSampler
 from .uniform import UniformSampler
 
 __all__ = [
+    "GraphSampler",
     "Sampler",
     "UniformSampler",
 ]
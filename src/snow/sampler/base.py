@@ -3,10 +3,49 @@ from abc import ABC, abstractmethod
 import numpy as np
 
 from src.snow.node import BaseNode
+from src.utils.streams import RandomStreams
 
 
 class Sampler(ABC):
-    """Base sampling class."""
+    """
+    Base sampling class.
+
+    Randomness comes from `rng`, a fresh unseeded generator by default, or,
+    if `streams` is set, from counter-based streams keyed by the current
+    trial, round and querying node, which makes runs reproducible.
+    """
+
+    def __init__(
+        self,
+        rng: np.random.Generator | None = None,
+        streams: RandomStreams | None = None,
+    ) -> None:
+        """
+        Initialize the sources of randomness.
+
+        Args:
+            rng: sequential generator, used if no streams are given.
+            streams: counter-based streams.
+
+        """
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.streams = streams
+        self.trial = 0
+        self.round = 0
+
+    def set_trial(self, trial: int) -> None:
+        """Select the trial used to key the random streams."""
+        self.trial = trial
+
+    def set_round(self, round_: int) -> None:
+        """Select the round used to key the random streams."""
+        self.round = round_
+
+    def choose_node(self, nodes: np.ndarray) -> BaseNode:
+        """Randomly select one of the given nodes."""
+        if self.streams is not None:
+            return nodes[self.streams.choice(self.trial, self.round, len(nodes))]
+        return self.rng.choice(nodes)
 
     @abstractmethod
     def sample(self, node: BaseNode, all_nodes: np.ndarray, k: int) -> np.ndarray:
@@ -22,3 +61,24 @@ class Sampler(ABC):
             A list of sampled nodes.
 
         """
+
+    def sample_batch(
+        self, queriers: np.ndarray, all_nodes: np.ndarray, k: int
+    ) -> np.ndarray:
+        """
+        Method for sampling k peers for each of many querying nodes.
+
+        Args:
+            queriers: nodes doing the sampling.
+            all_nodes: full list of nodes, indexed by node_id.
+            k: sample size.
+
+        Returns:
+            An (M, k) integer array of sampled node ids.
+
+        """
+        peer_ids = np.empty((len(queriers), k), dtype=np.int64)
+        for row, node in enumerate(queriers):
+            peer_ids[row] = [peer.node_id for peer in self.sample(node, all_nodes, k)]
+
+        return peer_ids
@@ -0,0 +1,80 @@
+from typing import override
+
+import numpy as np
+
+from src.snow.node import BaseNode
+from src.utils.streams import RandomStreams
+from src.utils.topology import PeerGraph
+
+from .base import Sampler
+
+
+class GraphSampler(Sampler):
+    """Sampling of distinct neighbors in a peer graph."""
+
+    def __init__(
+        self,
+        graph: PeerGraph,
+        rng: np.random.Generator | None = None,
+        streams: RandomStreams | None = None,
+    ) -> None:
+        """
+        Initialize the peer graph and the sources of randomness.
+
+        Args:
+            graph: peer graph over the node ids.
+            rng: sequential generator, used if no streams are given.
+            streams: counter-based streams.
+
+        """
+        super().__init__(rng=rng, streams=streams)
+        self.graph = graph
+
+    @override
+    def sample(self, node: BaseNode, all_nodes: np.ndarray, k: int) -> np.ndarray:
+        """
+        Method for sampling k neighbors of 'node'.
+
+        Args:
+            node: node doing the sampling.
+            all_nodes: full list of nodes.
+            k: sample size.
+
+        Returns:
+            A list of sampled nodes.
+
+        """
+        all_nodes = np.asarray(all_nodes, dtype=object)
+        return all_nodes[self.sample_batch(np.array([node]), all_nodes, k)[0]]
+
+    @override
+    def sample_batch(
+        self, queriers: np.ndarray, all_nodes: np.ndarray, k: int
+    ) -> np.ndarray:
+        """
+        Method for sampling k neighbors for each of many querying nodes.
+
+        Args:
+            queriers: nodes doing the sampling.
+            all_nodes: full list of nodes, indexed by node_id.
+            k: sample size.
+
+        Returns:
+            An (M, k) integer array of sampled node ids.
+
+        """
+        if self.graph.num_nodes != len(all_nodes):
+            e = (
+                f"Peer graph has {self.graph.num_nodes} nodes, "
+                f"the network {len(all_nodes)}."
+            )
+            raise ValueError(e)
+        self.graph.check_degree(k)
+
+        node_ids = np.array([node.node_id for node in queriers], dtype=np.int64)
+        if self.streams is not None:
+            u = self.streams.uniform(self.trial, self.round, node_ids, k)
+        else:
+            u = self.rng.random((node_ids.size, k))
+
+        return self.graph.sample(node_ids, u)
@@ -25,8 +25,41 @@ class UniformSampler(Sampler):
 
         """
         all_nodes = np.asarray(all_nodes, dtype=object)
+        if self.streams is not None:
+            return all_nodes[self.sample_batch(np.array([node]), all_nodes, k)[0]]
+
         mask = np.array([n.node_id != node.node_id for n in all_nodes])
         candidates = all_nodes[mask]
 
-        rng = np.random.default_rng()
-        return rng.choice(candidates, size=k, replace=False)
+        return self.rng.choice(candidates, size=k, replace=False)
+
+    @override
+    def sample_batch(
+        self, queriers: np.ndarray, all_nodes: np.ndarray, k: int
+    ) -> np.ndarray:
+        """
+        Method for sampling k peers for each of many querying nodes.
+
+        Args:
+            queriers: nodes doing the sampling.
+            all_nodes: full list of nodes, indexed by node_id.
+            k: sample size.
+
+        Returns:
+            An (M, k) integer array of sampled node ids.
+
+        """
+        num_nodes = len(all_nodes)
+        if self.streams is not None:
+            node_ids = np.array([node.node_id for node in queriers], dtype=np.int64)
+            return self.streams.peer_samples(
+                self.trial, self.round, node_ids, num_nodes, k
+            )
+
+        peer_ids = np.empty((len(queriers), k), dtype=np.int64)
+        for row, node in enumerate(queriers):
+            # draw from [0..N-2], then shift ≥node_id up by 1 to skip self
+            u = self.rng.choice(num_nodes - 1, size=k, replace=False)
+            peer_ids[row] = u + (u >= node.node_id)
+
+        return peer_ids
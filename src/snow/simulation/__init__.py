@@ -1,5 +1,6 @@
-from .runner import run_simulation
+from .runner import fork_network, run_simulation
 
 __all__ = [
+    "fork_network",
     "run_simulation",
 ]
@@ -1,32 +1,69 @@
+from copy import deepcopy
+from typing import TYPE_CHECKING
+
 from tqdm import trange
 
 from src.config import SimConfig
 from src.snow.network import BaseNetwork
 from src.snow.sampler import Sampler
+from src.utils.milestones import MilestoneTracker
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from src.utils.milestones import Milestone
+    from src.utils.telemetry import Telemetry
+
 
+def _run_milestones(net: BaseNetwork, tracker: MilestoneTracker) -> dict:
+    """Run a network until its required milestones are reached."""
+    tracker.observe(net)
+    while not net.check_honest_finalization():
+        net.run_round()
+        if tracker.observe(net):
+            break
 
-def run_simulation(
+    stats = net.get_finalization_stats()
+    stats["milestones"] = tracker.results()
+    return stats
+
+
+def run_simulation(  # noqa: PLR0913
     network_class: type[BaseNetwork],
     sampler: Sampler,
     sim_config: SimConfig,
     finality: str = "full",  # or "partial"
+    *,
+    telemetry: "Telemetry | None" = None,
+    milestones: "Iterable[Milestone | str] | None" = None,
 ) -> list[dict]:
     """
     Run multiple network simulations with identical parameters.
 
+    If `telemetry` is given, it follows the network of the current trial.
+    If `milestones` are given, each run records them under "milestones"
+    and stops once all required ones are reached, instead of at `finality`.
+
     Returns:
         List of finalization stats dicts (one per run).
 
     """
     results = []
 
-    for _ in trange(sim_config.num_iterations, desc="Running simulations"):
+    for trial in trange(sim_config.num_iterations, desc="Running simulations"):
+        sampler.set_trial(trial)
         net = network_class(
             node_counts=sim_config.node_counts,
             initial_preferences=sim_config.initial_preferences,
             snowball_params=sim_config.snowball,
             sampler=sampler,
         )
+        if telemetry is not None:
+            telemetry.watch(net)
+
+        if milestones is not None:
+            results.append(_run_milestones(net, MilestoneTracker(milestones)))
+            continue
 
         while True:
             net.run_round()
@@ -38,3 +75,40 @@ def run_simulation(
         results.append(net.get_finalization_stats())
 
     return results
+
+
+def fork_network(
+    network: BaseNetwork,
+    continuations: int,
+    finality: str = "full",  # or "partial"
+) -> list[dict]:
+    """
+    Run many independent continuations of a network from its current round.
+
+    Each continuation runs on a deep copy of the network, so the rounds that
+    led to it are paid for once. Copies draw from generators spawned from
+    the sampler's `rng`; with streams, continuation i uses trial
+    `sampler.trial + 1 + i`.
+
+    Returns:
+        List of finalization stats dicts (one per continuation).
+
+    """
+    sampler = network.sampler
+    results = []
+
+    for i, rng in enumerate(sampler.rng.spawn(continuations)):
+        net = deepcopy(network)
+        net.sampler.rng = rng
+        net.sampler.set_trial(sampler.trial + 1 + i)
+
+        while True:
+            if finality == "partial" and net.check_partial_finalization():
+                break
+            if finality == "full" and net.check_honest_finalization():
+                break
+            net.run_round()
+
+        results.append(net.get_finalization_stats())
+
+    return results
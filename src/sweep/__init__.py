@@ -0,0 +1,11 @@
+from .queue import WorkQueue, work
+from .spec import ENGINES, SweepSpec, WorkUnit, run_engine
+
+__all__ = [
+    "ENGINES",
+    "SweepSpec",
+    "WorkQueue",
+    "WorkUnit",
+    "run_engine",
+    "work",
+]
@@ -0,0 +1,165 @@
+import argparse
+import json
+import multiprocessing as mp
+import sys
+from collections.abc import Sequence
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import pandas as pd
+
+from src.sweep.queue import WorkQueue, work
+from src.sweep.spec import SweepSpec
+
+if TYPE_CHECKING:
+    from multiprocessing.sharedctypes import Synchronized
+
+
+def _echo(message: str) -> None:
+    sys.stdout.write(f"{message}\n")
+
+
+def _init(args: argparse.Namespace) -> None:
+    units = SweepSpec.load(args.spec).expand()
+    added = WorkQueue(args.queue).init(units)
+    _echo(f"Enqueued {added} of {len(units)} units in {args.queue}")
+
+
+def _work_process(
+    queue: Path, options: dict[str, Any], processed: "Synchronized[int]"
+) -> None:
+    count = work(queue, **options)
+    with processed.get_lock():
+        processed.value += count
+
+
+def _work(args: argparse.Namespace) -> None:
+    options = {
+        "worker_id": args.worker_id,
+        "max_units": args.max_units,
+        "telemetry_interval": args.telemetry_interval,
+        "store": args.store,
+    }
+    if args.processes == 1:
+        processed = work(args.queue, **options)
+        _echo(f"Processed {processed} units")
+        return
+
+    # Plain processes, not a Pool: units may start their own workers
+    ctx = mp.get_context()
+    counter = ctx.Value("l", 0)
+    workers = [
+        ctx.Process(
+            target=_work_process,
+            args=(
+                args.queue,
+                options
+                | {
+                    "worker_id": None
+                    if args.worker_id is None
+                    else f"{args.worker_id}/{i}"
+                },
+                counter,
+            ),
+        )
+        for i in range(args.processes)
+    ]
+    for process in workers:
+        process.start()
+    for process in workers:
+        process.join()
+    _echo(f"Processed {counter.value} units")
+
+
+def _status(args: argparse.Namespace) -> None:
+    queue = WorkQueue(args.queue)
+    _echo(json.dumps(queue.status()))
+    progress = queue.progress()
+    if progress["workers"]:
+        _echo(json.dumps({"telemetry": progress}))
+    for unit_id, error in queue.errors().items():
+        last_line = error.strip().splitlines()[-1] if error.strip() else ""
+        _echo(f"{unit_id}: {last_line}")
+
+
+def _requeue(args: argparse.Namespace) -> None:
+    requeued = WorkQueue(args.queue).requeue(
+        failed=args.failed, older_than=args.stale_after
+    )
+    _echo(f"Requeued {requeued} units")
+
+
+def _collect(args: argparse.Namespace) -> None:
+    rows = [
+        {"unit_id": record["unit"]["unit_id"], **record["unit"]["params"], **result}
+        for record in WorkQueue(args.queue).results()
+        for result in record["results"]
+    ]
+    pd.DataFrame(rows).to_csv(args.output, index=False)
+    _echo(f"Wrote {len(rows)} rows to {args.output}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the `python -m src.sweep` argument parser."""
+    parser = argparse.ArgumentParser(
+        prog="python -m src.sweep",
+        description="Run parameter sweeps from a shared work queue directory.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    init = commands.add_parser("init", help="expand a spec file into a queue")
+    init.add_argument("spec", type=Path, help="JSON sweep spec")
+    init.add_argument("queue", type=Path, help="queue directory")
+    init.set_defaults(func=_init)
+
+    worker = commands.add_parser("work", help="run units until the queue is empty")
+    worker.add_argument("queue", type=Path, help="queue directory")
+    worker.add_argument("-p", "--processes", type=int, default=1)
+    worker.add_argument("--worker-id", default=None)
+    worker.add_argument(
+        "--max-units",
+        type=int,
+        default=None,
+        help="stop each worker process after this many units",
+    )
+    worker.add_argument(
+        "--telemetry-interval",
+        type=float,
+        default=None,
+        help="publish progress gauges to <queue>/telemetry every this many seconds",
+    )
+    worker.add_argument(
+        "--store",
+        type=Path,
+        default=None,
+        help="also append results to this ExperimentStore directory",
+    )
+    worker.set_defaults(func=_work)
+
+    status = commands.add_parser("status", help="count units per state")
+    status.add_argument("queue", type=Path, help="queue directory")
+    status.set_defaults(func=_status)
+
+    requeue = commands.add_parser("requeue", help="retry failed or stale units")
+    requeue.add_argument("queue", type=Path, help="queue directory")
+    requeue.add_argument("--failed", action="store_true")
+    requeue.add_argument(
+        "--stale-after",
+        type=float,
+        default=None,
+        help="requeue units claimed more than this many seconds ago",
+    )
+    requeue.set_defaults(func=_requeue)
+
+    collect = commands.add_parser("collect", help="gather results into a CSV")
+    collect.add_argument("queue", type=Path, help="queue directory")
+    collect.add_argument("-o", "--output", type=Path, default=Path("sweep.csv"))
+    collect.set_defaults(func=_collect)
+
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """Entry point of `python -m src.sweep`."""
+    args = build_parser().parse_args(sys.argv[1:] if argv is None else argv)
+    args.func(args)
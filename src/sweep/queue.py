@@ -0,0 +1,319 @@
+import fcntl
+import json
+import math
+import os
+import re
+import socket
+import time
+import traceback
+import uuid
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from src.sweep.spec import WorkUnit
+from src.utils.store import ExperimentStore
+from src.utils.telemetry import Telemetry, aggregate
+
+PENDING, CLAIMED, DONE, FAILED = "pending", "claimed", "done", "failed"
+STATES = (PENDING, CLAIMED, DONE, FAILED)
+
+
+def _to_builtin(value: Any) -> Any:
+    """JSON fallback for numpy scalars and arrays in engine results."""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if hasattr(value, "summary"):
+        return value.summary()
+    e = f"Object of type {type(value).__name__} is not JSON serializable"
+    raise TypeError(e)
+
+
+def default_worker_id() -> str:
+    """Identify a worker by host and process id."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class WorkQueue:
+    """
+    Work queue kept as a directory on a shared filesystem.
+
+    Every unit is a JSON file that moves between the `pending`, `claimed`,
+    `done` and `failed` subdirectories. Moves happen under an exclusive
+    `flock` on `queue.lock`, so any number of workers, on any number of
+    hosts sharing the directory, claim each unit exactly once. Results and
+    failure tracebacks are written next to the unit, in `results/` and
+    `failed/`.
+
+    Each claim carries a random token. A unit requeued as stale while its
+    worker is still running may be claimed again; the slow worker then no
+    longer holds the claim and its outcome is dropped.
+    """
+
+    def __init__(self, root: str | Path) -> None:
+        """Open the queue rooted at `root`."""
+        self.root = Path(root)
+        self._tokens: dict[str, str] = {}
+
+    def _dir(self, state: str) -> Path:
+        return self.root / state
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Hold the queue lock for the duration of the block."""
+        with (self.root / "queue.lock").open("a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def init(self, units: Iterable[WorkUnit]) -> int:
+        """
+        Create the queue directory and enqueue units.
+
+        Units already present in any state are left untouched, so
+        re-initializing with the same spec only adds missing units.
+
+        Returns:
+            number of newly enqueued units
+
+        """
+        for state in (*STATES, "results"):
+            self._dir(state).mkdir(parents=True, exist_ok=True)
+
+        added = 0
+        with self._locked():
+            known = {path.stem for state in STATES for path in self._units(state)}
+            for unit in units:
+                if unit.unit_id in known:
+                    continue
+                path = self._dir(PENDING) / f"{unit.unit_id}.json"
+                tmp = path.with_suffix(".tmp")
+                tmp.write_text(unit.to_json())
+                tmp.rename(path)
+                added += 1
+
+        return added
+
+    def _units(self, state: str) -> list[Path]:
+        return sorted(self._dir(state).glob("*.json"))
+
+    def claim(self, worker_id: str | None = None) -> WorkUnit | None:
+        """
+        Claim the next pending unit.
+
+        Returns:
+            the claimed unit, or None if no unit is pending
+
+        """
+        with self._locked():
+            pending = self._units(PENDING)
+            if not pending:
+                return None
+
+            path = pending[0]
+            claimed = self._dir(CLAIMED) / path.name
+            path.rename(claimed)
+
+            token = uuid.uuid4().hex
+            owner = {
+                "worker": worker_id or default_worker_id(),
+                "time": time.time(),
+                "token": token,
+            }
+            claimed.with_suffix(".owner").write_text(json.dumps(owner))
+            self._tokens[path.stem] = token
+
+        return WorkUnit.from_json(claimed.read_text())
+
+    def _holds(self, unit: WorkUnit) -> bool:
+        """Whether this queue still holds its claim on `unit`; needs the lock."""
+        owner = self._dir(CLAIMED) / f"{unit.unit_id}.owner"
+        try:
+            token = json.loads(owner.read_text())["token"]
+        except FileNotFoundError:
+            return False
+        return token == self._tokens.get(unit.unit_id)
+
+    def complete(self, unit: WorkUnit, results: list[dict]) -> bool:
+        """
+        Store the results of a claimed unit and mark it done.
+
+        Returns:
+            False if the claim was lost and nothing was stored
+
+        """
+        record = {"unit": unit.__dict__, "results": results}
+        path = self._dir("results") / f"{unit.unit_id}.json"
+        text = json.dumps(record, indent=2, default=_to_builtin)
+
+        with self._locked():
+            if not self._holds(unit):
+                return False
+            tmp = path.with_suffix(".tmp")
+            tmp.write_text(text)
+            tmp.rename(path)
+            self._finish(unit, DONE)
+
+        return True
+
+    def fail(self, unit: WorkUnit, error: str) -> bool:
+        """
+        Record the error of a claimed unit and mark it failed.
+
+        Returns:
+            False if the claim was lost and nothing was stored
+
+        """
+        with self._locked():
+            if not self._holds(unit):
+                return False
+            (self._dir(FAILED) / f"{unit.unit_id}.err").write_text(error)
+            self._finish(unit, FAILED)
+
+        return True
+
+    def _finish(self, unit: WorkUnit, state: str) -> None:
+        """Move a held unit out of `claimed`; needs the lock."""
+        claimed = self._dir(CLAIMED) / f"{unit.unit_id}.json"
+        claimed.rename(self._dir(state) / claimed.name)
+        claimed.with_suffix(".owner").unlink(missing_ok=True)
+        self._tokens.pop(unit.unit_id, None)
+
+    def requeue(self, *, failed: bool = False, older_than: float | None = None) -> int:
+        """
+        Move units back to pending.
+
+        Args:
+            failed: requeue failed units
+            older_than: requeue units claimed more than this many seconds
+                ago, e.g. by a worker that was killed, and units whose claim
+                was never recorded
+
+        Returns:
+            number of requeued units
+
+        """
+        requeued = 0
+        now = time.time()
+        with self._locked():
+            if older_than is not None:
+                for path in self._units(CLAIMED):
+                    owner = path.with_suffix(".owner")
+                    try:
+                        claimed_at = json.loads(owner.read_text())["time"]
+                    except (FileNotFoundError, ValueError):
+                        # Killed while claiming: the owner file is not written
+                        claimed_at = -math.inf
+                    if now - claimed_at > older_than:
+                        path.rename(self._dir(PENDING) / path.name)
+                        owner.unlink(missing_ok=True)
+                        requeued += 1
+
+            if failed:
+                for path in self._units(FAILED):
+                    path.rename(self._dir(PENDING) / path.name)
+                    path.with_suffix(".err").unlink(missing_ok=True)
+                    requeued += 1
+
+        return requeued
+
+    def status(self) -> dict[str, int]:
+        """Count units per state."""
+        return {state: len(self._units(state)) for state in STATES}
+
+    def results(self) -> list[dict]:
+        """Load the stored records of all done units."""
+        return [json.loads(path.read_text()) for path in self._units("results")]
+
+    def telemetry(self, worker_id: str, interval: float) -> Telemetry:
+        """Telemetry of one worker, written to `telemetry/<worker>.prom`."""
+        name = re.sub(r"[^\w.-]", "_", worker_id)
+        return Telemetry(
+            interval=interval,
+            textfile=self.root / "telemetry" / f"{name}.prom",
+            labels={"worker": worker_id},
+        )
+
+    def progress(self) -> dict[str, float]:
+        """Combine the telemetry of all workers that published any."""
+        return aggregate(sorted((self.root / "telemetry").glob("*.prom")))
+
+    def errors(self) -> dict[str, str]:
+        """Load the error message of every failed unit."""
+        return {
+            path.stem: path.read_text()
+            for path in sorted(self._dir(FAILED).glob("*.err"))
+        }
+
+
+def work(
+    root: str | Path,
+    *,
+    worker_id: str | None = None,
+    max_units: int | None = None,
+    telemetry_interval: float | None = None,
+    store: str | Path | None = None,
+) -> int:
+    """
+    Claim and run units until the queue is drained.
+
+    Exceptions raised by a unit are recorded as its failure and the worker
+    moves on to the next unit. Outcomes of units whose claim was lost to a
+    stale requeue are dropped.
+
+    Args:
+        root: queue directory
+        worker_id: identifier stored with each claim
+        max_units: stop after processing this many units
+        telemetry_interval: publish progress gauges this often, in seconds
+        store: ExperimentStore directory where results are also appended,
+            indexed by the unit's parameters
+
+    Returns:
+        number of processed units
+
+    """
+    queue = WorkQueue(root)
+    experiments = None if store is None else ExperimentStore(store)
+    processed = 0
+
+    telemetry = None
+    if telemetry_interval is not None:
+        telemetry = queue.telemetry(
+            worker_id or default_worker_id(), telemetry_interval
+        )
+        telemetry.start()
+
+    try:
+        while max_units is None or processed < max_units:
+            unit = queue.claim(worker_id)
+            if unit is None:
+                break
+
+            try:
+                results = unit.run(telemetry)
+            except Exception:  # noqa: BLE001
+                queue.fail(unit, traceback.format_exc())
+            else:
+                if queue.complete(unit, results) and experiments is not None:
+                    experiments.append(
+                        results,
+                        engine=unit.engine,
+                        sim_config=unit.sim_config(),
+                        seed=unit.seed,
+                        params={"unit_id": unit.unit_id, **unit.params},
+                    )
+
+            processed += 1
+    finally:
+        if telemetry is not None:
+            telemetry.stop()
+
+    return processed
@@ -0,0 +1,206 @@
+import json
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from functools import partial
+from itertools import product
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from src.config import SimConfig, SnowballConfig
+from src.frostbyte.sampler import SnowballSampler
+from src.frostbyte.simul import run_snowball
+from src.frostbyte.snowball import (
+    snowball_ls,
+    snowball_ls_parallel,
+    snowball_nary_ls,
+    snowball_nary_rs,
+    snowball_rs,
+)
+from src.preferences import PreferenceSpec
+from src.snow.network import LockstepNetwork, RandomSamplingNetwork
+from src.snow.sampler import UniformSampler
+from src.snow.simulation import run_simulation
+from src.utils.streams import RandomStreams
+from src.utils.telemetry import Telemetry
+
+_FROSTBYTE_ENGINES: dict[str, Callable[..., dict]] = {
+    "snowball_ls": snowball_ls,
+    "snowball_ls_parallel": snowball_ls_parallel,
+    "snowball_rs": snowball_rs,
+    "snowball_nary_ls": snowball_nary_ls,
+    "snowball_nary_rs": snowball_nary_rs,
+    "snowflake_ls": partial(snowball_ls, protocol="snowflake"),
+    "snowflake_rs": partial(snowball_rs, protocol="snowflake"),
+    "slush_ls": partial(snowball_ls, protocol="slush"),
+    "slush_rs": partial(snowball_rs, protocol="slush"),
+}
+
+# The parallel coordinator keeps no SnowballState for telemetry to watch
+_UNOBSERVED = {"snowball_ls_parallel"}
+
+_SNOW_NETWORKS = {
+    "snow_lockstep": LockstepNetwork,
+    "snow_random_sampling": RandomSamplingNetwork,
+}
+
+ENGINES = sorted([*_FROSTBYTE_ENGINES, *_SNOW_NETWORKS])
+
+
+@dataclass(frozen=True)
+class WorkUnit:
+    """One point of a sweep: a full SimConfig plus its engine and seed."""
+
+    unit_id: str
+    engine: str
+    finality: str
+    seed: int
+    params: dict[str, Any]
+    config: dict[str, Any]
+
+    def to_json(self) -> str:
+        """Serialize the unit."""
+        return json.dumps(self.__dict__, indent=2)
+
+    @classmethod
+    def from_json(cls, text: str) -> "WorkUnit":
+        """Deserialize a unit."""
+        return cls(**json.loads(text))
+
+    def sim_config(self) -> SimConfig:
+        """Build the SimConfig of this unit."""
+        config = dict(self.config)
+        config["snowball"] = SnowballConfig(**config["snowball"])
+        config["initial_preferences"] = {
+            node_type: PreferenceSpec.from_json(prefs)
+            if isinstance(prefs, dict)
+            else prefs
+            for node_type, prefs in config["initial_preferences"].items()
+        }
+        return SimConfig(**config)
+
+    def run(self, telemetry: Telemetry | None = None) -> list[dict]:
+        """Run all trials of this unit, optionally followed by `telemetry`."""
+        if telemetry is not None:
+            telemetry.labels["unit"] = self.unit_id
+        return run_engine(
+            self.engine, self.sim_config(), self.finality, self.seed, telemetry
+        )
+
+
+def run_engine(
+    engine: str,
+    sim_config: SimConfig,
+    finality: str,
+    seed: int,
+    telemetry: Telemetry | None = None,
+) -> list[dict]:
+    """Run all trials of a config on a named engine, with streams from `seed`."""
+    rng = np.random.default_rng(seed)
+    streams = RandomStreams(seed)
+
+    if engine in _FROSTBYTE_ENGINES:
+        observed = telemetry is not None and engine not in _UNOBSERVED
+        return run_snowball(
+            sim_config=sim_config,
+            sampler=SnowballSampler(rng=rng, streams=streams),
+            snowball_algo=_FROSTBYTE_ENGINES[engine],
+            finality=finality,
+            **({"telemetry": telemetry} if observed else {}),
+        )
+
+    if engine in _SNOW_NETWORKS:
+        return run_simulation(
+            network_class=_SNOW_NETWORKS[engine],
+            sampler=UniformSampler(rng=rng, streams=streams),
+            sim_config=sim_config,
+            finality=finality,
+            telemetry=telemetry,
+        )
+
+    e = f"Unknown engine: {engine}. Supported engines: {ENGINES}"
+    raise ValueError(e)
+
+
+@dataclass
+class SweepSpec:
+    """
+    Sweep specification, read from a JSON file of the form.
+
+    .. code-block:: json
+
+        {
+          "name": "alpha_confidence",
+          "engine": "snowball_ls",
+          "finality": "full",
+          "seed": 1234,
+          "base": {
+            "num_nodes": 250,
+            "num_iterations": 10,
+            "snowball": {"K": 21, "AlphaPreference": 11,
+                         "AlphaConfidence": 11, "Beta": 30},
+            "node_counts": {"honest": 250},
+            "initial_preferences": {"honest": {"proportions": {"0": 0.5, "1": 0.5}}}
+          },
+          "grid": {"AlphaConfidence": [11, 13, 15], "Beta": [20, 30]}
+        }
+
+    Grid keys are SnowballConfig fields or top-level SimConfig fields; the
+    sweep is the cartesian product of all grid values. Initial preferences
+    are explicit lists or compact specs, see `PreferenceSpec.from_json`.
+    """
+
+    name: str
+    engine: str
+    base: dict[str, Any]
+    grid: dict[str, list[Any]] = field(default_factory=dict)
+    finality: str = "full"
+    seed: int = 0
+
+    @classmethod
+    def load(cls, path: str | Path) -> "SweepSpec":
+        """Read a sweep spec file."""
+        with Path(path).open() as f:
+            return cls(**json.load(f))
+
+    def expand(self) -> list[WorkUnit]:
+        """Expand the grid into work units with independent seeds."""
+        if self.engine not in ENGINES:
+            e = f"Unknown engine: {self.engine}. Supported engines: {ENGINES}"
+            raise ValueError(e)
+
+        keys = sorted(self.grid)
+        points = list(product(*(self.grid[k] for k in keys)))
+        seeds = np.random.SeedSequence(self.seed).spawn(len(points))
+        width = len(str(max(len(points) - 1, 0)))
+
+        units = []
+        for index, (values, seed) in enumerate(zip(points, seeds, strict=True)):
+            params = dict(zip(keys, values, strict=True))
+            units.append(
+                WorkUnit(
+                    unit_id=f"{self.name}-{index:0{width}d}",
+                    engine=self.engine,
+                    finality=self.finality,
+                    seed=int(seed.generate_state(1, np.uint64)[0]),
+                    params=params,
+                    config=self._apply(params),
+                )
+            )
+
+        return units
+
+    def _apply(self, params: dict[str, Any]) -> dict[str, Any]:
+        """Return the base SimConfig fields with grid values applied."""
+        config = json.loads(json.dumps(self.base))  # deep copy
+        for key, value in params.items():
+            if key in SnowballConfig.__dataclass_fields__:
+                config["snowball"][key] = value
+            elif key in SimConfig.__dataclass_fields__:
+                config[key] = value
+            else:
+                e = f"Invalid sweep parameter: {key}"
+                raise ValueError(e)
+
+        return config
@@ -1,5 +1,9 @@
 from .saver import save_json
+from .store import ExperimentStore, Run, config_hash
 
 __all__ = [
+    "ExperimentStore",
+    "Run",
+    "config_hash",
     "save_json",
 ]
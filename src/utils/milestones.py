@@ -0,0 +1,165 @@
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class Progress:
+    """Snapshot of a run taken once per round by `MilestoneTracker`."""
+
+    round: int
+    num_honest: int
+    finalized: int
+    quorum: int
+    count_0: int
+    lnode_pref: int
+    flips: int  # honest preference changes so far, adoptions included
+
+
+def _snapshot(target: Any) -> Progress:
+    """Read a SnowballState or a snow network at its current round."""
+    if hasattr(target, "honest_nodes"):
+        num_honest = len(target.honest_nodes)
+        count_0, count_1 = target.honest_counts
+        return Progress(
+            round=target.round,
+            num_honest=num_honest,
+            finalized=len(target.finalized_rounds),
+            # As `check_partial_finalization`
+            quorum=num_honest // 2,
+            count_0=count_0,
+            lnode_pref=0 if count_0 < count_1 else 1,
+            flips=target.flips,
+        )
+
+    return Progress(
+        round=target.round,
+        num_honest=target.num_honest,
+        finalized=target.finalized_count,
+        # As the partial finality check of the frostbyte engines
+        quorum=target.preferences.size // 2,
+        count_0=target.count_0,
+        lnode_pref=target.lnode_pref,
+        flips=target.flips,
+    )
+
+
+@dataclass(frozen=True)
+class Milestone:
+    """
+    A round of interest in a run.
+
+    By default, the milestone is the first round at which `condition` holds.
+    With `last=True`, it is instead the last round at which `condition`
+    changed value, which is only known once the run stops; such milestones
+    are never required.
+    """
+
+    name: str
+    condition: Callable[[Progress], Any]
+    last: bool = False
+    required: bool = True
+
+    @property
+    def blocking(self) -> bool:
+        """Whether the run must go on until this milestone is reached."""
+        return self.required and not self.last
+
+
+def finalized_fraction(fraction: float, *, required: bool = True) -> Milestone:
+    """First round at which `fraction` of the honest nodes have finalized."""
+    return Milestone(
+        f"finalized_{round(100 * fraction):g}",
+        lambda p: p.finalized >= fraction * p.num_honest,
+        required=required,
+    )
+
+
+FIRST_FINALIZATION = Milestone("first_finalization", lambda p: p.finalized > 0)
+PARTIAL = Milestone("partial", lambda p: p.finalized > p.quorum)
+FULL = Milestone("full", lambda p: p.finalized == p.num_honest)
+LAST_FLIP = Milestone("last_flip", lambda p: p.flips, last=True)
+LAST_LNODE_CHANGE = Milestone("last_lnode_change", lambda p: p.lnode_pref, last=True)
+
+MILESTONES = {
+    milestone.name: milestone
+    for milestone in (
+        FIRST_FINALIZATION,
+        PARTIAL,
+        finalized_fraction(0.9),
+        FULL,
+        LAST_FLIP,
+        LAST_LNODE_CHANGE,
+    )
+}
+
+
+def _same(a: Any, b: Any) -> bool:
+    """Compare two condition values, scalars or arrays."""
+    if isinstance(a, np.ndarray):
+        return np.array_equal(a, b)
+    return a == b
+
+
+class MilestoneTracker:
+    """
+    Records the rounds at which a run reaches a set of milestones.
+
+    Engines call `observe` once per round, at the top of their round loop,
+    with the number of completed rounds in the target's `round`, as for
+    `rounds_to_partial`. `observe` returns True once every required
+    milestone is reached, which ends the run.
+    """
+
+    def __init__(self, milestones: Iterable[Milestone | str]) -> None:
+        """
+        Track the given milestones.
+
+        Args:
+            milestones: Milestone instances, or names of `MILESTONES`
+
+        """
+        self.milestones = [
+            MILESTONES[m] if isinstance(m, str) else m for m in milestones
+        ]
+        self.rounds: dict[str, int | None] = {m.name: None for m in self.milestones}
+        self._values: dict[str, Any] = {}
+
+    @property
+    def done(self) -> bool:
+        """Whether every required milestone has been reached, if there is any."""
+        required = [m.name for m in self.milestones if m.blocking]
+        return bool(required) and all(
+            self.rounds[name] is not None for name in required
+        )
+
+    def observe(self, target: Any) -> bool:
+        """
+        Update the milestones from a SnowballState or snow network.
+
+        Returns:
+            True once every required milestone is reached
+
+        """
+        progress = _snapshot(target)
+        for milestone in self.milestones:
+            name = milestone.name
+            if not milestone.last:
+                if self.rounds[name] is None and milestone.condition(progress):
+                    self.rounds[name] = progress.round
+                continue
+
+            value = milestone.condition(progress)
+            if name in self._values and not _same(value, self._values[name]):
+                self.rounds[name] = progress.round
+            self._values[name] = (
+                value.copy() if isinstance(value, np.ndarray) else value
+            )
+
+        return self.done
+
+    def results(self) -> dict[str, int | None]:
+        """Round of every milestone, None if not reached."""
+        return dict(self.rounds)
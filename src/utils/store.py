@@ -0,0 +1,461 @@
+import contextlib
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import uuid
+from collections.abc import Iterable, Iterator, Mapping
+from dataclasses import asdict, dataclass, field, fields, is_dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+import pandas as pd
+
+if TYPE_CHECKING:
+    from src.config import SimConfig
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS configs (
+    hash TEXT PRIMARY KEY,
+    config TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS runs (
+    id TEXT PRIMARY KEY,
+    config_hash TEXT REFERENCES configs(hash),
+    engine TEXT NOT NULL,
+    seed TEXT,
+    trial INTEGER NOT NULL,
+    created REAL NOT NULL,
+    results TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_config_hash ON runs(config_hash);
+CREATE INDEX IF NOT EXISTS runs_engine ON runs(engine);
+CREATE INDEX IF NOT EXISTS runs_seed ON runs(seed);
+CREATE INDEX IF NOT EXISTS runs_created ON runs(created);
+CREATE TABLE IF NOT EXISTS params (
+    run_id TEXT NOT NULL REFERENCES runs(id),
+    name TEXT NOT NULL,
+    value,
+    PRIMARY KEY (run_id, name)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS params_name_value ON params(name, value);
+CREATE TABLE IF NOT EXISTS arrays (
+    run_id TEXT NOT NULL REFERENCES runs(id),
+    name TEXT NOT NULL,
+    file TEXT NOT NULL,
+    PRIMARY KEY (run_id, name)
+) WITHOUT ROWID;
+"""
+
+# Seconds a writer waits for another one to commit
+BUSY_TIMEOUT = 60.0
+
+
+def _canonical(value: Any) -> Any:
+    """JSON-ready form of configs and results, with string keys."""
+    if is_dataclass(value) and not isinstance(value, type):
+        return {
+            "type": type(value).__name__,
+            **{f.name: _canonical(getattr(value, f.name)) for f in fields(value)},
+        }
+    if isinstance(value, Mapping):
+        return {str(key): _canonical(item) for key, item in value.items()}
+    if isinstance(value, list | tuple):
+        return [_canonical(item) for item in value]
+    if isinstance(value, np.ndarray | np.generic):
+        return value.tolist()
+    if isinstance(value, Path):
+        return str(value)
+    return value
+
+
+def config_hash(sim_config: "SimConfig") -> str:
+    """Stable hash of a SimConfig, equal for equal configs."""
+    text = json.dumps(_canonical(sim_config), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(text.encode()).hexdigest()[:16]
+
+
+def _indexable(value: Any) -> Any:
+    """SQLite value of a parameter: scalars as is, anything else as JSON."""
+    value = _canonical(value)
+    if value is None or isinstance(value, int | float | str):
+        return value
+    return json.dumps(value, sort_keys=True)
+
+
+def config_params(sim_config: "SimConfig") -> dict[str, Any]:
+    """Indexed parameters of a SimConfig: SnowballConfig fields and node counts."""
+    params = {
+        key: value
+        for key, value in asdict(sim_config.snowball).items()
+        if value is not None
+    }
+    params["num_nodes"] = sim_config.num_nodes
+    for node_type, count in sim_config.node_counts.items():
+        params[f"count_{node_type}"] = count
+    return params
+
+
+@dataclass(frozen=True)
+class Run:
+    """
+    One stored run: its index entries, scalar results and array side-cars.
+
+    Arrays are only read when asked for, memory-mapped from their `.npy`
+    files.
+    """
+
+    run_id: str
+    engine: str
+    seed: int | None
+    trial: int
+    created: float
+    config_hash: str | None
+    params: dict[str, Any] = field(default_factory=dict)
+    results: dict[str, Any] = field(default_factory=dict)
+    array_files: dict[str, Path] = field(default_factory=dict)
+
+    def array(self, name: str) -> np.ndarray:
+        """Read one per-node array of the run."""
+        return np.load(self.array_files[name], mmap_mode="r")
+
+    def result(self) -> dict[str, Any]:
+        """Scalar results and all arrays, as the engine returned them."""
+        return {
+            **self.results,
+            **{name: self.array(name) for name in self.array_files},
+        }
+
+
+class ExperimentStore:
+    """
+    Local store of simulation runs, indexed for queries.
+
+    Runs are rows of a SQLite database in WAL mode (`store.db`), indexed by
+    config hash, engine, seed, creation time and parameters; parameters
+    live in a (run, name, value) table so that any of them can be filtered
+    on. Scalar results are kept as JSON; numpy arrays (per-node
+    finalization rounds or values) are written to `.npy` side-cars under
+    `arrays/` and only loaded when accessed.
+
+    Any number of processes can append concurrently: each append is one
+    transaction, and writers wait up to `BUSY_TIMEOUT` seconds for each
+    other. A store can be passed to pool workers, which open their own
+    connection.
+    """
+
+    def __init__(self, root: str | Path = Path("outputs") / "experiments") -> None:
+        """Open (or create) the store in directory `root`."""
+        self.root = Path(root)
+        self._conn: sqlite3.Connection | None = None
+        self._pid: int | None = None
+
+    def __getstate__(self) -> dict[str, Any]:
+        """Pickle only the location, connections are per process."""
+        return {"root": self.root}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        """Reopen lazily in the unpickling process."""
+        self.__init__(state["root"])
+
+    def _connection(self) -> sqlite3.Connection:
+        """Connection of the current process, creating the schema once."""
+        if self._conn is not None and self._pid == os.getpid():
+            return self._conn
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(
+            self.root / "store.db", timeout=BUSY_TIMEOUT, isolation_level=None
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(f"BEGIN IMMEDIATE;{_SCHEMA}COMMIT;")
+        self._conn, self._pid = conn, os.getpid()
+        return conn
+
+    def close(self) -> None:
+        """Close this process's connection."""
+        if self._conn is not None and self._pid == os.getpid():
+            self._conn.close()
+        self._conn = None
+
+    def _write_array(self, run_id: str, name: str, array: np.ndarray) -> str:
+        """Write an array side-car, returning its path relative to the root."""
+        relative = Path("arrays") / run_id[:2] / run_id / f"{name}.npy"
+        path = self.root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        with tmp.open("wb") as f:
+            np.save(f, array, allow_pickle=False)
+        tmp.rename(path)
+        return str(relative)
+
+    def _remove_arrays(self, relatives: list[str]) -> None:
+        """Delete array side-cars and the run directories they leave empty."""
+        for relative in relatives:
+            path = self.root / relative
+            path.unlink(missing_ok=True)
+            with contextlib.suppress(OSError):
+                path.parent.rmdir()
+
+    def _insert(
+        self,
+        digest: str | None,
+        config_text: str | None,
+        rows: list[tuple],
+        param_rows: list[tuple],
+        array_rows: list[tuple],
+    ) -> None:
+        """Insert the rows of one `append` in a single transaction."""
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if digest is not None:
+                conn.execute(
+                    "INSERT OR IGNORE INTO configs VALUES (?, ?)", (digest, config_text)
+                )
+            conn.executemany("INSERT INTO runs VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            conn.executemany("INSERT INTO params VALUES (?, ?, ?)", param_rows)
+            conn.executemany("INSERT INTO arrays VALUES (?, ?, ?)", array_rows)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def append(  # noqa: PLR0913
+        self,
+        results: Iterable[dict],
+        *,
+        engine: str,
+        sim_config: "SimConfig | None" = None,
+        seed: int | None = None,
+        params: Mapping[str, Any] | None = None,
+        first_trial: int = 0,
+    ) -> list[str]:
+        """
+        Store the runs of one simulation, such as the output of `run_snowball`.
+
+        Args:
+            results: result dict of every run, in trial order
+            engine: name of the engine that produced them
+            sim_config: configuration of the runs, hashed and indexed by
+                its SnowballConfig fields and node counts
+            seed: seed of the runs
+            params: further parameters to index, such as sweep values;
+                they override those of `sim_config`
+            first_trial: trial number of the first run
+
+        Returns:
+            ids of the stored runs
+
+        """
+        indexed = {} if sim_config is None else config_params(sim_config)
+        indexed.update(params or {})
+        digest, config_text = None, None
+        if sim_config is not None:
+            digest = config_hash(sim_config)
+            config_text = json.dumps(_canonical(sim_config), sort_keys=True)
+
+        rows, param_rows, array_rows = [], [], []
+        created = time.time()
+        try:
+            for trial, result in enumerate(results, start=first_trial):
+                run_id = uuid.uuid4().hex
+                scalars = {}
+                for name, value in result.items():
+                    if isinstance(value, np.ndarray):
+                        array_rows.append(
+                            (run_id, name, self._write_array(run_id, name, value))
+                        )
+                    elif hasattr(value, "summary"):
+                        # Such as a FinalizationHistogram, as in sweep results
+                        scalars[name] = _canonical(value.summary())
+                    else:
+                        scalars[name] = _canonical(value)
+                rows.append(
+                    (
+                        run_id,
+                        digest,
+                        engine,
+                        None if seed is None else str(seed),
+                        trial,
+                        created,
+                        json.dumps(scalars),
+                    )
+                )
+                param_rows += [
+                    (run_id, name, _indexable(value)) for name, value in indexed.items()
+                ]
+            self._insert(digest, config_text, rows, param_rows, array_rows)
+        except BaseException:
+            # No row refers to the side-cars written so far
+            self._remove_arrays([path for _, _, path in array_rows])
+            raise
+
+        return [row[0] for row in rows]
+
+    @staticmethod
+    def _where(
+        *,
+        engine: str | None = None,
+        seed: int | None = None,
+        config_hash: str | None = None,
+        since: float | None = None,
+        until: float | None = None,
+        **params: Any,
+    ) -> tuple[str, list[Any]]:
+        """SQL condition on `runs` for the filters of `runs`, with its arguments."""
+        clauses, args = ["1"], []
+        for column, value in (
+            ("engine", engine),
+            ("seed", None if seed is None else str(seed)),
+            ("config_hash", config_hash),
+        ):
+            if value is not None:
+                clauses.append(f"runs.{column} = ?")
+                args.append(value)
+        if since is not None:
+            clauses.append("runs.created >= ?")
+            args.append(since)
+        if until is not None:
+            clauses.append("runs.created < ?")
+            args.append(until)
+
+        for name, value in params.items():
+            args.append(name)
+            if isinstance(value, slice):
+                bounds = ["value IS NOT NULL"]
+                for op, bound in ((">=", value.start), ("<=", value.stop)):
+                    if bound is not None:
+                        bounds.append(f"value {op} ?")
+                        args.append(bound)
+                condition = " AND ".join(bounds)
+            elif isinstance(value, list | tuple | set | frozenset):
+                condition = f"value IN ({', '.join('?' * len(value))})"
+                args += list(value)
+            else:
+                condition = "value = ?"
+                args.append(value)
+            # Only placeholders are formatted in, values are bound
+            clauses.append(
+                f"runs.id IN (SELECT run_id FROM params WHERE name = ? AND {condition})"  # noqa: S608
+            )
+
+        return " AND ".join(clauses), args
+
+    def runs(
+        self,
+        *,
+        engine: str | None = None,
+        seed: int | None = None,
+        config_hash: str | None = None,
+        since: float | None = None,
+        until: float | None = None,
+        **params: Any,
+    ) -> Iterator[Run]:
+        """
+        Iterate over the stored runs matching all filters, oldest first.
+
+        Parameters filter by equality; a list (or tuple, set) matches any
+        of its values and a `slice(low, high)` matches the inclusive range,
+        either bound being optional. For example,
+        `store.runs(engine="snowball_ls", Beta=slice(10, 20), K=[10, 15])`.
+
+        Args:
+            engine: engine name
+            seed: seed of the runs
+            config_hash: hash of the SimConfig, see `config_hash`
+            since: runs stored at or after this Unix time
+            until: runs stored before this Unix time
+            params: filters on indexed parameters
+
+        Yields:
+            Run of every match; arrays are read only when accessed
+
+        """
+        where, args = self._where(
+            engine=engine,
+            seed=seed,
+            config_hash=config_hash,
+            since=since,
+            until=until,
+            **params,
+        )
+        conn = self._connection()
+
+        # Parameters and array files of all matches, in one query each
+        matched: dict[str, dict[str, dict]] = {"params": {}, "arrays": {}}
+        for table, column in (("params", "value"), ("arrays", "file")):
+            rows = conn.execute(
+                f"SELECT t.run_id, t.name, t.{column} FROM {table} t "  # noqa: S608
+                f"JOIN runs ON runs.id = t.run_id WHERE {where}",
+                args,
+            )
+            for run_id, key, value in rows:
+                matched[table].setdefault(run_id, {})[key] = (
+                    value if table == "params" else self.root / value
+                )
+
+        rows = conn.execute(
+            "SELECT id, engine, seed, trial, created, config_hash, results "  # noqa: S608
+            f"FROM runs WHERE {where} ORDER BY created, trial",
+            args,
+        )
+        for run_id, run_engine, run_seed, trial, created, digest, results in rows:
+            yield Run(
+                run_id=run_id,
+                engine=run_engine,
+                seed=None if run_seed is None else int(run_seed),
+                trial=trial,
+                created=created,
+                config_hash=digest,
+                params=matched["params"].get(run_id, {}),
+                results=json.loads(results),
+                array_files=matched["arrays"].get(run_id, {}),
+            )
+
+    def frame(self, **filters: Any) -> pd.DataFrame:
+        """
+        Table of the matching runs: index entries, parameters and scalar results.
+
+        Takes the filters of `runs`; arrays are not loaded.
+        """
+        return pd.DataFrame(
+            [
+                {
+                    "run_id": run.run_id,
+                    "engine": run.engine,
+                    "seed": run.seed,
+                    "trial": run.trial,
+                    "created": run.created,
+                    "config_hash": run.config_hash,
+                    **run.params,
+                    **run.results,
+                }
+                for run in self.runs(**filters)
+            ]
+        )
+
+    def count(self, **filters: Any) -> int:
+        """Number of runs matching the filters of `runs`."""
+        where, args = self._where(**filters)
+        conn = self._connection()
+        (total,) = conn.execute(
+            f"SELECT COUNT(*) FROM runs WHERE {where}",  # noqa: S608
+            args,
+        ).fetchone()
+        return total
+
+    def config(self, digest: str) -> dict[str, Any]:
+        """Stored SimConfig of a config hash, as JSON data."""
+        row = (
+            self._connection()
+            .execute("SELECT config FROM configs WHERE hash = ?", (digest,))
+            .fetchone()
+        )
+        if row is None:
+            e = f"Unknown config hash: {digest}"
+            raise KeyError(e)
+        return json.loads(row[0])
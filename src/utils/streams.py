@@ -0,0 +1,314 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+# Philox4x32-10 multipliers and Weyl key increments (Salmon et al., 2011)
+_M0, _M1 = np.uint64(0xD2511F53), np.uint64(0xCD9E8D57)
+_W0, _W1 = np.uint64(0x9E3779B9), np.uint64(0xBB67AE85)
+_MASK32 = np.uint64(0xFFFFFFFF)
+_SHIFT32 = np.uint64(32)
+_ROUNDS = 10
+
+# Purposes share the last counter word with the block index
+PEERS, CHOICE = 0, 1
+_PURPOSE_SHIFT = 24
+
+# Nodes per chunk of peer draws, keeping the work arrays in cache
+CHUNK_ROWS = 4096
+
+
+def _philox_rounds(
+    c: list[np.ndarray],
+    key: tuple[int, int],
+    spare: np.ndarray,
+    products: np.ndarray,
+) -> list[np.ndarray]:
+    """
+    Apply the Philox4x32-10 rounds in place to four counter word columns.
+
+    Args:
+        c: four uint64 arrays of 32-bit counter words, overwritten
+        key: two 32-bit key words
+        spare: uint64 array shaped like a column, overwritten
+        products: (2, ...) uint64 array for the round products
+
+    Returns:
+        the four columns of random words, reusing `c` and `spare`
+
+    """
+    c0, c1, c2, c3 = c
+    p0, p1 = products
+    k0, k1 = np.uint64(key[0]), np.uint64(key[1])
+
+    for r in range(_ROUNDS):
+        if r > 0:
+            k0, k1 = (k0 + _W0) & _MASK32, (k1 + _W1) & _MASK32
+        np.multiply(c0, _M0, out=p0)
+        np.multiply(c2, _M1, out=p1)
+
+        # New c0 goes to the spare column, the others overwrite their own
+        np.right_shift(p1, _SHIFT32, out=spare)
+        spare ^= c1
+        spare ^= k0
+        np.bitwise_and(p1, _MASK32, out=c1)
+        np.right_shift(p0, _SHIFT32, out=c2)
+        c2 ^= c3
+        c2 ^= k1
+        np.bitwise_and(p0, _MASK32, out=c3)
+        c0, spare = spare, c0
+
+    return [c0, c1, c2, c3]
+
+
+def philox4x32(counters: np.ndarray, key: tuple[int, int]) -> np.ndarray:
+    """
+    Apply the Philox4x32-10 bijection to a batch of counters.
+
+    Args:
+        counters: (..., 4) array of 32-bit counter words
+        key: two 32-bit key words
+
+    Returns:
+        (..., 4) uint32 array of random words
+
+    """
+    c = np.asarray(counters, dtype=np.uint64)
+    columns = [c[..., i].flatten() for i in range(4)]
+    spare = np.empty_like(columns[0])
+    products = np.empty((2, spare.size), dtype=np.uint64)
+
+    words = _philox_rounds(columns, key, spare, products)
+    return np.stack(words, axis=-1).reshape(c.shape).astype(np.uint32)
+
+
+def floyd_sample(
+    u: np.ndarray,
+    population: "int | np.ndarray",
+    out: np.ndarray | None = None,
+    buffers: "StreamBuffers | None" = None,
+) -> np.ndarray:
+    """
+    Turn uniforms into k distinct positions per row with Floyd's algorithm.
+
+    Vectorized across rows: the j-th draw is uniform in [0, P-k+j], replaced
+    by P-k+j if already taken, where P is the row's population.
+
+    Args:
+        u: (M, k) array of uniforms in [0, 1)
+        population: population size, shared or one per row (at least k)
+        out: optional (M, k) integer array to write the positions to
+        buffers: StreamBuffers of at least M rows, to reuse for the draws
+
+    Returns:
+        (M, k) integer array of positions in [0, P), `out` if given
+
+    """
+    m, k = u.shape
+    positions = np.empty((m, k), dtype=np.int64) if out is None else out
+    if buffers is None:
+        buffers = StreamBuffers(m, k, words=False)
+    scaled, draw = buffers.scaled[:m], buffers.draw[:m]
+    equal, taken = buffers.equal[:m], buffers.taken[:m]
+
+    for j in range(k):
+        top = np.asarray(population) - k + j
+        np.multiply(u[:, j], top + 1, out=scaled)
+        np.copyto(draw, scaled, casting="unsafe")
+        np.equal(positions[:, :j], draw[:, None], out=equal[:, :j])
+        np.any(equal[:, :j], axis=1, out=taken)
+        np.copyto(draw, top, where=taken)
+        positions[:, j] = draw
+
+    return positions
+
+
+class StreamBuffers:
+    """
+    Reusable work arrays of `RandomStreams.peer_samples`.
+
+    Peers of large node sets are drawn in chunks of `rows` nodes through
+    these arrays: Philox rounds, uniforms and Floyd's draws write through
+    `out=` targets, and the chunks stay small enough for the CPU caches.
+    Engines running many rounds keep one instance instead of allocating
+    the arrays in every round.
+    """
+
+    def __init__(self, rows: int, k: int, *, words: bool = True) -> None:
+        """
+        Allocate the arrays of chunks of `rows` nodes drawing `k` peers.
+
+        Args:
+            rows: nodes per chunk
+            k: peers per node
+            words: also allocate the Philox arrays, not needed by
+                `floyd_sample` alone
+
+        """
+        self.rows, self.k = rows, k
+
+        # Floyd's algorithm
+        self.uniforms = np.empty((rows, k), dtype=np.float64)
+        self.scaled = np.empty(rows, dtype=np.float64)
+        self.draw = np.empty(rows, dtype=np.int64)
+        self.equal = np.empty((rows, k), dtype=bool)
+        self.taken = np.empty(rows, dtype=bool)
+        if not words:
+            return
+
+        # Two uniforms per block of four words, one row of blocks per node
+        self.blocks = -(-2 * k // 4)
+        size = rows * self.blocks
+        self.columns = np.empty((5, size), dtype=np.uint64)
+        self.products = np.empty((2, size), dtype=np.uint64)
+        self.high = np.empty(size, dtype=np.float64)
+        self.low = np.empty(size, dtype=np.float64)
+
+
+@dataclass(frozen=True)
+class RandomStreams:
+    """
+    Counter-based random streams keyed by (seed, trial, round, node).
+
+    Every draw is a pure function of its key, so a node's peers in a given
+    round do not depend on which other nodes are sampled in the same call,
+    in which order, or in which process. Serial, vectorized and sharded
+    engines therefore follow identical trajectories.
+    """
+
+    seed: int
+
+    @property
+    def key(self) -> tuple[int, int]:
+        """Philox key words derived from the 64-bit seed."""
+        seed = self.seed & 0xFFFFFFFFFFFFFFFF
+        return seed & 0xFFFFFFFF, seed >> 32
+
+    def words(
+        self,
+        trial: int,
+        round_: int,
+        nodes: np.ndarray,
+        num_words: int,
+        purpose: int = PEERS,
+    ) -> np.ndarray:
+        """
+        Draw `num_words` random 32-bit words for each node.
+
+        Returns:
+            (M, num_words) uint32 array
+
+        """
+        nodes = np.asarray(nodes, dtype=np.uint64).reshape(-1)
+        num_blocks = -(-num_words // 4)
+
+        counters = np.empty((nodes.size, num_blocks, 4), dtype=np.uint64)
+        counters[..., 0] = trial
+        counters[..., 1] = round_
+        counters[..., 2] = nodes[:, None]
+        counters[..., 3] = (purpose << _PURPOSE_SHIFT) + np.arange(num_blocks)
+
+        words = philox4x32(counters, self.key)
+        return words.reshape(nodes.size, 4 * num_blocks)[:, :num_words]
+
+    def uniform(
+        self,
+        trial: int,
+        round_: int,
+        nodes: np.ndarray,
+        size: int,
+        purpose: int = PEERS,
+    ) -> np.ndarray:
+        """Draw `size` doubles in [0, 1) with 53 random bits for each node."""
+        words = self.words(trial, round_, nodes, 2 * size, purpose)
+        a = (words[:, 0::2] >> 5).astype(np.float64)
+        b = (words[:, 1::2] >> 6).astype(np.float64)
+        return (a * 67108864.0 + b) / 9007199254740992.0
+
+    def _uniform_chunk(
+        self,
+        trial: int,
+        round_: int,
+        nodes: np.ndarray,
+        buffers: StreamBuffers,
+    ) -> np.ndarray:
+        """`uniform(trial, round_, nodes, buffers.k)`, written to `buffers`."""
+        m, blocks = nodes.size, buffers.blocks
+        size = m * blocks
+        c0, c1, c2, c3, spare = (column[:size] for column in buffers.columns)
+
+        c0[:] = trial
+        c1[:] = round_
+        c2.reshape(m, blocks)[:] = nodes[:, None]
+        c3.reshape(m, blocks)[:] = (PEERS << _PURPOSE_SHIFT) + np.arange(blocks)
+
+        words = _philox_rounds(
+            [c0, c1, c2, c3], self.key, spare, buffers.products[:, :size]
+        )
+
+        # Uniform 2b uses words 0-1 of block b, uniform 2b+1 words 2-3
+        u = buffers.uniforms[:m]
+        high, low = buffers.high[:size], buffers.low[:size]
+        for first, targets in ((0, u[:, 0::2]), (2, u[:, 1::2])):
+            np.right_shift(words[first], 5, out=spare)
+            np.copyto(high, spare, casting="unsafe")
+            np.right_shift(words[first + 1], 6, out=spare)
+            np.copyto(low, spare, casting="unsafe")
+            high *= 67108864.0
+            high += low
+            high /= 9007199254740992.0
+            targets[:] = high.reshape(m, blocks)[:, : targets.shape[1]]
+
+        return u
+
+    def peer_samples(  # noqa: PLR0913, PLR0917
+        self,
+        trial: int,
+        round_: int,
+        nodes: np.ndarray,
+        num_nodes: int,
+        k: int,
+        out: np.ndarray | None = None,
+        buffers: StreamBuffers | None = None,
+    ) -> np.ndarray:
+        """
+        Draw k distinct peers out of `num_nodes` for each node, excluding itself.
+
+        Uses `floyd_sample` over the N-1 other nodes, in chunks of nodes
+        drawn through `buffers`; these are allocated for the call if not
+        given.
+
+        Returns:
+            (M, k) integer array of peer indices, `out` if given
+
+        """
+        nodes = np.asarray(nodes, dtype=np.int64).reshape(-1)
+        population = num_nodes - 1
+        if k > population:
+            e = "Cannot take a larger sample than population when replace is False"
+            raise ValueError(e)
+
+        peers = np.empty((nodes.size, k), dtype=np.int64) if out is None else out
+        if buffers is None:
+            buffers = StreamBuffers(max(min(nodes.size, CHUNK_ROWS), 1), k)
+        elif buffers.k != k:
+            e = f"StreamBuffers drawing {buffers.k} peers cannot draw {k}."
+            raise ValueError(e)
+
+        for start in range(0, nodes.size, buffers.rows):
+            chunk = nodes[start : start + buffers.rows]
+            chunk_peers = peers[start : start + buffers.rows]
+            u = self._uniform_chunk(trial, round_, chunk, buffers)
+            floyd_sample(u, population, out=chunk_peers, buffers=buffers)
+
+            # shift those ≥ node_id up by 1 to skip self
+            skip = np.greater_equal(
+                chunk_peers, chunk[:, None], out=buffers.equal[: chunk.size]
+            )
+            np.add(chunk_peers, skip, out=chunk_peers)
+
+        return peers
+
+    def choice(self, trial: int, round_: int, size: int) -> int:
+        """Draw an index in [0, size) for a per-round choice, such as a querier."""
+        u = self.uniform(trial, round_, np.zeros(1), 1, purpose=CHOICE)
+        return int(u[0, 0] * size)
@@ -0,0 +1,268 @@
+import os
+import re
+import resource
+import threading
+import time
+from collections.abc import Iterable, Mapping
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Self
+
+PREFIX = "snowball"
+
+# Gauges published for the watched run, with their help text
+GAUGES = {
+    "round": "Current round of the watched run.",
+    "active_honest": "Honest nodes that have not finalized.",
+    "finalized_honest": "Honest nodes that have finalized.",
+    "count_0": "Honest nodes preferring 0.",
+    "rounds_per_second": "Rounds completed per second since the last sample.",
+    "rss_bytes": "Resident set size of the process.",
+}
+
+_LINE = re.compile(r"^(\w+)(?:\{(.*)\})?\s+(\S+)$")
+_LABEL = re.compile(r'(\w+)="((?:[^"\\]|\\.)*)"')
+_ESCAPE = re.compile(r"\\(.)")
+
+
+def rss_bytes() -> int:
+    """Current resident set size, or the peak if /proc is unavailable."""
+    try:
+        pages = int(Path("/proc/self/statm").read_text().split()[1])
+    except (OSError, IndexError, ValueError):
+        # ru_maxrss is in kilobytes on Linux
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    return pages * os.sysconf("SC_PAGE_SIZE")
+
+
+def _progress(target: Any) -> dict[str, float]:
+    """Read round and node counts from a SnowballState or a snow network."""
+    if hasattr(target, "honest_nodes"):
+        honest = target.honest_nodes
+        finalized = sum(node.finalized for node in honest)
+        count_0 = sum(node.preference == 0 for node in honest)
+        num_honest = len(honest)
+    else:
+        finalized, count_0 = target.finalized_count, target.count_0
+        num_honest = target.num_honest
+
+    return {
+        "round": target.round,
+        "active_honest": num_honest - finalized,
+        "finalized_honest": finalized,
+        "count_0": count_0,
+    }
+
+
+def _format_labels(labels: Mapping[str, str]) -> str:
+    """Render a Prometheus label set, escaping backslashes, quotes and newlines."""
+    if not labels:
+        return ""
+    pairs = []
+    for key, value in sorted(labels.items()):
+        escaped = (
+            str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        )
+        pairs.append(f'{key}="{escaped}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+class Telemetry:
+    """
+    Periodic progress gauges of a long simulation run.
+
+    Engines hand over their state once through `watch`; a daemon thread then
+    reads it every `interval` seconds, so the cost per round is nil. Gauges
+    are rendered in the Prometheus text format and written to `textfile`
+    (atomically, for a node-exporter textfile collector or `aggregate`)
+    and/or served on `http://127.0.0.1:<port>/metrics`.
+
+    Reads race with the engine's writes; gauges are point-in-time samples of
+    plain integer fields and may mix two consecutive rounds.
+    """
+
+    def __init__(
+        self,
+        *,
+        interval: float = 5.0,
+        textfile: str | Path | None = None,
+        port: int | None = None,
+        labels: Mapping[str, str] | None = None,
+    ) -> None:
+        """
+        Configure the telemetry outputs.
+
+        Args:
+            interval: seconds between samples
+            textfile: path of the Prometheus textfile to keep up to date
+            port: local port to serve the gauges on
+            labels: labels attached to every gauge, e.g. a worker id
+
+        """
+        self.interval = interval
+        self.textfile = Path(textfile) if textfile is not None else None
+        self.port = port
+        self.labels = dict(labels or {})
+
+        self._target: Any = None
+        self._last: tuple[float, int] | None = None
+        self._values: dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._server: ThreadingHTTPServer | None = None
+
+    def watch(self, target: Any, **labels: str) -> None:
+        """Follow a SnowballState or snow network from now on."""
+        with self._lock:
+            self._target = target
+            self._last = None
+            self.labels.update(labels)
+
+    def sample(self) -> dict[str, float]:
+        """Read the gauges of the watched run now."""
+        with self._lock:
+            values = {"rss_bytes": float(rss_bytes())}
+            if self._target is not None:
+                values |= _progress(self._target)
+                now, current = time.monotonic(), int(values["round"])
+                if self._last is not None and now > self._last[0]:
+                    values["rounds_per_second"] = (current - self._last[1]) / (
+                        now - self._last[0]
+                    )
+                self._last = (now, current)
+            self._values = values
+
+        return values
+
+    def render(self) -> str:
+        """Render the last sampled gauges in the Prometheus text format."""
+        with self._lock:
+            labels = _format_labels(self.labels)
+            values = dict(self._values)
+
+        lines = []
+        for name, value in values.items():
+            metric = f"{PREFIX}_{name}"
+            lines += [
+                f"# HELP {metric} {GAUGES[name]}",
+                f"# TYPE {metric} gauge",
+                f"{metric}{labels} {value:g}",
+            ]
+
+        return "\n".join(lines) + "\n"
+
+    def publish(self) -> None:
+        """Sample the gauges and write the textfile, if any."""
+        self.sample()
+        if self.textfile is not None:
+            self.textfile.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.textfile.with_suffix(".tmp")
+            tmp.write_text(self.render())
+            tmp.replace(self.textfile)
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.publish()
+
+    def start(self) -> Self:
+        """Start the sampling thread and the HTTP endpoint."""
+        self._stop.clear()
+        self.publish()
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+
+        if self.port is not None:
+            self._server = ThreadingHTTPServer(("127.0.0.1", self.port), _handler(self))
+            # Port 0 binds any free port
+            self.port = self._server.server_address[1]
+            threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+        return self
+
+    def stop(self) -> None:
+        """Publish a last sample and stop all threads."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        self.publish()
+
+    def __enter__(self) -> Self:
+        """Start publishing for the duration of a `with` block."""
+        return self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Stop publishing."""
+        self.stop()
+
+
+def _handler(telemetry: Telemetry) -> type[BaseHTTPRequestHandler]:
+    """Build a request handler serving the gauges of `telemetry`."""
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path.rstrip("/") not in {"", "/metrics"}:
+                self.send_error(404)
+                return
+            telemetry.sample()
+            body = telemetry.render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args: object) -> None:
+            pass
+
+    return MetricsHandler
+
+
+def _unescape(value: str) -> str:
+    """Undo the label value escaping of `_format_labels`."""
+    return _ESCAPE.sub(lambda m: "\n" if m[1] == "n" else m[1], value)
+
+
+def parse_textfile(text: str) -> list[tuple[str, dict[str, str], float]]:
+    """Parse Prometheus text lines into (name, labels, value) samples."""
+    samples = []
+    for line in text.splitlines():
+        match = _LINE.match(line.strip())
+        if line.startswith("#") or match is None:
+            continue
+        name, labels, value = match.groups()
+        parsed = {
+            key: _unescape(escaped) for key, escaped in _LABEL.findall(labels or "")
+        }
+        samples.append((name, parsed, float(value)))
+
+    return samples
+
+
+def aggregate(paths: Iterable[str | Path]) -> dict[str, float]:
+    """
+    Combine the textfiles of several workers or sweep shards.
+
+    Node counts, rates and memory are summed over the files, the round is
+    the slowest worker's.
+
+    Returns:
+        dict of combined gauges, plus the number of "workers"
+
+    """
+    totals: dict[str, float] = {"workers": 0}
+    for path in paths:
+        totals["workers"] += 1
+        for name, _, value in parse_textfile(Path(path).read_text()):
+            gauge = name.removeprefix(f"{PREFIX}_")
+            if gauge == "round":
+                totals[gauge] = min(totals.get(gauge, value), value)
+            else:
+                totals[gauge] = totals.get(gauge, 0.0) + value
+
+    return totals
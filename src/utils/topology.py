@@ -0,0 +1,219 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from src.utils.streams import floyd_sample
+
+
+@dataclass(frozen=True)
+class PeerGraph:
+    """
+    Undirected peer graph in CSR form.
+
+    The neighbors of node i are `indices[indptr[i]:indptr[i + 1]]`, sorted
+    and without self-loops or duplicates. Memory is O(edges): int64 row
+    offsets and int32 neighbor ids, so graphs with millions of nodes stay
+    practical.
+    """
+
+    indptr: np.ndarray
+    indices: np.ndarray
+
+    @classmethod
+    def from_edges(
+        cls, src: np.ndarray, dst: np.ndarray, num_nodes: int
+    ) -> "PeerGraph":
+        """
+        Build a graph from an edge list, in either direction.
+
+        Self-loops are dropped and duplicate edges merged.
+
+        Args:
+            src: array of edge endpoints
+            dst: array of the other edge endpoints
+            num_nodes: number of nodes
+
+        Returns:
+            PeerGraph with every edge stored in both directions
+
+        """
+        src = np.asarray(src, dtype=np.int64)
+        dst = np.asarray(dst, dtype=np.int64)
+        keep = src != dst
+
+        # Encode directed edges as src * N + dst: sorting groups rows
+        keys = np.concatenate(
+            [src[keep] * num_nodes + dst[keep], dst[keep] * num_nodes + src[keep]]
+        )
+        keys = np.unique(keys)
+
+        counts = np.bincount(keys // num_nodes, minlength=num_nodes)
+        indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+        np.cumsum(counts, out=indptr[1:])
+
+        return cls(indptr=indptr, indices=(keys % num_nodes).astype(np.int32))
+
+    @property
+    def num_nodes(self) -> int:
+        """Number of nodes."""
+        return self.indptr.size - 1
+
+    @property
+    def num_edges(self) -> int:
+        """Number of undirected edges."""
+        return self.indices.size // 2
+
+    @property
+    def degrees(self) -> np.ndarray:
+        """Degree of every node."""
+        return np.diff(self.indptr)
+
+    def neighbors(self, node: int) -> np.ndarray:
+        """Neighbors of a single node."""
+        return self.indices[self.indptr[node] : self.indptr[node + 1]]
+
+    def check_degree(self, k: int) -> None:
+        """Ensure every node has at least k neighbors to sample from."""
+        min_degree = int(self.degrees.min(initial=k))
+        if min_degree < k:
+            e = f"Peer graph has nodes of degree {min_degree}, below sample size {k}."
+            raise ValueError(e)
+
+    def sample(
+        self,
+        nodes: np.ndarray,
+        u: np.ndarray,
+        out: np.ndarray | None = None,
+    ) -> np.ndarray:
+        """
+        Draw k distinct neighbors for each node from (M, k) uniforms.
+
+        Floyd's algorithm runs on neighbor positions, with each row's own
+        degree as population, so nodes of any degree of at least k are
+        sampled in one vectorized pass.
+
+        Args:
+            nodes: (M,) array of querying nodes
+            u: (M, k) array of uniforms in [0, 1)
+            out: optional (M, k) integer array to write the peers to
+
+        Returns:
+            (M, k) integer array of peer indices, `out` if given
+
+        """
+        nodes = np.asarray(nodes, dtype=np.int64).reshape(-1)
+        start = self.indptr[nodes]
+        degree = self.indptr[nodes + 1] - start
+
+        positions = floyd_sample(u, degree)
+        positions += start[:, None]
+        if out is None:
+            return self.indices[positions]
+        return np.take(self.indices, positions, out=out)
+
+
+def random_regular(num_nodes: int, degree: int, seed: int = 0) -> PeerGraph:
+    """
+    Build a random graph in which every node has about `degree` neighbors.
+
+    The graph is the union of degree // 2 random Hamiltonian cycles, plus a
+    random perfect matching for odd degrees. Cycles rarely share an edge;
+    when they do the edge is merged, so a handful of nodes may end up with
+    degree - 1 or degree - 2.
+
+    Args:
+        num_nodes: number of nodes, even if `degree` is odd
+        degree: target degree of every node
+        seed: seed of the construction
+
+    Returns:
+        PeerGraph instance
+
+    """
+    if degree % 2 and num_nodes % 2:
+        e = "Odd-degree regular graphs need an even number of nodes."
+        raise ValueError(e)
+
+    rng = np.random.default_rng(seed)
+    src, dst = [], []
+    for _ in range(degree // 2):
+        cycle = rng.permutation(num_nodes)
+        src.append(cycle)
+        dst.append(np.roll(cycle, -1))
+    if degree % 2:
+        matching = rng.permutation(num_nodes).reshape(-1, 2)
+        src.append(matching[:, 0])
+        dst.append(matching[:, 1])
+
+    return PeerGraph.from_edges(np.concatenate(src), np.concatenate(dst), num_nodes)
+
+
+def small_world(
+    num_nodes: int, degree: int, rewire: float = 0.1, seed: int = 0
+) -> PeerGraph:
+    """
+    Build a Watts-Strogatz small-world graph.
+
+    Each node starts linked to its degree // 2 successors on a ring; every
+    such edge is then rewired with probability `rewire` to a uniformly
+    random node.
+
+    Args:
+        num_nodes: number of nodes
+        degree: even ring-lattice degree
+        rewire: rewiring probability
+        seed: seed of the construction
+
+    Returns:
+        PeerGraph instance
+
+    """
+    rng = np.random.default_rng(seed)
+    offsets = np.arange(1, degree // 2 + 1)
+    src = np.repeat(np.arange(num_nodes), offsets.size)
+    dst = (src + np.tile(offsets, num_nodes)) % num_nodes
+
+    rewired = rng.random(dst.size) < rewire
+    dst[rewired] = rng.integers(num_nodes, size=int(rewired.sum()))
+
+    return PeerGraph.from_edges(src, dst, num_nodes)
+
+
+def clustered(
+    num_nodes: int,
+    num_clusters: int,
+    degree: int,
+    mixing: float = 0.05,
+    seed: int = 0,
+) -> PeerGraph:
+    """
+    Build a graph of densely connected clusters with sparse links between them.
+
+    Nodes are split into `num_clusters` contiguous clusters. Every node links
+    to degree // 2 random nodes, inside its own cluster or, with probability
+    `mixing`, anywhere in the graph. Degrees vary around `degree`, with at
+    least degree // 2 neighbors per node up to merged duplicates.
+
+    Args:
+        num_nodes: number of nodes
+        num_clusters: number of clusters
+        degree: mean degree
+        mixing: probability that a link leaves the cluster
+        seed: seed of the construction
+
+    Returns:
+        PeerGraph instance
+
+    """
+    rng = np.random.default_rng(seed)
+    bounds = np.linspace(0, num_nodes, num_clusters + 1).astype(np.int64)
+    cluster = np.repeat(np.arange(num_clusters), np.diff(bounds))
+
+    src = np.repeat(np.arange(num_nodes), degree // 2)
+    lo, hi = bounds[cluster[src]], bounds[cluster[src] + 1]
+    dst = lo + (rng.random(src.size) * (hi - lo)).astype(np.int64)
+
+    outside = rng.random(src.size) < mixing
+    dst[outside] = rng.integers(num_nodes, size=int(outside.sum()))
+
+    return PeerGraph.from_edges(src, dst, num_nodes)
@@ -0,0 +1,122 @@
+import numpy as np
+import pytest
+
+from src.config import SnowballConfig
+from src.frostbyte.adversary import (
+    BalancingStrategy,
+    ContrarianStrategy,
+    MinorityStrategy,
+    StaleViewStrategy,
+)
+from src.frostbyte.snowball import snowball_ls, snowball_rs
+from src.frostbyte.snowball.state import SnowballState
+
+
+@pytest.fixture
+def config():
+    """Define an instance of SnowballConfig."""
+    return SnowballConfig(K=4, AlphaPreference=3, AlphaConfidence=3, Beta=6)
+
+
+def make_state(config: SnowballConfig, prefs: np.ndarray, num_honest: int):
+    """Build a fresh SnowballState."""
+    count_0 = int(np.sum(prefs[:num_honest] == 0))
+    return SnowballState(
+        snowball_config=config,
+        preferences=prefs.copy(),
+        strengths=np.zeros((prefs.size, 2), dtype=np.uint8),
+        confidences=np.zeros(prefs.size, dtype=np.uint8),
+        last_majority=prefs[:num_honest].copy(),
+        finalized=np.zeros(prefs.size, dtype=bool),
+        count_0=count_0,
+        num_honest=num_honest,
+        lnode_pref=0 if count_0 < (num_honest - count_0) else 1,
+        finalized_count=0,
+    )
+
+
+def test_minority_strategy_matches_default(config, make_sampler):
+    node_types = np.array([20, 20, 24])
+    prefs = np.random.default_rng(0).integers(0, 2, 24).astype(np.uint8)
+    kwargs = {"config": config, "node_types": node_types, "initial_preferences": prefs}
+
+    default = snowball_ls(sampler=make_sampler(node_types, config.K, 5), **kwargs)
+    minority = snowball_ls(
+        sampler=make_sampler(node_types, config.K, 5, adversary=MinorityStrategy()),
+        **kwargs,
+    )
+
+    assert minority == default
+
+
+def test_contrarian_votes_against_querier(config, make_sampler):
+    # 4 honest nodes, 4 L-nodes: every sample hits at least one L-node
+    prefs = np.array([0, 1, 0, 1, 0, 0, 0, 0], dtype=np.uint8)
+    state = make_state(config, prefs, num_honest=4)
+    sampler = make_sampler(
+        np.array([4, 4, 8]), config.K, 5, adversary=ContrarianStrategy()
+    )
+
+    queriers = np.arange(4)
+    peer_samples = np.array([[4, 5, 6, 7]] * 4)
+    votes = sampler.sampled_votes(
+        peer_samples, state.preferences, state.lnode_pref, queriers, state
+    )
+
+    assert votes[:, 0].tolist() == [1, 0, 1, 0]
+    assert (votes == votes[:, :1]).all()
+
+
+def test_balancing_targets_confident_nodes(config):
+    prefs = np.array([0, 0, 0, 1, 0, 0], dtype=np.uint8)
+    state = make_state(config, prefs, num_honest=4)
+    state.confidences[:4] = [5, 1, 3, 0]
+    strategy = BalancingStrategy(threshold=0.5)
+
+    votes = strategy.respond(np.arange(4), np.zeros((4, 4), dtype=int), state)
+
+    # lnode_pref is 1; nodes 0 and 2 are targeted against last majority 0
+    assert state.lnode_pref == 1
+    assert votes.ravel().tolist() == [1, 1, 1, 1]
+
+    state.last_majority[:] = 1
+    votes = strategy.respond(np.arange(4), np.zeros((4, 4), dtype=int), state)
+    assert votes.ravel().tolist() == [0, 1, 0, 1]
+
+
+def test_stale_view_lags_behind(config):
+    prefs = np.array([0, 0, 1, 0], dtype=np.uint8)
+    state = make_state(config, prefs, num_honest=3)
+    strategy = StaleViewStrategy(lag=2)
+
+    seen = []
+    for lnode_pref in [1, 0, 0, 1]:
+        state.lnode_pref = lnode_pref
+        strategy.observe(state)
+        seen.append(int(strategy.respond(np.arange(3), np.zeros((3, 2)), state)))
+
+    assert seen == [1, 1, 1, 0]
+
+    # A new run starts from a fresh history
+    other = make_state(config, prefs, num_honest=3)
+    strategy.observe(other)
+    assert list(strategy.history) == [other.lnode_pref]
+
+
+@pytest.mark.parametrize(
+    "strategy",
+    [ContrarianStrategy(), BalancingStrategy(0.8), StaleViewStrategy(3)],
+)
+@pytest.mark.parametrize("algo", [snowball_ls, snowball_rs])
+def test_engines_terminate_with_strategies(config, strategy, algo, make_sampler):
+    node_types = np.array([30, 30, 32])
+    prefs = np.zeros(32, dtype=np.uint8)
+
+    result = algo(
+        config=config,
+        node_types=node_types,
+        initial_preferences=prefs,
+        sampler=make_sampler(node_types, config.K, 5, adversary=strategy),
+    )
+
+    assert result["finalized_honest"] == 30
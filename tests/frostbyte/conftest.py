@@ -0,0 +1,22 @@
+import numpy as np
+import pytest
+
+from src.frostbyte.sampler import SnowballSampler
+
+
+@pytest.fixture
+def make_sampler():
+    """Define a factory of SnowballSampler instances configured for a network."""
+
+    def make(
+        node_types: np.ndarray, k: int, seed: int = 0, **kwargs
+    ) -> SnowballSampler:
+        sampler = SnowballSampler(rng=np.random.default_rng(seed), **kwargs)
+        sampler.update_config(
+            sample_size=k,
+            num_nodes=node_types[-1],
+            lnode_start=node_types[-2],
+        )
+        return sampler
+
+    return make
@@ -0,0 +1,203 @@
+import numpy as np
+import pytest
+
+from src.config import SnowballConfig
+from src.frostbyte.adversary import StaleViewStrategy
+from src.frostbyte.simul import fork, run_prefix
+from src.frostbyte.simul.fork import _continue
+from src.frostbyte.snowball.nary import _init_nary_state
+from src.frostbyte.snowball import snowball_ls
+from src.snow.network import LockstepNetwork
+from src.snow.node import TYPES
+from src.snow.sampler import UniformSampler
+from src.snow.simulation import fork_network
+from src.utils.streams import RandomStreams
+
+
+@pytest.fixture
+def config():
+    """Define an instance of SnowballConfig."""
+    return SnowballConfig(K=5, AlphaPreference=3, AlphaConfidence=4, Beta=4)
+
+
+def split_prefs(num_nodes: int) -> np.ndarray:
+    """Half of the nodes prefer 0, the other half 1."""
+    return np.array([0, 1] * (num_nodes // 2), dtype=np.uint8)
+
+
+def test_prefix_stops_on_condition(config, make_sampler):
+    node_types = np.array([40, 40, 40])
+    sampler = make_sampler(node_types, config.K, 3)
+    state = run_prefix(
+        config,
+        node_types,
+        split_prefs(40),
+        sampler,
+        lambda s: s.finalized_count > 0,
+    )
+
+    assert state.finalized_count > 0
+    assert state.round > 0
+
+    capped = run_prefix(
+        config, node_types, split_prefs(40), sampler, lambda s: False, max_rounds=2
+    )
+    assert capped.round == 2
+
+
+def test_fork_leaves_state_untouched(config, make_sampler):
+    node_types = np.array([40, 40, 42])
+    sampler = make_sampler(node_types, config.K, 3)
+    state = run_prefix(
+        config, node_types, split_prefs(42), sampler, lambda s: False, max_rounds=3
+    )
+    preferences = state.preferences.copy()
+
+    results = fork(state, sampler, 16)
+
+    assert len(results) == 16
+    assert state.round == 3
+    assert np.array_equal(state.preferences, preferences)
+    for result in results:
+        assert result["finalized_honest"] == 40
+        assert result["rounds_to_full"] >= 3
+        assert result["honest_0"] + result["honest_1"] == 40
+
+
+def test_fork_continuations_differ(config, make_sampler):
+    node_types = np.array([40, 40, 40])
+    sampler = make_sampler(node_types, config.K, 3)
+    state = run_prefix(config, node_types, split_prefs(40), sampler, lambda s: True)
+
+    results = fork(state, sampler, 32)
+
+    assert len({r["rounds_to_full"] for r in results}) > 1
+    assert len({r["honest_0"] for r in results}) > 1
+
+
+def test_fork_from_start_matches_snowball_ls(config, make_sampler):
+    node_types = np.array([30, 30, 32])
+    prefs = split_prefs(32)
+    sampler = make_sampler(node_types, config.K, 3)
+    state = run_prefix(config, node_types, prefs, sampler, lambda s: True)
+
+    forked = [r["rounds_to_full"] for r in fork(state, sampler, 400)]
+    direct = [
+        snowball_ls(config, node_types, prefs, sampler)["rounds_to_full"]
+        for _ in range(400)
+    ]
+
+    assert np.mean(forked) == pytest.approx(np.mean(direct), rel=0.1)
+
+
+def test_fork_with_streams_is_reproducible(config, make_sampler):
+    node_types = np.array([40, 40, 40])
+    streams = RandomStreams(seed=11)
+    sampler = make_sampler(node_types, config.K, 3, streams=streams)
+    state = run_prefix(
+        config, node_types, split_prefs(40), sampler, lambda s: False, max_rounds=2
+    )
+
+    first = fork(state, sampler, 8)
+    second = fork(state, make_sampler(node_types, config.K, 3, streams=streams), 8)
+
+    assert first == second
+
+
+def test_batched_fork_keeps_records(config, make_sampler):
+    node_types = np.array([40, 40, 40])
+    streams = RandomStreams(seed=11)
+    sampler = make_sampler(node_types, config.K, 3, streams=streams)
+    state = run_prefix(
+        config,
+        node_types,
+        split_prefs(40),
+        sampler,
+        lambda s: False,
+        max_rounds=3,
+        record_latency=True,
+        record_values=True,
+    )
+
+    results = fork(state, sampler, 4)
+
+    # Same draws as continuing every copy on its own, one round at a time
+    for i, result in enumerate(results):
+        clone = make_sampler(node_types, config.K, 3, streams=streams)
+        clone.set_trial(sampler.trial + 1 + i)
+        expected = _continue(state.copy(), clone, "full", None)
+        assert result.keys() == expected.keys()
+        for key, value in expected.items():
+            np.testing.assert_array_equal(result[key], value, err_msg=key)
+        assert result["finalization_rounds"].max() == result["rounds_to_full"]
+
+
+def test_fork_rejects_nary_state(config, make_sampler):
+    node_types = np.array([30, 30, 30])
+    prefs = np.array([0, 1, 2] * 10, dtype=np.uint8)
+    state = _init_nary_state(config, node_types, prefs, None)
+
+    with pytest.raises(TypeError, match="binary"):
+        fork(state, make_sampler(node_types, config.K, 3), 2)
+
+
+def test_fork_under_modified_config(config, make_sampler):
+    node_types = np.array([40, 40, 40])
+    sampler = make_sampler(node_types, config.K, 3)
+    state = run_prefix(
+        config, node_types, split_prefs(40), sampler, lambda s: False, max_rounds=2
+    )
+    slow = SnowballConfig(K=5, AlphaPreference=3, AlphaConfidence=4, Beta=12)
+
+    fast = np.mean([r["rounds_to_full"] for r in fork(state, sampler, 16)])
+    slower = np.mean(
+        [r["rounds_to_full"] for r in fork(state, sampler, 16, config=slow)]
+    )
+
+    assert slower > fast
+    assert state.snowball_config.Beta == config.Beta
+
+
+def test_fork_partial_finality(config, make_sampler):
+    node_types = np.array([40, 40, 40])
+    sampler = make_sampler(node_types, config.K, 3)
+    state = run_prefix(config, node_types, split_prefs(40), sampler, lambda s: True)
+
+    for result in fork(state, sampler, 8, finality="partial"):
+        assert result["rounds_to_partial"] is not None
+        assert result["rounds_to_full"] is None
+        assert result["finalized_honest"] > 20
+
+
+def test_fork_with_adversary(config, make_sampler):
+    node_types = np.array([36, 36, 40])
+    sampler = make_sampler(node_types, config.K, 3)
+    state = run_prefix(
+        config, node_types, split_prefs(40), sampler, lambda s: False, max_rounds=2
+    )
+    adversary = StaleViewStrategy(lag=2)
+
+    results = fork(state, sampler, 4, adversary=adversary, max_rounds=200)
+
+    assert len(results) == 4
+    assert sampler.adversary is None
+    for result in results:
+        assert result["finalized_honest"] > 0
+
+
+def test_fork_network(config):
+    net = LockstepNetwork(
+        node_counts={TYPES.honest: 20},
+        initial_preferences={TYPES.honest: [0] * 10 + [1] * 10},
+        snowball_params=config,
+        sampler=UniformSampler(rng=np.random.default_rng(4)),
+    )
+    net.run_round()
+    net.run_round()
+
+    results = fork_network(net, 6)
+
+    assert net.round == 2
+    assert len(results) == 6
+    for result in results:
+        assert result["rounds_to_full"] >= 2
@@ -0,0 +1,131 @@
+import numpy as np
+import pytest
+
+from src.config import SimConfig, SnowballConfig
+from src.frostbyte.sampler import SnowballSampler
+from src.frostbyte.simul import FinalizationHistogram, run_snowball
+from src.frostbyte.snowball import snowball_ls, snowball_rs
+from src.frostbyte.snowball.state import NOT_FINALIZED
+from src.snow.network import LockstepNetwork
+from src.snow.node import TYPES
+from src.snow.sampler import UniformSampler
+from src.utils.streams import RandomStreams
+
+
+@pytest.fixture
+def config():
+    """Define an instance of SnowballConfig."""
+    return SnowballConfig(K=3, AlphaPreference=3, AlphaConfidence=3, Beta=5)
+
+
+def test_lockstep_records_finalization(config, make_sampler):
+    node_types = np.array([5, 5, 5])
+    initial_prefs = np.ones(5, dtype=np.uint8)
+
+    result = snowball_ls(
+        config=config,
+        node_types=node_types,
+        initial_preferences=initial_prefs,
+        sampler=make_sampler(node_types, config.K, 2),
+        record_latency=True,
+        record_values=True,
+    )
+
+    # Everyone finalizes once the fifth round completes
+    assert result["finalization_rounds"].dtype == np.uint32
+    assert result["finalization_rounds"].tolist() == [5] * 5
+    assert result["rounds_to_full"] == 5
+    assert result["finalized_values"].tolist() == [1] * 5
+
+
+def test_random_sampling_records_partial_finalization(make_sampler):
+    config = SnowballConfig(K=3, AlphaPreference=2, AlphaConfidence=2, Beta=5)
+    node_types = np.array([7, 7, 7])
+    initial_prefs = np.zeros(7, dtype=np.uint8)
+
+    result = snowball_rs(
+        config=config,
+        node_types=node_types,
+        initial_preferences=initial_prefs,
+        sampler=make_sampler(node_types, config.K, 2),
+        finality="partial",
+        record_latency=True,
+    )
+
+    rounds = result["finalization_rounds"]
+    done = rounds != NOT_FINALIZED
+    assert done.sum() == result["finalized_honest"]
+    assert rounds[done].max() <= result["rounds_to_partial"]
+    assert "finalized_values" not in result
+
+
+def test_histogram_merge_and_quantiles():
+    first = FinalizationHistogram.from_rounds(
+        np.array([3, 3, 5, NOT_FINALIZED], dtype=np.uint32)
+    )
+    second = FinalizationHistogram.from_rounds(np.array([1, 9], dtype=np.uint32))
+
+    total = FinalizationHistogram.merge([first, second])
+
+    assert total.counts.tolist() == [0, 1, 0, 2, 0, 1, 0, 0, 0, 1]
+    assert total.unfinalized == 1
+    assert total.finalized == 5
+    assert total.quantile(0.0) == 1
+    assert total.quantile(0.5) == 3
+    assert total.quantile(1.0) == 9
+    assert total.mean() == pytest.approx(21 / 5)
+    assert total.summary()["max"] == 9
+
+
+def test_run_snowball_latency_histogram(config):
+    sim_config = SimConfig(
+        num_nodes=6,
+        num_iterations=3,
+        snowball=config,
+        node_counts={TYPES.honest: 6},
+        initial_preferences={TYPES.honest: [0] * 6},
+    )
+
+    results = run_snowball(
+        sim_config=sim_config,
+        sampler=SnowballSampler(rng=np.random.default_rng(0)),
+        snowball_algo=snowball_ls,
+        latency_histogram=True,
+    )
+
+    assert all("finalization_rounds" not in r for r in results)
+    total = FinalizationHistogram.merge(r["latency_histogram"] for r in results)
+    assert total.counts.tolist() == [0, 0, 0, 0, 0, 18]
+
+
+def test_lockstep_rounds_match_snow_per_node_rounds():
+    config = SnowballConfig(K=3, AlphaPreference=2, AlphaConfidence=2, Beta=3)
+    prefs = [0] * 10 + [1] * 10
+
+    sampler = UniformSampler(streams=RandomStreams(seed=5))
+    net = LockstepNetwork(
+        node_counts={TYPES.honest: 20},
+        initial_preferences={TYPES.honest: prefs},
+        snowball_params=config,
+        sampler=sampler,
+    )
+    while not net.check_honest_finalization():
+        net.run_round()
+    snow = net.get_finalization_stats()
+
+    node_types = np.array([20, 20, 20])
+    frostbyte = SnowballSampler(
+        rng=np.random.default_rng(0), streams=RandomStreams(seed=5)
+    )
+    frostbyte.update_config(sample_size=3, num_nodes=20, lnode_start=20)
+    result = snowball_ls(
+        config,
+        node_types,
+        np.array(prefs, dtype=np.uint8),
+        frostbyte,
+        record_latency=True,
+    )
+
+    rounds = result["finalization_rounds"]
+    assert rounds.tolist() == [snow["per_node_rounds"][i] for i in range(20)]
+    assert rounds.max() == result["rounds_to_full"] == snow["rounds_to_full"]
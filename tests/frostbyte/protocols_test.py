@@ -0,0 +1,111 @@
+import numpy as np
+import pytest
+
+from src.config import SnowballConfig
+from src.frostbyte.snowball import snowball_ls, snowball_ls_buffered, snowball_rs
+from src.frostbyte.snowball.lockstep import lockstep_update
+from src.frostbyte.snowball.state import SnowballState, SnowflakeState
+
+
+@pytest.fixture
+def config():
+    """Define an instance of SnowballConfig."""
+    return SnowballConfig(K=6, AlphaPreference=4, AlphaConfidence=4, Beta=6)
+
+
+def split_network() -> tuple[np.ndarray, np.ndarray]:
+    """60 honest nodes split 40/20, no byzantine nodes."""
+    node_types = np.array([60, 60, 60])
+    prefs = np.zeros(60, dtype=np.uint8)
+    prefs[40:] = 1
+    return node_types, prefs
+
+
+@pytest.mark.parametrize("engine", [snowball_ls, snowball_rs])
+def test_slush_finalizes_after_beta_polls(config, engine, make_sampler):
+    node_types, prefs = split_network()
+    result = engine(
+        config,
+        node_types,
+        prefs,
+        make_sampler(node_types, config.K, 0),
+        record_latency=True,
+        protocol="slush",
+    )
+
+    assert result["finalized_honest"] == 60
+    assert result["honest_0"] + result["honest_1"] == 60
+    if engine is snowball_ls:
+        # Every node polls once per round
+        assert result["rounds_to_full"] == config.Beta
+        assert np.all(result["finalization_rounds"] == config.Beta)
+
+
+def test_snowflake_adopts_majority_regardless_of_strength(config):
+    node_types = np.array([2, 2, 2])
+    prefs = np.array([0, 0], dtype=np.uint8)
+    majority_pref = np.array([1, 1], dtype=np.uint8)
+    majority_count = np.array([5, 5])
+
+    flipped = []
+    for state_class in (SnowballState, SnowflakeState):
+        state = state_class.initial(config, node_types, prefs)
+        state.strengths[:, 0] = 3
+        lockstep_update(state, np.arange(2), majority_pref, majority_count)
+        flipped.append(state.preferences.tolist())
+
+    assert flipped == [[0, 0], [1, 1]]
+
+
+@pytest.mark.parametrize("engine", [snowball_ls, snowball_ls_buffered, snowball_rs])
+def test_beta_rogue_equal_to_beta_changes_nothing(config, engine, make_sampler):
+    node_types, prefs = split_network()
+    results = []
+    for beta_rogue in (None, config.Beta):
+        config.BetaRogue = beta_rogue
+        results.append(
+            engine(
+                config,
+                node_types,
+                prefs,
+                make_sampler(node_types, config.K, 1),
+                record_latency=True,
+            )
+        )
+
+    np.testing.assert_array_equal(
+        results[0].pop("finalization_rounds"), results[1].pop("finalization_rounds")
+    )
+    assert results[0] == results[1]
+
+
+def test_rogue_nodes_need_beta_rogue(config, make_sampler):
+    config.BetaRogue = 9
+    node_types = np.array([3, 3, 3])
+    state = SnowballState.initial(config, node_types, np.zeros(3, dtype=np.uint8))
+    state.strengths[:] = [[2, 0], [2, 1], [0, 0]]
+
+    np.testing.assert_array_equal(state.beta(np.arange(3)), [6, 9, 6])
+
+    node_types, prefs = split_network()
+    result = snowball_ls(
+        config,
+        node_types,
+        prefs,
+        make_sampler(node_types, config.K, 2),
+        record_latency=True,
+    )
+    assert result["finalized_honest"] == 60
+    assert result["finalization_rounds"].min() >= config.Beta
+
+
+def test_unknown_protocol(config, make_sampler):
+    node_types, prefs = split_network()
+    with pytest.raises(ValueError, match="Unknown protocol"):
+        snowball_ls(
+            config,
+            node_types,
+            prefs,
+            make_sampler(node_types, config.K, 0),
+            protocol="avalanche",
+        )
@@ -0,0 +1,161 @@
+import numpy as np
+import pytest
+
+from src.config import SimConfig, SnowballConfig
+from src.frostbyte.sampler import SnowballSampler
+from src.frostbyte.simul import search_threshold, wilson_interval
+from src.frostbyte.simul.search import liveness_failure
+from src.frostbyte.snowball import snowball_ls
+from src.preferences import Proportions
+from src.snow.node import TYPES
+from src.utils.streams import RandomStreams
+
+
+@pytest.fixture
+def sim_config():
+    """Unanimous honest network finalizing in exactly Beta rounds."""
+    return SimConfig(
+        num_nodes=50,
+        num_iterations=1,
+        snowball=SnowballConfig(K=3, AlphaPreference=2, AlphaConfidence=2, Beta=5),
+        node_counts={TYPES.honest: 50},
+        initial_preferences={TYPES.honest: Proportions({0: 1.0})},
+    )
+
+
+@pytest.fixture
+def sampler():
+    """Define an instance of SnowballSampler."""
+    return SnowballSampler(rng=np.random.default_rng(0))
+
+
+def test_wilson_interval():
+    low, high = wilson_interval(0, 100)
+    assert low == 0
+    assert high == pytest.approx(0.037, abs=1e-3)
+
+    low, high = wilson_interval(50, 100)
+    assert low < 0.5 < high
+    assert 0.5 - low == pytest.approx(high - 0.5)
+    assert wilson_interval(0, 0) == (0.0, 1.0)
+
+
+def test_search_snowball_field(sim_config, sampler):
+    # Runs last exactly Beta rounds, so more than 12 rounds from Beta = 13 on
+    estimate = search_threshold(
+        sim_config,
+        sampler,
+        snowball_ls,
+        "Beta",
+        (1, 40),
+        event=lambda result: result["rounds_to_full"] > 12,  # noqa: PLR2004
+        target=0.5,
+        increasing=True,
+        batch=10,
+    )
+
+    assert estimate.threshold == 13
+    assert estimate.interval == (13, 13)
+    # Every point is settled by its first batch
+    assert all(point.trials == 10 for point in estimate.evaluations.values())
+    assert estimate.trials == 10 * len(estimate.evaluations)
+
+
+def test_search_node_fraction(sim_config, sampler):
+    # Fewer than 40 honest nodes once more than 10 of 50 nodes are offline
+    estimate = search_threshold(
+        sim_config,
+        sampler,
+        snowball_ls,
+        TYPES.offline,
+        (0.0, 0.5),
+        event=lambda result: result["honest_0"] < 40,  # noqa: PLR2004
+        target=0.5,
+        increasing=True,
+        batch=5,
+        max_rounds=50,
+    )
+
+    assert estimate.threshold == pytest.approx(11 / 50)
+    assert estimate.interval == pytest.approx((11 / 50, 11 / 50))
+
+
+def test_search_without_crossing(sim_config, sampler):
+    estimate = search_threshold(
+        sim_config,
+        sampler,
+        snowball_ls,
+        "Beta",
+        (1, 8),
+        event=lambda result: result["rounds_to_full"] > 12,  # noqa: PLR2004
+        target=0.5,
+        increasing=True,
+        batch=5,
+    )
+
+    assert estimate.threshold is None
+    assert estimate.interval is None
+
+
+def split_config(snowball: SnowballConfig) -> SimConfig:
+    """Honest network split evenly, with a preference list."""
+    return SimConfig(
+        num_nodes=40,
+        num_iterations=1,
+        snowball=snowball,
+        node_counts={TYPES.honest: 40},
+        initial_preferences={TYPES.honest: [0, 1] * 20},
+    )
+
+
+def assert_consistent(estimate, increasing):
+    """Check the threshold against the significant evaluations."""
+    lower, upper = estimate.interval
+    assert lower <= estimate.threshold <= upper
+    for value, point in estimate.evaluations.items():
+        if point.significant:
+            beyond = point.beyond(estimate.target, increasing=increasing)
+            assert value >= upper if beyond else value < lower
+
+
+def test_search_default_safety_failure():
+    # Even splits finalize on both values unless Beta is large enough
+    estimate = search_threshold(
+        split_config(SnowballConfig(K=5, AlphaPreference=3, AlphaConfidence=4, Beta=1)),
+        SnowballSampler(rng=np.random.default_rng(0), streams=RandomStreams(1)),
+        snowball_ls,
+        "Beta",
+        (1, 12),
+        target=0.05,
+        batch=40,
+        max_trials=120,
+    )
+
+    assert 1 < estimate.threshold < 12  # noqa: PLR2004
+    assert_consistent(estimate, increasing=False)
+    assert estimate.evaluations[estimate.threshold - 1].rate > estimate.target
+
+
+def test_search_liveness_failure_with_preference_list():
+    # L-nodes take the place of listed honest nodes, keeping the even split
+    estimate = search_threshold(
+        split_config(SnowballConfig(K=5, AlphaPreference=3, AlphaConfidence=5, Beta=8)),
+        SnowballSampler(rng=np.random.default_rng(0), streams=RandomStreams(1)),
+        snowball_ls,
+        TYPES.dynamic,
+        (0.0, 0.5),
+        event=liveness_failure,
+        target=0.5,
+        increasing=True,
+        batch=20,
+        max_trials=100,
+        max_rounds=40,
+    )
+
+    assert 0 < estimate.threshold <= 0.5  # noqa: PLR2004
+    assert_consistent(estimate, increasing=True)
+
+
+def test_invalid_parameter(sim_config, sampler):
+    with pytest.raises(ValueError, match="Invalid search parameter"):
+        search_threshold(sim_config, sampler, snowball_ls, "honest", (0, 1))
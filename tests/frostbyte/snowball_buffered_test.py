@@ -0,0 +1,116 @@
+import numpy as np
+import pytest
+
+from src.config import NO_PREFERENCE, SnowballConfig
+from src.frostbyte.adversary import BalancingStrategy
+from src.frostbyte.snowball import snowball_ls, snowball_ls_buffered
+from src.frostbyte.snowball.buffered import LockstepKernel
+from src.frostbyte.snowball.nary import _init_nary_state
+from src.utils.streams import RandomStreams
+
+U = NO_PREFERENCE
+
+
+@pytest.fixture
+def config():
+    """Define an instance of SnowballConfig."""
+    return SnowballConfig(K=6, AlphaPreference=4, AlphaConfidence=4, Beta=6)
+
+
+def run_both(
+    make_sampler, config, node_types, prefs, seed, protocol="snowball", **sampler_kwargs
+):
+    """Run both lockstep engines on identically seeded samplers."""
+    results = []
+    for engine in (snowball_ls, snowball_ls_buffered):
+        sampler = make_sampler(node_types, config.K, seed, **sampler_kwargs)
+        results.append(
+            engine(
+                config,
+                node_types,
+                prefs,
+                sampler,
+                record_latency=True,
+                record_values=True,
+                protocol=protocol,
+            )
+        )
+    return results
+
+
+def assert_same(expected: dict, actual: dict):
+    """Compare two result dicts, arrays included."""
+    assert expected.keys() == actual.keys()
+    for key, value in expected.items():
+        np.testing.assert_array_equal(actual[key], value, err_msg=key)
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_buffered_matches_lockstep(config, seed, make_sampler):
+    # 60 honest, 10 fixed, 8 L nodes
+    node_types = np.array([60, 70, 78])
+    prefs = np.zeros(78, dtype=np.uint8)
+    prefs[30:60] = 1
+
+    assert_same(*run_both(make_sampler, config, node_types, prefs, seed))
+
+
+def test_buffered_matches_lockstep_with_undecided(config, make_sampler):
+    node_types = np.array([60, 60, 70, 80])
+    prefs = np.full(80, U, dtype=np.uint8)
+    prefs[:20] = 0
+    prefs[20:35] = 1
+
+    assert_same(*run_both(make_sampler, config, node_types, prefs, 4))
+
+
+def test_buffered_matches_lockstep_with_adversary(config, make_sampler):
+    node_types = np.array([60, 60, 68])
+    prefs = np.zeros(68, dtype=np.uint8)
+    prefs[30:60] = 1
+
+    assert_same(
+        *run_both(
+            make_sampler, config, node_types, prefs, 3, adversary=BalancingStrategy()
+        )
+    )
+
+
+def test_buffered_matches_lockstep_with_streams(config, make_sampler):
+    node_types = np.array([300, 300, 310])
+    prefs = np.zeros(310, dtype=np.uint8)
+    prefs[150:300] = 1
+
+    assert_same(
+        *run_both(
+            make_sampler, config, node_types, prefs, 0, streams=RandomStreams(seed=9)
+        )
+    )
+
+
+@pytest.mark.parametrize("protocol", ["snowflake", "slush"])
+def test_buffered_matches_lockstep_protocols(config, protocol, make_sampler):
+    node_types = np.array([300, 300, 310])
+    prefs = np.zeros(310, dtype=np.uint8)
+    prefs[150:300] = 1
+
+    assert_same(
+        *run_both(
+            make_sampler,
+            config,
+            node_types,
+            prefs,
+            0,
+            protocol=protocol,
+            streams=RandomStreams(seed=9),
+        )
+    )
+
+
+def test_kernel_rejects_nary_state(config, make_sampler):
+    node_types = np.array([10, 10, 10])
+    prefs = np.array([0, 1, 2] * 3 + [0], dtype=np.uint8)
+    state = _init_nary_state(config, node_types, prefs, None)
+
+    with pytest.raises(TypeError, match="binary"):
+        LockstepKernel(state, make_sampler(node_types, config.K, 0))
@@ -0,0 +1,130 @@
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from src.config import NO_PREFERENCE, SimConfig, SnowballConfig
+from src.frostbyte.sampler import SnowballSampler
+from src.frostbyte.simul import run_snowball_configs
+from src.frostbyte.snowball import config_grid, snowball_ls, snowball_ls_configs
+from src.snow.node import TYPES
+from src.utils.streams import RandomStreams
+
+BASE = SnowballConfig(K=8, AlphaPreference=5, AlphaConfidence=6, Beta=6)
+
+# 80 honest, 10 fixed, 6 L nodes
+NODE_TYPES = np.array([80, 90, 96])
+PREFS = np.zeros(96, dtype=np.uint8)
+PREFS[35:80] = 1
+
+
+def test_config_grid_order():
+    configs = config_grid(BASE, Beta=[4, 8], AlphaConfidence=[5, 6])
+
+    assert [(c.Beta, c.AlphaConfidence) for c in configs] == [
+        (4, 5),
+        (4, 6),
+        (8, 5),
+        (8, 6),
+    ]
+    assert all(c.K == BASE.K for c in configs)
+
+
+@pytest.mark.parametrize("finality", ["full", "partial"])
+@pytest.mark.parametrize("seed", [0, 1])
+def test_every_config_follows_its_own_run(finality, seed, make_sampler):
+    configs = [
+        *config_grid(BASE, AlphaPreference=[5, 6], Beta=[3, 8]),
+        replace(BASE, AlphaConfidence=7, BetaRogue=10),
+    ]
+    batched = snowball_ls_configs(
+        configs,
+        NODE_TYPES,
+        PREFS,
+        make_sampler(NODE_TYPES, BASE.K, seed, streams=RandomStreams(seed)),
+        finality,
+        record_latency=True,
+    )
+
+    for config, result in zip(configs, batched, strict=True):
+        expected = snowball_ls(
+            config,
+            NODE_TYPES,
+            PREFS,
+            make_sampler(NODE_TYPES, BASE.K, seed, streams=RandomStreams(seed)),
+            finality,
+            record_latency=True,
+        )
+        rounds = result.pop("finalization_rounds")
+        assert np.array_equal(rounds, expected.pop("finalization_rounds"))
+        assert result == expected
+
+
+def test_single_config_matches_lockstep_rng(make_sampler):
+    (result,) = snowball_ls_configs(
+        [BASE], NODE_TYPES, PREFS, make_sampler(NODE_TYPES, BASE.K, 3)
+    )
+    expected = snowball_ls(BASE, NODE_TYPES, PREFS, make_sampler(NODE_TYPES, BASE.K, 3))
+
+    assert result == expected
+
+
+def test_round_cap_matches_lockstep(make_sampler):
+    configs = config_grid(BASE, Beta=[2, 20])
+    batched = snowball_ls_configs(
+        configs,
+        NODE_TYPES,
+        PREFS,
+        make_sampler(NODE_TYPES, BASE.K, 5, streams=RandomStreams(5)),
+        max_rounds=8,
+    )
+
+    for config, result in zip(configs, batched, strict=True):
+        assert result == snowball_ls(
+            config,
+            NODE_TYPES,
+            PREFS,
+            make_sampler(NODE_TYPES, BASE.K, 5, streams=RandomStreams(5)),
+            max_rounds=8,
+        )
+    assert batched[1]["rounds_to_full"] is None
+
+
+def test_rejects_unsupported_inputs(make_sampler):
+    with pytest.raises(ValueError, match="share K"):
+        snowball_ls_configs(
+            [BASE, replace(BASE, K=9)],
+            NODE_TYPES,
+            PREFS,
+            make_sampler(NODE_TYPES, BASE.K, 0, streams=RandomStreams(0)),
+        )
+
+    undecided = PREFS.copy()
+    undecided[0] = NO_PREFERENCE
+    with pytest.raises(ValueError, match="undecided"):
+        snowball_ls_configs(
+            [BASE],
+            NODE_TYPES,
+            undecided,
+            make_sampler(NODE_TYPES, BASE.K, 0, streams=RandomStreams(0)),
+        )
+
+
+def test_run_snowball_configs():
+    sim_config = SimConfig(
+        num_nodes=60,
+        num_iterations=3,
+        snowball=BASE,
+        node_counts={TYPES.honest: 60},
+        initial_preferences={TYPES.honest: [0, 1] * 30},
+    )
+    configs = config_grid(BASE, Beta=[4, 6, 8])
+    sampler = SnowballSampler(rng=np.random.default_rng(2), streams=RandomStreams(2))
+    results = run_snowball_configs(sim_config, sampler, configs)
+
+    assert [len(runs) for runs in results] == [3, 3, 3]
+    for runs in results:
+        assert all(run["finalized_honest"] == 60 for run in runs)
+
+    with pytest.raises(ValueError, match="K of the simulation"):
+        run_snowball_configs(sim_config, sampler, [replace(BASE, K=5)])
@@ -3,9 +3,10 @@ import logging
 import numpy as np
 import pytest
 
-from src.config import SnowballConfig
+from src.config import NO_PREFERENCE, SnowballConfig
 from src.frostbyte.sampler import SnowballSampler
 from src.frostbyte.snowball import snowball_ls
+from src.utils.streams import RandomStreams
 
 
 @pytest.fixture
@@ -96,3 +97,51 @@ def test_custom_finalization(config, sampler):
     assert result["honest_0"] == 7
     assert result["honest_1"] == 0
     assert result["finalized_honest"] == 7
+
+
+@pytest.mark.parametrize("streams", [None, RandomStreams(seed=9)])
+def test_chunked_rounds_match_default(streams):
+    config = SnowballConfig(K=5, AlphaPreference=3, AlphaConfidence=4, Beta=4)
+    node_types = np.array([60, 64, 70])
+    initial_prefs = np.array([0, 1] * 35, dtype=np.uint8)
+
+    results = []
+    for chunk_size in (None, 7, 1000):
+        sampler = SnowballSampler(rng=np.random.default_rng(3), streams=streams)
+        sampler.update_config(
+            sample_size=config.K,
+            num_nodes=node_types[-1],
+            lnode_start=node_types[-2],
+        )
+        results.append(
+            snowball_ls(
+                config=config,
+                node_types=node_types,
+                initial_preferences=initial_prefs,
+                sampler=sampler,
+                record_latency=True,
+                chunk_size=chunk_size,
+            )
+        )
+
+    default = results[0]
+    for chunked in results[1:]:
+        assert chunked["rounds_to_full"] == default["rounds_to_full"]
+        assert chunked["honest_0"] == default["honest_0"]
+        assert np.array_equal(
+            chunked["finalization_rounds"], default["finalization_rounds"]
+        )
+
+
+def test_chunked_rounds_reject_undecided(config, sampler):
+    node_types = np.array([4, 4, 4])
+    sampler.update_config(sample_size=config.K, num_nodes=4, lnode_start=4)
+
+    with pytest.raises(ValueError, match="undecided"):
+        snowball_ls(
+            config=config,
+            node_types=node_types,
+            initial_preferences=np.array([0, 1, 0, NO_PREFERENCE], dtype=np.uint8),
+            sampler=sampler,
+            chunk_size=2,
+        )
@@ -0,0 +1,111 @@
+import numpy as np
+import pytest
+
+from src.config import NO_PREFERENCE, SnowballConfig
+from src.frostbyte.adversary import BalancingStrategy
+from src.frostbyte.snowball import snowball_ls, snowball_multi_ls
+
+
+@pytest.fixture
+def config():
+    """Define an instance of SnowballConfig."""
+    return SnowballConfig(K=6, AlphaPreference=4, AlphaConfidence=4, Beta=6)
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_single_instance_matches_lockstep(config, seed, make_sampler):
+    # 60 honest, 10 fixed, 4 L nodes
+    node_types = np.array([60, 70, 74])
+    prefs = np.zeros(74, dtype=np.uint8)
+    prefs[30:60] = 1
+
+    expected = snowball_ls(
+        config,
+        node_types,
+        prefs,
+        make_sampler(node_types, config.K, seed),
+        record_values=True,
+    )
+    result = snowball_multi_ls(
+        config,
+        node_types,
+        prefs,
+        make_sampler(node_types, config.K, seed),
+        instances=1,
+        decisions=1,
+    )
+
+    assert result["decisions"] == 1
+    assert result["rounds"] == expected["rounds_to_full"]
+    assert result["decision_latencies"].tolist() == [expected["rounds_to_full"]]
+    assert result["decided_values"].tolist() == [
+        int(np.bincount(expected["finalized_values"]).argmax())
+    ]
+
+
+def test_pipeline_decides_every_instance(config, make_sampler):
+    node_types = np.array([60, 60, 60])
+    prefs = np.zeros(60, dtype=np.uint8)
+    prefs[40:] = 1
+
+    result = snowball_multi_ls(
+        config,
+        node_types,
+        prefs,
+        make_sampler(node_types, config.K, 3),
+        instances=4,
+        decisions=10,
+    )
+
+    assert result["decisions"] == 10
+    assert result["decision_latencies"].size == 10
+    assert np.all(result["decision_latencies"] >= config.Beta)
+    assert result["throughput"] == pytest.approx(10 / result["rounds"])
+    # Four slots share the rounds of a pipeline of ten decisions
+    assert result["rounds"] < result["decision_latencies"].sum()
+
+
+def test_partial_finality_and_round_cap(config, make_sampler):
+    node_types = np.array([60, 60, 60])
+    prefs = np.zeros(60, dtype=np.uint8)
+    prefs[40:] = 1
+
+    partial = snowball_multi_ls(
+        config,
+        node_types,
+        prefs,
+        make_sampler(node_types, config.K, 5),
+        "partial",
+        instances=2,
+        decisions=4,
+    )
+    capped = snowball_multi_ls(
+        config,
+        node_types,
+        prefs,
+        make_sampler(node_types, config.K, 5),
+        instances=2,
+        decisions=100,
+        max_rounds=config.Beta,
+    )
+
+    assert partial["decisions"] == 4
+    assert capped["rounds"] == config.Beta
+    assert capped["decisions"] <= 2
+
+
+def test_rejects_unsupported_runs(config, make_sampler):
+    node_types = np.array([10, 10, 10])
+    prefs = np.zeros(10, dtype=np.uint8)
+    sampler = make_sampler(node_types, config.K, 0)
+
+    undecided = prefs.copy()
+    undecided[0] = NO_PREFERENCE
+    with pytest.raises(ValueError, match="undecided"):
+        snowball_multi_ls(config, node_types, undecided, sampler)
+
+    node_types = np.array([10, 10, 12])
+    prefs = np.zeros(12, dtype=np.uint8)
+    sampler = make_sampler(node_types, config.K, 0, adversary=BalancingStrategy())
+    with pytest.raises(ValueError, match="adversary"):
+        snowball_multi_ls(config, node_types, prefs, sampler)
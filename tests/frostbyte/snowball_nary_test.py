@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+from src.config import SnowballConfig
+from src.frostbyte.snowball import (
+    snowball_ls,
+    snowball_nary_ls,
+    snowball_nary_rs,
+)
+
+
+@pytest.fixture
+def config():
+    """Define an instance of SnowballConfig."""
+    return SnowballConfig(K=3, AlphaPreference=2, AlphaConfidence=2, Beta=5)
+
+
+def test_batch_sampler_nary_counts(config, make_sampler):
+    node_types = np.array([6, 6, 6])
+    prefs = np.array([0, 1, 2, 2, 2, 2], dtype=np.uint8)
+    sampler = make_sampler(node_types, k=5)
+
+    majority_pref, majority_count = sampler.batch_sampler_nary(
+        np.array([0, 1]), prefs, lnode_pref=0, num_choices=3
+    )
+
+    # Every sample of 5 out of the other 5 nodes sees four 2s
+    assert majority_pref.tolist() == [2, 2]
+    assert majority_count.tolist() == [4, 4]
+
+
+def test_nary_unanimous_termination(config, make_sampler):
+    node_types = np.array([6, 6, 6])
+    initial_prefs = np.full(6, 2, dtype=np.uint8)
+    sampler = make_sampler(node_types, config.K)
+
+    result = snowball_nary_ls(
+        config=config,
+        node_types=node_types,
+        initial_preferences=initial_prefs,
+        sampler=sampler,
+        num_choices=4,
+    )
+
+    assert result["honest_2"] == 6
+    assert result["honest_0"] == result["honest_1"] == result["honest_3"] == 0
+    assert result["finalized_honest"] == 6
+    assert result["rounds_to_full"] == 5
+
+
+@pytest.mark.parametrize("algo", [snowball_nary_ls, snowball_nary_rs])
+def test_nary_convergence_with_lnodes(config, algo, make_sampler):
+    # 9 honest nodes split over three values, 1 L-node
+    node_types = np.array([9, 9, 10])
+    initial_prefs = np.array([0, 0, 0, 0, 0, 0, 1, 2, 2, 0], dtype=np.uint8)
+    sampler = make_sampler(node_types, config.K)
+
+    result = algo(
+        config=config,
+        node_types=node_types,
+        initial_preferences=initial_prefs,
+        sampler=sampler,
+    )
+
+    assert result["finalized_honest"] == 9
+    assert result["honest_0"] + result["honest_1"] + result["honest_2"] == 9
+
+
+def test_nary_matches_binary_engine(make_sampler):
+    config = SnowballConfig(K=5, AlphaPreference=3, AlphaConfidence=4, Beta=8)
+    node_types = np.array([40, 42, 45])
+    rng = np.random.default_rng(7)
+    initial_prefs = rng.integers(0, 2, size=45).astype(np.uint8)
+
+    kwargs = {
+        "config": config,
+        "node_types": node_types,
+        "initial_preferences": initial_prefs,
+    }
+    binary = snowball_ls(sampler=make_sampler(node_types, config.K, 3), **kwargs)
+    nary = snowball_nary_ls(sampler=make_sampler(node_types, config.K, 3), **kwargs)
+
+    assert nary == binary
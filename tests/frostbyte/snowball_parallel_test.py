@@ -0,0 +1,101 @@
+import numpy as np
+import pytest
+
+from src.config import SnowballConfig
+from src.frostbyte.sampler import SnowballSampler
+from src.frostbyte.snowball import snowball_ls, snowball_ls_parallel
+from src.utils.streams import RandomStreams
+
+
+@pytest.fixture
+def config():
+    """Define an instance of SnowballConfig."""
+    return SnowballConfig(K=3, AlphaPreference=3, AlphaConfidence=3, Beta=5)
+
+
+def test_parallel_basic_termination(config, make_sampler):
+    # Five honest nodes only, more workers than some rounds need
+    node_types = np.array([5, 5, 5])
+    initial_prefs = np.zeros(5, dtype=np.uint8)
+
+    result = snowball_ls_parallel(
+        config=config,
+        node_types=node_types,
+        initial_preferences=initial_prefs,
+        sampler=make_sampler(node_types, config.K),
+        num_workers=2,
+    )
+
+    assert result["honest_0"] == 5
+    assert result["honest_1"] == 0
+    assert result["finalized_honest"] == 5
+    assert result["rounds_to_full"] == 5
+    assert result["rounds_to_partial"] == 5
+
+
+def test_parallel_custom_finalization(config, make_sampler):
+    # 7 honest nodes, 2 fixed, 1 Lnode
+    node_types = np.array([7, 7, 9])
+    initial_prefs = np.array([0, 0, 0, 0, 0, 0, 0, 1, 1], dtype=np.uint8)
+
+    result = snowball_ls_parallel(
+        config=config,
+        node_types=node_types,
+        initial_preferences=initial_prefs,
+        sampler=make_sampler(node_types, config.K),
+        num_workers=3,
+    )
+
+    assert result["honest_0"] == 7
+    assert result["finalized_honest"] == 7
+
+
+def test_parallel_partial_finality(make_sampler):
+    config = SnowballConfig(K=5, AlphaPreference=3, AlphaConfidence=4, Beta=6)
+    node_types = np.array([60, 60, 60])
+    initial_prefs = np.random.default_rng(1).integers(0, 2, 60).astype(np.uint8)
+
+    result = snowball_ls_parallel(
+        config=config,
+        node_types=node_types,
+        initial_preferences=initial_prefs,
+        sampler=make_sampler(node_types, config.K),
+        finality="partial",
+        num_workers=2,
+    )
+
+    assert result["finalized_honest"] > 30
+    assert result["rounds_to_partial"] is not None
+    assert result["rounds_to_full"] is None
+
+
+def test_parallel_matches_serial_with_streams():
+    config = SnowballConfig(K=7, AlphaPreference=5, AlphaConfidence=6, Beta=6)
+    node_types = np.array([60, 62, 65])
+    initial_prefs = np.array([0] * 30 + [1] * 30 + [1, 0] + [0] * 3, dtype=np.uint8)
+
+    results = []
+    for num_workers in (None, 1, 3):
+        sampler = SnowballSampler(
+            rng=np.random.default_rng(num_workers),
+            streams=RandomStreams(seed=4),
+        )
+        sampler.update_config(
+            sample_size=config.K,
+            num_nodes=node_types[-1],
+            lnode_start=node_types[-2],
+        )
+        engine_kwargs = {
+            "config": config,
+            "node_types": node_types,
+            "initial_preferences": initial_prefs,
+            "sampler": sampler,
+        }
+        if num_workers is None:
+            results.append(snowball_ls(**engine_kwargs))
+        else:
+            results.append(
+                snowball_ls_parallel(**engine_kwargs, num_workers=num_workers)
+            )
+
+    assert results[0] == results[1] == results[2]
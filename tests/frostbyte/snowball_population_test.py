@@ -0,0 +1,108 @@
+import numpy as np
+import pytest
+
+from src.config import NO_PREFERENCE, SimConfig, SnowballConfig
+from src.frostbyte.adversary import BalancingStrategy
+from src.frostbyte.sampler import SnowballSampler
+from src.frostbyte.simul import run_snowball
+from src.frostbyte.snowball import snowball_ls, snowball_population_ls
+from src.frostbyte.snowball.population import outcome_probabilities
+from src.preferences import Proportions
+from src.snow.node import TYPES
+
+
+@pytest.fixture
+def config():
+    """Define an instance of SnowballConfig."""
+    return SnowballConfig(K=6, AlphaPreference=4, AlphaConfidence=5, Beta=6)
+
+
+def test_outcome_probabilities(config):
+    # Unanimous zeros pass both thresholds
+    np.testing.assert_allclose(
+        outcome_probabilities(config, 20, 0, 0), [0, 0, 0, 1, 0, 0, 0, 0]
+    )
+    # Only silent nodes: a tie at zero votes, failing both thresholds
+    np.testing.assert_allclose(
+        outcome_probabilities(config, 0, 0, 20), [1, 0, 0, 0, 0, 0, 0, 0]
+    )
+    probs = outcome_probabilities(config, 30, 30, 9)
+    assert probs.sum() == pytest.approx(1)
+    assert probs[0] > probs[4]  # ties go to 0
+
+
+def test_first_round_matches_lockstep(config, make_sampler):
+    # 33/27 honest split, 3/3 fixed nodes, 4 L nodes
+    node_types = np.array([60, 66, 70])
+    prefs = np.zeros(70, dtype=np.uint8)
+    prefs[33:60] = 1
+    prefs[60:63] = 1
+
+    means = []
+    for engine in (snowball_ls, snowball_population_ls):
+        sampler = make_sampler(node_types, config.K, 0)
+        honest_0 = [
+            engine(config, node_types, prefs, sampler, max_rounds=1)["honest_0"]
+            for _ in range(2000)
+        ]
+        means.append((np.mean(honest_0), np.std(honest_0) / np.sqrt(2000)))
+
+    (lockstep, lockstep_se), (population, population_se) = means
+    assert abs(lockstep - population) < 4 * np.hypot(lockstep_se, population_se)
+
+
+def test_unanimous_network_finalizes_after_beta(config, make_sampler):
+    num_nodes = 10_000_000
+    node_types = np.array([num_nodes, num_nodes, num_nodes])
+    prefs = np.zeros(num_nodes, dtype=np.uint8)
+
+    result = snowball_population_ls(
+        config,
+        node_types,
+        prefs,
+        make_sampler(node_types, config.K, 0),
+        record_latency=True,
+    )
+
+    assert result["rounds_to_full"] == config.Beta
+    assert result["finalized_honest"] == num_nodes
+    assert result["finalization_counts"][config.Beta] == num_nodes
+    assert result["max_cells"] <= 2  # noqa: PLR2004
+
+
+def test_latency_histogram_from_counts(config):
+    sim_config = SimConfig(
+        num_nodes=1000,
+        num_iterations=3,
+        snowball=config,
+        node_counts={TYPES.honest: 950, TYPES.dynamic: 50},
+        initial_preferences={TYPES.honest: Proportions({0: 0.7, 1: 0.3})},
+    )
+    results = run_snowball(
+        sim_config,
+        SnowballSampler(rng=np.random.default_rng(1)),
+        snowball_population_ls,
+        latency_histogram=True,
+    )
+
+    for result in results:
+        histogram = result["latency_histogram"]
+        assert histogram.finalized == result["finalized_honest"] == 950
+        assert histogram.unfinalized == 0
+        assert histogram.counts.size == result["rounds_to_full"] + 1
+
+
+def test_rejects_unsupported_runs(config, make_sampler):
+    node_types = np.array([10, 10, 12])
+    prefs = np.zeros(12, dtype=np.uint8)
+
+    undecided = prefs.copy()
+    undecided[0] = NO_PREFERENCE
+    with pytest.raises(ValueError, match="undecided"):
+        snowball_population_ls(
+            config, node_types, undecided, make_sampler(node_types, config.K, 0)
+        )
+
+    sampler = make_sampler(node_types, config.K, 0, adversary=BalancingStrategy())
+    with pytest.raises(ValueError, match="exchangeable"):
+        snowball_population_ls(config, node_types, prefs, sampler)
@@ -0,0 +1,134 @@
+from copy import deepcopy
+
+import numpy as np
+import pytest
+
+from src.config import SnowballConfig
+from src.frostbyte.snowball import snowball_rs, snowball_rs_tau
+from src.frostbyte.snowball.random_sampling import _flip_distance, leap_update
+from src.frostbyte.snowball.state import SnowballState
+from src.utils.streams import RandomStreams
+
+
+@pytest.fixture
+def config():
+    """Define an instance of SnowballConfig."""
+    return SnowballConfig(K=6, AlphaPreference=4, AlphaConfidence=4, Beta=6)
+
+
+def split_network(num_honest: int = 200) -> tuple[np.ndarray, np.ndarray]:
+    """Honest nodes split 60/40, with 5% L nodes."""
+    num_nodes = num_honest + num_honest // 20
+    node_types = np.array([num_honest, num_honest, num_nodes])
+    prefs = np.zeros(num_nodes, dtype=np.uint8)
+    prefs[num_honest * 6 // 10 : num_honest] = 1
+    return node_types, prefs
+
+
+def test_tau_leaping_tracks_exact_stepping(config, make_sampler):
+    node_types, prefs = split_network()
+    exact, leaped = [], []
+    for seed in range(5):
+        exact.append(
+            snowball_rs(
+                config, node_types, prefs, make_sampler(node_types, config.K, seed)
+            )
+        )
+        leaped.append(
+            snowball_rs_tau(
+                config,
+                node_types,
+                prefs,
+                make_sampler(node_types, config.K, seed),
+                tolerance=0.02,
+            )
+        )
+
+    for result in leaped:
+        assert result["finalized_honest"] == 200
+        assert result["leaps"] < result["steps"]
+        assert 0 < result["mean_leap_error"] <= result["leap_error"] < 0.1
+
+    exact_rounds = np.mean([result["rounds_to_full"] for result in exact])
+    leaped_rounds = np.mean([result["rounds_to_full"] for result in leaped])
+    assert leaped_rounds == pytest.approx(exact_rounds, rel=0.2)
+
+
+def test_leap_error_bounds_exact_stepping(config, make_sampler):
+    # One leap from the initial split, against exact stepping of its nodes
+    node_types, prefs = split_network()
+    size, fixed, num_lnodes = 40, np.zeros(2, dtype=np.int64), 10
+    leaped, exact, bounds = [], [], []
+    for seed in range(200):
+        sampler = make_sampler(node_types, config.K, seed, streams=RandomStreams(seed))
+        state = SnowballState.initial(config, node_types, prefs)
+        stepped = deepcopy(state)
+        nodes = sampler.choose_nodes(np.arange(200), size)
+
+        majority_pref, majority_count = sampler.batch_sampler(
+            nodes, state.preferences, state.lnode_pref, state=state
+        )
+        distance = _flip_distance(state, fixed, num_lnodes)
+        flipped = leap_update(state, nodes, majority_pref, majority_count)
+        leaped.extend(2 * majority_pref + (majority_count >= config.AlphaPreference))
+        bounds.append(size * flipped * distance)
+
+        for node in nodes:
+            pref, count = sampler.sample_and_count(
+                node, stepped.preferences, stepped.lnode_pref, state=stepped
+            )
+            leap_update(stepped, np.array([node]), np.array([pref]), np.array([count]))
+            exact.append(2 * pref + (count >= config.AlphaPreference))
+
+    # Outcome frequencies differ by the mean bound per poll, plus sampling noise
+    frequencies = [np.bincount(o, minlength=4) / len(o) for o in (leaped, exact)]
+    distance = 0.5 * np.abs(frequencies[0] - frequencies[1]).sum()
+    assert 0 < np.mean(bounds) / size < 0.5  # noqa: PLR2004
+    assert distance <= np.mean(bounds) / size + 0.03  # noqa: PLR2004
+
+
+def test_leap_size_follows_tolerance(config, make_sampler):
+    node_types, prefs = split_network()
+    results = [
+        snowball_rs_tau(
+            config,
+            node_types,
+            prefs,
+            make_sampler(node_types, config.K, 0),
+            tolerance=tolerance,
+        )
+        for tolerance in (0.005, 0.05)
+    ]
+
+    assert results[0]["leaps"] > results[1]["leaps"]
+    assert results[0]["leap_error"] < results[1]["leap_error"]
+
+
+def test_tau_leaping_with_streams_is_reproducible(config, make_sampler):
+    node_types, prefs = split_network()
+    results = [
+        snowball_rs_tau(
+            config,
+            node_types,
+            prefs,
+            make_sampler(node_types, config.K, seed, streams=RandomStreams(7)),
+            record_latency=True,
+        )
+        for seed in (0, 1)
+    ]
+
+    np.testing.assert_array_equal(
+        results[0].pop("finalization_rounds"), results[1].pop("finalization_rounds")
+    )
+    assert results[0] == results[1]
+
+
+def test_choose_nodes_is_distinct(config, make_sampler):
+    node_types, _ = split_network()
+    active = np.arange(0, 200, 2)
+    for streams in (None, RandomStreams(3)):
+        sampler = make_sampler(node_types, config.K, 0, streams=streams)
+        chosen = sampler.choose_nodes(active, 30)
+        assert chosen.size == 30
+        assert np.unique(chosen).size == 30
+        assert np.isin(chosen, active).all()
@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+
+from src.config import NO_PREFERENCE, SimConfig, SnowballConfig
+from src.frostbyte.sampler import SnowballSampler
+from src.frostbyte.simul import run_snowball
+from src.frostbyte.snowball import snowball_ls, snowball_nary_ls, snowball_rs
+from src.frostbyte.snowball.state import SnowballState
+from src.snow.node import TYPES
+
+U = NO_PREFERENCE
+
+
+@pytest.fixture
+def config():
+    """Define an instance of SnowballConfig."""
+    return SnowballConfig(K=4, AlphaPreference=2, AlphaConfidence=2, Beta=5)
+
+
+def test_undecided_peers_adopt_first_querier(config):
+    # Honest nodes 0-3, node 4 offline
+    prefs = np.array([0, 1, U, U, U], dtype=np.uint8)
+    node_types = np.array([4, 4, 5, 5])
+    state = SnowballState.initial(config, node_types, prefs)
+    assert state.num_undecided == 2
+
+    queriers = np.array([0, 1])
+    peer_samples = np.array([[2, 4, 3, 1], [3, 2, 4, 0]])
+    votes = state.preferences[peer_samples]
+    state.answer_undecided(queriers, peer_samples, votes)
+
+    # 2 and 3 adopt node 0's preference on their first query
+    assert votes.tolist() == [[U, U, U, 1], [0, 0, U, 0]]
+    assert state.preferences[:5].tolist() == [0, 1, 0, 0, U]
+    assert state.num_undecided == 0
+    assert state.count_0 == 3
+
+
+def test_missing_votes_are_not_counted(config, make_sampler):
+    node_types = np.array([4, 4, 8, 8])
+    prefs = np.array([1, 1, 1, 1, U, U, U, U], dtype=np.uint8)
+    sampler = make_sampler(node_types, config.K, 11)
+
+    majority_pref, majority_count = sampler.batch_sampler(
+        np.arange(4), prefs, lnode_pref=0
+    )
+
+    # Only the three other honest nodes can answer
+    assert majority_pref.tolist() == [1, 1, 1, 1]
+    assert (majority_count <= 3).all()
+
+
+@pytest.mark.parametrize("algo", [snowball_ls, snowball_rs, snowball_nary_ls])
+def test_undecided_nodes_converge(config, algo, make_sampler):
+    # 10 honest nodes, half undecided, and 2 offline nodes
+    node_types = np.array([10, 10, 12, 12])
+    prefs = np.array([0] * 5 + [U] * 5 + [U, U], dtype=np.uint8)
+
+    result = algo(
+        config=config,
+        node_types=node_types,
+        initial_preferences=prefs,
+        sampler=make_sampler(node_types, config.K, 11),
+    )
+
+    assert result["honest_0"] == 10
+    assert result["honest_undecided"] == 0
+    assert result["finalized_honest"] == 10
+    assert result["rounds_to_full"] is not None
+
+
+def test_run_snowball_with_offline_nodes(config):
+    sim_config = SimConfig(
+        num_nodes=14,
+        num_iterations=2,
+        snowball=config,
+        node_counts={TYPES.honest: 12, TYPES.offline: 2},
+        initial_preferences={TYPES.honest: [0] * 8 + [None] * 4},
+    )
+
+    results = run_snowball(
+        sim_config=sim_config,
+        sampler=SnowballSampler(rng=np.random.default_rng(0)),
+        snowball_algo=snowball_ls,
+    )
+
+    for result in results:
+        assert result["honest_0"] == 12
+        assert result["finalized_honest"] == 12
@@ -0,0 +1,127 @@
+import numpy as np
+import pytest
+
+from src.config import SimConfig, SnowballConfig
+from src.frostbyte.sampler import SnowballSampler
+from src.frostbyte.simul import (
+    RareEventEstimate,
+    SplittingResult,
+    conflict_score,
+    multilevel_splitting,
+    run_snowball,
+    run_splitting,
+)
+from src.frostbyte.snowball import snowball_ls
+from src.frostbyte.snowball.state import SnowballState
+from src.snow.node import TYPES
+
+
+@pytest.fixture
+def config():
+    """Define an instance of SnowballConfig."""
+    return SnowballConfig(K=5, AlphaPreference=3, AlphaConfidence=3, Beta=3)
+
+
+def split_config(snowball: SnowballConfig, num_iterations: int) -> SimConfig:
+    """Twenty honest nodes split evenly."""
+    return SimConfig(
+        num_nodes=20,
+        num_iterations=num_iterations,
+        snowball=snowball,
+        node_counts={TYPES.honest: 20},
+        initial_preferences={TYPES.honest: [0] * 10 + [1] * 10},
+    )
+
+
+def test_conflict_detection(config):
+    node_types = np.array([4, 4, 4])
+    state = SnowballState.initial(
+        config, node_types, np.array([0, 0, 1, 1], dtype=np.uint8)
+    )
+
+    state.confidences[:] = config.Beta - 1
+    state.batch_confidence_update(
+        np.array([0, 2]), np.array([0, 1]), np.array([config.K, config.K])
+    )
+
+    assert state.finalized_counts.tolist() == [1, 1]
+    assert state.conflict
+    assert state.summary(1, None, "full")["conflict"]
+    assert conflict_score(state) == config.Beta
+
+
+def test_no_conflict_on_agreement(config, make_sampler):
+    node_types = np.array([8, 8, 8])
+    result = snowball_ls(
+        config=config,
+        node_types=node_types,
+        initial_preferences=np.ones(8, dtype=np.uint8),
+        sampler=make_sampler(node_types, config.K, 2),
+    )
+
+    assert result["finalized_honest"] == 8
+    assert result["conflict"] is False
+
+
+def test_copy_is_independent(config):
+    node_types = np.array([4, 4, 4])
+    state = SnowballState.initial(
+        config, node_types, np.array([0, 0, 1, 1], dtype=np.uint8)
+    )
+
+    clone = state.copy()
+    clone.preferences[0] = 1
+    clone.finalized_counts[0] = 3
+
+    assert state.preferences[0] == 0
+    assert state.finalized_counts[0] == 0
+    assert clone.snowball_config is state.snowball_config
+
+
+def test_impossible_event_has_zero_probability(config, make_sampler):
+    node_types = np.array([8, 8, 8])
+    result = multilevel_splitting(
+        config=config,
+        node_types=node_types,
+        initial_preferences=np.zeros(8, dtype=np.uint8),
+        sampler=make_sampler(node_types, config.K, 2),
+        trajectories=20,
+    )
+
+    assert result.probability == 0
+    assert result.level_probabilities[-1] == 0
+
+
+def test_splitting_matches_monte_carlo(config):
+    mc = run_snowball(
+        sim_config=split_config(config, 1000),
+        sampler=SnowballSampler(rng=np.random.default_rng(0)),
+        snowball_algo=snowball_ls,
+    )
+    mc_prob = np.mean([r["conflict"] for r in mc])
+    mc_var = mc_prob * (1 - mc_prob) / len(mc)
+
+    estimate = run_splitting(
+        sim_config=split_config(config, 5),
+        sampler=SnowballSampler(rng=np.random.default_rng(1)),
+        trajectories=200,
+    )
+
+    assert 0 < estimate.variance < mc_var
+    assert abs(estimate.probability - mc_prob) < 4 * np.sqrt(mc_var + estimate.variance)
+    assert estimate.summary()["runs"] == 5
+
+
+def test_summary_counts_unreached_levels_as_zero():
+    levels = [1.0, 2.0, 3.0]
+    estimate = RareEventEstimate(
+        runs=[
+            SplittingResult(levels, [0.5, 0.5, 0.5], trajectories=10, rounds=30),
+            SplittingResult(levels, [0.5, 0.0], trajectories=10, rounds=20),
+        ]
+    )
+
+    summary = estimate.summary()
+    assert summary["probability"] == pytest.approx(0.0625)
+    assert summary["level_probabilities"] == pytest.approx([0.5, 0.25, 0.25])
+    assert RareEventEstimate().summary()["level_probabilities"] is None
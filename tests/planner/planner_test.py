@@ -0,0 +1,174 @@
+import numpy as np
+import pytest
+
+from src.config import NO_PREFERENCE, SimConfig, SnowballConfig
+from src.planner import (
+    ENGINES,
+    CostModel,
+    Request,
+    RunOptions,
+    calibrate,
+    describe_request,
+    plan_simulation,
+    simulate,
+)
+from src.planner.engines import RANDOM_SAMPLING
+from src.snow.node import TYPES
+
+CONFIG = SnowballConfig(K=5, AlphaPreference=3, AlphaConfidence=4, Beta=5)
+
+
+def make_config(prefs: list[int], lnodes: int = 0, iterations: int = 1) -> SimConfig:
+    """Honest nodes with the given preferences, and optional L-nodes."""
+    node_counts = {TYPES.honest: len(prefs)}
+    if lnodes:
+        node_counts[TYPES.dynamic] = lnodes
+    return SimConfig(
+        num_nodes=len(prefs) + lnodes,
+        num_iterations=iterations,
+        snowball=CONFIG,
+        node_counts=node_counts,
+        initial_preferences={TYPES.honest: prefs},
+    )
+
+
+def test_describe_request_reads_needs():
+    prefs = [0, 1, 2, NO_PREFERENCE] * 10
+    request = describe_request(
+        make_config(prefs, lnodes=4, iterations=3),
+        RunOptions(record_latency=True, milestones=["full"]),
+    )
+
+    assert (request.num_nodes, request.num_honest) == (44, 40)
+    assert (request.k, request.beta, request.trials) == (5, 5, 3)
+    assert request.needs == {
+        "undecided",
+        "nary",
+        "finalization_rounds",
+        "milestones",
+    }
+
+
+def test_plan_rejects_unsupported_engines():
+    request = Request(
+        num_nodes=1000,
+        num_honest=1000,
+        k=5,
+        beta=5,
+        trials=1,
+        model=RANDOM_SAMPLING,
+        needs=frozenset({"adversary"}),
+    )
+    plan = plan_simulation(request, CostModel())
+
+    assert plan.engine == "snowball_rs"
+    assert plan.rejected["snowball_ls"] == "lockstep model"
+    assert "needing nary" in plan.rejected["snowball_nary_rs"]
+    assert "approximate" in plan.rejected["snowball_rs_tau"]
+    assert "adversary" in plan.rejected["snow_random_sampling"]
+    assert set(plan.estimates) | set(plan.rejected) == set(ENGINES)
+
+
+def test_plan_follows_cost_model():
+    request = Request(
+        num_nodes=10**6,
+        num_honest=10**6,
+        k=10,
+        beta=10,
+        trials=2,
+        counts_only=True,
+    )
+    assert plan_simulation(request, CostModel()).engine == "snowball_population_ls"
+
+    costly = CostModel({"snowball_population_ls": (1e4, 0.0, 0.0)})
+    plan = plan_simulation(request, costly)
+    assert plan.engine != "snowball_population_ls"
+    assert plan.calibrated["snowball_population_ls"]
+    assert not plan.calibrated[plan.engine]
+
+
+def test_plan_prefers_exact_engines_without_counts_only():
+    request = Request(num_nodes=10**6, num_honest=10**6, k=10, beta=10, trials=2)
+    plan = plan_simulation(request, CostModel())
+
+    assert plan.engine in {"snowball_ls", "snowball_ls_buffered"}
+    assert plan.estimates["snowball_population_ls"] < plan.estimates[plan.engine]
+    assert "counts only" in plan.explain()
+
+
+def test_parallel_cost_scales_with_cpus(monkeypatch):
+    request = Request(num_nodes=10**5, num_honest=10**5, k=10, beta=10, trials=1)
+    parallel = ENGINES["snowball_ls_parallel"]
+
+    monkeypatch.setattr("os.cpu_count", lambda: 1)
+    single = CostModel().estimate(parallel, request)
+    assert plan_simulation(request, CostModel()).engine != "snowball_ls_parallel"
+
+    monkeypatch.setattr("os.cpu_count", lambda: 8)
+    assert CostModel().estimate(parallel, request) < single / 4
+
+
+def test_engine_kwargs_keep_falsy_settings():
+    kwargs = RunOptions(max_rounds=0, milestones=[]).engine_kwargs()
+    assert kwargs == {"max_rounds": 0, "milestones": []}
+    assert RunOptions(record_latency=True).engine_kwargs() == {"record_latency": True}
+
+
+def test_forced_engine_must_support_request():
+    request = Request(
+        num_nodes=100,
+        num_honest=100,
+        k=5,
+        beta=5,
+        trials=1,
+        needs=frozenset({"nary"}),
+    )
+
+    assert plan_simulation(request, CostModel()).engine == "snowball_nary_ls"
+    plain = Request(num_nodes=100, num_honest=100, k=5, beta=5, trials=1)
+    assert plan_simulation(plain, CostModel(), engine="snow_lockstep").engine == (
+        "snow_lockstep"
+    )
+    with pytest.raises(ValueError, match="does not support nary"):
+        plan_simulation(request, CostModel(), engine="snowball_ls")
+    with pytest.raises(ValueError, match="Unknown engine"):
+        plan_simulation(request, CostModel(), engine="warp_drive")
+
+
+def test_calibrate_saves_and_reloads(tmp_path):
+    path = tmp_path / "cost_model.json"
+    model = calibrate(["snowball_ls"], trials=1, sizes=[50, 100], path=path)
+
+    loaded = CostModel.load(path)
+    assert loaded.coefficients == model.coefficients
+    assert loaded.is_calibrated(ENGINES["snowball_ls"])
+    assert not loaded.is_calibrated(ENGINES["snowball_rs"])
+    assert all(c >= 0 for c in loaded.coefficients["snowball_ls"])
+
+    with pytest.raises(ValueError, match="Unknown engines"):
+        calibrate(["warp_drive"], path=None)
+
+
+def test_simulate_explains_choice(tmp_path):
+    sim_config = make_config([0, 1] * 30, iterations=2)
+    simulation = simulate(
+        sim_config,
+        seed=1,
+        record_latency=True,
+        cost_model=tmp_path / "missing.json",
+    )
+
+    assert simulation.plan.engine in {"snowball_ls", "snowball_ls_buffered"}
+    assert len(simulation.results) == 2
+    for result in simulation.results:
+        assert result["rounds_to_full"] is not None
+        assert np.all(result["finalization_rounds"] > 0)
+    assert simulation.plan.engine in simulation.plan.explain()
+
+
+def test_simulate_forced_engine_matches_direct_run():
+    sim_config = make_config([0, 1] * 30)
+    planned = simulate(sim_config, seed=3, engine="snowball_ls", cost_model=CostModel())
+    direct = ENGINES["snowball_ls"].run(sim_config, "full", RunOptions(seed=3))
+
+    assert planned.results[0]["rounds_to_full"] == direct[0]["rounds_to_full"]
@@ -0,0 +1,114 @@
+import numpy as np
+import pytest
+
+from src.config import NO_PREFERENCE, SimConfig, SnowballConfig
+from src.frostbyte.sampler import SnowballSampler
+from src.frostbyte.simul import run_snowball
+from src.frostbyte.snowball import snowball_ls
+from src.preferences import (
+    ArrayFile,
+    PreferenceSpec,
+    Proportions,
+    RandomSplit,
+    RunLength,
+    preference_array,
+)
+from src.snow.network import LockstepNetwork
+from src.snow.node import TYPES
+from src.snow.sampler import UniformSampler
+
+
+@pytest.fixture
+def config():
+    """Define an instance of SnowballConfig."""
+    return SnowballConfig(K=3, AlphaPreference=2, AlphaConfidence=2, Beta=3)
+
+
+def test_proportions_split_exactly():
+    prefs = Proportions({0: 1, 1: 1, None: 1}).build(10)
+
+    # Largest remainder gives the extra node to the first value
+    assert prefs.dtype == np.uint8
+    assert prefs.tolist() == [0] * 4 + [1] * 3 + [NO_PREFERENCE] * 3
+
+
+def test_run_length_checks_size():
+    spec = RunLength([(1, 2), (0, 3)])
+
+    assert spec.build(5).tolist() == [1, 1, 0, 0, 0]
+    with pytest.raises(ValueError, match="cover 5 nodes instead of 6"):
+        spec.build(6)
+
+
+def test_random_split_is_seeded():
+    spec = RandomSplit({0: 0.25, 1: 0.75}, seed=4)
+    prefs = spec.build(1000)
+
+    assert np.count_nonzero(prefs == 0) == 250
+    np.testing.assert_array_equal(prefs, spec.build(1000))
+    assert not np.array_equal(
+        prefs, RandomSplit({0: 0.25, 1: 0.75}, seed=5).build(1000)
+    )
+
+
+def test_array_file_is_memory_mapped(tmp_path):
+    path = tmp_path / "prefs.npy"
+    np.save(path, np.array([0, 1, 1, NO_PREFERENCE], dtype=np.uint8))
+
+    prefs = ArrayFile(path).build(4)
+
+    assert isinstance(prefs, np.memmap)
+    assert prefs.tolist() == [0, 1, 1, NO_PREFERENCE]
+    with pytest.raises(ValueError, match="instead of 5"):
+        ArrayFile(path).build(5)
+
+
+def test_from_json():
+    assert PreferenceSpec.from_json({"proportions": {"0": 0.5, "none": 0.5}}) == (
+        Proportions({0: 0.5, None: 0.5})
+    )
+    assert PreferenceSpec.from_json({"random": {"1": 1}, "seed": 3}) == RandomSplit(
+        {1: 1}, seed=3
+    )
+    assert PreferenceSpec.from_json({"runs": [[0, 2]]}).build(2).tolist() == [0, 0]
+    with pytest.raises(ValueError, match="Invalid preference spec"):
+        PreferenceSpec.from_json({"ratio": 1})
+
+
+def test_lists_are_still_accepted():
+    assert preference_array([0, None, 1], 3).tolist() == [0, NO_PREFERENCE, 1]
+    assert preference_array(None, 2).tolist() == [NO_PREFERENCE] * 2
+    with pytest.raises(ValueError, match="3 entries instead of 4"):
+        preference_array([0, None, 1], 4)
+
+
+def test_run_snowball_spec_matches_list(config):
+    results = []
+    for honest in ([0] * 6 + [1] * 4, RunLength([(0, 6), (1, 4)])):
+        sim_config = SimConfig(
+            num_nodes=12,
+            num_iterations=3,
+            snowball=config,
+            node_counts={TYPES.honest: 10, TYPES.dynamic: 2},
+            initial_preferences={TYPES.honest: honest},
+        )
+        results.append(
+            run_snowball(
+                sim_config=sim_config,
+                sampler=SnowballSampler(rng=np.random.default_rng(0)),
+                snowball_algo=snowball_ls,
+            )
+        )
+
+    assert results[0] == results[1]
+
+
+def test_network_accepts_spec(config):
+    net = LockstepNetwork(
+        node_counts={TYPES.honest: 4, TYPES.offline: 1},
+        initial_preferences={TYPES.honest: Proportions({1: 0.5, None: 0.5})},
+        snowball_params=config,
+        sampler=UniformSampler(),
+    )
+
+    assert [n.preference for n in net.nodes[:4]] == [1, 1, None, None]
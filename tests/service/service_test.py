@@ -0,0 +1,92 @@
+import pytest
+
+from src.config import SimConfig, SnowballConfig
+from src.service import FairQueue, Service, ServiceClient, split_trials
+from src.snow.node import TYPES
+from src.sweep import run_engine
+
+CONFIG = SnowballConfig(K=5, AlphaPreference=3, AlphaConfidence=4, Beta=5)
+
+
+def make_config(num_nodes: int = 40, iterations: int = 3) -> SimConfig:
+    """Honest nodes split evenly between 0 and 1."""
+    return SimConfig(
+        num_nodes=num_nodes,
+        num_iterations=iterations,
+        snowball=CONFIG,
+        node_counts={TYPES.honest: num_nodes},
+        initial_preferences={TYPES.honest: [0, 1] * (num_nodes // 2)},
+    )
+
+
+@pytest.fixture
+def socket_path(tmp_path):
+    with Service(tmp_path / "service.sock", processes=2, warm_up=False) as service:
+        yield service.path
+
+
+def test_fair_queue_round_robin():
+    queue = FairQueue()
+    queue.add("sweep", [(0, i) for i in range(4)])
+    queue.add("notebook", [(0, "a"), (1, "b")])
+
+    order = [queue.pop() for _ in range(3)]
+    assert order == [("sweep", (0, 0)), ("notebook", (0, "a")), ("sweep", (0, 1))]
+
+    assert queue.drop("notebook", job=1) == 1
+    assert queue.drop("sweep") == 2
+    assert queue.pop() is None
+    assert len(queue) == 0
+
+
+def test_split_trials():
+    tasks = split_trials("snowball_ls", make_config(iterations=4), seed=7, index=2)
+
+    assert [task.trial for task in tasks] == [0, 1, 2, 3]
+    assert all(task.sim_config.num_iterations == 1 for task in tasks)
+    assert all(task.index == 2 for task in tasks)
+    assert len({task.seed for task in tasks}) == 4
+
+    with pytest.raises(ValueError, match="Unknown engine"):
+        split_trials("warp_drive", make_config())
+
+
+def test_results_stream_per_trial(socket_path):
+    configs = [make_config(), make_config(60, iterations=2)]
+    with ServiceClient(socket_path) as client:
+        job = client.submit(configs, seed=3)
+        trials = list(job)
+        results = job.results()
+
+    assert len(trials) == 5
+    assert [len(runs) for runs in results] == [3, 2]
+    assert all(run["finalized_honest"] == 40 for run in results[0])
+
+    first = split_trials("snowball_ls", configs[1], seed=4, index=1)[0]
+    (direct,) = run_engine("snowball_ls", first.sim_config, "full", first.seed)
+    assert results[1][0]["rounds_to_full"] == direct["rounds_to_full"]
+
+
+def test_clients_share_the_workers(socket_path):
+    with ServiceClient(socket_path) as sweep, ServiceClient(socket_path) as notebook:
+        large = sweep.submit([make_config(200, iterations=20)])
+        small = notebook.submit([make_config()], "snow_lockstep")
+
+        assert len(small.results()[0]) == 3
+        assert notebook.status()["clients"] == 2
+        large.cancel()
+        assert len(list(large)) < 20
+
+        # The connection is still usable after a cancelled job
+        assert len(sweep.submit([make_config(iterations=1)]).results()) == 1
+
+
+def test_failed_trials_are_reported(socket_path):
+    broken = make_config()
+    broken.initial_preferences = {TYPES.honest: [0, 1]}
+
+    with ServiceClient(socket_path) as client:
+        job = client.submit([broken])
+        assert all(trial.error for trial in job)
+        with pytest.raises(RuntimeError, match="3 of 3 trials failed"):
+            job.results()
@@ -1,7 +1,8 @@
+import numpy as np
 import pytest
 
 from src.config import SnowballConfig
-from src.snow.node import FixedNode, LNode, OfflineNode
+from src.snow.node import NO_RESPONSE, FixedNode, LNode, OfflineNode
 
 
 @pytest.fixture
@@ -52,3 +53,18 @@ def test_lnode_response(config):
     # Equal (should return 0 by tie-break rule)
     node.update_distribution({0: 30, 1: 20})
     assert node.on_query(peer_preference=None) == 1
+
+
+def test_adversary_batch_responses(config):
+    """Test batched responses of adversarial nodes."""
+    queries = np.array([0, 1, NO_RESPONSE])
+
+    offline = OfflineNode(node_id=0, snowball_params=config)
+    assert offline.on_query_batch(queries).tolist() == [NO_RESPONSE] * 3
+
+    fixed = FixedNode(node_id=1, fixed_preference=1, snowball_params=config)
+    assert fixed.on_query_batch(queries).tolist() == [1, 1, 1]
+
+    lnode = LNode(node_id=2, snowball_params=config)
+    lnode.update_distribution({0: 70, 1: 30})
+    assert lnode.on_query_batch(queries).tolist() == [1, 1, 1]
@@ -2,7 +2,7 @@ import numpy as np
 import pytest
 
 from src.config import SnowballConfig
-from src.snow.node import HonestNode
+from src.snow.node import NO_RESPONSE, HonestNode
 
 
 @pytest.fixture
@@ -82,3 +82,31 @@ def test_preference_switch(config):
 
     # preference_strength[1] = 2, [0] = 1 → should still stick with 1
     assert node.preference == 1
+
+
+def test_on_query_batch_initialized(config):
+    """Test batched responses of a decided node."""
+    node = HonestNode(node_id=0, initial_preference=1, snowball_params=config)
+    responses = node.on_query_batch(np.array([0, NO_RESPONSE, 0]))
+    assert responses.tolist() == [1, 1, 1]
+
+
+def test_on_query_batch_uninitialized(config):
+    """Test batched queries adopt the first available querier preference."""
+    node = HonestNode(node_id=0, initial_preference=None, snowball_params=config)
+    responses = node.on_query_batch(np.array([NO_RESPONSE, 0, 1, 1]))
+    assert responses.tolist() == [NO_RESPONSE, NO_RESPONSE, 0, 0]
+    assert node.preference == 0
+
+
+def test_snowball_round_integer_votes(config):
+    """Test rounds on integer vote arrays with missing votes."""
+    node = HonestNode(node_id=0, initial_preference=0, snowball_params=config)
+    node.snowball_round(np.array([1, NO_RESPONSE, NO_RESPONSE]))
+    assert node.confidence == 0
+    assert node.preference == 0
+
+    for _ in range(3):
+        node.snowball_round(np.array([1, 1, NO_RESPONSE]))
+    assert node.preference == 1
+    assert node.finalized is True
@@ -1,11 +1,13 @@
 import logging
 
+import numpy as np
 import pytest
 
 from src.config import SnowballConfig
 from src.snow.network import LockstepNetwork, RandomSamplingNetwork
-from src.snow.node import TYPES
+from src.snow.node import NO_RESPONSE, TYPES
 from src.snow.sampler import UniformSampler
+from src.utils.streams import RandomStreams
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -91,3 +93,89 @@ def test_random_sampling_finalization(simple_config, honest_setup):
     assert stats["rounds_to_full"] is not None
     assert len(stats["per_node_rounds"]) == 20
     assert sum(stats["distribution"].values()) == 20
+
+
+def test_query_peers_batched(simple_config):
+    """Test batched peer queries, including undecided and offline peers."""
+    net = LockstepNetwork(
+        node_counts={TYPES.honest: 3, TYPES.offline: 1},
+        initial_preferences={TYPES.honest: [0, 1, None]},
+        snowball_params=simple_config,
+        sampler=UniformSampler(),
+    )
+    queriers = net.nodes[:2]
+    peer_ids = np.array([[2, 3, 1], [2, 0, 3]])
+
+    votes = net._query_peers(queriers, peer_ids)
+
+    # Node 2 adopts the first querier's preference, node 3 never responds
+    assert votes.tolist() == [[NO_RESPONSE, NO_RESPONSE, 1], [0, 0, NO_RESPONSE]]
+    assert net.nodes[2].preference == 0
+
+
+def test_query_peers_pass_adopted_preferences(simple_config):
+    """Test that queriers adopting a preference earlier ask with it."""
+    net = LockstepNetwork(
+        node_counts={TYPES.honest: 3},
+        initial_preferences={TYPES.honest: [0, None, None]},
+        snowball_params=simple_config,
+        sampler=UniformSampler(),
+    )
+    peer_ids = np.array([[1, 1, 1], [2, 0, 0], [1, 1, 0]])
+
+    votes = net._query_peers(net.nodes, peer_ids)
+
+    # Node 1 adopts 0 from node 0, then passes it on to node 2
+    assert votes.tolist() == [[NO_RESPONSE, 0, 0], [NO_RESPONSE, 0, 0], [0, 0, 0]]
+    assert [node.preference for node in net.nodes] == [0, 0, 0]
+
+
+def test_query_peers_match_sequential_queries(simple_config):
+    """Test batched queries against one on_query call per sampled peer."""
+    rng = np.random.default_rng(5)
+    prefs = rng.choice([0, 1, None], size=60).tolist()
+    nets = [
+        LockstepNetwork(
+            node_counts={TYPES.honest: 60, TYPES.offline: 5},
+            initial_preferences={TYPES.honest: prefs},
+            snowball_params=simple_config,
+            sampler=UniformSampler(),
+        )
+        for _ in range(2)
+    ]
+    peer_ids = rng.integers(0, 65, size=(60, 3))
+
+    batched = nets[0]._query_peers(nets[0].nodes[:60], peer_ids)
+
+    sequential = np.empty_like(batched)
+    for row, querier in enumerate(nets[1].nodes[:60]):
+        for col, peer_id in enumerate(peer_ids[row]):
+            response = nets[1].nodes[peer_id].on_query(querier.preference)
+            sequential[row, col] = NO_RESPONSE if response is None else response
+
+    assert batched.tolist() == sequential.tolist()
+    assert [n.preference for n in nets[0].nodes] == [
+        n.preference for n in nets[1].nodes
+    ]
+
+
+@pytest.mark.parametrize("network_class", [LockstepNetwork, RandomSamplingNetwork])
+def test_streams_make_runs_reproducible(network_class, simple_config, honest_setup):
+    """Test that networks sampling from the same streams follow the same run."""
+    node_counts, initial_prefs = honest_setup
+
+    stats = []
+    for _ in range(2):
+        sampler = UniformSampler(streams=RandomStreams(seed=9))
+        sampler.set_trial(3)
+        net = network_class(
+            node_counts=node_counts,
+            initial_preferences=initial_prefs,
+            snowball_params=simple_config,
+            sampler=sampler,
+        )
+        while not net.check_honest_finalization():
+            net.run_round()
+        stats.append(net.get_finalization_stats())
+
+    assert stats[0] == stats[1]
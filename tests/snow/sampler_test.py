@@ -1,8 +1,10 @@
+import numpy as np
 import pytest
 
 from src.config import SnowballConfig
 from src.snow.node import HonestNode
-from src.snow.sampler import UniformSampler
+from src.snow.sampler import GraphSampler, UniformSampler
+from src.utils.topology import random_regular
 
 
 def make_dummy_nodes(size: int) -> list[HonestNode]:
@@ -60,3 +62,33 @@ def test_sampler_invalid():
 
     with pytest.raises(ValueError):
         sampler.sample(target, nodes, 5)
+
+
+def test_sampler_batch_excludes_self():
+    """Test batched sampling returns k distinct peers per querier."""
+    nodes = make_dummy_nodes(10)
+    sampler = UniformSampler()
+    queriers = np.array(nodes[:4], dtype=object)
+
+    peer_ids = sampler.sample_batch(queriers, nodes, 9)
+
+    assert peer_ids.shape == (4, 9)
+    for node, row in zip(queriers, peer_ids):
+        assert node.node_id not in row
+        assert len(set(row.tolist())) == 9
+
+
+def test_graph_sampler_draws_neighbors():
+    """Test graph sampling returns k distinct neighbors."""
+    nodes = make_dummy_nodes(30)
+    graph = random_regular(30, 6, seed=1)
+    sampler = GraphSampler(graph, rng=np.random.default_rng(0))
+
+    for target in nodes[:5]:
+        sample = sampler.sample(target, nodes, 4)
+        ids = [n.node_id for n in sample]
+        assert len(set(ids)) == 4
+        assert set(ids) <= set(graph.neighbors(target.node_id).tolist())
+
+    with pytest.raises(ValueError, match="degree"):
+        sampler.sample(nodes[0], nodes, 10)
@@ -0,0 +1,203 @@
+import json
+import multiprocessing as mp
+from pathlib import Path
+
+import pytest
+
+from src.sweep import SweepSpec, WorkQueue, work
+from src.sweep.cli import main
+from src.utils.store import ExperimentStore
+
+
+@pytest.fixture
+def spec() -> SweepSpec:
+    """Return a small lockstep sweep over AlphaConfidence and Beta."""
+    return SweepSpec(
+        name="tiny",
+        engine="snowball_ls",
+        seed=7,
+        base={
+            "num_nodes": 20,
+            "num_iterations": 2,
+            "snowball": {"K": 5, "AlphaPreference": 3, "AlphaConfidence": 4, "Beta": 3},
+            "node_counts": {"honest": 20},
+            "initial_preferences": {"honest": [0] * 10 + [1] * 10},
+        },
+        grid={"AlphaConfidence": [3, 4, 5], "Beta": [2, 3]},
+    )
+
+
+def test_expand_grid(spec: SweepSpec) -> None:
+    """Test one unit per grid point, with distinct seeds."""
+    units = spec.expand()
+
+    assert len(units) == 6
+    assert len({unit.unit_id for unit in units}) == 6
+    assert len({unit.seed for unit in units}) == 6
+    assert units[-1].params == {"AlphaConfidence": 5, "Beta": 3}
+    assert units[-1].sim_config().snowball.Beta == 3
+
+
+def test_expand_invalid_parameter(spec: SweepSpec) -> None:
+    """Test that unknown grid keys are rejected."""
+    spec.grid = {"Gamma": [1]}
+
+    with pytest.raises(ValueError, match="Invalid sweep parameter"):
+        spec.expand()
+
+
+def test_init_is_idempotent(spec: SweepSpec, tmp_path: Path) -> None:
+    """Test that re-initializing a queue does not duplicate units."""
+    queue = WorkQueue(tmp_path)
+
+    assert queue.init(spec.expand()) == 6
+    assert queue.init(spec.expand()) == 0
+    assert queue.status() == {"pending": 6, "claimed": 0, "done": 0, "failed": 0}
+
+
+def test_workers_drain_queue(spec: SweepSpec, tmp_path: Path) -> None:
+    """Test that concurrent workers run every unit exactly once."""
+    queue = WorkQueue(tmp_path)
+    queue.init(spec.expand())
+
+    with mp.get_context().Pool(3) as pool:
+        processed = pool.map(work, [tmp_path] * 3)
+
+    assert sum(processed) == 6
+    assert queue.status() == {"pending": 0, "claimed": 0, "done": 6, "failed": 0}
+
+    records = queue.results()
+    assert sorted(r["unit"]["unit_id"] for r in records) == [
+        u.unit_id for u in spec.expand()
+    ]
+    assert all(len(r["results"]) == 2 for r in records)
+    assert all(res["finalized_honest"] == 20 for r in records for res in r["results"])
+
+
+def test_failures_are_recorded(spec: SweepSpec, tmp_path: Path) -> None:
+    """Test that a failing unit is recorded and can be requeued."""
+    spec.grid = {"K": [5, 50]}  # K larger than the network
+    queue = WorkQueue(tmp_path)
+    queue.init(spec.expand())
+
+    assert work(tmp_path) == 2
+    assert queue.status()["done"] == 1
+    assert queue.status()["failed"] == 1
+    assert list(queue.errors()) == ["tiny-1"]
+
+    assert queue.requeue(failed=True) == 1
+    assert queue.status()["pending"] == 1
+    assert queue.errors() == {}
+
+
+def test_stale_claims_are_requeued(spec: SweepSpec, tmp_path: Path) -> None:
+    """Test that claims of dead workers go back to pending."""
+    queue = WorkQueue(tmp_path)
+    queue.init(spec.expand())
+    queue.claim("dead-worker")
+
+    assert queue.requeue(older_than=3600) == 0
+    assert queue.requeue(older_than=-1) == 1
+    assert queue.status()["pending"] == 6
+
+
+def test_claims_without_owner_are_requeued(spec: SweepSpec, tmp_path: Path) -> None:
+    """Test that a worker killed while claiming does not block requeueing."""
+    queue = WorkQueue(tmp_path)
+    queue.init(spec.expand())
+    unit = queue.claim("killed-worker")
+    (tmp_path / "claimed" / f"{unit.unit_id}.owner").unlink()
+
+    assert queue.requeue(older_than=3600) == 1
+    assert queue.status()["pending"] == 6
+    assert queue.claim("next-worker") == unit
+
+
+def test_lost_claims_are_dropped(spec: SweepSpec, tmp_path: Path) -> None:
+    """Test that a slow worker does not overwrite a requeued unit."""
+    slow, fast = WorkQueue(tmp_path), WorkQueue(tmp_path)
+    slow.init(spec.expand())
+    unit = slow.claim("slow-worker")
+    slow.requeue(older_than=-1)
+
+    # Another worker runs the unit while the slow one is still busy
+    assert fast.claim("fast-worker") == unit
+    assert fast.complete(unit, [{"run": "fast"}])
+
+    assert not slow.complete(unit, [{"run": "slow"}])
+    assert not slow.fail(unit, "late failure")
+    assert slow.results()[0]["results"] == [{"run": "fast"}]
+    assert slow.status() == {"pending": 5, "claimed": 0, "done": 1, "failed": 0}
+
+
+def test_cli_roundtrip(spec: SweepSpec, tmp_path: Path) -> None:
+    """Test init, work and collect through the command line."""
+    spec_path = tmp_path / "spec.json"
+    spec_path.write_text(json.dumps(spec.__dict__))
+    queue_dir, output = tmp_path / "queue", tmp_path / "out.csv"
+
+    main(["init", str(spec_path), str(queue_dir)])
+    main(["work", str(queue_dir)])
+    main(["collect", str(queue_dir), "-o", str(output)])
+
+    lines = output.read_text().splitlines()
+    assert len(lines) == 1 + 6 * 2
+    assert lines[0].startswith("unit_id,AlphaConfidence,Beta,")
+
+
+def test_cli_processes_respect_max_units(spec: SweepSpec, tmp_path: Path) -> None:
+    """Test that every worker process stops after --max-units units."""
+    spec_path = tmp_path / "spec.json"
+    spec_path.write_text(json.dumps(spec.__dict__))
+    queue_dir = tmp_path / "queue"
+
+    main(["init", str(spec_path), str(queue_dir)])
+    main(["work", str(queue_dir), "-p", "2", "--max-units", "1"])
+
+    assert WorkQueue(queue_dir).status()["done"] == 2
+
+
+def test_cli_processes_can_run_parallel_units(
+    spec: SweepSpec, tmp_path: Path
+) -> None:
+    """Test that worker processes may start the parallel engine's workers."""
+    spec.engine = "snowball_ls_parallel"
+    spec.grid = {"Beta": [2, 3]}
+    spec_path = tmp_path / "spec.json"
+    spec_path.write_text(json.dumps(spec.__dict__))
+    queue_dir = tmp_path / "queue"
+
+    main(["init", str(spec_path), str(queue_dir)])
+    main(["work", str(queue_dir), "-p", "2"])
+
+    queue = WorkQueue(queue_dir)
+    assert queue.errors() == {}
+    assert queue.status()["done"] == 2
+
+
+def test_workers_publish_telemetry(spec: SweepSpec, tmp_path: Path) -> None:
+    """Test that workers leave progress gauges for `status`."""
+    queue = WorkQueue(tmp_path)
+    queue.init(spec.expand())
+
+    work(tmp_path, worker_id="w1", max_units=2, telemetry_interval=60)
+
+    progress = queue.progress()
+    assert progress["workers"] == 1
+    assert progress["finalized_honest"] == 20
+
+
+def test_workers_append_to_store(spec: SweepSpec, tmp_path: Path) -> None:
+    """Test that worker processes index their results in an ExperimentStore."""
+    spec_path = tmp_path / "spec.json"
+    spec_path.write_text(json.dumps(spec.__dict__))
+    queue_dir, store_dir = tmp_path / "queue", tmp_path / "store"
+
+    main(["init", str(spec_path), str(queue_dir)])
+    main(["work", str(queue_dir), "-p", "2", "--store", str(store_dir)])
+
+    store = ExperimentStore(store_dir)
+    assert store.count(engine="snowball_ls") == 12
+    frame = store.frame(Beta=3, AlphaConfidence=[3, 5])
+    assert len(frame) == 4
+    assert set(frame["unit_id"]) == {"tiny-1", "tiny-5"}
@@ -0,0 +1,153 @@
+from types import SimpleNamespace
+
+import numpy as np
+
+from src.config import NO_PREFERENCE, SimConfig, SnowballConfig
+from src.frostbyte.sampler import SnowballSampler
+from src.frostbyte.snowball import snowball_ls
+from src.frostbyte.snowball.lockstep import lockstep_round
+from src.frostbyte.snowball.state import SnowballState
+from src.snow.network import LockstepNetwork
+from src.snow.node import TYPES
+from src.snow.sampler import UniformSampler
+from src.snow.simulation import run_simulation
+from src.utils.milestones import MILESTONES, Milestone, MilestoneTracker
+
+CONFIG = SnowballConfig(K=5, AlphaPreference=3, AlphaConfidence=4, Beta=5)
+
+
+def run_lockstep(**kwargs) -> dict:
+    """Run a small lockstep simulation with a fixed seed."""
+    node_types = np.array([40, 40, 44])
+    prefs = np.array([0, 1] * 22, dtype=np.uint8)
+
+    sampler = SnowballSampler(rng=np.random.default_rng(0))
+    sampler.update_config(sample_size=5, num_nodes=44, lnode_start=40)
+    return snowball_ls(CONFIG, node_types, prefs, sampler, **kwargs)
+
+
+def test_all_milestones_in_one_run():
+    result = run_lockstep(milestones=MILESTONES)
+    rounds = result["milestones"]
+
+    assert set(rounds) == set(MILESTONES)
+    assert 0 < rounds["first_finalization"] <= rounds["partial"]
+    assert rounds["partial"] <= rounds["finalized_90"] <= rounds["full"]
+    assert rounds["partial"] == result["rounds_to_partial"]
+    assert rounds["full"] == result["rounds_to_full"]
+    assert rounds["last_flip"] <= rounds["full"]
+
+
+def test_milestones_do_not_change_the_run():
+    plain = run_lockstep(record_latency=True)
+    tracked = run_lockstep(record_latency=True, milestones=["last_flip"])
+
+    assert tracked["rounds_to_full"] == plain["rounds_to_full"]
+    assert np.array_equal(
+        tracked["finalization_rounds"], plain["finalization_rounds"]
+    )
+    assert tracked["milestones"]["last_flip"] is not None
+
+
+def test_run_stops_at_last_required_milestone():
+    result = run_lockstep(milestones=["first_finalization", "last_flip"])
+    rounds = result["milestones"]
+
+    assert result["rounds_to_full"] is None
+    assert 0 < result["finalized_honest"] < 40
+    assert rounds["first_finalization"] is not None
+
+
+def test_optional_milestone_does_not_block():
+    late = Milestone("never", lambda p: False, required=False)
+    result = run_lockstep(milestones=["partial", late])
+
+    assert result["milestones"]["never"] is None
+    assert result["milestones"]["partial"] == result["rounds_to_partial"]
+    assert result["rounds_to_full"] is None
+
+
+def test_last_change_records_latest_round():
+    tracker = MilestoneTracker(["last_lnode_change", "full"])
+    state = SimpleNamespace(
+        round=0,
+        num_honest=4,
+        finalized_count=0,
+        count_0=3,
+        lnode_pref=1,
+        preferences=np.array([0, 0, 0, 1], dtype=np.uint8),
+        flips=0,
+    )
+
+    for round_, lnode_pref in enumerate([1, 0, 0, 1, 1]):
+        state.round, state.lnode_pref = round_, lnode_pref
+        assert not tracker.observe(state)
+
+    state.round, state.finalized_count = 5, 4
+    assert tracker.observe(state)
+    assert tracker.results() == {"last_lnode_change": 3, "full": 5}
+
+
+def test_run_simulation_milestones():
+    sim_config = SimConfig(
+        num_nodes=20,
+        num_iterations=2,
+        snowball=CONFIG,
+        node_counts={TYPES.honest: 20},
+        initial_preferences={TYPES.honest: [0] * 10 + [1] * 10},
+    )
+    results = run_simulation(
+        LockstepNetwork,
+        UniformSampler(rng=np.random.default_rng(1)),
+        sim_config,
+        milestones=["first_finalization", "partial", "full", "last_flip"],
+    )
+
+    for result in results:
+        rounds = result["milestones"]
+        assert rounds["first_finalization"] <= rounds["partial"] <= rounds["full"]
+        assert rounds["full"] == result["rounds_to_full"]
+        assert rounds["partial"] <= result["rounds_to_full"]
+
+
+def test_flip_counts_match_preference_changes():
+    node_types = np.array([40, 40, 44])
+    prefs = np.array([0, 1, NO_PREFERENCE, 1] * 11, dtype=np.uint8)
+    state = SnowballState.initial(CONFIG, node_types, prefs)
+    sampler = SnowballSampler(rng=np.random.default_rng(2))
+    sampler.update_config(sample_size=5, num_nodes=44, lnode_start=40)
+    tracker = MilestoneTracker(["last_flip"])
+
+    changes, last_change = 0, None
+    tracker.observe(state)
+    while True:
+        before = state.preferences[:40].copy()
+        if not lockstep_round(state, sampler, np.arange(40)):
+            break
+        changed = np.count_nonzero(state.preferences[:40] != before)
+        changes += changed
+        last_change = state.round if changed else last_change
+        tracker.observe(state)
+
+    assert state.flips == changes > 0
+    assert tracker.results()["last_flip"] == last_change
+
+
+def test_network_counts_follow_preferences():
+    net = LockstepNetwork(
+        node_counts={TYPES.honest: 30, TYPES.dynamic: 4},
+        initial_preferences={TYPES.honest: [0, 1, None] * 10},
+        snowball_params=CONFIG,
+        sampler=UniformSampler(rng=np.random.default_rng(3)),
+    )
+
+    # Nodes adopting a preference may flip it in the same round
+    changes = 0
+    while not net.check_honest_finalization() and net.round < 100:  # noqa: PLR2004
+        before = [node.preference for node in net.honest_nodes]
+        net.run_round()
+        after = [node.preference for node in net.honest_nodes]
+        changes += sum(a != b for a, b in zip(before, after, strict=True))
+        assert net.honest_counts == [after.count(0), after.count(1)]
+
+    assert net.flips >= changes > 0
@@ -0,0 +1,146 @@
+import multiprocessing as mp
+import sqlite3
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.config import SimConfig, SnowballConfig
+from src.frostbyte.simul.metrics import FinalizationHistogram
+from src.preferences import Proportions
+from src.snow.node import TYPES
+from src.utils.store import ExperimentStore, config_hash
+
+
+def make_config(beta: int, num_nodes: int = 30) -> SimConfig:
+    """Small honest network with the given Beta."""
+    return SimConfig(
+        num_nodes=num_nodes,
+        num_iterations=2,
+        snowball=SnowballConfig(K=5, AlphaPreference=3, AlphaConfidence=4, Beta=beta),
+        node_counts={TYPES.honest: num_nodes},
+        initial_preferences={TYPES.honest: Proportions({0: 0.5, 1: 0.5})},
+    )
+
+
+def make_results(rounds: int) -> list[dict]:
+    """Two runs with scalar results and a per-node array."""
+    return [
+        {
+            "finalized_honest": 30,
+            "rounds_to_full": rounds + trial,
+            "conflict": False,
+            "finalization_rounds": np.arange(30, dtype=np.uint32) + trial,
+        }
+        for trial in range(2)
+    ]
+
+
+def test_append_and_filter(tmp_path: Path) -> None:
+    store = ExperimentStore(tmp_path)
+    for beta in (5, 10, 15):
+        store.append(
+            make_results(beta),
+            engine="snowball_ls",
+            sim_config=make_config(beta),
+            seed=2**64 - beta,
+            params={"label": f"beta-{beta}"},
+        )
+    store.append(make_results(1), engine="snowball_rs", sim_config=make_config(5))
+
+    assert store.count() == 8
+    assert store.count(engine="snowball_ls", Beta=10) == 2
+    assert store.count(Beta=[5, 15]) == 6
+    assert store.count(Beta=slice(10, None), K=5) == 4
+    assert store.count(label="beta-5", engine="snowball_rs") == 0
+    assert store.count(seed=2**64 - 15) == 2
+    assert store.count(config_hash=config_hash(make_config(5))) == 4
+
+    (first, second) = store.runs(Beta=15, engine="snowball_ls")
+    assert (first.trial, second.trial) == (0, 1)
+    assert first.seed == 2**64 - 15
+    assert first.params["num_nodes"] == 30
+    assert first.params["count_honest"] == 30
+    assert second.results["rounds_to_full"] == 16
+
+
+def test_arrays_are_loaded_lazily(tmp_path: Path) -> None:
+    store = ExperimentStore(tmp_path)
+    store.append(make_results(3), engine="snowball_ls", sim_config=make_config(5))
+
+    run = list(store.runs())[1]
+    assert "finalization_rounds" not in run.results
+    rounds = run.array("finalization_rounds")
+    assert isinstance(rounds, np.memmap)
+    assert np.array_equal(rounds, np.arange(30) + 1)
+    assert run.result()["rounds_to_full"] == 4
+
+    frame = store.frame()
+    assert list(frame["rounds_to_full"]) == [3, 4]
+    assert "finalization_rounds" not in frame
+
+
+def test_failed_appends_leave_no_arrays(tmp_path: Path) -> None:
+    store = ExperimentStore(tmp_path)
+    results = make_results(3)
+    results[1]["rounds_to_full"] = object()
+    with pytest.raises(TypeError):
+        store.append(results, engine="snowball_ls")
+
+    # A failing insert rolls back the runs
+    conn = store._connection()
+    conn.execute("DROP TABLE arrays")
+    with pytest.raises(sqlite3.OperationalError):
+        store.append(make_results(3), engine="snowball_ls")
+
+    assert conn.execute("SELECT COUNT(*) FROM runs").fetchone() == (0,)
+    assert not any(path.is_file() for path in (tmp_path / "arrays").rglob("*"))
+
+
+def test_configs_are_stored_once(tmp_path: Path) -> None:
+    store = ExperimentStore(tmp_path)
+    digest = config_hash(make_config(5))
+    assert digest == config_hash(make_config(5))
+    assert digest != config_hash(make_config(6))
+
+    store.append(make_results(3), engine="snowball_ls", sim_config=make_config(5))
+    store.append(make_results(4), engine="snowball_ls", sim_config=make_config(5))
+
+    config = store.config(digest)
+    assert config["snowball"]["Beta"] == 5
+    assert config["initial_preferences"]["honest"]["type"] == "Proportions"
+    with pytest.raises(KeyError, match="Unknown config hash"):
+        store.config("0" * 16)
+
+
+def test_histograms_are_summarized(tmp_path: Path) -> None:
+    store = ExperimentStore(tmp_path)
+    histogram = FinalizationHistogram.from_rounds(np.array([3, 3, 4], dtype=np.uint32))
+    store.append([{"latency_histogram": histogram}], engine="snowball_ls")
+
+    (run,) = store.runs()
+    assert run.results["latency_histogram"] == histogram.summary()
+    assert run.config_hash is None
+
+
+def _append_many(args: tuple[ExperimentStore, int]) -> None:
+    store, worker = args
+    for beta in range(10):
+        store.append(
+            make_results(beta),
+            engine="snowball_ls",
+            sim_config=make_config(beta + 1),
+            seed=worker,
+        )
+
+
+def test_concurrent_appends(tmp_path: Path) -> None:
+    store = ExperimentStore(tmp_path)
+    store.count()  # the parent's connection must not leak into workers
+
+    with mp.get_context().Pool(4) as pool:
+        pool.map(_append_many, [(store, worker) for worker in range(4)])
+
+    assert store.count() == 80
+    assert store.count(seed=2, Beta=slice(None, 5)) == 10
+    assert len({run.run_id for run in store.runs()}) == 80
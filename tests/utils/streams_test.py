@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+
+from src.utils.streams import RandomStreams, StreamBuffers, floyd_sample, philox4x32
+
+
+@pytest.mark.parametrize(
+    ("counter", "key", "expected"),
+    [
+        ([0, 0, 0, 0], (0, 0), [0x6627E8D5, 0xE169C58D, 0xBC57AC4C, 0x9B00DBD8]),
+        (
+            [0xFFFFFFFF] * 4,
+            (0xFFFFFFFF, 0xFFFFFFFF),
+            [0x408F276D, 0x41C83B0E, 0xA20BC7C6, 0x6D5451FD],
+        ),
+        (
+            [0x243F6A88, 0x85A308D3, 0x13198A2E, 0x03707344],
+            (0xA4093822, 0x299F31D0),
+            [0xD16CFE09, 0x94FDCCEB, 0x5001E420, 0x24126EA1],
+        ),
+    ],
+)
+def test_philox_known_answers(counter, key, expected):
+    """Test against the Random123 Philox4x32-10 known-answer vectors."""
+    assert philox4x32(np.array(counter), key).tolist() == expected
+
+
+def test_peer_samples_are_distinct_and_exclude_self():
+    streams = RandomStreams(seed=3)
+    nodes = np.arange(50)
+
+    peers = streams.peer_samples(0, 7, nodes, num_nodes=50, k=20)
+
+    assert peers.shape == (50, 20)
+    assert peers.min() >= 0
+    assert peers.max() < 50
+    assert all(len(set(row)) == 20 for row in peers.tolist())
+    assert not (peers == nodes[:, None]).any()
+
+
+def test_peer_samples_do_not_depend_on_batching():
+    streams = RandomStreams(seed=3)
+    nodes = np.arange(100)
+
+    full = streams.peer_samples(2, 5, nodes, num_nodes=100, k=10)
+    shards = [
+        streams.peer_samples(2, 5, shard, num_nodes=100, k=10)
+        for shard in np.array_split(nodes[::-1], 7)
+    ]
+
+    np.testing.assert_array_equal(full[::-1], np.concatenate(shards))
+    assert streams.peer_samples(2, 5, nodes[:0], num_nodes=100, k=10).shape == (0, 10)
+
+
+def test_streams_differ_by_key():
+    nodes = np.arange(10)
+    base = RandomStreams(seed=1).peer_samples(0, 0, nodes, 100, 5)
+
+    assert not np.array_equal(
+        base, RandomStreams(seed=2).peer_samples(0, 0, nodes, 100, 5)
+    )
+    assert not np.array_equal(
+        base, RandomStreams(seed=1).peer_samples(1, 0, nodes, 100, 5)
+    )
+    assert not np.array_equal(
+        base, RandomStreams(seed=1).peer_samples(0, 1, nodes, 100, 5)
+    )
+
+
+def test_peer_samples_are_uniform():
+    streams = RandomStreams(seed=11)
+
+    counts = np.zeros(11, dtype=np.int64)
+    for round_ in range(2000):
+        peers = streams.peer_samples(0, round_, np.array([0]), num_nodes=11, k=3)
+        counts += np.bincount(peers.ravel(), minlength=11)
+
+    # Each of the 10 peers is drawn 600 times on average
+    assert counts[0] == 0
+    assert np.all(np.abs(counts[1:] - 600) < 90)
+
+
+def test_peer_samples_reuse_buffers():
+    streams = RandomStreams(seed=5)
+    nodes = np.random.default_rng(0).permutation(200)[:150]
+    u = streams.uniform(1, 2, nodes, 7)
+    expected = floyd_sample(u, 199)
+    expected += expected >= nodes[:, None]
+
+    # Chunks of 16 nodes through the same buffers, over two calls
+    buffers = StreamBuffers(16, 7)
+    out = np.empty((150, 7), dtype=np.int32)
+    for _ in range(2):
+        peers = streams.peer_samples(1, 2, nodes, 200, 7, out=out, buffers=buffers)
+        assert peers is out
+        np.testing.assert_array_equal(peers, expected)
+
+    with pytest.raises(ValueError, match="cannot draw 5"):
+        streams.peer_samples(1, 2, nodes, 200, 5, buffers=buffers)
@@ -0,0 +1,73 @@
+import urllib.request
+
+import numpy as np
+
+from src.config import SnowballConfig
+from src.frostbyte.sampler import SnowballSampler
+from src.frostbyte.snowball import snowball_ls
+from src.utils.telemetry import Telemetry, aggregate, parse_textfile
+
+
+def run_watched(telemetry: Telemetry) -> dict:
+    """Run a small lockstep simulation followed by `telemetry`."""
+    config = SnowballConfig(K=5, AlphaPreference=3, AlphaConfidence=4, Beta=5)
+    node_types = np.array([40, 40, 40])
+    prefs = np.zeros(40, dtype=np.uint8)
+    prefs[:10] = 1
+
+    sampler = SnowballSampler(rng=np.random.default_rng(0))
+    sampler.update_config(sample_size=5, num_nodes=40, lnode_start=40)
+    return snowball_ls(config, node_types, prefs, sampler, telemetry=telemetry)
+
+
+def test_textfile_reports_final_state(tmp_path):
+    path = tmp_path / "worker.prom"
+    with Telemetry(interval=0.01, textfile=path, labels={"worker": 'a"b'}) as tel:
+        result = run_watched(tel)
+
+    samples = {
+        name: (labels, value)
+        for name, labels, value in parse_textfile(path.read_text())
+    }
+    labels, rounds = samples["snowball_round"]
+    assert labels == {"worker": 'a"b'}
+    assert samples["snowball_finalized_honest"][1] == result["finalized_honest"]
+    assert samples["snowball_active_honest"][1] == 40 - result["finalized_honest"]
+    assert samples["snowball_count_0"][1] == result["honest_0"]
+    assert samples["snowball_rss_bytes"][1] > 0
+    assert rounds == result["rounds_to_full"]
+
+
+def test_http_endpoint_serves_gauges():
+    telemetry = Telemetry(interval=60, port=0)
+    with telemetry:
+        run_watched(telemetry)
+        url = f"http://127.0.0.1:{telemetry.port}/metrics"
+        with urllib.request.urlopen(url, timeout=5) as response:  # noqa: S310
+            body = response.read().decode()
+
+    assert "# TYPE snowball_finalized_honest gauge" in body
+    assert "snowball_finalized_honest 40" in body
+
+
+def test_labels_survive_render_and_parse():
+    labels = {"host": 'C:\\runs\\"x"', "shard": "a\nb} 1", "worker": "\\n"}
+    telemetry = Telemetry(interval=60, labels=labels)
+    telemetry.sample()
+
+    samples = parse_textfile(telemetry.render())
+    assert samples
+    assert all(parsed == labels for _, parsed, _ in samples)
+
+
+def test_aggregate_sums_workers(tmp_path):
+    for worker, (rounds, finalized) in enumerate([(7, 10), (3, 25)]):
+        (tmp_path / f"{worker}.prom").write_text(
+            f"# TYPE snowball_round gauge\n"
+            f'snowball_round{{worker="{worker}"}} {rounds}\n'
+            f'snowball_finalized_honest{{worker="{worker}"}} {finalized}\n'
+        )
+
+    totals = aggregate(sorted(tmp_path.glob("*.prom")))
+
+    assert totals == {"workers": 2, "round": 3, "finalized_honest": 35}
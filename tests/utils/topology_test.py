@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from src.config import SnowballConfig
+from src.frostbyte.sampler import SnowballSampler
+from src.frostbyte.snowball import snowball_ls
+from src.utils.streams import RandomStreams
+from src.utils.topology import PeerGraph, clustered, random_regular, small_world
+
+
+def test_from_edges_symmetrizes_and_dedupes():
+    graph = PeerGraph.from_edges(
+        np.array([0, 1, 2, 2, 3]), np.array([1, 0, 2, 3, 0]), num_nodes=4
+    )
+
+    assert graph.num_edges == 3
+    assert graph.degrees.tolist() == [2, 1, 1, 2]
+    assert graph.neighbors(0).tolist() == [1, 3]
+    assert graph.neighbors(3).tolist() == [0, 2]
+
+
+@pytest.mark.parametrize(
+    "graph",
+    [
+        random_regular(1000, 8, seed=1),
+        random_regular(1000, 7, seed=2),
+        small_world(1000, 8, rewire=0.2, seed=3),
+        clustered(1000, 10, 12, mixing=0.1, seed=4),
+    ],
+)
+def test_generators_are_simple_undirected_graphs(graph):
+    assert graph.num_nodes == 1000
+    for node in range(0, 1000, 97):
+        neighbors = graph.neighbors(node)
+        assert node not in neighbors
+        assert np.all(np.diff(neighbors) > 0)
+        for peer in neighbors:
+            assert node in graph.neighbors(peer)
+
+
+def test_random_regular_degrees():
+    degrees = random_regular(2000, 10, seed=5).degrees
+
+    assert degrees.max() == 10
+    assert np.mean(degrees == 10) > 0.95
+
+
+def test_sample_variable_degree():
+    graph = clustered(500, 5, 16, seed=6)
+    nodes = np.arange(500)
+    u = np.random.default_rng(0).random((500, 6))
+
+    peers = graph.sample(nodes, u)
+
+    for node, row in zip(nodes, peers):
+        assert len(set(row.tolist())) == 6
+        assert set(row.tolist()) <= set(graph.neighbors(node).tolist())
+
+
+def test_sampler_with_graph_runs_lockstep():
+    graph = random_regular(400, 12, seed=7)
+    config = SnowballConfig(K=8, AlphaPreference=5, AlphaConfidence=6, Beta=10)
+    node_types = np.array([400, 400, 400])
+    prefs = np.zeros(400, dtype=np.uint8)
+    prefs[::4] = 1
+
+    sampler = SnowballSampler(
+        rng=np.random.default_rng(0), streams=RandomStreams(seed=1), graph=graph
+    )
+    sampler.update_config(sample_size=8, num_nodes=400, lnode_start=400)
+    peers = sampler.draw_peers(np.array([0, 1]))
+    assert set(peers[0].tolist()) <= set(graph.neighbors(0).tolist())
+
+    # Boundary nodes of a sparse graph may never settle: stop at partial
+    results = snowball_ls(config, node_types, prefs, sampler, finality="partial")
+    assert results["rounds_to_partial"] is not None
+
+    sampler.update_config(sample_size=13, num_nodes=400, lnode_start=400)
+    with pytest.raises(ValueError, match="degree"):
+        sampler.check_config()